@@ -0,0 +1,67 @@
+"""Loading time of B-UML code: executing it versus the AST-based BUMLLoader.
+
+Builds a domain model with ``--classes`` classes of ``--attributes`` attributes, each class associated with the next
+one, writes its code with ``domain_model_to_code``, and times loading that code with ``exec`` (as the web editor
+backend and the deployment notation used to) and with ``load_buml_code``, which builds the same elements from the
+syntax tree without executing the code. Both are dominated by Python's parser: ``exec`` compiles the code to bytecode,
+while the loader has the parser build the syntax tree as Python objects, which is slower.
+
+Run it from the root of the repository::
+
+    python benchmarks/buml_loading.py --classes 2000
+"""
+
+import argparse
+import ast
+import time
+
+from besser.BUML.metamodel.structural import DomainModel, Class, Property, BinaryAssociation, Multiplicity, \
+    IntegerType, StringType
+from besser.generators import MemorySink
+from besser.utilities import domain_model_to_code, load_buml_code
+
+
+def build(classes: int, attributes: int) -> DomainModel:
+    """Create the domain model."""
+    types = [Class(name=f"C{index}", attributes={Property(name=f"a{attribute}", type=IntegerType if attribute % 2
+                                                          else StringType) for attribute in range(attributes)})
+             for index in range(classes)]
+    associations = {BinaryAssociation(name=f"r{index}", ends={
+        Property(name=f"source{index}", type=types[index], multiplicity=Multiplicity(1, 1)),
+        Property(name=f"target{index}", type=types[index + 1], multiplicity=Multiplicity(0, "*"))})
+        for index in range(classes - 1)}
+    return DomainModel(name="Benchmark", types=set(types), associations=associations)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def execute(code: str) -> dict:
+    namespace = {}
+    exec(code, namespace)
+    return namespace
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--classes", type=int, default=2000, help="number of classes (default: 2000)")
+    parser.add_argument("--attributes", type=int, default=5, help="attributes per class (default: 5)")
+    args = parser.parse_args()
+
+    sink = MemorySink()
+    domain_model_to_code(build(args.classes, args.attributes), "model.py", sink=sink)
+    code = sink.files["model.py"].decode()
+
+    executed, exec_time = timed(execute, code)
+    loaded, load_time = timed(load_buml_code, code)
+    _, parse_time = timed(ast.parse, code)
+    assert len(executed["domain_model"].types) == len(loaded["domain_model"].types)
+    print(f"{args.classes} classes, {len(code.splitlines())} lines: exec {exec_time:.2f} s, "
+          f"BUMLLoader {load_time:.2f} s (of which {parse_time:.2f} s building the syntax tree)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Conversion time of web editor class diagrams (JSON) to B-UML domain models.
+
+Builds the JSON of a synthetic class diagram with ``--classes`` classes of ``--attributes`` attributes and
+``--methods`` methods, ``--enumerations`` enumerations used as attribute types, an association between each class and
+the next one, and a generalization for every tenth class, and times ``process_class_diagram`` on it.
+
+Run it from the root of the repository::
+
+    python benchmarks/class_diagram_conversion.py --classes 5000
+"""
+
+import argparse
+import time
+
+from besser.utilities.web_modeling_editor.backend.services.json_to_buml import process_class_diagram
+
+PRIMITIVE_TYPES = ("str", "int", "float", "bool", "date")
+
+
+def build(classes: int, attributes: int, methods: int, enumerations: int) -> dict:
+    """Create the JSON of the class diagram."""
+    elements = {}
+    relationships = {}
+    for index in range(enumerations):
+        literals = [f"e{index}_l{literal}" for literal in range(4)]
+        elements[f"e{index}"] = {"id": f"e{index}", "name": f"Enum{index}", "type": "Enumeration", "owner": None,
+                                 "attributes": literals, "methods": []}
+        for literal in literals:
+            elements[literal] = {"id": literal, "name": f"L{literal.rsplit('l', 1)[1]}", "type": "ClassAttribute",
+                                 "owner": f"e{index}"}
+    for index in range(classes):
+        attribute_ids = [f"c{index}_a{attribute}" for attribute in range(attributes)]
+        method_ids = [f"c{index}_m{method}" for method in range(methods)]
+        elements[f"c{index}"] = {"id": f"c{index}", "name": f"C{index}", "type": "Class", "owner": None,
+                                 "attributes": attribute_ids, "methods": method_ids}
+        for attribute, attribute_id in enumerate(attribute_ids):
+            attribute_type = f"Enum{(index + attribute) % enumerations}" if enumerations and attribute == 0 \
+                else PRIMITIVE_TYPES[attribute % len(PRIMITIVE_TYPES)]
+            elements[attribute_id] = {"id": attribute_id, "name": f"+ a{attribute}: {attribute_type}",
+                                      "type": "ClassAttribute", "owner": f"c{index}"}
+        for method, method_id in enumerate(method_ids):
+            elements[method_id] = {"id": method_id, "name": f"+ m{method}(x: int, y: str = 'a'): C{(index + 1) % classes}",
+                                   "type": "ClassMethod", "owner": f"c{index}"}
+        if index:
+            relationships[f"r{index}"] = {"id": f"r{index}", "name": f"r{index}", "type": "ClassBidirectional",
+                                          "source": {"element": f"c{index - 1}", "multiplicity": "1",
+                                                     "role": f"source{index}"},
+                                          "target": {"element": f"c{index}", "multiplicity": "0..*",
+                                                     "role": f"target{index}"}}
+        if index % 10 == 9:
+            relationships[f"g{index}"] = {"id": f"g{index}", "type": "ClassInheritance",
+                                          "source": {"element": f"c{index}"}, "target": {"element": f"c{index - 9}"}}
+    return {"elements": {"elements": elements, "relationships": relationships}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--classes", type=int, default=5000, help="number of classes (default: 5000)")
+    parser.add_argument("--attributes", type=int, default=5, help="attributes per class (default: 5)")
+    parser.add_argument("--methods", type=int, default=2, help="methods per class (default: 2)")
+    parser.add_argument("--enumerations", type=int, default=50, help="number of enumerations (default: 50)")
+    args = parser.parse_args()
+
+    diagram = build(args.classes, args.attributes, args.methods, args.enumerations)
+    start = time.perf_counter()
+    model = process_class_diagram(diagram)
+    elapsed = time.perf_counter() - start
+    print(f"{args.classes} classes, {len(diagram['elements']['elements'])} elements, "
+          f"{len(diagram['elements']['relationships'])} relationships: process_class_diagram {elapsed:.2f} s "
+          f"({len(model.associations)} associations, {len(model.generalizations)} generalizations)")
+
+
+if __name__ == "__main__":
+    main()
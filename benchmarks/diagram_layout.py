@@ -0,0 +1,72 @@
+"""Layout time of the diagrams produced from B-UML models by the web editor backend.
+
+Builds a domain model with ``--classes`` classes, a fifth of them specializing one of the five previous classes, and
+about one association per class with one of the next twenty classes, and times ``compute_layout`` (layered placement
+of the generalization hierarchies, then force-directed placement of the hierarchies and isolated classes) and the
+whole ``domain_model_to_json`` conversion. It also reports the mean length of the associations against the mean
+distance between two random classes, to show that associated classes are placed close to each other.
+
+Run it from the root of the repository::
+
+    python benchmarks/diagram_layout.py --classes 1000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from besser.BUML.metamodel.structural import DomainModel, Class, Property, BinaryAssociation, Generalization, \
+    Multiplicity, IntegerType
+from besser.utilities.web_modeling_editor.backend.services.buml_to_json import domain_model_to_json, \
+    element_height, ELEMENT_WIDTH
+from besser.utilities.web_modeling_editor.backend.services.layout_engine import compute_layout
+
+
+def build(classes: int, seed: int) -> DomainModel:
+    """Create the domain model."""
+    rng = random.Random(seed)
+    types = [Class(name=f"C{index}", attributes={Property(name=f"a{attribute}", type=IntegerType)
+                                                 for attribute in range(rng.randint(0, 6))})
+             for index in range(classes)]
+    generalizations = {Generalization(general=types[index - rng.randint(1, 5)], specific=types[index])
+                       for index in range(5, classes) if rng.random() < 0.2}
+    associations = set()
+    for index in range(classes - 1):
+        other = min(classes - 1, index + rng.randint(1, 20))
+        associations.add(BinaryAssociation(name=f"r{index}", ends={
+            Property(name=f"source{index}", type=types[index], multiplicity=Multiplicity(1, 1)),
+            Property(name=f"target{index}", type=types[other], multiplicity=Multiplicity(0, "*"))}))
+    return DomainModel(name="Benchmark", types=set(types), associations=associations,
+                       generalizations=generalizations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--classes", type=int, default=1000, help="number of classes (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random model (default: 0)")
+    args = parser.parse_args()
+
+    model = build(args.classes, args.seed)
+    sizes = {cls: (ELEMENT_WIDTH, element_height(cls)) for cls in sorted(model.types, key=lambda cls: cls.name)}
+    links = [tuple(end.type for end in association.ends) for association in model.associations]
+    start = time.perf_counter()
+    positions = compute_layout(sizes, [(g.specific, g.general) for g in model.generalizations], links)
+    layout_time = time.perf_counter() - start
+    start = time.perf_counter()
+    domain_model_to_json(model)
+    conversion_time = time.perf_counter() - start
+
+    points = {cls: np.array(position) for cls, position in positions.items()}
+    rng = random.Random(args.seed)
+    classes = list(points)
+    link_length = np.mean([np.linalg.norm(points[a] - points[b]) for a, b in links])
+    random_length = np.mean([np.linalg.norm(points[rng.choice(classes)] - points[rng.choice(classes)])
+                             for _ in range(2000)])
+    print(f"{args.classes} classes: layout {layout_time:.2f} s, domain_model_to_json {conversion_time:.2f} s, "
+          f"mean association length {link_length:.0f} px (random pair: {random_length:.0f} px)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Memory footprint of the B-UML metamodel elements.
+
+Builds an object model with ``--objects`` instances of a class with ``--attributes`` integer attributes, and
+reports the memory allocated per metamodel element, measured with ``tracemalloc``. With ``--columnar``, the same
+objects are loaded column by column into a ``ColumnarObjectModel``.
+
+Run it from the root of the repository::
+
+    python benchmarks/metamodel_memory.py --objects 100000
+    python benchmarks/metamodel_memory.py --objects 10000000 --columnar
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from besser.BUML.metamodel.structural import Class, Property, IntegerType
+from besser.BUML.metamodel.object import Object, AttributeLink, DataValue, ObjectModel, ColumnarObjectModel
+
+
+def build(objects: int, attributes: int):
+    """Create the object model, returning the objects and the number of elements created."""
+    properties = [Property(name=f"a{index}", type=IntegerType) for index in range(attributes)]
+    cls = Class(name="Item", attributes=set(properties))
+    instances = [
+        Object(name=f"item{index}", classifier=cls,
+               slots=[AttributeLink(attribute=prop, value=DataValue(classifier=IntegerType, value=index))
+                      for prop in properties])
+        for index in range(objects)
+    ]
+    model = ObjectModel(name="Items", instances=set(instances), links=set())
+    # Object + (AttributeLink + DataValue) per attribute
+    return model, objects * (1 + 2 * attributes)
+
+
+def build_columnar(objects: int, attributes: int):
+    """Create the same objects in a columnar object model."""
+    properties = [Property(name=f"a{index}", type=IntegerType) for index in range(attributes)]
+    cls = Class(name="Item", attributes=set(properties))
+    model = ColumnarObjectModel(name="Items")
+    values = range(objects)
+    model.add_objects(cls, {prop.name: values for prop in properties})
+    return model, objects * (1 + 2 * attributes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=100_000, help="number of objects (default: 100000)")
+    parser.add_argument("--attributes", type=int, default=3, help="attributes per object (default: 3)")
+    parser.add_argument("--columnar", action="store_true", help="load the objects into a ColumnarObjectModel")
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    model, elements = (build_columnar if args.columnar else build)(args.objects, args.attributes)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{args.objects} objects, {elements} elements: {current / 2 ** 20:.1f} MiB, "
+          f"{current / elements:.0f} bytes per element, {elapsed:.1f} s (traced)")
+
+
+if __name__ == "__main__":
+    main()
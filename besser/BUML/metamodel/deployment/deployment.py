@@ -121,6 +121,8 @@ class Resources:
         memory (int): The amount of memory in megabytes.
     """
 
+    __slots__ = ("__cpu", "__memory")
+
     def __init__(self, cpu: int, memory: int):
         self.cpu: int = cpu
         self.memory: int = memory
@@ -166,6 +168,8 @@ class Application(NamedElement):
         domain_model (DomainModel): The domain model of the application.
     """
 
+    __slots__ = ("__image_repo", "__port", "__required_resources", "__domain_model")
+
     def __init__(self, name: str, image_repo: str, port: int, required_resources: Resources,
             domain_model: DomainModel):
         super().__init__(name)
@@ -234,6 +238,8 @@ class Volume(NamedElement):
         sub_path (str): The sub-path within the volume.
     """
 
+    __slots__ = ("__mount_path", "__sub_path")
+
     def __init__(self, name: str, mount_path: str, sub_path: str):
         super().__init__(name)
         self.mount_path: str = mount_path
@@ -278,6 +284,8 @@ class Container(NamedElement):
         volumes (set[Volume]): The set of volumes attached to the container.
     """
 
+    __slots__ = ("__application", "__resources_limit", "__volumes")
+
     def __init__(self, name: str, application: Application, resources_limit: Resources = None,
             volumes: set[Volume] = None):
         super().__init__(name)
@@ -332,6 +340,8 @@ class Deployment(NamedElement):
         containers (set[Container]): The set of containers in the deployment.
     """
 
+    __slots__ = ("__replicas", "__containers")
+
     def __init__(self, name: str, replicas: int, containers: set[Container]):
         super().__init__(name)
         self.replicas: int = replicas
@@ -380,6 +390,8 @@ class Service(NamedElement):
         application (Application): The application associated with the service.
     """
 
+    __slots__ = ("__port", "__target_port", "__type", "__protocol", "__application")
+
     def __init__(self, name: str, port: int, target_port: int, type: ServiceType,
                  protocol: Protocol, application: Application = None):
         super().__init__(name)
@@ -460,6 +472,8 @@ class IPRange(NamedElement):
         public (bool): Whether the IP range is public or private.
     """
 
+    __slots__ = ("__cidr_range", "__type", "__public")
+
     def __init__(self, name: str, cidr_range: str, type: IPRangeType, public: bool):
         super().__init__(name)
         self.cidr_range: str = cidr_range
@@ -511,6 +525,8 @@ class SecurityGroup(NamedElement):
         rules (set[Service]): The set of services that define the security rules.
     """
 
+    __slots__ = ("__rules",)
+
     def __init__(self, name: str, rules: set[Service]):
         super().__init__(name)
         self.rules: set[Service] = rules
@@ -542,6 +558,8 @@ class Network(NamedElement):
         network.
     """
 
+    __slots__ = ("__security_groups",)
+
     def __init__(self, name: str, security_groups: set[SecurityGroup] = None):
         super().__init__(name)
         self.security_groups: set[SecurityGroup] = security_groups if security_groups is not None else set()
@@ -573,6 +591,8 @@ class Subnetwork(NamedElement):
         network (Network): The network to which the subnetwork belongs.
     """
 
+    __slots__ = ("__ip_ranges", "__network")
+
     def __init__(self, name: str, ip_ranges: set[IPRange], network: Network):
         super().__init__(name)
         self.ip_ranges : set[IPRange] = ip_ranges
@@ -612,6 +632,8 @@ class Zone(NamedElement):
         name (str): The name of the zone.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str):
         super().__init__(name)
 
@@ -629,6 +651,8 @@ class Region(NamedElement):
         zones (set[Zone]): The set of zones within the region.
     """
 
+    __slots__ = ("__zones",)
+
     def __init__(self, name: str, zones: set[Zone]):
         super().__init__(name)
         self.zones : set[Zone] = zones
@@ -668,6 +692,8 @@ class Node(NamedElement):
         processor (Processor): The processor type of the node.
     """
 
+    __slots__ = ("__public_ip", "__private_ip", "__os", "__resources", "__storage", "__processor")
+
     def __init__(self, name: str, public_ip: str, private_ip, os: str, resources: Resources,
                  storage: int, processor: Processor):
         super().__init__(name)
@@ -743,6 +769,8 @@ class EdgeNode(Node):
     """A class to represent an edge node.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, public_ip: str, private_ip, os: str, resources: Resources,
                  storage: int, processor: Processor):
         super().__init__(name, public_ip, private_ip, os, resources, storage, processor)
@@ -752,6 +780,8 @@ class CloudNode(Node):
     """A class to represent a cloud node.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, public_ip: str, private_ip, os: str, resources: Resources,
                  storage: int, processor: Processor):
         super().__init__(name, public_ip, private_ip, os, resources, storage, processor)
@@ -780,6 +810,8 @@ class Cluster(NamedElement):
         subnets (set[Subnetwork]): The set of subnetworks in the cluster.
     """
 
+    __slots__ = ("__services", "__deployments", "__regions", "__net_config", "__nodes", "__networks", "__subnets")
+
     def __init__(self, name: str, services: set[Service], deployments: set[Deployment],
                  regions: set[Region], net_config: bool = True, nodes: set[Node] = None,
                  networks: set[Network] = None, subnets: set[Subnetwork] = None):
@@ -890,6 +922,8 @@ class PublicCluster(Cluster):
         provider (Provider): The provider of the public cluster.
     """
 
+    __slots__ = ("__config_file", "__num_nodes", "__provider")
+
     def __init__(self, name: str, services: set[Service], deployments: set[Deployment],
                  regions: Region, num_nodes: int, provider: Provider, config_file: str,
                  networks: set[Network] = None, subnets: set[Subnetwork] = None,
@@ -953,6 +987,8 @@ class OnPremises(Cluster):
         hypervisor (Hypervisor): The hypervisor used in the on-premises cluster.
     """
 
+    __slots__ = ("__hypervisor",)
+
     def __init__(self, name: str, services: set[Service], deployments: set[Deployment],
                  regions: Region, nodes: set[Node], hypervisor: Hypervisor,
                  networks: set[Network], subnets: set[Subnetwork]):
@@ -987,6 +1023,8 @@ class DeploymentModel(Model):
         clusters (set[Cluster]): The set of clusters in the deployment model.
     """
 
+    __slots__ = ("__clusters",)
+
     def __init__(self, name: str, clusters: set[Cluster]):
         super().__init__(name)
         self.clusters: set[Cluster] = clusters
@@ -14,6 +14,8 @@ class FileSourceType:
         name (str): The name of the file source type.
         type (str): The type of the file source, such as 'FileSystem', 'LocalStorage', or 'DatabaseFileSystem'.
     """
+
+    __slots__ = ("__name", "__type")
     
     def __init__(self, name: str, type: str):
         self.type: str = type
@@ -62,6 +64,8 @@ class CollectionSourceType:
         name (str): The name of the collection source type.
         type (str): The type of the collection source, such as 'List', 'Table', 'Tree', 'Grid', 'Array', or 'Stack'.
     """
+
+    __slots__ = ("__name", "__type")
     
     def __init__(self, name: str, type: str):
         self.type: str = type
@@ -152,6 +156,8 @@ class DataSource:
         name (str): The name of the data source.
     """
 
+    __slots__ = ("__name",)
+
     def __init__(self, name: str):
         self.name: str = name
 
@@ -182,6 +188,8 @@ class ModelElement(DataSource):
         dataSourceClass (Class): The class representing the data source.
         fields: set[Property]: The fields representing the attributes of the model element.
     """
+
+    __slots__ = ("__dataSourceClass", "__fields")
     
     def __init__(self, name: str, dataSourceClass: Class, fields: set[Property]):
         super().__init__(name)
@@ -227,6 +235,8 @@ class File(DataSource):
         name (str): The name of the file data source.
         type (FileSourceType): The type of the file data source.
     """
+
+    __slots__ = ("__type",)
     
     def __init__(self, name: str, type:FileSourceType):
         super().__init__(name)
@@ -258,6 +268,8 @@ class Collection(DataSource):
         name (str): The name of the collection data source.
         type (CollectionSourceType): The type of the collection data source.
     """
+
+    __slots__ = ("__type",)
     def __init__(self, name: str, type:CollectionSourceType):
         super().__init__(name)
         self.type: CollectionSourceType = type
@@ -287,9 +299,11 @@ class ViewElement(NamedElement):
         name (str): The name of the view element.
         description (str): the description of the view element.
     """
+
+    __slots__ = ("__description",)
     
     def __init__(self, name: str, description: str, visibility: str = "public"):
-        super().__init__(name, visibility)
+        super().__init__(name, visibility=visibility)
         self.description: str = description
 
     @property
@@ -317,6 +331,8 @@ class ViewComponent(ViewElement):
         name (str): The name of the view component.
         description (str): The description of the view component.
     """
+
+    __slots__ = ()
     
     def __init__(self, name: str, description: str):
         super().__init__(name, description)
@@ -336,6 +352,8 @@ class ViewContainer(ViewElement):
         name (str): The name of the view container.
         description (str): The description of the view container.
     """
+
+    __slots__ = ("__view_elements",)
     
     def __init__(self, name: str, description: str, view_elements: set[ViewElement]):
         super().__init__(name, description)
@@ -376,6 +394,8 @@ class Screen(ViewContainer):
         y_dpi (str): The Y DPI (dots per inch) of the screen.
         size (str): The size of the screen.
     """
+
+    __slots__ = ("__x_pdi", "__y_pdi", "__size")
     
     def __init__(self, name: str, description: str, view_elements: set[ViewElement], x_dpi: str, y_dpi: str, size: str):
         super().__init__(name, description, view_elements)
@@ -435,9 +455,11 @@ class Module(NamedElement):
         name (str): name (str): The name of the module.
         screens (set[Screen]): The set of screens contained in the module.
     """
+
+    __slots__ = ("__screens",)
     
     def __init__(self, name: str, screens: set[Screen], visibility: str = "public"):
-        super().__init__(name, visibility)
+        super().__init__(name, visibility=visibility)
         self.screens: set[Screen] = screens
 
     @property
@@ -469,6 +491,8 @@ class DataList(ViewComponent):
         name (str): The name of the list.
         list_sources (set[DataSource]): The set of data sources associated with the list.
     """
+
+    __slots__ = ("__list_sources",)
     
     def __init__(self, name: str, description: str, list_sources: set[DataSource]):
         super().__init__(name, description)
@@ -511,6 +535,8 @@ class Button(ViewComponent):
         actionType (ButtonActionType): The action type of the button.
         targetScreen (Screen, optional): The target Screen associated with the button when the actionType is "Navigate"
     """
+
+    __slots__ = ("__label", "__buttonType", "__actionType", "__targetScreen")
     
     def __init__(self, name: str, description: str, label: str, buttonType: ButtonType, actionType: ButtonActionType, targetScreen: Screen = None):
         super().__init__(name, description)
@@ -589,6 +615,8 @@ class Image(ViewComponent):
     Attributes:
         name (str): The name of the image.
     """
+
+    __slots__ = ()
     
     def __init__(self, name: str, description: str):
         super().__init__(name, description)
@@ -613,6 +641,8 @@ class InputField(ViewComponent):
         fieldType (str): The type of the input field.
         validationRules (str): The validation rules for the input field.
     """
+
+    __slots__ = ("__validationRules", "__fieldType")
     
     def __init__(self, name: str, description: str, fieldType: str, validationRules: str):
         super().__init__(name, description)
@@ -665,6 +695,8 @@ class Form(ViewComponent):
         description (str): The description of the form.
         inputFields (set[InputField]): The set of input fields contained in the form.
     """
+
+    __slots__ = ("__inputFields",)
     
     def __init__(self, name: str, description: str, inputFields: set[InputField]):
         super().__init__(name, description)
@@ -693,6 +725,8 @@ class MenuItem:
     Attributes:
         label (str): The label of the menu item.
     """
+
+    __slots__ = ("label",)
     
     def __init__(self, label: str):
         self.label: str = label
@@ -714,6 +748,8 @@ class Menu(ViewComponent):
         description (str): The description of the menu.
         menuItems (set[MenuItem]): The set of menu items contained in the menu.
     """
+
+    __slots__ = ("__menuItems",)
     
     def __init__(self, name: str, description: str, menuItems: set[MenuItem]):
         super().__init__(name, description)
@@ -755,6 +791,8 @@ class Application(Model):
         description (str): The description of the application.
         screenCompatibility (bool): Indicates whether the application has screen compatibility.
     """
+
+    __slots__ = ("__package", "__versionCode", "__versionName", "__description", "__screenCompatibility", "__modules")
     def __init__(self, name: str, package: str, versionCode: str, versionName: str, modules: set[Module], description: str, screenCompatibility: bool = False):
         super().__init__(name)
         self.package: str = package
@@ -1 +1,2 @@
-from .object import *
\ No newline at end of file
+from .object import *
+from .columnar import *
@@ -0,0 +1,727 @@
+import numbers
+from array import array
+from typing import Any, Iterable, Optional
+
+from besser.BUML.metamodel.structural import NamedElement, Property, Type, Class, Association
+from besser.BUML.metamodel.object.object import AttributeLink, DataValue, Instance, Object, LinkEnd, Link, \
+    ObjectModel
+
+# Typecodes of the arrays storing the values of each primitive data type, and the type of their values; other types
+# are dictionary-encoded.
+_TYPECODES = {"int": ("q", numbers.Integral), "float": ("d", numbers.Real), "bool": ("b", bool)}
+
+
+class _TypedColumn:
+    """A column of numbers or booleans stored in a typed array, with a mask of the defined values."""
+
+    __slots__ = ("values", "defined", "kind")
+
+    def __init__(self, typecode: str, kind: type):
+        self.values: array = array(typecode)
+        self.defined: bytearray = bytearray()
+        self.kind: type = kind
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, row: int) -> Any:
+        if not self.defined[row]:
+            return None
+        # booleans are stored as bytes
+        return bool(self.values[row]) if self.kind is bool else self.values[row]
+
+    def __setitem__(self, row: int, value: Any):
+        self.check((value,))
+        self.values[row] = 0 if value is None else value
+        self.defined[row] = value is not None
+
+    def check(self, values: Iterable):
+        """Check that values can be stored in the column, before any is stored."""
+        if isinstance(values, range):
+            return
+        kind = self.kind
+        for value in values:
+            # bool is a subclass of int, but booleans and numbers are not stored in the same columns
+            if value is not None and (not isinstance(value, kind) or (kind is not bool and isinstance(value, bool))):
+                type_name = next(name for name, (_, other) in _TYPECODES.items() if other is kind)
+                raise ValueError(f"{value!r} is not a value of type '{type_name}'.")
+
+    def extend(self, values: Iterable):
+        values = values if isinstance(values, (list, range)) else list(values)
+        if isinstance(values, range) or None not in values:
+            self.values.extend(values)
+            self.defined.extend(b"\x01" * len(values))
+        else:
+            self.values.extend(0 if value is None else value for value in values)
+            self.defined.extend(value is not None for value in values)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.itemsize * len(self.values) + len(self.defined)
+
+
+class _DictionaryColumn:
+    """A dictionary-encoded column: each distinct value is stored once and rows hold its code (-1 for None)."""
+
+    __slots__ = ("codes", "dictionary", "index")
+
+    def __init__(self):
+        self.codes: array = array("i")
+        self.dictionary: list = []
+        self.index: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> Any:
+        code = self.codes[row]
+        return self.dictionary[code] if code >= 0 else None
+
+    def __setitem__(self, row: int, value: Any):
+        self.codes[row] = self.__code(value)
+
+    def check(self, values: Iterable):
+        """Any value can be stored in a dictionary-encoded column."""
+
+    def extend(self, values: Iterable):
+        values = values if isinstance(values, list) else list(values)
+        if values.count(None) == len(values):
+            self.codes.extend(array("i", [-1]) * len(values))
+            return
+        index = self.index
+        codes = [index.get(value) for value in values]
+        if None in codes:
+            codes = [self.__code(value) for value in values]
+        self.codes.extend(codes)
+
+    def __code(self, value: Any) -> int:
+        if value is None:
+            return -1
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        return code
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.itemsize * len(self.codes)
+
+
+class ClassTable:
+    """The objects of a class stored column by column: one column per attribute and one for the object names.
+
+    Numeric and boolean attributes are stored in typed arrays; the other attributes and the names are
+    dictionary-encoded.
+
+    Args:
+        cls (Class): the class of the objects.
+
+    Attributes:
+        cls (Class): the class of the objects.
+        attributes (list[Property]): the attributes of the class (including inherited ones), by name.
+    """
+
+    __slots__ = ("cls", "attributes", "__columns", "__names")
+
+    def __init__(self, cls: Class):
+        self.cls: Class = cls
+        self.attributes: list[Property] = sorted(cls.all_attributes(), key=lambda attribute: attribute.name)
+        self.__columns: dict = {
+            attribute.name: _TypedColumn(*_TYPECODES[attribute.type.name])
+            if attribute.type is not None and attribute.type.name in _TYPECODES else _DictionaryColumn()
+            for attribute in self.attributes
+        }
+        self.__names: _DictionaryColumn = _DictionaryColumn()
+
+    def __len__(self) -> int:
+        return len(self.__names)
+
+    def extend(self, columns: dict, names: list = None, count: int = None) -> range:
+        """Append rows given column by column.
+
+        Args:
+            columns (dict[str, list]): the values of each attribute, by attribute name. Missing attributes are None.
+            names (list[str], optional): the names of the objects. Defaults to names generated from the row.
+            count (int, optional): the number of rows, required if neither columns nor names are given.
+
+        Returns:
+            range: the rows appended.
+        """
+        if count is None:
+            if names is None and not columns:
+                raise ValueError("The number of rows is required when no columns or names are given.")
+            count = len(names) if names is not None else len(next(iter(columns.values())))
+        unknown = set(columns) - set(self.__columns)
+        if unknown:
+            raise ValueError(f"Class '{self.cls.name}' has no attributes {sorted(unknown)}.")
+        start = len(self)
+        # all the columns are checked before any is extended, so that a rejected column leaves the table unchanged
+        for name, column in self.__columns.items():
+            values = columns.get(name)
+            if values is not None:
+                if len(values) != count:
+                    raise ValueError(f"Column '{name}' has {len(values)} values for {count} rows.")
+                column.check(values)
+        for name, column in self.__columns.items():
+            values = columns.get(name)
+            column.extend(values if values is not None else [None] * count)
+        self.__names.extend(names if names is not None else [None] * count)
+        return range(start, start + count)
+
+    def value(self, row: int, attribute: str) -> Any:
+        """Get the value of an attribute of the object in a row (None if the class has no such attribute)."""
+        column = self.__columns.get(attribute)
+        return column[row] if column is not None else None
+
+    def set_value(self, row: int, attribute: str, value: Any):
+        """Set the value of an attribute of the object in a row."""
+        if attribute not in self.__columns:
+            raise ValueError(f"Class '{self.cls.name}' has no attribute '{attribute}'.")
+        self.__columns[attribute][row] = value
+
+    def dictionary(self, attribute: str) -> Optional[list]:
+        """Get the distinct values of a dictionary-encoded attribute (None for attributes stored in typed arrays)."""
+        column = self.__columns[attribute]
+        return column.dictionary if isinstance(column, _DictionaryColumn) else None
+
+    def undefined_rows(self, attribute: str) -> list[int]:
+        """Get the rows in which an attribute has no value."""
+        column = self.__columns[attribute]
+        if isinstance(column, _DictionaryColumn):
+            if -1 not in column.codes:
+                return []
+            return [row for row, code in enumerate(column.codes) if code < 0]
+        rows, row = [], column.defined.find(0)
+        while row >= 0:
+            rows.append(row)
+            row = column.defined.find(0, row + 1)
+        return rows
+
+    def name(self, row: int) -> str:
+        """Get the name of the object in a row."""
+        name = self.__names[row]
+        return name if name is not None else f"{self.cls.name.lower()}_{row}"
+
+    @property
+    def nbytes(self) -> int:
+        """int: Get the number of bytes used by the columns (excluding the dictionaries of distinct values)."""
+        return self.__names.nbytes + sum(column.nbytes for column in self.__columns.values())
+
+
+class _EdgeTable:
+    """The links of a binary association, as two arrays of object ids (one per end) and lazily built indexes."""
+
+    __slots__ = ("association", "ends", "first", "second", "__indexes")
+
+    def __init__(self, association: Association):
+        self.association: Association = association
+        # edge i links first[i], at the side of ends[0], and second[i], at the side of ends[1]
+        self.ends: tuple = tuple(sorted(association.ends, key=lambda end: end.name))
+        self.first: array = array("q")
+        self.second: array = array("q")
+        self.__indexes: dict = {}
+
+    def side(self, end: Property) -> int:
+        """Get the position (0 or 1) of an association end."""
+        for position, other in enumerate(self.ends):
+            if other is end or other.name == end.name:
+                return position
+        raise ValueError(f"'{end.name}' is not an end of association '{self.association.name}'.")
+
+    def extend(self, first: Iterable, second: Iterable):
+        self.first.extend(first)
+        self.second.extend(second)
+        self.__indexes = {}
+
+    def targets(self, object_id: int, end: Property, size: int) -> array:
+        """Get the ids of the objects linked to an object, on the side of an end, using a CSR index."""
+        position = self.side(end)
+        if position not in self.__indexes:
+            sources, targets = (self.first, self.second) if position == 1 else (self.second, self.first)
+            self.__indexes[position] = _csr(sources, targets, size)
+        offsets, values = self.__indexes[position]
+        if object_id + 1 >= len(offsets):
+            return values[0:0]
+        return values[offsets[object_id]:offsets[object_id + 1]]
+
+    def degrees(self, end: Property, size: int) -> array:
+        """Count the objects linked to each object through an end, in one pass over the edges."""
+        sources = self.first if self.side(end) == 1 else self.second
+        counts = array("q", bytes(8 * size))
+        for source in sources:
+            counts[source] += 1
+        return counts
+
+    @property
+    def nbytes(self) -> int:
+        return 16 * len(self.first)
+
+
+def _csr(sources: array, targets: array, size: int) -> tuple:
+    """Group the targets by source: the targets of source s are values[offsets[s]:offsets[s + 1]]."""
+    offsets = array("q", bytes(8 * (size + 1)))
+    for source in sources:
+        offsets[source + 1] += 1
+    for position in range(size):
+        offsets[position + 1] += offsets[position]
+    values = array("q", bytes(8 * len(targets)))
+    positions = offsets[:-1]
+    for source, target in zip(sources, targets):
+        values[positions[source]] = target
+        positions[source] += 1
+    return offsets, values
+
+
+class ObjectView(Object):
+    """A lightweight view of an object stored in a columnar object model.
+
+    Views are created on demand and hold no values: the attribute values are read from the columns of the
+    model, and the slots and links are built when they are accessed. Two views of the same object are equal.
+
+    Args:
+        model (ColumnarObjectModel): the model storing the object.
+        object_id (int): the id of the object in the model.
+
+    Attributes:
+        object_id (int): the id of the object in the model.
+    """
+
+    __slots__ = ("__model", "__id")
+
+    def __init__(self, model: "ColumnarObjectModel", object_id: int):
+        self._tracker = None
+        self.__model: ColumnarObjectModel = model
+        self.__id: int = object_id
+
+    @property
+    def object_id(self) -> int:
+        """int: Get the id of the object in the model."""
+        return self.__id
+
+    @property
+    def name(self) -> str:
+        """str: Get the name of the object."""
+        return self.__model.name_of(self.__id)
+
+    @property
+    def classifier(self) -> Type:
+        """Type: Get the class of the object."""
+        return self.__model.class_of(self.__id)
+
+    @property
+    def creation_sequence(self) -> int:
+        """int: Get the id of the object, which follows the order in which objects were added."""
+        return self.__id
+
+    @property
+    def timestamp(self):
+        """datetime: Get the timestamp of the model, shared by its objects."""
+        return self.__model.timestamp
+
+    @property
+    def synonyms(self):
+        """None: Objects of columnar models have no synonyms."""
+        return None
+
+    @property
+    def visibility(self) -> str:
+        """str: Get the visibility of the object."""
+        return "public"
+
+    def value_of(self, attribute: Property) -> Any:
+        """Get the value of an attribute of the object."""
+        return self.__model.value(self.__id, attribute)
+
+    @property
+    def slots(self) -> list[AttributeLink]:
+        """list[AttributeLink]: Build the slots of the object from the columns of the model."""
+        return [AttributeLink(attribute=attribute, value=DataValue(classifier=attribute.type,
+                                                                  value=self.__model.value(self.__id, attribute)))
+                for attribute in self.__model.attributes_of(self.__id)]
+
+    @property
+    def links(self) -> set:
+        """set[Link]: Build the links involving the object from the edges of the model."""
+        return self.__model.links_of(self.__id)
+
+    def link_ends(self) -> set:
+        """set[LinkEnd]: Get the link ends of the links of the object, on the side of the linked objects."""
+        return {end for link in self.links for end in link.connections if end.object != self}
+
+    def navigate(self, end: Property) -> list:
+        """Get the objects linked to the object through an association end.
+
+        Args:
+            end (Property): the association end to navigate (the end on the side of the linked objects).
+
+        Returns:
+            list[Object]: the linked objects (views), once per link.
+        """
+        return [self.__model.object(target) for target in self.__model.navigate(self.__id, end)]
+
+    def _add_link(self, link):
+        """Links of columnar models are stored as edges: building a Link from views does not change them."""
+
+    def _delete_link(self, link):
+        """Links of columnar models are stored as edges: building a Link from views does not change them."""
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ObjectView) and other.__model is self.__model and other.__id == self.__id
+
+    def __hash__(self) -> int:
+        return hash((id(self.__model), self.__id))
+
+
+class ColumnarObjectModel(ObjectModel):
+    """An object model storing its objects column by column, for large data sets.
+
+    The attribute values of the objects of each class are stored in a ``ClassTable`` (typed arrays for numbers and
+    booleans, dictionary-encoded columns for the other values) and the links of each binary association as two
+    arrays of object ids. Objects are identified by integer ids and accessed through ``ObjectView`` instances,
+    created on demand, which implement the ``Object`` API; ``instances_of()`` and ``navigate()`` read the tables
+    and the edge indexes directly.
+
+    Objects cannot be removed and changes cannot be tracked: columnar models are meant for data snapshots.
+    Iterating over ``instances`` or ``links`` builds a view of every object or link of the model.
+
+    Args:
+        name (str): the name of the object model.
+
+    Attributes:
+        name (str): inherited from NamedElement, represents the name of the model.
+        tables (list[ClassTable]): the tables of the objects, one per class.
+    """
+
+    __slots__ = ("__tables", "__table_index", "__table_ids", "__object_tables", "__object_rows", "__edges")
+
+    def __init__(self, name: str):
+        NamedElement.__init__(self, name)
+        self.__tables: list[ClassTable] = []
+        self.__table_index: dict[str, int] = {}
+        # ranges of the ids of the objects of each table
+        self.__table_ids: list[list[range]] = []
+        # table and row of each object, by object id
+        self.__object_tables: array = array("i")
+        self.__object_rows: array = array("q")
+        self.__edges: dict[str, _EdgeTable] = {}
+
+    @classmethod
+    def from_object_model(cls, object_model: ObjectModel) -> "ColumnarObjectModel":
+        """Copy the objects and links of an object model into a columnar object model.
+
+        Args:
+            object_model (ObjectModel): the object model.
+
+        Returns:
+            ColumnarObjectModel: the columnar copy of the model.
+        """
+        model = cls(object_model.name)
+        ids = {}
+        objects = sorted((instance for instance in object_model.instances if isinstance(instance, Object)),
+                         key=lambda obj: obj.creation_sequence)
+        for obj in objects:
+            ids[obj] = model.add_instance(obj)
+        for link in sorted(object_model.links, key=lambda link: link.creation_sequence):
+            # The edges are stored with the association owning the ends of the link
+            ends = {end.association_end: ids[end.object] for end in link.connections}
+            owner = next(iter(ends)).owner if ends else None
+            model.add_link(owner if isinstance(owner, Association) else link.association, ends)
+        return model
+
+    @property
+    def tables(self) -> list[ClassTable]:
+        """list[ClassTable]: Get the tables of the objects, one per class."""
+        return list(self.__tables)
+
+    def table(self, cls: Class) -> ClassTable:
+        """Get the table storing the objects of a class, creating it if needed.
+
+        Args:
+            cls (Class): the class.
+
+        Returns:
+            ClassTable: the table of the class.
+        """
+        index = self.__table_index.get(cls.name)
+        if index is None:
+            index = self.__table_index[cls.name] = len(self.__tables)
+            self.__tables.append(ClassTable(cls))
+            self.__table_ids.append([])
+        return self.__tables[index]
+
+    def __len__(self) -> int:
+        return len(self.__object_rows)
+
+    def add_objects(self, cls: Class, columns: dict, names: list = None, count: int = None) -> range:
+        """Add objects of a class, given their attribute values column by column.
+
+        Args:
+            cls (Class): the class of the objects.
+            columns (dict[str, list]): the values of each attribute, by attribute name. Missing attributes are None.
+            names (list[str], optional): the names of the objects. Defaults to names generated from the row.
+            count (int, optional): the number of objects, required if neither columns nor names are given.
+
+        Returns:
+            range: the ids of the objects added.
+        """
+        table = self.table(cls)
+        index = self.__table_index[cls.name]
+        rows = table.extend(columns, names, count)
+        start = len(self.__object_rows)
+        self.__object_tables.extend([index] * len(rows))
+        self.__object_rows.extend(rows)
+        ids = self.__table_ids[index]
+        if ids and ids[-1].stop == start:
+            ids[-1] = range(ids[-1].start, start + len(rows))
+        else:
+            ids.append(range(start, start + len(rows)))
+        return range(start, start + len(rows))
+
+    def add_object(self, cls: Class, values: dict = None, name: str = None) -> int:
+        """Add an object of a class.
+
+        Args:
+            cls (Class): the class of the object.
+            values (dict[str, Any], optional): the attribute values, by attribute name.
+            name (str, optional): the name of the object.
+
+        Returns:
+            int: the id of the object.
+        """
+        columns = {attribute: [value] for attribute, value in (values or {}).items()}
+        return self.add_objects(cls, columns, names=[name], count=1)[0]
+
+    def add_links(self, end: Property, sources: Iterable[int], targets: Iterable[int]):
+        """Link objects through a binary association.
+
+        Args:
+            end (Property): an end of the association.
+            sources (Iterable[int]): the ids of the objects on the opposite side of end.
+            targets (Iterable[int]): the ids of the objects on the side of end, reachable from the sources
+                through end.
+        """
+        edges = self.__edge_table(end.owner)
+        if edges.side(end) == 1:
+            edges.extend(sources, targets)
+        else:
+            edges.extend(targets, sources)
+
+    def add_link(self, association: Association, objects: dict):
+        """Link two objects through a binary association.
+
+        Args:
+            association (Association): the association.
+            objects (dict[Property, int]): the id of the object at each end of the association.
+        """
+        edges = self.__edge_table(association)
+        by_side = {edges.side(end): object_id for end, object_id in objects.items()}
+        edges.extend([by_side[0]], [by_side[1]])
+
+    def __edge_table(self, association: Association) -> _EdgeTable:
+        if association.name not in self.__edges:
+            if len(association.ends) != 2:
+                raise ValueError(f"Association '{association.name}' is not binary.")
+            self.__edges[association.name] = _EdgeTable(association)
+        return self.__edges[association.name]
+
+    def object(self, object_id: int) -> ObjectView:
+        """Get a view of an object.
+
+        Args:
+            object_id (int): the id of the object.
+
+        Returns:
+            ObjectView: the view of the object.
+        """
+        return ObjectView(self, object_id)
+
+    def class_of(self, object_id: int) -> Class:
+        """Class: Get the class of an object."""
+        return self.__tables[self.__object_tables[object_id]].cls
+
+    def name_of(self, object_id: int) -> str:
+        """str: Get the name of an object."""
+        return self.__tables[self.__object_tables[object_id]].name(self.__object_rows[object_id])
+
+    def attributes_of(self, object_id: int) -> list:
+        """list[Property]: Get the attributes of the class of an object."""
+        return self.__tables[self.__object_tables[object_id]].attributes
+
+    def value(self, object_id: int, attribute: Property) -> Any:
+        """Get the value of an attribute of an object (None if undefined).
+
+        Args:
+            object_id (int): the id of the object.
+            attribute (Property): the attribute.
+
+        Returns:
+            Any: the value of the attribute.
+        """
+        return self.__tables[self.__object_tables[object_id]].value(self.__object_rows[object_id], attribute.name)
+
+    def set_value(self, object_id: int, attribute: Property, value: Any):
+        """Set the value of an attribute of an object.
+
+        Args:
+            object_id (int): the id of the object.
+            attribute (Property): the attribute.
+            value (Any): the new value.
+        """
+        self.__tables[self.__object_tables[object_id]].set_value(self.__object_rows[object_id], attribute.name, value)
+
+    def navigate(self, object_id: int, end: Property) -> list:
+        """Get the ids of the objects linked to an object through an association end.
+
+        Args:
+            object_id (int): the id of the source object.
+            end (Property): the association end to navigate (the end on the side of the linked objects).
+
+        Returns:
+            list[int]: the ids of the linked objects, once per link.
+        """
+        edges = self.__edges.get(end.owner.name) if end.owner is not None else None
+        if edges is None:
+            return []
+        return edges.targets(object_id, end, len(self)).tolist()
+
+    def degrees(self, end: Property) -> array:
+        """Count the objects linked to each object through an association end.
+
+        Args:
+            end (Property): the association end (the end on the side of the linked objects).
+
+        Returns:
+            array: the number of objects linked to each object, by object id.
+        """
+        edges = self.__edges.get(end.owner.name) if end.owner is not None else None
+        if edges is None:
+            return array("q", bytes(8 * len(self)))
+        return edges.degrees(end, len(self))
+
+    def classes_at(self, end: Property) -> set:
+        """Get the classes of the objects linked at the side of an association end.
+
+        Args:
+            end (Property): the association end.
+
+        Returns:
+            set[Class]: the classes of the objects.
+        """
+        edges = self.__edges.get(end.owner.name) if end.owner is not None else None
+        if edges is None:
+            return set()
+        targets = edges.second if edges.side(end) == 1 else edges.first
+        return {self.__tables[index].cls for index in set(map(self.__object_tables.__getitem__, targets))}
+
+    def table_ids(self, cls: Class) -> list[range]:
+        """Get the ids of the objects stored in the table of a class, in row order.
+
+        Args:
+            cls (Class): the class.
+
+        Returns:
+            list[range]: the ranges of ids (empty if the model has no table for the class).
+        """
+        index = self.__table_index.get(cls.name)
+        return list(self.__table_ids[index]) if index is not None else []
+
+    def links_of(self, object_id: int) -> set:
+        """Build the links involving an object.
+
+        Args:
+            object_id (int): the id of the object.
+
+        Returns:
+            set[Link]: the links, between views of the objects.
+        """
+        links = set()
+        for edges in self.__edges.values():
+            first_end, second_end = edges.ends
+            for target in edges.targets(object_id, second_end, len(self)):
+                links.add(self.__link(edges, object_id, target))
+            for source in edges.targets(object_id, first_end, len(self)):
+                if source != object_id:
+                    links.add(self.__link(edges, source, object_id))
+        return links
+
+    def __link(self, edges: _EdgeTable, first: int, second: int) -> Link:
+        first_end, second_end = edges.ends
+        return Link(name=f"{edges.association.name}_{first}_{second}", association=edges.association,
+                    connections=[LinkEnd(name=first_end.name, association_end=first_end, object=self.object(first)),
+                                 LinkEnd(name=second_end.name, association_end=second_end,
+                                         object=self.object(second))])
+
+    @property
+    def instances(self) -> set:
+        """set[Instance]: Build a view of every object of the model."""
+        return {ObjectView(self, object_id) for object_id in range(len(self))}
+
+    @instances.setter
+    def instances(self, instances: set[Instance]):
+        """Columnar models are filled with add_objects() or add_instance()."""
+        raise ValueError("The instances of a columnar object model cannot be replaced.")
+
+    @property
+    def links(self) -> set:
+        """set[Link]: Build every link of the model."""
+        return {self.__link(edges, first, second)
+                for edges in self.__edges.values() for first, second in zip(edges.first, edges.second)}
+
+    @links.setter
+    def links(self, links: set[Link]):
+        """Columnar models are filled with add_links() or add_link()."""
+        raise ValueError("The links of a columnar object model cannot be replaced.")
+
+    def add_instance(self, instance: Instance) -> int:
+        """Copy an object into the model.
+
+        Args:
+            instance (Instance): the object to copy; its classifier must be a class.
+
+        Returns:
+            int: the id of the object in the model.
+        """
+        if not isinstance(instance, Object) or not isinstance(instance.classifier, Class):
+            raise ValueError("Columnar object models only store objects of classes.")
+        values = {slot.attribute.name: slot.value.value if slot.value is not None else None
+                  for slot in instance.slots}
+        return self.add_object(instance.classifier, values, instance.name)
+
+    def remove_instance(self, instance: Instance):
+        """Columnar models do not support removing objects."""
+        raise ValueError("Objects cannot be removed from a columnar object model.")
+
+    def instances_of(self, classifier: Type) -> list:
+        """Get the views of the objects of a class and of its specializations.
+
+        Args:
+            classifier (Type): the class.
+
+        Returns:
+            list[ObjectView]: the views of the objects, by id.
+        """
+        ids = sorted(object_id for index, table in enumerate(self.__tables)
+                     if table.cls.name == classifier.name
+                     or any(parent.name == classifier.name for parent in table.cls.all_parents())
+                     for ids in self.__table_ids[index] for object_id in ids)
+        return [ObjectView(self, object_id) for object_id in ids]
+
+    @property
+    def change_tracker(self):
+        """None: Changes of columnar models are not tracked."""
+        return None
+
+    def track_changes(self):
+        """Columnar models do not support change tracking."""
+        raise ValueError("Changes of a columnar object model cannot be tracked.")
+
+    def stop_tracking_changes(self):
+        """Columnar models do not track changes."""
+
+    @property
+    def nbytes(self) -> int:
+        """int: Get the number of bytes used by the columns, edges and object ids of the model."""
+        return (sum(table.nbytes for table in self.__tables) + sum(edges.nbytes for edges in self.__edges.values())
+                + self.__object_tables.itemsize * len(self.__object_tables)
+                + self.__object_rows.itemsize * len(self.__object_rows))
@@ -1,5 +1,5 @@
 import string
-from besser.BUML.metamodel.structural import NamedElement, Property, Type, Association
+from besser.BUML.metamodel.structural import NamedElement, Property, Type, Association, Class
 
 class AttributeLink():
     """An attribute link is a named slot in an instance, which holds the value of an attribute
@@ -15,9 +15,12 @@ class AttributeLink():
         attribute (Property): the attribute or property from the structural metamodel.
     """
 
+    __slots__ = ("_owner", "__attribute", "__value")
+
     def __init__(self, value: "DataValue", attribute: Property):
-        self.value: DataValue = value
+        self._owner: Object = None
         self.__attribute: Property = attribute
+        self.value: DataValue = value
 
     @property
     def value(self) -> "DataValue":
@@ -28,6 +31,14 @@ class AttributeLink():
     def value(self, value: "DataValue"):
         """DataValue: Set the value of the attribute."""
         self.__value = value
+        if isinstance(value, DataValue):
+            value._slot = self
+        self._notify_change()
+
+    def _notify_change(self):
+        """Record a change of the value in the change tracker of the owner object, if any."""
+        if self._owner is not None and self._owner._tracker is not None:
+            self._owner._tracker.attribute_changed(self._owner, self.__attribute)
 
     @property
     def attribute(self) -> Property:
@@ -52,8 +63,12 @@ class Instance(NamedElement):
     Attributes:
         name (str): inherited from NamedElement, represents the name of the instance.
         classifier (Type): the classifier of the instance. It could be for example a Class or a PrimitiveDataType of the structural metamodel.
+            It should not be changed while the instance is in an object model, whose extents are indexed by
+            classifier: remove the instance from the model, change its classifier, and add it again.
     """
 
+    __slots__ = ("__classifier",)
+
     def __init__(self, name: str, classifier: Type):
         super().__init__(name)
         self.classifier: Type = classifier
@@ -80,12 +95,20 @@ class Object(Instance):
         name (str): inherited from NamedElement, represents the name of the object instance.
         classifier (Type): Inherited from Instance, represents the classifier of the object.
         slots (list[AttributeLink]): list of properties of the instance
+        links (set[Link]): the links involving the object.
     """
+
+    __slots__ = ("_tracker", "__links", "__slots", "__neighbors")
     def __init__(self, name: str, classifier: Type, slots: list[AttributeLink] = []):
+        self._tracker: ChangeTracker = None
         super().__init__(name, classifier)
 
         self.slots: list[AttributeLink] = slots
-        self.__links: set[Link] = set()
+        # links involving the object, with the (association end, object) pairs each one added to the neighbors,
+        # so that a link is unindexed exactly as it was indexed
+        self.__links: dict[Link, list] = {}
+        # objects linked to this object, by association end (the end on the side of the linked objects)
+        self.__neighbors: dict[Property, list[Object]] = {}
 
     @property
     def slots(self) -> list[AttributeLink]:
@@ -95,24 +118,66 @@ class Object(Instance):
     @slots.setter
     def slots(self, slots: list[AttributeLink]):
         """list[AttributeLink]: Set the slots."""
+        if self._tracker is not None:
+            for slot in getattr(self, "_Object__slots", []):
+                self._tracker.attribute_changed(self, slot.attribute)
         self.__slots = slots
+        for slot in slots:
+            slot._owner = self
+            slot._notify_change()
 
     def add_slot(self, slot: AttributeLink):
         """ Method to add attribute link to slots"""
         self.__slots.append(slot)
+        slot._owner = self
+        slot._notify_change()
 
     @property
     def links(self) -> set:
         """set[Link]: Get the set of links involving the object."""
-        return self.__links
+        return self.__links.keys()
     
     def _add_link(self, link):
         """Link: Add an link to the set of object links."""
-        self.__links.add(link)
+        if link in self.__links:
+            return
+        targets = link._targets(self)
+        self.__links[link] = targets
+        for end, target in targets:
+            self.__neighbors.setdefault(end, []).append(target)
+        if self._tracker is not None:
+            self._tracker.link_changed(self, link)
     
     def _delete_link(self, link):
         """Link: Remove a link to the set of object links."""
-        self.__links.discard(link)
+        if link not in self.__links:
+            return
+        for end, target in self.__links.pop(link):
+            targets = self.__neighbors[end]
+            targets.remove(target)
+            if not targets:
+                del self.__neighbors[end]
+        if self._tracker is not None:
+            self._tracker.link_changed(self, link)
+
+    def navigate(self, end: Property) -> list:
+        """Get the objects linked to the object through an association end.
+
+        Ends are matched by identity or, for models deserialized separately, by name and type name.
+
+        Args:
+            end (Property): the association end to navigate (the end on the side of the linked objects).
+
+        Returns:
+            list[Object]: the linked objects, once per link.
+        """
+        targets = self.__neighbors.get(end)
+        if targets is None:
+            for other, other_targets in self.__neighbors.items():
+                if other.name == end.name and other.type.name == end.type.name:
+                    targets = other_targets
+                    break
+        return list(targets) if targets is not None else []
 
     def link_ends(self) -> set:
         """set[LinkEnd]: Get the set of link ends of the object."""
@@ -143,9 +208,12 @@ class DataValue(Instance):
         value: value of the property Instance.
     """
 
+    __slots__ = ("__value", "_slot")
+
     def __init__(self, classifier: Type, value, name=""):
         super().__init__(name, classifier)
         self.__value = value
+        self._slot: AttributeLink = None
 
     @property
     def value(self):
@@ -156,6 +224,8 @@ class DataValue(Instance):
     def value(self, val):
         """Method to set Value"""
         self.__value = val
+        if self._slot is not None:
+            self._slot._notify_change()
 
 class LinkEnd(NamedElement):
     """ A link end is an end point of a link.
@@ -168,11 +238,15 @@ class LinkEnd(NamedElement):
     Attributes:
         name (str): inherited from NamedElement, represents the name of the LinkEnd
         association_end (Property): the end of the link
-        object (Object): the object pointed to by the LinkEnd
+        object (Object): the object pointed to by the LinkEnd. Setting it updates the navigation of the objects of
+            the link.
     """
 
+    __slots__ = ("_link", "__association_end", "__object")
+
     def __init__(self, name:str, association_end: Property, object: Object):
         super().__init__(name)
+        self._link: Link = None
         self.association_end: Property = association_end
         self.object: Object = object
 
@@ -194,7 +268,12 @@ class LinkEnd(NamedElement):
     @object.setter
     def object(self, object: Object):
         """Object: Method to set the object"""
+        link = self._link
+        if link is not None:
+            link._unindex()
         self.__object = object
+        if link is not None:
+            link._index()
 
 class Link(NamedElement):
     """ A link represent a relationship between objects.
@@ -207,9 +286,12 @@ class Link(NamedElement):
     Attributes:
         name (str): inherited from NamedElement, represents the name of the Link
         association (Association): the Association that represents the Link
-        connections: list of link ends.
+        connections: list of link ends. The list should not be changed in place: assign a new list, or use
+            add_to_connection, so that the navigation of the linked objects is updated.
     """
 
+    __slots__ = ("__association", "__connections")
+
     def __init__(self, name: str, association: Association, connections: list[LinkEnd]):
         super().__init__(name)
         self.association: Association = association
@@ -234,15 +316,91 @@ class Link(NamedElement):
     def connections(self, connections: list[LinkEnd]):
         """list[LinkEnd]: Method to set the connections"""
         if hasattr(self, "connections"):
-            for conn in self.connections:
-                conn.object._delete_link(link=self)
-        for end in connections:
-            end.object._add_link(link=self)
+            self._unindex()
+            for end in self.__connections:
+                end._link = None
         self.__connections = connections
+        for end in connections:
+            end._link = self
+        self._index()
 
     def add_to_connection(self,linkEnd):
         """Method to add linkend"""
-        self.connections.append(linkEnd)
+        self._unindex()
+        self.__connections.append(linkEnd)
+        linkEnd._link = self
+        self._index()
+
+    def _index(self):
+        """Add the link to the objects it connects."""
+        for end in self.__connections:
+            end.object._add_link(link=self)
+
+    def _unindex(self):
+        """Remove the link from the objects it connects."""
+        for end in self.__connections:
+            end.object._delete_link(link=self)
+
+    def _targets(self, obj: Object) -> list:
+        """Get the (association end, object) pairs navigable from obj through the link."""
+        connections = self.__connections
+        return [(end.association_end, end.object) for end in connections
+                if any(other is not end and other.object is obj for other in connections)]
+
+class ChangeTracker:
+    """ A change tracker records the changes made to the objects of an object model since the last time it was
+    cleared: objects added or removed, attributes whose value changed, and association ends whose navigation
+    changed because a link was created, modified or removed.
+
+    Attributes:
+        added (set[Object]): objects added to the model.
+        removed (set[Object]): objects removed from the model.
+        attributes (dict[Object, set[Property]]): attributes whose value changed, by object.
+        ends (dict[Object, set[Property]]): association ends (navigated from the object) whose linked objects changed.
+    """
+
+    __slots__ = ("added", "removed", "attributes", "ends")
+
+    def __init__(self):
+        self.added: set[Object] = set()
+        self.removed: set[Object] = set()
+        self.attributes: dict[Object, set[Property]] = {}
+        self.ends: dict[Object, set[Property]] = {}
+
+    @property
+    def has_changes(self) -> bool:
+        """bool: Whether any change has been recorded."""
+        return bool(self.added or self.removed or self.attributes or self.ends)
+
+    def attribute_changed(self, obj: Object, attribute: Property):
+        """Record that the value of an attribute of an object changed."""
+        self.attributes.setdefault(obj, set()).add(attribute)
+
+    def link_changed(self, obj: Object, link: "Link"):
+        """Record that a link involving an object was added, modified or removed."""
+        connections = link.connections
+        for end in connections:
+            if any(other is not end and other.object is obj for other in connections):
+                self.ends.setdefault(obj, set()).add(end.association_end)
+
+    def object_added(self, obj: Object):
+        """Record that an object was added to the model."""
+        self.removed.discard(obj)
+        self.added.add(obj)
+
+    def object_removed(self, obj: Object):
+        """Record that an object was removed from the model."""
+        self.added.discard(obj)
+        self.attributes.pop(obj, None)
+        self.ends.pop(obj, None)
+        self.removed.add(obj)
+
+    def clear(self):
+        """Forget all the recorded changes."""
+        self.added = set()
+        self.removed = set()
+        self.attributes = {}
+        self.ends = {}
 
 class ObjectModel(NamedElement):
     """ An object model is the root element that comprises a number of instances and links.
@@ -255,10 +413,20 @@ class ObjectModel(NamedElement):
         name (str): inherited from NamedElement, represents the name of the model
         association (Association): the Association that represents the Link
         connections: list of link ends.
+        change_tracker (ChangeTracker): records the changes of the model objects, once enabled with track_changes().
+
+    The model keeps the extent of each classifier (its instances and the instances of its specializations), kept
+    up to date when instances are set, added or removed. The classifier of an instance should not be changed while
+    it is in the model (see Instance).
     """
 
+    __slots__ = ("__change_tracker", "__instances", "__links", "__extents")
+
     def __init__(self, name: str, instances: set[Instance], links: set[Link]):
         super().__init__(name)
+        self.__change_tracker: ChangeTracker = None
+        # instances of each classifier and of its specializations, by classifier
+        self.__extents: dict[Type, set[Instance]] = {}
         self.instances: set[Instance] = instances
         self.links: set[Link] = links
 
@@ -270,7 +438,108 @@ class ObjectModel(NamedElement):
     @instances.setter
     def instances(self, instances: set[Instance]):
         """Association: Method to set the instances"""
+        tracker = self.__change_tracker
+        if tracker is not None:
+            old_instances = self.__instances
+            for instance in old_instances:
+                if isinstance(instance, Object) and instance not in instances:
+                    instance._tracker = None
+                    tracker.object_removed(instance)
+            for instance in instances:
+                if isinstance(instance, Object) and instance not in old_instances:
+                    instance._tracker = tracker
+                    tracker.object_added(instance)
         self.__instances = instances
+        self.__extents = {}
+        for instance in instances:
+            self.__index(instance)
+
+    def add_instance(self, instance: Instance):
+        """Instance: Add an instance to the model."""
+        if instance in self.__instances:
+            return
+        self.__instances.add(instance)
+        self.__index(instance)
+        if self.__change_tracker is not None and isinstance(instance, Object):
+            instance._tracker = self.__change_tracker
+            self.__change_tracker.object_added(instance)
+
+    def remove_instance(self, instance: Instance):
+        """Instance: Remove an instance from the model."""
+        if instance not in self.__instances:
+            return
+        self.__instances.discard(instance)
+        classifiers = self.__classifiers(instance)
+        if instance.classifier is not None and instance not in self.__extents.get(instance.classifier, ()):
+            # The classifier was changed after the instance was added: look for it in all the extents
+            classifiers = list(self.__extents)
+        for classifier in classifiers:
+            extent = self.__extents.get(classifier)
+            if extent is not None:
+                extent.discard(instance)
+                if not extent:
+                    del self.__extents[classifier]
+        if self.__change_tracker is not None and isinstance(instance, Object):
+            instance._tracker = None
+            self.__change_tracker.object_removed(instance)
+
+    def instances_of(self, classifier: Type) -> list:
+        """Get the instances of a classifier and of its specializations (OCL ``allInstances()``).
+
+        Classifiers are matched by identity or, for models deserialized separately, by name.
+
+        Args:
+            classifier (Type): the classifier.
+
+        Returns:
+            list[Instance]: the instances of the classifier.
+        """
+        extent = self.__extents.get(classifier)
+        if extent is None:
+            extent = next((instances for other, instances in self.__extents.items()
+                           if other.name == classifier.name), ())
+        return list(extent)
+
+    def __index(self, instance: Instance):
+        """Add an instance to the extents of its classifier and of all its generalizations."""
+        for classifier in self.__classifiers(instance):
+            self.__extents.setdefault(classifier, set()).add(instance)
+
+    @staticmethod
+    def __classifiers(instance: Instance) -> set:
+        """Get the classifier of an instance and all its generalizations."""
+        classifier = instance.classifier
+        if classifier is None:
+            return set()
+        classifiers = {classifier}
+        if isinstance(classifier, Class):
+            classifiers.update(classifier.all_parents())
+        return classifiers
+
+    @property
+    def change_tracker(self) -> ChangeTracker:
+        """ChangeTracker: Get the change tracker of the model (None if changes are not being tracked)."""
+        return self.__change_tracker
+
+    def track_changes(self) -> ChangeTracker:
+        """Start recording the changes made to the objects of the model.
+
+        Returns:
+            ChangeTracker: the change tracker of the model.
+        """
+        if self.__change_tracker is None:
+            self.__change_tracker = ChangeTracker()
+            for instance in self.instances:
+                if isinstance(instance, Object):
+                    instance._tracker = self.__change_tracker
+        return self.__change_tracker
+
+    def stop_tracking_changes(self):
+        """Stop recording the changes made to the objects of the model."""
+        for instance in self.instances:
+            if isinstance(instance, Object):
+                instance._tracker = None
+        self.__change_tracker = None
 
     @property
     def links(self):
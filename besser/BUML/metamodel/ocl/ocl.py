@@ -14,6 +14,8 @@ class OCLExpression(TypedElement):
         _referredOperation: points to any refferred operation that the expression has.
     """
 
+    __slots__ = ("_source", "_referredOperation")
+
     def __init__(self, name: str, type: Type):
         super().__init__(name, type)
         self._source = None
@@ -54,6 +56,8 @@ class LiteralExpression(OCLExpression):
         value: value of the expression
     """
 
+    __slots__ = ("__value",)
+
     def __init__(self, name: str, type: Type, value: Any):
         super().__init__(name, type)
         self.value: Any = value
@@ -79,6 +83,8 @@ class IntegerLiteralExpression(LiteralExpression):
         value: value of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: int):
         super().__init__(name, type=PrimitiveDataType(name="int"), value=value)
 
@@ -96,6 +102,8 @@ class PropertyCallExpression(OCLExpression):
         property: Property of the expression
     """
 
+    __slots__ = ("__property",)
+
     def __init__(self, name: str, property: Property):
         super().__init__(name, Type(property.type))
         self.property: Property = property
@@ -134,6 +142,8 @@ class OperationCallExpression(OCLExpression):
         arguments: Arguments of the function
     """
 
+    __slots__ = ("__operation", "__arguments")
+
     def __init__(self, name: str, operation: str, arguments: list[OCLExpression]):
         super().__init__(name, Type(PrimitiveDataType("bool")))  # Type for now is always boolean, it should be the return type of the operation
         self.operation: str = operation
@@ -182,6 +192,8 @@ class OCLConstraint(Constraint):
         language: Language of constraint
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, context: Class, expression: OCLExpression, language: str = "OCL"):
         super().__init__(name, context, expression, language)
 
@@ -197,6 +209,8 @@ class IfExp(OCLExpression):
         then Exp: then expression of constraint
     """
 
+    __slots__ = ("_ifCondition", "_else_expression", "_then_expression")
+
     def __init__(self, name: str, type: Type,ifcond = None, elseExp = None, thenExp = None,):
         # self.ifOwner = null
         super().__init__(name, type)
@@ -247,6 +261,8 @@ class VariableExp(OCLExpression):
         variable: variable of the expression
     """
 
+    __slots__ = ("variable",)
+
     def __init__(self,name: str, type: Type):
         super().__init__(name, type)
         self.name = name
@@ -272,6 +288,8 @@ class Variable(OCLExpression):
         type: type of the expression
     """
 
+    __slots__ = ("representatedParameter",)
+
     def __init__(self,name: str, type: Type):
         super().__init__(name, type)
 
@@ -294,6 +312,8 @@ class TypeExp(OCLExpression):
         referedType: classifier of the expression
     """
 
+    __slots__ = ("referedType",)
+
     def __init__(self,name: str, type: Type):
         super().__init__(name, type)
         self.referedType = Classifier(name)
@@ -308,6 +328,8 @@ class Parameter:
         value: Value of the parameter
     """
 
+    __slots__ = ("value",)
+
     def __init__(self,val):
         self.value =val
 
@@ -327,6 +349,8 @@ class StateExp(OCLExpression):
         ReferedState: Referred state of the expression
     """
 
+    __slots__ = ("referedState",)
+
     def __init__(self,name: str, type: Type):
         super().__init__(name, type)
 
@@ -335,6 +359,8 @@ class StateExp(OCLExpression):
 class State:
     """A class to define state"""
 
+    __slots__ = ("stateExp",)
+
     def __init__(self):
         self.stateExp = []
 
@@ -346,6 +372,8 @@ class RealLiteralExpression(LiteralExpression):
         value: value of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: float):
         super().__init__(name, type=PrimitiveDataType(name="float"), value=value)
 
@@ -360,25 +388,31 @@ class Classifier:
         name (str): the name of the classifier
     """
 
+    __slots__ = ("name",)
+
     def __init__(self, name= None):
         self.name = name
     pass
 
 class CallExp(OCLExpression):
     """ A class to define call expression"""
-    pass
+
+    __slots__ = ()
 
 class FeatureCallExp(CallExp):
     """ A class to define feature call expression"""
-    pass
+
+    __slots__ = ()
 
 class LiteralExp(OCLExpression):
     """ A class to define Literal expression"""
-    pass
+
+    __slots__ = ()
 
 class InvalidLiteralExp(LiteralExp):
     """ A class to define invalid literal expression"""
-    pass
+
+    __slots__ = ()
 
 class LoopExp(CallExp):
     """ A class to define loop expression
@@ -394,6 +428,8 @@ class LoopExp(CallExp):
         iterator: list to store all the iterators
     """
 
+    __slots__ = ("body", "iterator")
+
     def __init__(self,name: str, type: Type):
         super().__init__(name, type)
         self.name = name
@@ -433,23 +469,28 @@ class LoopExp(CallExp):
 
 class MessageExp(OCLExpression):
     """A class to define message expression"""
-    pass
+
+    __slots__ = ()
 
 class NavigationCallExp(OCLExpression):
     """A class to define navigation call expression"""
-    pass
+
+    __slots__ = ()
 
 class NullLiteralExp(LiteralExp):
     """A class to define null literal expression"""
-    pass
+
+    __slots__ = ()
 
 class PrimitiveLiteralExp(LiteralExp):
     """A class to define primitive literal expression"""
-    pass
+
+    __slots__ = ()
 
 class NumericLiteralExp(PrimitiveLiteralExp):
     """A class to define numeric literal expression"""
-    pass
+
+    __slots__ = ()
 
 class IterateExp(LoopExp):
     """A class to define Iterate expression
@@ -462,6 +503,8 @@ class IterateExp(LoopExp):
         result: variable to store the result
     """
 
+    __slots__ = ("result",)
+
     def __init__(self,name: str, type: Type):
         super().__init__(name, type)
 
@@ -479,6 +522,8 @@ class IteratorExp(LoopExp):
         type: type of expression
     """
 
+    __slots__ = ()
+
     def __init__(self,name: str, type: Type):
         super().__init__(name, type)
         self.name = name
@@ -500,6 +545,8 @@ class LetExp(OCLExpression):
         variable: variable of the Let expression
     """
 
+    __slots__ = ("OCLExpression", "variable")
+
     def __init__(self, name: str, type: Type):
         super().__init__(name, type)
         self.OCLExpression = None
@@ -513,6 +560,8 @@ class BooleanLiteralExpression(LiteralExpression):
         value: value of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: bool):
         super().__init__(name, type=PrimitiveDataType(name="bool"), value=value)
 
@@ -527,6 +576,8 @@ class DateLiteralExpression(LiteralExpression):
         value: value of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: str):
         super().__init__(name, type=PrimitiveDataType(name="date"), value=value)
 
@@ -542,6 +593,8 @@ class StringLiteralExpression(LiteralExpression):
         value: value of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, value: str):
         super().__init__(name, type=PrimitiveDataType(name="str"), value=value)
 
@@ -558,6 +611,8 @@ class InfixOperator:
         operator: Operator of the expression
     """
 
+    __slots__ = ("operator",)
+
     def __init__(self,operator):
         self.operator = operator
 
@@ -575,6 +630,8 @@ class DataType(Classifier):
         name: Name of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self,name):
         super().__init__(name)
 
@@ -585,6 +642,8 @@ class CollectionType(DataType):
         name: Name of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self,name):
         super().__init__(name)
 
@@ -595,6 +654,8 @@ class OrderedSetType(CollectionType):
         name: Name of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self,name):
         super().__init__(name)
 
@@ -605,6 +666,8 @@ class SequenceType(CollectionType):
         name: Name of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self,name):
         super().__init__(name)
 
@@ -615,6 +678,8 @@ class BagType(CollectionType):
         name: Name of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self,name):
         super().__init__(name)
 
@@ -625,6 +690,8 @@ class SetType(CollectionType):
         name: Name of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self,name):
         super().__init__(name)
 
@@ -641,6 +708,8 @@ class CollectionLiteralExp(LiteralExp):
         collectionItems: Items in the collection literal expression
     """
 
+    __slots__ = ("kind", "collectionItems")
+
     def __init__(self, name, type):
         super().__init__(name,type)
         self.kind = type
@@ -663,6 +732,8 @@ class CollectionLiteralPart(TypedElement):
         name: Name of the expression
     """
 
+    __slots__ = ()
+
     def __init__(self, name):
         super().__init__(name,type = "NP")
 
@@ -677,6 +748,8 @@ class CollectionItem(CollectionLiteralPart):
         value: Value of the item
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, name,item):
         super().__init__(name)
         self.value = item
@@ -703,6 +776,8 @@ class CollectionRange(CollectionLiteralPart):
         last: last item of collection
     """
 
+    __slots__ = ("first", "last")
+
     def __init__(self, name):
         super().__init__(name)
         self.first = None
@@ -1 +1 @@
-from .state_machine import *
\ No newline at end of file
+from .state_machine import *
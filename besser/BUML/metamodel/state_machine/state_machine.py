@@ -36,6 +36,19 @@ class ConfigProperty:
         return f"ConfigProperty(section='{self.section}', name='{self.name}', value={repr(self.value)})"
 
 
+def _get_code(method: Method) -> str:
+    # The source of the callable is only read (from the file it was defined in) the first time it is needed
+    code = Method.code.fget(method)
+    if code is None and method.callable is not None:
+        code = inspect.getsource(method.callable)
+        Method.code.fset(method, code)
+    return code
+
+
+def _set_code(method: Method, code: str):
+    Method.code.fset(method, code)
+
+
 class Body(Method):
     """The body of the state of a state machine.
 
@@ -46,6 +59,7 @@ class Body(Method):
     Args:
         name (str): The name of the body.
         callable (Callable): The function containing the body's code.
+        code (str): The source code of the function, if no callable is given.
 
     Attributes:
         name (str): Inherited from Method, represents the name of the body.
@@ -54,17 +68,21 @@ class Body(Method):
         is_abstract (bool): Inherited from Method, indicates if the body is abstract.
         parameters (set[Parameter]): Inherited from Method, the set of parameters for the body.
         owner (Type): Inherited from Method, the type that owns the property.
-        code (str): Inherited from Method, code of the body.
+        code (str): Inherited from Method, code of the body, read from the callable when first accessed.
+        callable (Callable): The function containing the body's code, executed by the state machine runtime.
     """
 
-    def __init__(self, name: str, callable: Callable):
+    def __init__(self, name: str, callable: Callable = None, code: str = None):
+        self.callable: Callable = callable
         super().__init__(
             name=name,
             parameters={Parameter(name='session', type=Type('Session'))},
             type=None,
-            code=inspect.getsource(callable)
+            code=code
         )
 
+    code = property(_get_code, _set_code, doc="str: Get the source code of the body.")
+
     def __repr__(self):
         return f"Body(name='{self.name}')"
 
@@ -76,6 +94,7 @@ class Event(Method):
     Args:
         name (str): The name of the event.
         callable (Callable): The function containing the event's code.
+        code (str): The source code of the function, if no callable is given.
 
     Attributes:
         name (str): Inherited from Method, represents the name of the body.
@@ -84,14 +103,13 @@ class Event(Method):
         is_abstract (bool): Inherited from Method, indicates if the body is abstract.
         parameters (set[Parameter]): Inherited from Method, the set of parameters for the body.
         owner (Type): Inherited from Method, the type that owns the property.
-        code (str): Inherited from Method, code of the body.
+        code (str): Inherited from Method, code of the body, read from the callable when first accessed.
+        callable (Callable): The function containing the event's code, executed by the state machine runtime. If
+            neither a callable nor code is given, the event always triggers its transitions.
     """
 
-    def __init__(self, name: str, callable: Callable):
-        if callable is not None:
-            code = inspect.getsource(callable)
-        else:
-            code = None
+    def __init__(self, name: str, callable: Callable = None, code: str = None):
+        self.callable: Callable = callable
         super().__init__(
             name=name,
             parameters={
@@ -102,6 +120,8 @@ class Event(Method):
             code=code
         )
 
+    code = property(_get_code, _set_code, doc="str: Get the source code of the event.")
+
     def __repr__(self):
         return f"Event(name='{self.name}')"
 
@@ -157,10 +177,12 @@ class State(NamedElement):
         visibility (str): Inherited from NamedElement, determines the kind of visibility of the state (public as default).
         sm (StateMachine): the state machine the state belongs to
         initial (bool): whether the state is initial or not
-        transitions (list[Transition]): The state's transitions to other states
+        transitions (tuple[Transition]): The state's transitions to other states. It is read-only: transitions
+            are added with ``when_event_go_to`` or by assigning a new sequence.
         body (Body): the body of the state
         fallback_body (Body): the fallback body of the state
         _transition_counter (int): Count the number of transitions of this state. Used to name the transitions.
+        _transitions_by_event (dict[str, tuple[Transition]]): The state's transitions, by event name.
     """
 
     def __init__(self, sm: 'StateMachine', name: str, initial: bool = False):
@@ -168,7 +190,7 @@ class State(NamedElement):
         super().__init__(name)
         self.sm: StateMachine = sm
         self.initial: bool = initial
-        self.transitions: list[Transition] = []
+        self.transitions = []
         self.body: Body = None
         self.fallback_body: Body = None
         self._transition_counter: int = 0
@@ -182,6 +204,33 @@ class State(NamedElement):
     def __hash__(self):
         return hash((self.name, self.sm.name))
 
+    @property
+    def transitions(self) -> tuple[Transition]:
+        """tuple[Transition]: Get the state's transitions to other states."""
+        return self.__transitions
+
+    @transitions.setter
+    def transitions(self, transitions: list[Transition]):
+        """list[Transition]: Set the state's transitions to other states, indexing them by event name."""
+        self.__transitions: tuple[Transition] = tuple(transitions)
+        by_event: dict[str, list[Transition]] = {}
+        for transition in self.__transitions:
+            by_event.setdefault(transition.event.name, []).append(transition)
+        self._transitions_by_event: dict[str, tuple[Transition]] = {
+            event: tuple(event_transitions) for event, event_transitions in by_event.items()
+        }
+
+    def transitions_for(self, event: str) -> tuple[Transition]:
+        """Get the transitions triggered by an event, in definition order.
+
+        Args:
+            event (str): the event name
+
+        Returns:
+            tuple[Transition]: the transitions of the state whose event has that name
+        """
+        return self._transitions_by_event.get(event, ())
+
     def _t_name(self) -> str:
         """Name generator for transitions. Transition names are generic and enumerated. On each call, a new name is
         generated and the transition counter is incremented for the next name.
@@ -209,7 +258,9 @@ class State(NamedElement):
         self.fallback_body = body
 
     def when_event_go_to(self, event: Event, dest: 'State', event_params: dict) -> None:
-        self.transitions.append(Transition(name=self._t_name(), source=self, dest=dest, event=event, event_params=event_params))
+        transition = Transition(name=self._t_name(), source=self, dest=dest, event=event, event_params=event_params)
+        self.__transitions += (transition,)
+        self._transitions_by_event[event.name] = self.transitions_for(event.name) + (transition,)
 
     def __repr__(self):
         return f"State(name='{self.name}', initial={self.initial})"
@@ -224,15 +275,41 @@ class StateMachine(Model):
     Attributes:
         name (str): Inherited from Model, represents the name of the state machine.
         visibility (str): Inherited from Model, determines the kind of visibility of the state machine (public as default).
-        states (list[State]): the states of the state machine
+        states (tuple[State]): the states of the state machine. It is read-only: states are added with
+            ``new_state`` or by assigning a new sequence.
         properties (list[ConfigProperty]): the configuration properties of the state machine.
+        _states_by_name (dict[str, State]): the states of the state machine, by name.
+        _initial_state (State): the initial state of the state machine.
     """
 
     def __init__(self, name: str):
         super().__init__(name)
-        self.states: list[State] = []
+        self.states = []
         self.properties: list[ConfigProperty] = []
 
+    @property
+    def states(self) -> tuple[State]:
+        """tuple[State]: Get the states of the state machine."""
+        return self.__states
+
+    @states.setter
+    def states(self, states: list[State]):
+        """list[State]: Set the states of the state machine, indexing them by name."""
+        self.__states: tuple[State] = tuple(states)
+        self._states_by_name: dict[str, State] = {state.name: state for state in self.__states}
+        self._initial_state: State = next((state for state in self.__states if state.initial), None)
+
+    def get_state(self, name: str) -> State or None:
+        """Get a state by name.
+
+        Args:
+            name (str): the state name
+
+        Returns:
+            State or None: the state, if exists
+        """
+        return self._states_by_name.get(name)
+
     def add_property(self, property: ConfigProperty) -> ConfigProperty:
         """Add a configuration property to the state machine.
 
@@ -274,14 +351,17 @@ class StateMachine(Model):
         Returns:
             State: the state
         """
-        new_state = State(self, name, initial)
-        if new_state in self.states:
-            raise ValueError(f"Duplicated state in StateMachine ({new_state.name})")
-        if initial and self.initial_state():
+        if name in self._states_by_name:
+            raise ValueError(f"Duplicated state in StateMachine ({name})")
+        if initial and self._initial_state:
             raise ValueError(f"A StateMachine must have exactly 1 initial state")
-        if not initial and not self.states:
+        if not initial and not self.__states:
             raise ValueError(f"The first state of a StateMachine must be initial")
-        self.states.append(new_state)
+        new_state = State(self, name, initial)
+        self.__states += (new_state,)
+        self._states_by_name[name] = new_state
+        if initial:
+            self._initial_state = new_state
         return new_state
 
     def initial_state(self) -> State or None:
@@ -290,10 +370,7 @@ class StateMachine(Model):
         Returns:
             State or None: the initial state of the machine, if exists
         """
-        for state in self.states:
-            if state.initial:
-                return state
-        return None
+        return self._initial_state
 
     def set_global_fallback_body(self, body: Body) -> None:
         """Set the global fallback body for all states in the state machine.
@@ -318,13 +395,24 @@ class Session:
     the states to read/write user information. If a state machine does not have the concept of 'users' (i.e., there are
     no concurrent executions of the state machine, but a single one) then it could simply have 1 unique session.
 
+    Args:
+        id (str): The session id, which must unique among all state machine sessions
+        current_state (State): The current state in the state machine for this session
+        store (SessionStore): The store keeping the session, notified when the session changes
+
     Attributes:
         id (str): The session id, which must unique among all state machine sessions
         current_state (str): The current state in the state machine for this session
+        event_params (dict): The parameters of the last event that moved the session to another state
+        store (SessionStore): The store keeping the session, notified when the session changes
+        _data (dict): The session private data storage
     """
-    def __init__(self):
-        self.id: str = None
-        self.current_state: State = None
+    def __init__(self, id: str = None, current_state: State = None, store: 'SessionStore' = None):
+        self.id: str = id
+        self.current_state: State = current_state
+        self.event_params: dict = {}
+        self.store: 'SessionStore' = store
+        self._data: dict = {}
 
     def set(self, key: str, value: Any) -> None:
         """Set an entry to the session private data storage.
@@ -333,7 +421,9 @@ class Session:
             key (str): the entry key
             value (Any): the entry value
         """
-        pass
+        self._data[key] = value
+        if self.store is not None:
+            self.store.put(self)
 
     def get(self, key: str) -> Any:
         """Get an entry of the session private data storage.
@@ -344,7 +434,7 @@ class Session:
         Returns:
             Any: the entry value, or None if the key does not exist
         """
-        pass
+        return self._data.get(key)
 
     def delete(self, key: str) -> None:
         """Delete an entry of the session private data storage.
@@ -352,7 +442,8 @@ class Session:
         Args:
             key (str): the entry key
         """
-        pass
+        if self._data.pop(key, None) is not None and self.store is not None:
+            self.store.put(self)
 
     def move(self, transition: Transition) -> None:
         """Move to another state of the state machine.
@@ -360,8 +451,12 @@ class Session:
         Args:
             transition (Transition): the transition that points to the state to move
         """
-        pass
+        if self.current_state is not None and transition.source != self.current_state:
+            raise ValueError(f"Transition {transition.name} does not start in state {self.current_state.name}")
+        self.current_state = transition.dest
+        self.event_params = transition.event_params
+        if self.store is not None:
+            self.store.put(self)
 
     def __repr__(self):
         return f"Session(id='{self.id}', current_state='{self.current_state.name if self.current_state else None}')"
-
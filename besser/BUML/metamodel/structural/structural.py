@@ -1,11 +1,27 @@
+import threading
 import time
 from abc import ABC
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict, List, Set, Union, Optional
 
 # Constant - Represents the unlimited value for the maximum multiplicity (capped at 9999).
 UNLIMITED_MAX_MULTIPLICITY: int = int(9999)
 
+# Creation sequence of the named elements: the wall-clock time of the creation, in microseconds since the Unix epoch,
+# made strictly increasing within a process. As it does not depend on when the process started, the order and the
+# timestamps of the elements are kept when they are pickled and loaded in another process.
+_MICROSECONDS: int = 10 ** 6
+_last_sequence: int = 0
+_sequence_lock: threading.Lock = threading.Lock()
+
+
+def _next_creation_sequence() -> int:
+    """Draw the creation sequence of a new named element."""
+    global _last_sequence
+    with _sequence_lock:
+        _last_sequence = max(time.time_ns() // 1000, _last_sequence + 1)
+        return _last_sequence
+
 
 class Element(ABC):
     """The `Element` class is the superclass of all structural elements in the B-UML metamodel.
@@ -17,7 +33,8 @@ class Element(ABC):
     This class is an abstract class and should not be instantiated.
     """
 
-    pass
+    # Instance attributes are stored in slots declared by each subclass, with no per-instance __dict__.
+    __slots__ = ()
 
 
 class NamedElement(Element):
@@ -31,8 +48,12 @@ class NamedElement(Element):
         The name of the named element.
 
     timestamp : datetime
-        The object creation datetime. By default it is set to the actual object creation time.
-        See the `__init__` method for more details.
+        The object creation datetime. By default it is derived from the creation sequence of the element,
+        so that the timestamps of the elements follow their creation order. It is only built when it is read.
+
+    creation_sequence : int
+        The creation time of the named element in microseconds since the Unix epoch, strictly increasing in the
+        creation order, used to sort elements by timestamp.
 
     synonyms : Optional[List[str]]
         The list of synonyms of the named element. By default it is `None`.
@@ -55,6 +76,8 @@ class NamedElement(Element):
         Determines the kind of visibility of the named element.
     """
 
+    __slots__ = ("__name", "__sequence", "__timestamp", "__synonyms", "__visibility")
+
     def __init__(
         self,
         name: str,
@@ -70,13 +93,13 @@ class NamedElement(Element):
         self.name: str = name
 
         # Set the timestamp of the named element.
-        # If the timestamp is not provided, it is set to the time when the object is created.
-        self.timestamp: datetime = (
-            timestamp
-            if timestamp is not None
-            else datetime.now()
-            + timedelta(microseconds=(time.perf_counter_ns() % 1_000_000) / 1000)
-        )
+        # If the timestamp is not provided, only the next creation sequence number is drawn: the datetime is
+        # built from it the first time the timestamp is read.
+        if timestamp is None:
+            self.__sequence: int = _next_creation_sequence()
+            self.__timestamp: Optional[datetime] = None
+        else:
+            self.timestamp = timestamp
 
         # Set the list of synonyms of the named element.
         self.synonyms: Optional[List[str]] = synonyms
@@ -117,6 +140,11 @@ class NamedElement(Element):
         timestamp : datetime
             The object creation datetime.
         """
+        # Build the timestamp from the creation sequence, the first time it is read.
+        if self.__timestamp is None:
+            seconds, microseconds = divmod(self.__sequence, _MICROSECONDS)
+            self.__timestamp = datetime.fromtimestamp(seconds).replace(microsecond=microseconds)
+
         # Return the timestamp of the named element.
         return self.__timestamp
 
@@ -124,14 +152,39 @@ class NamedElement(Element):
     def timestamp(self, timestamp: datetime):
         """Set the timestamp of the named element.
 
+        The creation sequence of the named element is updated to keep the order of the timestamps.
+
         Parameters
         ----------
         timestamp : datetime
             The object creation datetime.
         """
-        # Set the timestamp of the named element.
+        # Without a datetime, the timestamp is built again from the creation sequence when it is read.
+        if timestamp is None:
+            self.__timestamp = None
+            return
+
+        # Timezone-aware datetimes are compared in local time, as the timestamps built from the creation sequence.
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone().replace(tzinfo=None)
+
+        # Set the timestamp and the matching creation sequence of the named element.
+        seconds = int(timestamp.replace(microsecond=0).timestamp())
+        self.__sequence = seconds * _MICROSECONDS + timestamp.microsecond
         self.__timestamp = timestamp
 
+    @property
+    def creation_sequence(self) -> int:
+        """Get the creation sequence of the named element.
+
+        Returns
+        -------
+        creation_sequence : int
+            The position of the named element in the creation order, consistent with the order of the timestamps.
+        """
+        # Return the creation sequence of the named element.
+        return self.__sequence
+
     @property
     def synonyms(self) -> Optional[List[str]]:
         """Get the list of synonyms of the named element.
@@ -202,7 +255,7 @@ class Type(NamedElement):
 
     timestamp : datetime
         The object creation datetime. Inherits from `NamedElement`.
-        By default it is set to the actual object creation time.
+        By default it is derived from the creation order of the object.
         See the `__init__` method for more details.
 
     synonyms : Optional[List[str]]
@@ -221,6 +274,8 @@ class Type(NamedElement):
         The list of synonyms of the type.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
@@ -254,6 +309,8 @@ class DataType(Type):
     This class inherits from the `Type` class.
     """
 
+    __slots__ = ()
+
     def __repr__(self) -> str:
         """Return a string representation of the `DataType` object.
 
@@ -274,6 +331,8 @@ class PrimitiveDataType(DataType):
     This class inherits from the `DataType` class.
     """
 
+    __slots__ = ()
+
     @NamedElement.name.setter  # type: ignore
     # Mypy does not recognize the setter decorator. See more: https://github.com/python/mypy/issues/5936.
     def name(self, name: str):
@@ -351,7 +410,7 @@ class EnumerationLiteral(NamedElement):
 
     timestamp : datetime
         The object creation datetime. Inherits from `NamedElement`.
-        By default it is set to the actual object creation time.
+        By default it is derived from the creation order of the object.
         See the `__init__` method for more details.
 
     synonyms : Optional[List[str]]
@@ -373,6 +432,8 @@ class EnumerationLiteral(NamedElement):
         The list of synonyms of the enumeration literal.
     """
 
+    __slots__ = ("__owner",)
+
     def __init__(
         self,
         name: str,
@@ -452,7 +513,7 @@ class Enumeration(DataType):
 
     timestamp : datetime
         The object creation datetime. Inherits from `DataType`.
-        By default it is set to the actual object creation time.
+        By default it is derived from the creation order of the object.
         See the `__init__` method for more details.
 
     synonyms : Optional[List[str]]
@@ -474,6 +535,8 @@ class Enumeration(DataType):
         The list of synonyms of the enumeration.
     """
 
+    __slots__ = ("__literals",)
+
     def __init__(
         self,
         name: str,
@@ -603,7 +666,7 @@ class TypedElement(NamedElement):
 
     timestamp : datetime
         The object creation datetime. Inherits from `NamedElement`.
-        By default it is set to the actual object creation time.
+        By default it is derived from the creation order of the object.
         See the `__init__` method for more details.
 
     synonyms : Optional[List[str]]
@@ -632,6 +695,8 @@ class TypedElement(NamedElement):
         Determines the kind of visibility of the typed element.
     """
 
+    __slots__ = ("__type",)
+
     # Define a mapping from strings to primitive data types.
     type_mapping: Dict[str, PrimitiveDataType] = {
         "str": StringType,
@@ -679,7 +744,11 @@ class TypedElement(NamedElement):
                 self.type_mapping[type] if type in self.type_mapping else Type(type)
             )
 
-        # If the provided type is neither a `Type` object nor a string, raise an error.
+        # OCL expressions whose type is not known yet are typed `None`.
+        elif type is None:
+            self.type: Type = None
+
+        # If the provided type is neither a `Type` object, a string nor None, raise an error.
         else:
             raise ValueError("Invalid type.")
 
@@ -728,6 +797,8 @@ class Multiplicity:
         The maximum multiplicity. Use "*" for unlimited.
     """
 
+    __slots__ = ("__min", "__max")
+
     def __init__(self, min_multiplicity: int, max_multiplicity: Union[int, str]):
         """Initialize an instance of the `Multiplicity` class.
 
@@ -885,7 +956,7 @@ class Property(TypedElement):
 
     timestamp : datetime
         The object creation datetime. Inherits from `TypedElement`.
-        By default it is set to the actual object creation time.
+        By default it is derived from the creation order of the object.
         See the `__init__` method for more details.
 
     synonyms : List[str]
@@ -928,6 +999,8 @@ class Property(TypedElement):
         The list of synonyms of the property.
     """
 
+    __slots__ = ("multiplicity", "__owner", "__is_composite", "__is_navigable", "__is_id", "__is_read_only")
+
     def __init__(
         self,
         name: str,
@@ -1133,7 +1206,7 @@ class Parameter(TypedElement):
 
     timestamp : datetime
         The object creation datetime. Inherits from `TypedElement`.
-        By default it is set to the actual object creation time.
+        By default it is derived from the creation order of the object.
         See the `__init__` method for more details.
 
     synonyms : Optional[List[str]]
@@ -1158,6 +1231,8 @@ class Parameter(TypedElement):
         The list of synonyms of the parameter.
     """
 
+    __slots__ = ("__default_value",)
+
     def __init__(
         self,
         name: str,
@@ -1244,7 +1319,7 @@ class Method(TypedElement):
 
     timestamp : datetime
         The object creation datetime. Inherits from `TypedElement`.
-        By default it is set to the actual object creation time.
+        By default it is derived from the creation order of the object.
         See the `__init__` method for more details.
 
     synonyms : Optional[List[str]]
@@ -1281,6 +1356,8 @@ class Method(TypedElement):
         The list of synonyms of the method.
     """
 
+    __slots__ = ("__is_abstract", "__owner", "__code", "__parameters")
+
     def __init__(
         self,
         name: str,
@@ -1530,7 +1607,7 @@ class Class(Type):
 
     timestamp : datetime
         The object creation datetime. Inherits from `Type`.
-        By default it is set to the actual object creation time.
+        By default it is derived from the creation order of the object.
         See the `__init__` method for more details.
 
     synonyms : Optional[List[str]]
@@ -1569,6 +1646,8 @@ class Class(Type):
         The list of synonyms of the class.
     """
 
+    __slots__ = ("__associations", "__generalizations", "__is_abstract", "__is_read_only", "__attributes", "__methods")
+
     def __init__(
         self,
         name: str,
@@ -2139,7 +2218,7 @@ class Association(NamedElement):
 
     timestamp : datetime
         The object creation datetime. Inherits from `Type`.
-        By default it is set to the actual object creation time.
+        By default it is derived from the creation order of the object.
         See the `__init__` method for more details.
 
     synonyms : Optional[List[str]]
@@ -2161,6 +2240,8 @@ class Association(NamedElement):
         List of synonyms of the association.
     """
 
+    __slots__ = ("__ends",)
+
     def __init__(
         self,
         name: str,
@@ -2239,9 +2320,10 @@ class Association(NamedElement):
             end.type._add_association(association=self)
         """
 
-        # For each end in the set of current ends, remove the association from the end's type.
-        for end in self.ends:
-            end.type._delete_association(association=self)  # type: ignore
+        # For each end in the set of current ends (if any), remove the association from the end's type.
+        if hasattr(self, "ends"):
+            for end in self.ends:
+                end.type._delete_association(association=self)  # type: ignore
         
         # For each end in the set of new ends, set the owner of the end to the association and add the association to the end's type.
         for end in ends:
@@ -2286,6 +2368,8 @@ class BinaryAssociation(Association):
         synonyms (List[str]): List of synonyms of the binary association (None as default).
     """
 
+    __slots__ = ()
+
     @Association.ends.setter
     def ends(self, ends: set[Property]):
         """set[Property]: Set the ends of the association.
@@ -2324,6 +2408,8 @@ class AssociationClass(Class):
         synonyms (List[str]): List of synonyms of the association class (None as default).
     """
 
+    __slots__ = ("__association",)
+
     def __init__(
         self,
         name: str,
@@ -2366,6 +2452,8 @@ class Generalization(Element):
         timestamp (datetime): Inherited from NamedElement; object creation datetime (default is current time).
     """
 
+    __slots__ = ("__general", "__specific", "__timestamp")
+
     def __init__(
         self, general: Class, specific: Class, timestamp: Optional[datetime] = None
     ):
@@ -2444,6 +2532,8 @@ class GeneralizationSet(NamedElement):
         synonyms (List[str]): List of synonyms of the generalization set (None as default).
     """
 
+    __slots__ = ("__generalizations", "__is_disjoint", "__is_complete")
+
     def __init__(
         self,
         name: str,
@@ -2511,6 +2601,8 @@ class Package(NamedElement):
         synonyms (List[str]): List of synonyms of the package (None as default).
     """
 
+    __slots__ = ("__classes",)
+
     def __init__(
         self,
         name: str,
@@ -2558,6 +2650,8 @@ class Constraint(NamedElement):
         synonyms (List[str]): List of synonyms of the constraint (None as default).
     """
 
+    __slots__ = ("__context", "__expression", "__language")
+
     def __init__(
         self,
         name: str,
@@ -2621,6 +2715,8 @@ class Model(NamedElement):
         synonyms (List[str]): List of synonyms of the model (None as default).
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
@@ -2655,6 +2751,8 @@ class DomainModel(Model):
         synonyms (List[str]): List of synonyms of the domain model (None as default).
     """
 
+    __slots__ = ("__types", "__associations", "__generalizations", "__packages", "__constraints")
+
     def __init__(
         self,
         name: str,
@@ -3,6 +3,7 @@ from .deploymentLexer import deploymentLexer
 from .deploymentParser import deploymentParser
 from .depl_to_buml_listener import Deployment_BUML_Listener
 from besser.BUML.metamodel.deployment import DeploymentModel
+from besser.utilities.buml_loader import load_buml_code
 import os
 
 def buml_deployment_model(deployment_textfile: str, buml_model_file_name: str = "deployment_buml_model", output_dir: str = "buml"):
@@ -31,10 +32,8 @@ def buml_deployment_model(deployment_textfile: str, buml_model_file_name: str =
         walker.walk(listen, parse_tree)
 
     # model creation
-    namespace = {}
     with open(output_file, 'r') as model_code:
-        code = model_code.read()
-        exec(code, namespace)
-    
+        namespace = load_buml_code(model_code.read(), output_file)
+
     BUML_model: DeploymentModel = namespace.get('deployment_model')
     return BUML_model
\ No newline at end of file
@@ -4,6 +4,11 @@ from besser.BUML.notations.ocl.BOCLListener import BOCLListener
 from besser.BUML.notations.ocl.RootHandler import Root_Handler
 from antlr4 import *
 class OCLParserWrapper:
+    """Parser of the B-OCL language (grammar BOCL.g4), checking the syntax of OCL constraints.
+
+    The executable subset of OCL used by the validation of object models and the code generators is parsed by
+    ``OCLExpressionParser`` (see expression_parser.py for the split between the two parsers).
+    """
     def __init__(self, dm, om):
         self.dm = dm
         self.om = om
@@ -0,0 +1,421 @@
+"""Lightweight parser that turns OCL invariant text into a well-formed tree of OCL metamodel elements.
+
+BESSER has two OCL parsers:
+
+- The ANTLR based ``OCLParserWrapper`` (grammar ``BOCL.g4``) owns the B-OCL language as a whole (definitions,
+  collection literals, ranges, ...). It checks the syntax of constraints, but the tree it builds is not meant to be
+  executed, and ``BOCL.g4`` is too ambiguous to be parsed on every evaluation (a single invariant may take seconds).
+- This parser accepts a small *executable subset* of B-OCL invariants, which is what the validation of object models,
+  the SQL, Python and pydantic generators and the web editor support. Every expression of the subset is also a valid
+  B-OCL expression: ``tests/BUML/metamodel/ocl/test_expression_parser.py`` parses a corpus covering each rule and
+  table entry below with both parsers. Anything else raises ``OCLParseError``, and the consumers report the
+  constraint as unsupported instead of guessing.
+
+The subset, after the optional ``context <Class> inv <name>:`` header::
+
+    expression     ::= or ("implies" or)*
+    or             ::= and (("or" | "xor") and)*
+    and            ::= equality ("and" equality)*
+    equality       ::= relational (("=" | "<>") relational)*
+    relational     ::= additive (("<" | ">" | "<=" | ">=") additive)*
+    additive       ::= multiplicative (("+" | "-") multiplicative)*
+    multiplicative ::= unary (("*" | "/" | "div" | "mod") unary)*
+    unary          ::= ("not" | "-") unary | postfix
+    postfix        ::= primary ("." NAME
+                                | "." OBJECT_OPERATION "(" [expression ("," expression)*] ")"
+                                | "->" COLLECTION_OPERATION "(" [expression ("," expression)*] ")"
+                                | "->" LOOP_OPERATION "(" [iterator ("," iterator)* "|"] expression ")")*
+    iterator       ::= NAME [":" NAME]
+    primary        ::= INTEGER | REAL | STRING | "true" | "false" | "null" | "self" | NAME
+                     | NAME "::" NAME | NAME "->" "allInstances" "(" ")" | "(" expression ")"
+                     | "if" expression "then" expression "else" expression "endif"
+    STRING         ::= '"' (any character except '"' and '\\')* '"' | "'" NAME "'"
+
+``oclIsTypeOf`` and ``oclIsKindOf`` take a type name as argument. New constructs are added here, with a table entry
+and corpus expressions, only once ``BOCL.g4`` accepts them; changes to the B-OCL syntax belong to ``BOCL.g4``.
+
+Expressions built by this parser have a regular shape that evaluators, code generators and analyses can walk:
+
+- ``OperationCallExpression``: infix and prefix operators keep their operands in ``arguments`` and have no
+  ``source`` (e.g., ``a > b`` has ``arguments == [a, b]``; ``not a`` has ``arguments == [a]``). Operations called on
+  a receiver (``x->size()``, ``x.oclIsTypeOf(T)``, ``x->includes(y)``, ``T->allInstances()``) store the receiver in
+  ``source`` and the remaining parameters in ``arguments``.
+- ``PropertyCallExpression``: attribute access or association-end navigation; ``source`` holds the receiver.
+- ``LoopExp``: ``forAll``, ``exists``, ``select``, ``reject`` and ``collect``; ``source`` is the iterated collection,
+  ``iterator`` the declared ``IteratorExp`` variables and ``body`` a single-element list with the body expression.
+- ``IfExp``, ``VariableExp``, ``TypeExp`` and the literal expressions of the OCL metamodel.
+"""
+
+import re
+from typing import Optional
+
+from besser.BUML.metamodel.structural import Class, DomainModel, Enumeration, Property, Type, Constraint, \
+    StringType, IntegerType, FloatType, BooleanType, DateType, DateTimeType, TimeType, TimeDeltaType
+from besser.BUML.metamodel.ocl.ocl import OCLExpression, OperationCallExpression, PropertyCallExpression, \
+    IntegerLiteralExpression, RealLiteralExpression, StringLiteralExpression, BooleanLiteralExpression, \
+    LiteralExpression, NullLiteralExp, VariableExp, TypeExp, IfExp, LoopExp, IteratorExp
+
+# OCL type names mapped to the B-UML primitive data types
+OCL_PRIMITIVE_TYPES = {
+    "String": StringType,
+    "Integer": IntegerType,
+    "Real": FloatType,
+    "Boolean": BooleanType,
+    "Date": DateType,
+    "DateTime": DateTimeType,
+    "Time": TimeType,
+    "TimeDelta": TimeDeltaType,
+}
+
+LOOP_OPERATIONS = ("forAll", "exists", "select", "reject", "collect")
+COLLECTION_OPERATIONS = ("size", "isEmpty", "includes", "excludes", "sum", "max", "min", "first", "last")
+OBJECT_OPERATIONS = ("oclIsTypeOf", "oclIsKindOf", "oclIsUndefined", "abs", "floor", "round", "toUpper", "toLower",
+                     "concat", "substring")
+BOOLEAN_OPERATORS = ("and", "or", "xor", "implies", "not")
+COMPARISON_OPERATORS = ("=", "<>", "<", ">", "<=", ">=")
+ARITHMETIC_OPERATORS = ("+", "-", "*", "/", "div", "mod")
+
+_HEADER = re.compile(r"^\s*context\s+[\w:]+\s+inv\b\s*(\w*)\s*:", re.DOTALL)
+_TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<real>\d+\.\d+)
+  | (?P<int>\d+)
+  | (?P<str>"[^"\\]*"|'[A-Za-z_][A-Za-z0-9_]*')
+  | (?P<op>->|<>|<=|>=|::|[=<>+\-*/().,|:{}])
+  | (?P<id>[A-Za-z_][A-Za-z0-9_]*)
+""", re.VERBOSE)
+_KEYWORDS = {"and", "or", "xor", "implies", "not", "if", "then", "else", "endif", "true", "false", "null",
+             "self", "div", "mod"}
+
+
+class OCLParseError(ValueError):
+    """Raised when an OCL expression falls outside the supported subset or cannot be resolved against the model."""
+
+
+class OCLExpressionParser:
+    """Recursive descent parser for OCL invariants.
+
+    Names are resolved against the context class of the constraint and, when provided, the types of a
+    domain model (needed to resolve class names such as ``Book->allInstances()``).
+
+    Args:
+        domain_model (DomainModel, optional): the domain model used to resolve type names.
+
+    Attributes:
+        domain_model (DomainModel): the domain model used to resolve type names.
+    """
+
+    def __init__(self, domain_model: DomainModel = None):
+        self.domain_model: DomainModel = domain_model
+        self.__tokens: list = []
+        self.__pos: int = 0
+        self.__variables: dict = {}
+        self.__types: dict = {}
+
+    def parse(self, constraint: Constraint) -> OCLExpression:
+        """Parse the expression of an OCL constraint.
+
+        Args:
+            constraint (Constraint): the constraint to parse. Its expression may include the
+                ``context <Class> inv <name>:`` header.
+
+        Returns:
+            OCLExpression: the root of the parsed expression.
+        """
+        if isinstance(constraint.expression, OCLExpression):
+            return constraint.expression
+        return self.parse_expression(constraint.expression, constraint.context)
+
+    def parse_expression(self, text: str, context: Class) -> OCLExpression:
+        """Parse an OCL expression evaluated on instances of a context class.
+
+        Args:
+            text (str): the OCL text, with or without the ``context ... inv ...:`` header.
+            context (Class): the class ``self`` refers to.
+
+        Returns:
+            OCLExpression: the root of the parsed expression.
+        """
+        header = _HEADER.match(text)
+        if header:
+            text = text[header.end():]
+        self.__tokens = self.__tokenize(text)
+        self.__pos = 0
+        self.__types = self.__collect_types(context)
+        self.__variables = {"self": (context, False)}
+        expression, _, _ = self.__implies()
+        if self.__peek() is not None:
+            raise OCLParseError(f"Unexpected token '{self.__peek()}' in OCL expression: {text.strip()}")
+        return expression
+
+    # Lexing helpers
+
+    @staticmethod
+    def __tokenize(text: str) -> list:
+        tokens = []
+        pos = 0
+        while pos < len(text):
+            match = _TOKEN.match(text, pos)
+            if match is None:
+                raise OCLParseError(f"Invalid character '{text[pos]}' in OCL expression: {text.strip()}")
+            pos = match.end()
+            if match.lastgroup != "ws":
+                tokens.append((match.lastgroup, match.group()))
+        return tokens
+
+    def __peek(self, offset: int = 0) -> Optional[str]:
+        if self.__pos + offset < len(self.__tokens):
+            return self.__tokens[self.__pos + offset][1]
+        return None
+
+    def __next(self) -> tuple:
+        if self.__pos >= len(self.__tokens):
+            raise OCLParseError("Unexpected end of OCL expression.")
+        token = self.__tokens[self.__pos]
+        self.__pos += 1
+        return token
+
+    def __expect(self, value: str):
+        kind, token = self.__next()
+        if token != value:
+            raise OCLParseError(f"Expected '{value}' but found '{token}'.")
+
+    # Name resolution helpers
+
+    def __collect_types(self, context: Class) -> dict:
+        types = dict(OCL_PRIMITIVE_TYPES)
+        if self.domain_model is not None:
+            for type_ in self.domain_model.types:
+                types[type_.name] = type_
+        pending = [context]
+        visited = set()
+        while pending:
+            cls = pending.pop()
+            if cls is None or cls in visited:
+                continue
+            visited.add(cls)
+            types.setdefault(cls.name, cls)
+            if isinstance(cls, Class):
+                pending.extend(end.type for end in cls.all_association_ends())
+                pending.extend(cls.all_parents())
+                pending.extend(attr.type for attr in cls.all_attributes() if isinstance(attr.type, Enumeration))
+        return types
+
+    def __resolve_type(self, name: str) -> Type:
+        if name not in self.__types:
+            raise OCLParseError(f"Type '{name}' not found.")
+        return self.__types[name]
+
+    @staticmethod
+    def __resolve_property(cls: Type, name: str) -> Property:
+        if not isinstance(cls, Class):
+            raise OCLParseError(f"Property '{name}' cannot be accessed on '{cls.name if cls else None}'.")
+        for attribute in cls.all_attributes():
+            if attribute.name == name:
+                return attribute
+        for end in cls.all_association_ends():
+            if end.name == name:
+                return end
+        raise OCLParseError(f"Property '{name}' not found in class '{cls.name}'.")
+
+    # Grammar. Each rule returns a tuple (expression, static type, is collection).
+
+    def __binary(self, operators: tuple, next_rule) -> tuple:
+        left = next_rule()
+        while self.__peek() in operators:
+            operator = self.__next()[1]
+            right = next_rule()
+            left = self.__operation(operator, [left[0], right[0]], None), self.__result_type(operator, left, right), False
+        return left
+
+    def __implies(self) -> tuple:
+        return self.__binary(("implies",), self.__or)
+
+    def __or(self) -> tuple:
+        return self.__binary(("or", "xor"), self.__and)
+
+    def __and(self) -> tuple:
+        return self.__binary(("and",), self.__equality)
+
+    def __equality(self) -> tuple:
+        return self.__binary(("=", "<>"), self.__relational)
+
+    def __relational(self) -> tuple:
+        return self.__binary(("<", ">", "<=", ">="), self.__additive)
+
+    def __additive(self) -> tuple:
+        return self.__binary(("+", "-"), self.__multiplicative)
+
+    def __multiplicative(self) -> tuple:
+        return self.__binary(("*", "/", "div", "mod"), self.__unary)
+
+    def __unary(self) -> tuple:
+        if self.__peek() in ("not", "-"):
+            operator = self.__next()[1]
+            operand = self.__unary()
+            result_type = BooleanType if operator == "not" else operand[1]
+            return self.__operation(operator, [operand[0]], None), result_type, False
+        return self.__postfix()
+
+    def __postfix(self) -> tuple:
+        expression, static_type, is_collection = self.__primary()
+        while self.__peek() in (".", "->"):
+            arrow = self.__next()[1] == "->"
+            name = self.__next()[1]
+            if arrow and name in LOOP_OPERATIONS:
+                expression, static_type, is_collection = self.__loop(name, expression, static_type)
+            elif self.__peek() == "(":
+                expression, static_type, is_collection = self.__call(name, expression, static_type, arrow)
+            elif arrow:
+                raise OCLParseError(f"Expected a collection operation after '->' but found '{name}'.")
+            else:
+                prop = self.__resolve_property(static_type, name)
+                call = PropertyCallExpression(name, prop)
+                call.source = expression
+                many = prop.multiplicity.max > 1 if isinstance(prop.type, Class) else False
+                expression, static_type, is_collection = call, prop.type, is_collection or many
+        return expression, static_type, is_collection
+
+    def __call(self, name: str, source: OCLExpression, static_type: Type, arrow: bool) -> tuple:
+        if name not in (COLLECTION_OPERATIONS if arrow else OBJECT_OPERATIONS):
+            raise OCLParseError(f"Unsupported OCL operation '{'->' if arrow else '.'}{name}'.")
+        self.__expect("(")
+        arguments = []
+        if name in ("oclIsTypeOf", "oclIsKindOf"):
+            type_name = self.__next()[1]
+            arguments.append(TypeExp(type_name, self.__resolve_type(type_name)))
+        elif self.__peek() != ")":
+            arguments.append(self.__implies()[0])
+            while self.__peek() == ",":
+                self.__next()
+                arguments.append(self.__implies()[0])
+        self.__expect(")")
+        result_type = {
+            "size": IntegerType, "isEmpty": BooleanType, "includes": BooleanType, "excludes": BooleanType,
+            "oclIsTypeOf": BooleanType, "oclIsKindOf": BooleanType, "oclIsUndefined": BooleanType,
+            "toUpper": StringType, "toLower": StringType, "concat": StringType, "substring": StringType,
+            "floor": IntegerType, "round": IntegerType,
+        }.get(name, static_type)
+        return self.__operation(name, arguments, source), result_type, False
+
+    def __loop(self, name: str, source: OCLExpression, static_type: Type) -> tuple:
+        self.__expect("(")
+        loop = LoopExp(name, BooleanType if name in ("forAll", "exists") else static_type)
+        loop.source = source
+        declared = []
+        # Iterator declarations are optional: "x | body", "x : T | body", "x, y | body" or just "body".
+        lookahead = 0
+        while self.__peek(lookahead) not in (None, "|", ")", "("):
+            lookahead += 1
+        if self.__peek(lookahead) == "|":
+            while self.__peek() != "|":
+                variable = self.__next()[1]
+                variable_type = static_type
+                if self.__peek() == ":":
+                    self.__next()
+                    variable_type = self.__resolve_type(self.__next()[1])
+                declared.append((variable, variable_type))
+                if self.__peek() == ",":
+                    self.__next()
+            self.__next()
+        else:
+            declared.append(("_it", static_type))
+        saved = dict(self.__variables)
+        for variable, variable_type in declared:
+            loop.addIterator(IteratorExp(variable, variable_type))
+            self.__variables[variable] = (variable_type, False)
+        body, body_type, _ = self.__implies()
+        self.__variables = saved
+        loop.add_body(body)
+        self.__expect(")")
+        if name in ("forAll", "exists"):
+            return loop, BooleanType, False
+        if name == "collect":
+            loop.type = body_type
+            return loop, body_type, True
+        return loop, static_type, True
+
+    def __primary(self) -> tuple:
+        kind, token = self.__next()
+        if kind == "int":
+            return IntegerLiteralExpression("NP", int(token)), IntegerType, False
+        if kind == "real":
+            return RealLiteralExpression("NP", float(token)), FloatType, False
+        if kind == "str":
+            return StringLiteralExpression("str", token[1:-1]), StringType, False
+        if token in ("true", "false"):
+            return BooleanLiteralExpression("NP", token == "true"), BooleanType, False
+        if token == "null":
+            return NullLiteralExp("null", "OclVoid"), None, False
+        if token == "(":
+            inner = self.__implies()
+            self.__expect(")")
+            return inner
+        if token == "if":
+            return self.__if()
+        if kind == "id" and token not in _KEYWORDS or token == "self":
+            if self.__peek() == "::":
+                self.__next()
+                literal = self.__next()[1]
+                enumeration = self.__resolve_type(token)
+                return LiteralExpression(literal, enumeration, literal), enumeration, False
+            if token in self.__variables:
+                variable_type, is_collection = self.__variables[token]
+                return VariableExp(token, variable_type), variable_type, is_collection
+            if token in self.__types and self.__peek() == "->" and self.__peek(1) == "allInstances":
+                self.__next()
+                self.__next()
+                self.__expect("(")
+                self.__expect(")")
+                type_ = self.__types[token]
+                return self.__operation("allInstances", [], TypeExp(token, type_)), type_, True
+            # Implicit receiver: 'pages > 0' means 'self.pages > 0', or '_it.pages > 0' inside an
+            # iterator body without declared variables (e.g., 'self.has->forAll(pages > 0)').
+            receiver = "_it" if "_it" in self.__variables else "self"
+            receiver_type = self.__variables[receiver][0]
+            prop = self.__resolve_property(receiver_type, token)
+            call = PropertyCallExpression(token, prop)
+            call.source = VariableExp(receiver, receiver_type)
+            many = prop.multiplicity.max > 1 if isinstance(prop.type, Class) else False
+            return call, prop.type, many
+        raise OCLParseError(f"Unexpected token '{token}' in OCL expression.")
+
+    def __if(self) -> tuple:
+        condition = self.__implies()[0]
+        self.__expect("then")
+        then_expression, then_type, then_collection = self.__implies()
+        self.__expect("else")
+        else_expression = self.__implies()[0]
+        self.__expect("endif")
+        if_expression = IfExp("if", then_type if then_type is not None else "OclAny")
+        if_expression.ifCondition = condition
+        if_expression.thenExpression = then_expression
+        if_expression.elseCondition = else_expression
+        return if_expression, then_type, then_collection
+
+    @staticmethod
+    def __operation(operator: str, arguments: list, source: Optional[OCLExpression]) -> OperationCallExpression:
+        operation = OperationCallExpression(operator, operator, arguments)
+        operation.source = source
+        return operation
+
+    @staticmethod
+    def __result_type(operator: str, left: tuple, right: tuple) -> Type:
+        if operator in BOOLEAN_OPERATORS or operator in COMPARISON_OPERATORS:
+            return BooleanType
+        if operator == "/" or FloatType in (left[1], right[1]):
+            return FloatType
+        return left[1]
+
+
+def parse_ocl_constraint(constraint: Constraint, domain_model: DomainModel = None) -> OCLExpression:
+    """Parse the expression of an OCL constraint into a tree of OCL metamodel elements.
+
+    Args:
+        constraint (Constraint): the constraint to parse.
+        domain_model (DomainModel, optional): the domain model used to resolve type names.
+
+    Returns:
+        OCLExpression: the root of the parsed expression.
+    """
+    return OCLExpressionParser(domain_model).parse(constraint)
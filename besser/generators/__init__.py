@@ -1 +1,3 @@
-from .generator_interface import *
\ No newline at end of file
+from .generator_interface import *
+from .output_sink import *
+from .instrumentation import *
@@ -1,5 +1,6 @@
 import os
 import configparser
+from typing import Callable
 import docker
 from jinja2 import Environment, FileSystemLoader
 from besser.BUML.metamodel.structural import DomainModel
@@ -23,9 +24,13 @@ class BackendGenerator(GeneratorInterface):
         output_dir (str, optional): The output directory where the generated code will be saved. Defaults to None.
         docker_image (bool, optional): Flag to indicate if Docker image generation is required. Defaults to False.
         docker_config_path (str, optional): The path to the docker configuration file to auto upload the image. Defaults to None.
+        docker_client (docker.DockerClient, optional): The Docker client building and pushing the image. Defaults to a client
+                                configured from the environment (docker.from_env()), created when the image is built.
+        progress (Callable[[str], None], optional): Receives the messages of the Docker build and push. Defaults to print.
     """
 
-    def __init__(self, model: DomainModel, http_methods: list = None, nested_creations: bool = False, output_dir: str = None, docker_image: bool = False, docker_config_path: str = None):
+    def __init__(self, model: DomainModel, http_methods: list = None, nested_creations: bool = False, output_dir: str = None, docker_image: bool = False, docker_config_path: str = None,
+                 docker_client: docker.DockerClient = None, progress: Callable[[str], None] = None):
         super().__init__(model, output_dir)
         allowed_methods = ["GET", "POST", "PUT", "DELETE"]
         if not http_methods:
@@ -36,6 +41,8 @@ class BackendGenerator(GeneratorInterface):
         self.nested_creations = nested_creations
         self.docker_image = docker_image
         self.docker_config_path = docker_config_path
+        self.docker_client = docker_client
+        self.progress = progress or print
         self.config = self.load_config()
 
     def load_config(self):
@@ -71,7 +78,9 @@ class BackendGenerator(GeneratorInterface):
         Returns:
             None, but stores the generated code as files main_api.py, sql_alchemy.py and pydantic_classes.py
         """
-        if self.output_dir is not None:
+        if self.sink is not None:
+            backend_folder_path = self.build_generation_dir()
+        elif self.output_dir is not None:
             backend_folder_path = self.output_dir
             os.makedirs(backend_folder_path, exist_ok=True)
             print(f"Backend folder created at {backend_folder_path}")
@@ -83,19 +92,18 @@ class BackendGenerator(GeneratorInterface):
         docker_port = self.config["docker_port"] if self.config else 8000  # Use default port if config not provided
 
         rest_api = RESTAPIGenerator(model=self.model, http_methods=self.http_methods, nested_creations=self.nested_creations, output_dir=backend_folder_path, backend=True, port=docker_port)
-        rest_api.generate()
-
         sql_alchemy = SQLAlchemyGenerator(model=self.model, output_dir=backend_folder_path)
-        sql_alchemy.generate()
-
         pydantic_model = PydanticGenerator(model=self.model, output_dir=backend_folder_path, backend=True, nested_creations=self.nested_creations)
-        pydantic_model.generate()
+        # The generators of the backend files write to the same sink
+        for generator in (rest_api, sql_alchemy, pydantic_model):
+            generator.sink = self.sink
+            generator.generate()
 
         if self.docker_image:
             if self.config:
                 self.build_and_push_docker_image(backend_folder_path)
             else:
-                generate_docker_files(backend_folder_path)
+                generate_docker_files(backend_folder_path, open_file=self.open_output)
 
     def build_and_push_docker_image(self, backend_folder_path):
         """
@@ -137,9 +145,10 @@ class BackendGenerator(GeneratorInterface):
         full_image_name = f"{repository}/{image_name}:{tag}"
 
         # Create docker client
-        client = docker.from_env()
+        client = self.docker_client or docker.from_env()
 
         # Create docker image
+        self.progress(f"Building the Docker image {full_image_name}")
         image, build_logs = client.images.build(
             path=backend_folder_path,
             rm=True,
@@ -147,7 +156,7 @@ class BackendGenerator(GeneratorInterface):
         )
 
         for log in build_logs:
-            print(log)
+            self.report_docker_log(log)
 
         # Docker login
         username = self.config["docker_username"]
@@ -155,6 +164,22 @@ class BackendGenerator(GeneratorInterface):
         client.login(username=username, password=password)
 
         # Push Docker image
+        self.progress(f"Pushing the Docker image {full_image_name}")
         resp = client.api.push(full_image_name, stream=True, decode=True)
         for line in resp:
-            print(line)
+            if "error" in line:
+                raise RuntimeError(f"Push of the Docker image {full_image_name} failed: {line['error']}")
+            self.report_docker_log(line)
+
+    def report_docker_log(self, log: dict):
+        """
+        Reports an entry of the Docker build or push logs to the progress callback.
+
+        Args:
+            log (dict): The decoded log entry (e.g., {"stream": "Step 1/10 : FROM python:3.9-slim"}).
+        """
+        message = log.get("stream") or log.get("status") or ""
+        if log.get("progress"):
+            message = f"{message} {log['progress']}"
+        if message.strip():
+            self.progress(message.strip())
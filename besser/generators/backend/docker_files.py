@@ -1,10 +1,12 @@
-def generate_docker_files(path: str = "output_backend"):
-    generate_dockerfile(path)
-    generate_docker_image(path)
+import os
+
+def generate_docker_files(path: str = "output_backend", open_file=open):
+    generate_dockerfile(path, open_file)
+    generate_docker_image(path, open_file)
     pass
 
-def generate_dockerfile(path: str):
-    with open(path + '/Dockerfile', 'w') as dockerfile:
+def generate_dockerfile(path: str, open_file=open):
+    with open_file(os.path.join(path, 'Dockerfile'), 'w') as dockerfile:
         dockerfile.write('''FROM python:3.9-slim
 WORKDIR /app
 
@@ -24,8 +26,8 @@ CMD ["python", "main_api.py"]
 '''
         )
 
-def generate_docker_image(path: str):
-    with open(path + '/create_docker_image.py', 'w') as create_image:
+def generate_docker_image(path: str, open_file=open):
+    with open_file(os.path.join(path, 'create_docker_image.py'), 'w') as create_image:
         create_image.write('''import docker
 import os
 import argparse
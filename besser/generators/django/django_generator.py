@@ -31,7 +31,7 @@ class DjangoGenerator(GeneratorInterface):
         env = Environment(loader=FileSystemLoader(
             templates_path), trim_blocks=True, lstrip_blocks=True, extensions=['jinja2.ext.do'])
         template = env.get_template('django_template.py.j2')
-        with open(file_path, mode="w") as f:
+        with self.open_output(file_path, mode="w") as f:
             generated_code = template.render(model=self.model)
             f.write(generated_code)
             print("Code generated in the location: " + file_path)
@@ -63,7 +63,7 @@ class FlutterSQLHelperGenerator(GeneratorInterface):
             os.path.abspath(__file__)), "templates")
         env = Environment(loader=FileSystemLoader(templates_path))
         template = env.get_template('flutterCodeGeneratorSqlHelperFile.py.j2')
-        with open(file_path, mode="w") as f:
+        with self.open_output(file_path, mode="w") as f:
             generated_code = template.render(BUMLClasses= copy_model.get_classes(), model=copy_model, types=self.TYPES)
             f.write(generated_code)
             print("Code generated in the location: " + file_path)
@@ -168,7 +168,7 @@ class FlutterMainDartGenerator(GeneratorInterface):
         for scr in screens:
               print(scr.name + " ::  ")
   
-        with open(file_path, mode="w") as f:
+        with self.open_output(file_path, mode="w") as f:
             generated_code = template.render(
                 app=self.application,
                 screens=screens,
@@ -228,7 +228,7 @@ class FlutterPubspecGenerator(GeneratorInterface):
         templates_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
         env = Environment(loader=FileSystemLoader(templates_path))
         template = env.get_template('flutterCodeGeneratorPubspecFile.py.j2')
-        with open(file_path, mode="w") as f:
+        with self.open_output(file_path, mode="w") as f:
             generated_code = template.render(
                 app=self.application
             )
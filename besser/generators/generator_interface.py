@@ -1,14 +1,23 @@
 import os
 from abc import ABC, abstractmethod
 from besser.BUML.metamodel.structural import Model
+from besser.generators.output_sink import OutputSink
+from besser.generators.instrumentation import timed_generate
 
 # Interface for code generators
 class GeneratorInterface(ABC):
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The duration of generate() is recorded when metrics are enabled (see instrumentation.py)
+        if "generate" in cls.__dict__:
+            cls.generate = timed_generate(cls.__dict__["generate"])
+
     @abstractmethod
     def __init__(self, model: Model, output_dir: str = None):
         self.model = model
         self.output_dir = output_dir
+        self.sink = None
 
     @abstractmethod
     def generate(self, *args):
@@ -30,11 +39,36 @@ class GeneratorInterface(ABC):
     def output_dir(self, output_dir: str):
         self.__output_dir = output_dir
 
+    @property
+    def sink(self) -> OutputSink:
+        """OutputSink: the destination of the generated files (None to write them to the output directory)."""
+        return self.__sink
+
+    @sink.setter
+    def sink(self, sink: OutputSink):
+        self.__sink = sink
+
+    def open_output(self, file_path: str, mode: str = "w", newline: str = None):
+        """Open a generated file for writing, in the output directory or in the sink of the generator.
+
+        Args:
+            file_path (str): the path of the file, built with build_generation_path().
+            mode (str, optional): "w" for text or "wb" for bytes. Defaults to "w".
+            newline (str, optional): newline translation of text files, as in open(). Defaults to None.
+        """
+        if self.sink is not None:
+            return self.sink.open(file_path, mode=mode, newline=newline)
+        if "b" in mode:
+            return open(file_path, mode)
+        return open(file_path, mode, newline=newline)
+
     def build_generation_path(self, file_name:str) -> str:
         file_path = os.path.join(self.build_generation_dir(), file_name)
         return file_path
 
     def build_generation_dir(self) -> str:
+        if self.sink is not None:
+            return self.sink.generation_dir()
         if self.output_dir != None:
             os.makedirs(self.output_dir, exist_ok=True)
             file_path = os.path.join(self.output_dir)
@@ -0,0 +1,313 @@
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable
+
+# Spans are logged at the DEBUG level, with their stage, duration and labels in the "span" attribute of the record
+logger = logging.getLogger("besser.instrumentation")
+
+# Upper bounds of the buckets of the duration histograms, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_enabled: bool = os.environ.get("BESSER_METRICS", "").lower() in ("1", "true", "yes")
+_local = threading.local()
+
+
+def enable_metrics(enabled: bool = True):
+    """Enable (or disable) the metrics of this process. When disabled, spans and metric updates do nothing.
+
+    Args:
+        enabled (bool, optional): whether metrics are recorded. Defaults to True.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def metrics_enabled() -> bool:
+    """bool: Whether metrics are recorded: enabled in this process (by enable_metrics() or the BESSER_METRICS
+    variable), or captured in the current thread by ``run_recorded``."""
+    return _enabled or getattr(_local, "records", None) is not None
+
+
+class Metric:
+    """A metric, with a value for each combination of the values of its labels.
+
+    When a recording is active in the current thread (see ``run_recorded``), the updates are captured instead of
+    applied, to be replayed in another process.
+
+    Args:
+        name (str): the name of the metric.
+        documentation (str): the description of the metric.
+        label_names (tuple[str], optional): the names of its labels. Defaults to none.
+
+    Attributes:
+        name (str): the name of the metric.
+        documentation (str): the description of the metric.
+        label_names (tuple[str]): the names of its labels.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple = ()):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.label_names: tuple = tuple(label_names)
+        self._values: dict = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _update(self, operation: str, value: float, labels: dict):
+        records = getattr(_local, "records", None)
+        if records is not None:
+            records.append((self.name, operation, value, labels))
+        elif _enabled:
+            self._apply(operation, value, labels)
+
+    def _apply(self, operation: str, value: float, labels: dict):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._combine(self._values.get(key), operation, value)
+
+    def _combine(self, current: Any, operation: str, value: float) -> Any:
+        return (current or 0.0) + value if operation == "inc" else value
+
+    def clear(self):
+        """Remove the values of the metric."""
+        with self._lock:
+            self._values.clear()
+
+    def _samples(self) -> Iterable[tuple]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in sorted(values):
+            yield self.name, dict(zip(self.label_names, key)), value
+
+
+class Counter(Metric):
+    """A metric that only increases (e.g., a number of requests)."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        """Increase the value of the counter.
+
+        Args:
+            amount (float, optional): the increment. Defaults to 1.
+            **labels: the values of the labels.
+        """
+        self._update("inc", amount, labels)
+
+
+class Gauge(Metric):
+    """A metric that can take any value (e.g., the size of the last model)."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        """Set the value of the gauge.
+
+        Args:
+            value (float): the value.
+            **labels: the values of the labels.
+        """
+        self._update("set", value, labels)
+
+
+class Histogram(Metric):
+    """A metric counting observations (e.g., durations) in buckets, with their count and sum.
+
+    Args:
+        name (str): the name of the metric.
+        documentation (str): the description of the metric.
+        label_names (tuple[str], optional): the names of its labels. Defaults to none.
+        buckets (tuple[float], optional): the upper bounds of the buckets. Defaults to DEFAULT_BUCKETS.
+
+    Attributes:
+        buckets (tuple[float]): the upper bounds of the buckets.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets: tuple = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        """Add an observation.
+
+        Args:
+            value (float): the observed value.
+            **labels: the values of the labels.
+        """
+        self._update("observe", value, labels)
+
+    def _combine(self, current: Any, operation: str, value: float) -> Any:
+        counts, total = current if current is not None else ([0] * (len(self.buckets) + 1), 0.0)
+        # The last count is for the +Inf bucket; the counts are made cumulative when rendered
+        index = next((position for position, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        counts[index] += 1
+        return counts, total + value
+
+    def _samples(self) -> Iterable[tuple]:
+        for name, labels, (counts, total) in super()._samples():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f"{name}_bucket", {**labels, "le": bound}, cumulative
+            yield f"{name}_sum", labels, total
+            yield f"{name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    """The metrics of a process, rendered in the Prometheus text format.
+
+    Attributes:
+        metrics (dict[str, Metric]): the metrics, by name.
+    """
+
+    def __init__(self):
+        self.metrics: dict = {}
+
+    def __register(self, metric: Metric) -> Metric:
+        existing = self.metrics.setdefault(metric.name, metric)
+        if type(existing) is not type(metric):
+            raise ValueError(f"Metric {metric.name} is already registered as a {existing.kind}")
+        return existing
+
+    def counter(self, name: str, documentation: str, label_names: tuple = ()) -> Counter:
+        """Get or create a counter (see ``Counter``)."""
+        return self.__register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: tuple = ()) -> Gauge:
+        """Get or create a gauge (see ``Gauge``)."""
+        return self.__register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: tuple = (),
+                  buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram (see ``Histogram``)."""
+        return self.__register(Histogram(name, documentation, label_names, buckets))
+
+    def replay(self, records: Iterable[tuple]):
+        """Apply the metric updates captured by ``run_recorded`` (e.g., in a worker process), if metrics are enabled.
+
+        Args:
+            records (Iterable[tuple]): the captured updates.
+        """
+        if not _enabled:
+            return
+        for name, operation, value, labels in records:
+            metric = self.metrics.get(name)
+            if metric is not None:
+                metric._apply(operation, value, labels)
+
+    def clear(self):
+        """Remove the values of every metric."""
+        for metric in self.metrics.values():
+            metric.clear()
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text format (version 0.0.4).
+
+        Returns:
+            str: the metrics.
+        """
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation, help_text=True)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric._samples():
+                rendered = ",".join(f'{label}="{_escape(_format(label_value))}"'
+                                    for label, label_value in labels.items())
+                lines.append(f"{name}{{{rendered}}} {_format(value)}" if rendered else f"{name} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+def _escape(text: str, help_text: bool = False) -> str:
+    text = text.replace("\\", "\\\\").replace("\n", "\\n")
+    return text if help_text else text.replace('"', '\\"')
+
+
+# The metrics of the process, and the metrics recorded by the spans
+REGISTRY = MetricsRegistry()
+STAGE_DURATION = REGISTRY.histogram("besser_stage_duration_seconds",
+                                    "Duration of the stages of the model conversions and code generations.",
+                                    ("stage", "generator"))
+
+
+@contextmanager
+def span(stage: str, **labels):
+    """Time a stage (e.g., a conversion), recorded in the ``besser_stage_duration_seconds`` histogram and logged.
+
+    Can also decorate a function. Does nothing if metrics are disabled.
+
+    Args:
+        stage (str): the name of the stage.
+        **labels: the other labels of the stage (e.g., the generator).
+    """
+    if not metrics_enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_DURATION.observe(duration, stage=stage, **labels)
+        logger.debug("%s: %.4f s", stage, duration, extra={"span": {"stage": stage, "duration": duration, **labels}})
+
+
+def run_recorded(function: Callable, *args) -> tuple:
+    """Run a function, capturing the metric updates it makes instead of applying them. Used to run the jobs of
+    worker processes, whose updates are replayed in the main process with ``MetricsRegistry.replay``.
+
+    Args:
+        function (Callable): the function.
+        *args: the arguments of the function.
+
+    Returns:
+        tuple[Any, list, float]: the result of the function, the captured updates, and its duration in seconds.
+    """
+    previous = getattr(_local, "records", None)
+    records = _local.records = []
+    start = time.perf_counter()
+    try:
+        result = function(*args)
+    finally:
+        _local.records = previous
+    return result, records, time.perf_counter() - start
+
+
+def timed_generate(generate: Callable) -> Callable:
+    """Wrap the ``generate`` method of a generator to record its duration in the
+    ``besser_generator_duration_seconds`` histogram, labelled with the generator class. Calls made from the
+    ``generate`` method of the same generator (e.g., through ``super()``) are not recorded again."""
+    def wrapper(self, *args, **kwargs):
+        if not metrics_enabled() or getattr(_local, "generating", None) is self:
+            return generate(self, *args, **kwargs)
+        previous = getattr(_local, "generating", None)
+        _local.generating = self
+        start = time.perf_counter()
+        try:
+            return generate(self, *args, **kwargs)
+        finally:
+            _local.generating = previous
+            GENERATOR_DURATION.observe(time.perf_counter() - start, generator=type(self).__name__)
+
+    wrapper.__name__, wrapper.__qualname__, wrapper.__doc__ = generate.__name__, generate.__qualname__, generate.__doc__
+    wrapper.__wrapped__ = generate
+    wrapper.__isabstractmethod__ = getattr(generate, "__isabstractmethod__", False)
+    return wrapper
+
+
+GENERATOR_DURATION = REGISTRY.histogram("besser_generator_duration_seconds",
+                                        "Duration of the generate() calls of the code generators.", ("generator",))
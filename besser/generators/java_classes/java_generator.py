@@ -23,7 +23,7 @@ class JavaGenerator(GeneratorInterface):
                 package_name = self.output_dir
             else:
                 package_name = "output"
-            with open(file_path, mode="w") as f:
+            with self.open_output(file_path, mode="w") as f:
                 generated_code = template.render(class_obj=class_obj,
                                                  processed_associations=processed_associations,
                                                  package_name=package_name)
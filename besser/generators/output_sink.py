@@ -0,0 +1,110 @@
+import io
+import os
+import zipfile
+from abc import ABC, abstractmethod
+from typing import IO, BinaryIO
+
+
+class OutputSink(ABC):
+    """Destination of the files written by a generator.
+
+    Generators open their output files through ``GeneratorInterface.open_output``, which delegates to the sink of
+    the generator: the files can be written to a directory (``DiskSink``, the default), kept in memory
+    (``MemorySink``) or streamed into a zip archive (``ZipSink``).
+    """
+
+    @abstractmethod
+    def open(self, file_path: str, mode: str = "w", newline: str = None) -> IO:
+        """Open a file for writing.
+
+        Args:
+            file_path (str): path of the file, relative to the root of the sink.
+            mode (str, optional): "w" for text or "wb" for bytes. Defaults to "w".
+            newline (str, optional): newline translation of text files, as in open(). Defaults to None.
+
+        Returns:
+            IO: the file object; the file is complete when it is closed.
+        """
+
+    def generation_dir(self) -> str:
+        """Get the directory in which the file paths of the generators are built ("" for virtual sinks)."""
+        return ""
+
+    def close(self):
+        """Complete the output (e.g., write the directory of a zip archive)."""
+
+
+class DiskSink(OutputSink):
+    """A sink writing the files to a directory, creating the subdirectories as needed.
+
+    Args:
+        directory (str): the directory.
+    """
+
+    def __init__(self, directory: str):
+        self.directory: str = directory
+
+    def open(self, file_path: str, mode: str = "w", newline: str = None) -> IO:
+        path = os.path.join(self.directory, file_path)
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        if "b" in mode:
+            return open(path, mode)
+        return open(path, mode, newline=newline)
+
+    def generation_dir(self) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        return self.directory
+
+
+class _MemoryFile(io.BytesIO):
+    """A file kept in memory, stored in its sink when closed."""
+
+    def __init__(self, files: dict, file_path: str):
+        super().__init__()
+        self.__files: dict = files
+        self.__file_path: str = file_path
+
+    def close(self):
+        if not self.closed:
+            self.__files[self.__file_path] = self.getvalue()
+        super().close()
+
+
+class MemorySink(OutputSink):
+    """A sink keeping the files in memory, as UTF-8 encoded bytes.
+
+    Attributes:
+        files (dict[str, bytes]): the content of the files, by path.
+    """
+
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+
+    def open(self, file_path: str, mode: str = "w", newline: str = None) -> IO:
+        memory_file = _MemoryFile(self.files, file_path.replace(os.sep, "/"))
+        if "b" in mode:
+            return memory_file
+        return io.TextIOWrapper(memory_file, encoding="utf-8", newline=newline)
+
+
+class ZipSink(OutputSink):
+    """A sink streaming the files into a zip archive, one entry per file, as they are written.
+
+    Args:
+        file (BinaryIO): the binary file object receiving the archive.
+        compression (int, optional): the compression method. Defaults to zipfile.ZIP_DEFLATED.
+    """
+
+    def __init__(self, file: BinaryIO, compression: int = zipfile.ZIP_DEFLATED):
+        self.__archive: zipfile.ZipFile = zipfile.ZipFile(file, "w", compression)
+
+    def open(self, file_path: str, mode: str = "w", newline: str = None) -> IO:
+        entry = self.__archive.open(file_path.replace(os.sep, "/"), "w")
+        if "b" in mode:
+            return entry
+        return io.TextIOWrapper(entry, encoding="utf-8", newline=newline)
+
+    def close(self):
+        self.__archive.close()
@@ -2,6 +2,7 @@ import os
 from jinja2 import Environment, FileSystemLoader
 from besser.BUML.metamodel.structural import DomainModel
 from besser.generators import GeneratorInterface
+from besser.generators.python_classes.ocl_to_python import OCLToPythonTranslator
 import itertools
 
 class PydanticGenerator(GeneratorInterface):
@@ -30,6 +31,9 @@ class PydanticGenerator(GeneratorInterface):
         If the output directory was not specified, the code generated will be stored in the <current directory>/output
         folder.
 
+        The OCL constraints of the model that only read attributes are compiled into model validators of their
+        context class, so invalid data is rejected when the pydantic model is created.
+
         Returns:
             None, but store the generated code as a file named pydantic_classes.py 
         """
@@ -44,11 +48,16 @@ class PydanticGenerator(GeneratorInterface):
             extensions=['jinja2.ext.do']
         )
         template = env.get_template('pydantic_classes_template.py.j2')
-        with open(file_path, mode="w", newline='\n') as f:
+        # The associations of the pydantic classes are ids or nested objects depending on the generation options,
+        # so only the constraints without navigations are compiled.
+        invariants, skipped = OCLToPythonTranslator(self.domain_model, navigation=False).translate_all()
+        with self.open_output(file_path, mode="w", newline='\n') as f:
             generated_code = template.render(
                 domain=self.domain_model,
                 backend=self.backend,
-                nested_creations=self.nested_creations
+                nested_creations=self.nested_creations,
+                invariants=invariants,
+                skipped=skipped
             )
             f.write(generated_code)
             print("Code generated in the location: " + file_path)
\ No newline at end of file
@@ -1 +1,2 @@
-from .python_classes_generator import *
\ No newline at end of file
+from .python_classes_generator import *
+from .ocl_to_python import *
@@ -0,0 +1,227 @@
+import re
+
+from besser.BUML.metamodel.structural import Class, DomainModel, Enumeration, Constraint
+from besser.BUML.metamodel.ocl.ocl import OCLExpression, OperationCallExpression, PropertyCallExpression, \
+    LiteralExpression, NullLiteralExp, VariableExp, TypeExp, IfExp, LoopExp
+from besser.BUML.notations.ocl.expression_parser import OCLExpressionParser
+
+
+class PythonTranslationError(ValueError):
+    """Raised when an OCL expression cannot be translated to Python."""
+
+
+class PythonInvariant:
+    """An OCL invariant compiled to a Python expression over ``self``.
+
+    Args:
+        constraint (Constraint): the OCL constraint.
+        expression (str): the Python expression, True when the invariant holds.
+
+    Attributes:
+        name (str): the Python identifier of the constraint.
+        constraint (Constraint): the OCL constraint.
+        expression (str): the Python expression, True when the invariant holds.
+    """
+
+    def __init__(self, constraint: Constraint, expression: str):
+        self.name: str = re.sub(r"\W", "_", constraint.name)
+        self.constraint: Constraint = constraint
+        self.expression: str = expression
+
+    def __repr__(self):
+        return f"PythonInvariant({self.name}, {self.expression})"
+
+
+_BINARY_OPERATORS = {
+    "=": "==", "<>": "!=", "<": "<", ">": ">", "<=": "<=", ">=": ">=",
+    "+": "+", "-": "-", "*": "*", "/": "/", "and": "and", "or": "or",
+}
+
+_COLLECTION_FUNCTIONS = {"size": "len", "sum": "sum", "max": "max", "min": "min", "asSet": "set"}
+
+
+class OCLToPythonTranslator:
+    """Compiles OCL invariants into Python expressions over the attributes of the generated classes.
+
+    The expressions are parsed once, at generation time: the generated code reads attributes and association ends
+    directly (``self.pages > 0``), and collection operations and iterators become Python built-ins and generator
+    expressions (``all(b.pages > 0 for b in self.has)``).
+
+    Args:
+        model (DomainModel): the domain model holding the constraints.
+        navigation (bool, optional): whether association ends are attributes of the generated classes. If False,
+            constraints navigating associations are not translated. Defaults to True.
+    """
+
+    def __init__(self, model: DomainModel, navigation: bool = True):
+        self.model: DomainModel = model
+        self.navigation: bool = navigation
+        self.__parser: OCLExpressionParser = OCLExpressionParser(model)
+        self.__variables: int = 0
+
+    def translate(self, constraint: Constraint) -> PythonInvariant:
+        """Compile an OCL invariant.
+
+        Args:
+            constraint (Constraint): the OCL constraint.
+
+        Returns:
+            PythonInvariant: the compiled invariant.
+
+        Raises:
+            ValueError: if the constraint cannot be parsed or uses OCL features without a Python translation.
+        """
+        self.__variables = 0
+        return PythonInvariant(constraint, self.__translate(self.__parser.parse(constraint)))
+
+    def translate_all(self, constraints: list = None) -> tuple:
+        """Compile the OCL constraints of the model, grouped by context class.
+
+        Args:
+            constraints (list[Constraint], optional): the constraints. Defaults to the OCL constraints of the model.
+
+        Returns:
+            tuple: a dict with the list of compiled invariants (PythonInvariant) of each class, by class name, and a
+                dict with the reason why each untranslatable constraint was skipped, by constraint name.
+        """
+        if constraints is None:
+            constraints = sorted((c for c in self.model.constraints if c.language.upper() == "OCL"),
+                                 key=lambda c: c.name)
+        invariants, skipped = {}, {}
+        for constraint in constraints:
+            try:
+                invariants.setdefault(constraint.context.name, []).append(self.translate(constraint))
+            except ValueError as error:
+                skipped[constraint.name] = str(error)
+        return invariants, skipped
+
+    def __translate(self, expression: OCLExpression) -> str:
+        if isinstance(expression, NullLiteralExp):
+            return "None"
+        if isinstance(expression, LiteralExpression):
+            if isinstance(expression.type, Enumeration):
+                return f"{expression.type.name}.{expression.value}"
+            return repr(expression.value)
+        if isinstance(expression, VariableExp):
+            return expression.name
+        if isinstance(expression, TypeExp):
+            return expression.type.name
+        if isinstance(expression, IfExp):
+            return (f"({self.__translate(expression.thenExpression)} if {self.__translate(expression.ifCondition)} "
+                    f"else {self.__translate(expression.elseCondition)})")
+        if isinstance(expression, PropertyCallExpression):
+            return self.__property(expression)
+        if isinstance(expression, LoopExp):
+            return self.__loop(expression)
+        if isinstance(expression, OperationCallExpression):
+            if expression.source is None:
+                return self.__operator(expression)
+            return self.__call(expression)
+        raise PythonTranslationError(f"OCL expression '{expression.name}' has no Python translation.")
+
+    def __operator(self, expression: OperationCallExpression) -> str:
+        operator = expression.operation
+        arguments = expression.arguments
+        if len(arguments) == 1:
+            operand = self.__translate(arguments[0])
+            return f"(not {operand})" if operator == "not" else f"(-{operand})"
+        if operator in ("=", "<>") and any(isinstance(argument, NullLiteralExp) for argument in arguments):
+            other = [argument for argument in arguments if not isinstance(argument, NullLiteralExp)]
+            operand = self.__translate(other[0]) if other else "None"
+            return f"({operand} is {'' if operator == '=' else 'not '}None)"
+        left = self.__translate(arguments[0])
+        right = self.__translate(arguments[1])
+        if operator == "implies":
+            return f"(not {left} or {right})"
+        if operator == "xor":
+            return f"(bool({left}) != bool({right}))"
+        # OCL div truncates towards zero and mod has the sign of the dividend, unlike Python's // and %
+        if operator == "div":
+            return f"int({left} / {right})"
+        if operator == "mod":
+            return f"({left} - {right} * int({left} / {right}))"
+        return f"({left} {_BINARY_OPERATORS[operator]} {right})"
+
+    def __call(self, expression: OperationCallExpression) -> str:
+        operation = expression.operation
+        if operation == "allInstances":
+            raise PythonTranslationError("'allInstances' has no Python translation in generated classes.")
+        source = self.__translate(expression.source)
+        arguments = [self.__translate(argument) for argument in expression.arguments]
+        if operation in _COLLECTION_FUNCTIONS:
+            return f"{_COLLECTION_FUNCTIONS[operation]}({source})"
+        if operation == "isEmpty":
+            return f"(len({source}) == 0)"
+        if operation == "notEmpty":
+            return f"(len({source}) > 0)"
+        if operation == "includes":
+            return f"({arguments[0]} in {source})"
+        if operation == "excludes":
+            return f"({arguments[0]} not in {source})"
+        if operation == "oclIsUndefined":
+            return f"({source} is None)"
+        if operation == "oclIsTypeOf":
+            return f"(type({source}) is {arguments[0]})"
+        if operation == "oclIsKindOf":
+            return f"isinstance({source}, {arguments[0]})"
+        if operation == "toUpper":
+            return f"{source}.upper()"
+        if operation == "toLower":
+            return f"{source}.lower()"
+        if operation == "concat":
+            return f"({source} + {arguments[0]})"
+        if operation == "substring":
+            return f"{source}[{arguments[0]} - 1:{arguments[1]}]"
+        if operation == "floor":
+            return f"math.floor({source})"
+        if operation == "round":
+            # OCL rounds halves up, Python's round() rounds them to even
+            return f"math.floor({source} + 0.5)"
+        if operation == "abs":
+            return f"abs({source})"
+        raise PythonTranslationError(f"OCL operation '{operation}' has no Python translation.")
+
+    def __property(self, expression: PropertyCallExpression) -> str:
+        prop = expression.property
+        if isinstance(prop.type, Class) and not self.navigation:
+            raise PythonTranslationError(f"Navigation '{prop.name}' has no Python translation in generated classes.")
+        source = self.__translate(expression.source)
+        if self.__is_collection(expression.source):
+            variable = self.__variable()
+            if isinstance(prop.type, Class) and prop.multiplicity.max > 1:
+                inner = self.__variable()
+                return f"[{inner} for {variable} in {source} for {inner} in {variable}.{prop.name}]"
+            return f"[{variable}.{prop.name} for {variable} in {source}]"
+        return f"{source}.{prop.name}"
+
+    def __loop(self, expression: LoopExp) -> str:
+        source = self.__translate(expression.source)
+        names = [iterator.name for iterator in expression.iterator]
+        loops = " ".join(f"for {name} in {source}" for name in names)
+        body = self.__translate(expression.body[0])
+        if expression.name == "forAll":
+            return f"all({body} {loops})"
+        if expression.name == "exists":
+            return f"any({body} {loops})"
+        if expression.name == "select":
+            return f"[{names[0]} {loops} if {body}]"
+        if expression.name == "reject":
+            return f"[{names[0]} {loops} if not {body}]"
+        return f"[{body} {loops}]"
+
+    def __is_collection(self, expression: OCLExpression) -> bool:
+        if isinstance(expression, LoopExp):
+            return expression.name in ("select", "reject", "collect")
+        if isinstance(expression, OperationCallExpression):
+            return expression.operation == "asSet"
+        if isinstance(expression, PropertyCallExpression):
+            prop = expression.property
+            if isinstance(prop.type, Class) and prop.multiplicity.max > 1:
+                return True
+            return self.__is_collection(expression.source)
+        return False
+
+    def __variable(self) -> str:
+        self.__variables += 1
+        return f"_v{self.__variables}"
+
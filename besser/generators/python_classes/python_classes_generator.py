@@ -2,6 +2,7 @@ import os
 from jinja2 import Environment, FileSystemLoader
 from besser.BUML.metamodel.structural import DomainModel
 from besser.generators import GeneratorInterface
+from besser.generators.python_classes.ocl_to_python import OCLToPythonTranslator
 
 class PythonGenerator(GeneratorInterface):
     """
@@ -21,6 +22,9 @@ class PythonGenerator(GeneratorInterface):
         If the output directory was not specified, the code generated will be stored in the <current directory>/output
         folder.
 
+        The OCL constraints of the model are compiled into a validate() method of their context class, which
+        returns the names of the constraints violated by the object.
+
         Returns:
             None, but store the generated code as a file named classes.py 
         """
@@ -29,7 +33,8 @@ class PythonGenerator(GeneratorInterface):
             os.path.abspath(__file__)), "templates")
         env = Environment(loader=FileSystemLoader(templates_path))
         template = env.get_template('python_classes_template.py.j2')
-        with open(file_path, mode="w") as f:
-            generated_code = template.render(domain=self.model)
+        with self.open_output(file_path, mode="w") as f:
+            invariants, skipped = OCLToPythonTranslator(self.model).translate_all()
+            generated_code = template.render(domain=self.model, invariants=invariants, skipped=skipped)
             f.write(generated_code)
             print("Code generated in the location: " + file_path)
\ No newline at end of file
@@ -42,7 +42,7 @@ class RDFGenerator(GeneratorInterface):
             os.path.abspath(__file__)), "templates")
         env = Environment(loader=FileSystemLoader(templates_path), trim_blocks=True, lstrip_blocks=True)
         template = env.get_template('rdf_template.j2')
-        with open(file_path, mode="w") as f:
+        with self.open_output(file_path, mode="w") as f:
             generated_code = template.render(model=self.model, types=self.TYPES)
             f.write(generated_code)
             print("Code generated in the location: " + file_path)
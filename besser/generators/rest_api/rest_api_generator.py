@@ -53,7 +53,7 @@ class RESTAPIGenerator(GeneratorInterface):
             env = Environment(loader=FileSystemLoader(templates_path),
                           trim_blocks=True, lstrip_blocks=True, extensions=['jinja2.ext.do'])
             template = env.get_template('backend_fast_api_template.py.j2')
-            with open(file_path, mode="w") as f:
+            with self.open_output(file_path, mode="w") as f:
                 generated_code = template.render(name=self.model.name, classes=self.model.classes_sorted_by_inheritance(),
                                              http_methods=self.http_methods, nested_creations=self.nested_creations, port=self.port)
                 f.write(generated_code)
@@ -69,7 +69,7 @@ class RESTAPIGenerator(GeneratorInterface):
             env = Environment(loader=FileSystemLoader(templates_path),
                           trim_blocks=True, lstrip_blocks=True, extensions=['jinja2.ext.do'])
             template = env.get_template('fast_api_template.py.j2')
-            with open(file_path, mode="w") as f:
+            with self.open_output(file_path, mode="w") as f:
                 generated_code = template.render(classes=self.model.classes_sorted_by_inheritance(),
                                              http_methods=self.http_methods)
                 f.write(generated_code)
@@ -1 +1,2 @@
-from .sql_generator import *
\ No newline at end of file
+from .sql_generator import *
+from .ocl_to_sql import *
@@ -0,0 +1,496 @@
+import re
+from abc import ABC, abstractmethod
+
+from besser.BUML.metamodel.structural import Association, Class, DomainModel, Enumeration, Property, Constraint
+from besser.BUML.metamodel.ocl.ocl import OCLExpression, OperationCallExpression, PropertyCallExpression, \
+    LiteralExpression, NullLiteralExp, VariableExp, TypeExp, IfExp, LoopExp
+from besser.BUML.notations.ocl.expression_parser import OCLExpressionParser
+
+
+class SQLTranslationError(ValueError):
+    """Raised when an OCL expression cannot be translated to SQL."""
+
+
+class TableMapping(ABC):
+    """Describes how the classes and associations of a domain model are stored in relational tables, so that OCL
+    expressions can be translated to SQL over the schema produced by a generator.
+
+    Args:
+        model (DomainModel): the domain model.
+    """
+
+    def __init__(self, model: DomainModel):
+        self.model: DomainModel = model
+
+    @abstractmethod
+    def table(self, cls: Class) -> str:
+        """str: Get the table storing the instances of a class."""
+        pass
+
+    @abstractmethod
+    def key(self, cls: Class) -> str:
+        """str: Get the primary key column of the table of a class."""
+        pass
+
+    @abstractmethod
+    def parent_key(self, cls: Class, parent: Class) -> str:
+        """str: Get the column of the table of a class holding the key of the row of a parent class."""
+        pass
+
+    @abstractmethod
+    def storage(self, end: Property) -> tuple:
+        """Get how the links navigated through an association end are stored.
+
+        Args:
+            end (Property): the navigated end (its type is the class of the target objects).
+
+        Returns:
+            tuple: ("join", table, source column, target column) for an intermediate table, ("target", column) if
+                the table of the target class references the source, or ("source", column) if the table of the
+                source class references the target.
+        """
+        pass
+
+
+class SQLTableMapping(TableMapping):
+    """Table mapping of the schema produced by the ``SQLGenerator`` (tables named after the classes, ``<Class>_id``
+    keys and foreign keys)."""
+
+    def table(self, cls: Class) -> str:
+        return cls.name
+
+    def key(self, cls: Class) -> str:
+        return f"{cls.name}_id"
+
+    def parent_key(self, cls: Class, parent: Class) -> str:
+        return f"{parent.name}_id"
+
+    def storage(self, end: Property) -> tuple:
+        # Same decisions as sql_template.sql.j2, which takes the ends of an association in the order of their names
+        first, second = sorted(end.owner.ends, key=lambda e: e.name)
+        other = second if end is first else first
+        if end.multiplicity.max > 1 and other.multiplicity.max > 1:
+            return ("join", f"{first.type.name}_{second.type.name}", f"{other.type.name}_id", f"{end.type.name}_id")
+        # The foreign key is in the table of the class at the "many" end (of the first end for 1:1 associations)
+        if first.multiplicity.max == 1 and second.multiplicity.max > 1:
+            holder, referenced = second, first
+        else:
+            holder, referenced = first, second
+        column = f"{referenced.type.name}_id"
+        return ("target", column) if holder is end else ("source", column)
+
+
+class SQLAlchemyTableMapping(TableMapping):
+    """Table mapping of the schema produced by the ``SQLAlchemyGenerator`` (lower case table names, ``id`` keys,
+    joined table inheritance)."""
+
+    def table(self, cls: Class) -> str:
+        return cls.name.lower()
+
+    def key(self, cls: Class) -> str:
+        return "id"
+
+    def parent_key(self, cls: Class, parent: Class) -> str:
+        return "id"
+
+    def storage(self, end: Property) -> tuple:
+        # Same decisions as sql_alchemy_template.py.j2
+        other = [e for e in end.owner.ends if e is not end][0]
+        if end.multiplicity.max > 1 and other.multiplicity.max > 1:
+            return ("join", end.owner.name.lower(), f"{other.type.name.lower()}_id", f"{end.type.name.lower()}_id")
+        if end.multiplicity.max == 1:
+            return ("source", f"{end.type.name.lower()}_id")
+        return ("target", f"{other.type.name.lower()}_id")
+
+
+class SQLConstraint:
+    """An OCL invariant translated to SQL.
+
+    Args:
+        constraint (Constraint): the OCL constraint.
+        table (str): the table of the context class.
+        key (str): the primary key column of the table.
+        condition (str): the SQL condition that every row of the table must satisfy.
+        cross_table (bool): whether the condition reads other tables (or rows) than the checked row.
+
+    Attributes:
+        name (str): the SQL identifier of the constraint.
+        constraint (Constraint): the OCL constraint.
+        table (str): the table of the context class.
+        key (str): the primary key column of the table.
+        condition (str): the SQL condition that every row of the table must satisfy.
+        cross_table (bool): whether the condition reads other tables (or rows) than the checked row. Single-row
+            conditions can be enforced as CHECK constraints; the others are checked with a validation query.
+    """
+
+    def __init__(self, constraint: Constraint, table: str, key: str, condition: str, cross_table: bool):
+        self.name: str = re.sub(r"\W", "_", constraint.name)
+        self.constraint: Constraint = constraint
+        self.table: str = table
+        self.key: str = key
+        self.condition: str = condition
+        self.cross_table: bool = cross_table
+
+    @property
+    def check(self) -> str:
+        """str: The condition of the CHECK constraint enforcing the constraint. A CHECK constraint is satisfied when
+        its condition is NULL, whereas an undefined OCL invariant is violated, so the condition is wrapped in
+        ``IS TRUE`` (e.g., a NULL ``pages`` column violates ``self.pages > 0``)."""
+        return f"({self.condition}) IS TRUE"
+
+    @property
+    def query(self) -> str:
+        """str: A query returning the keys of the rows that violate the constraint."""
+        return f"SELECT t0.{self.key} FROM {self.table} t0 WHERE ({self.condition}) IS NOT TRUE"
+
+    def __repr__(self):
+        return f"SQLConstraint({self.name}, {self.table}, {self.condition}, cross_table={self.cross_table})"
+
+
+class _Rows:
+    """Rows of a class table reachable from the evaluation context (a collection of objects)."""
+
+    def __init__(self, alias: str, cls: Class, tables: list, conditions: list):
+        self.alias: str = alias
+        self.cls: Class = cls
+        self.tables: list = tables
+        self.conditions: list = conditions
+
+
+class _Values:
+    """Values computed on each row of a collection of objects (a collection of primitive values)."""
+
+    def __init__(self, value: str, rows: _Rows):
+        self.value: str = value
+        self.rows: _Rows = rows
+
+
+class OCLToSQLTranslator:
+    """Translates OCL invariants into SQL conditions over the tables of a generated schema.
+
+    Comparisons, boolean and arithmetic operators, ``if`` expressions and string/number operations are translated
+    to single-row conditions. Navigations through association ends, ``size()``, ``isEmpty()``, ``sum()``,
+    ``forAll``/``exists``/``select``/``reject``/``collect`` and ``allInstances()`` are translated to correlated
+    subqueries, so the condition becomes cross-table.
+
+    Args:
+        model (DomainModel): the domain model holding the constraints.
+        mapping (TableMapping): how classes and associations are stored in tables.
+        sql_dialect (str, optional): the SQL dialect. Values allowed: None, "postgres" or "mysql"
+            (the dialects of the ``SQLGenerator``; None gives standard SQL, also accepted by SQLite).
+    """
+
+    def __init__(self, model: DomainModel, mapping: TableMapping, sql_dialect: str = None):
+        self.model: DomainModel = model
+        self.mapping: TableMapping = mapping
+        self.sql_dialect: str = sql_dialect
+        self.__parser: OCLExpressionParser = OCLExpressionParser(model)
+        self.__aliases: int = 0
+        self.__cross_table: bool = False
+
+    def translate(self, constraint: Constraint) -> SQLConstraint:
+        """Translate an OCL invariant.
+
+        Args:
+            constraint (Constraint): the OCL constraint.
+
+        Returns:
+            SQLConstraint: the translated constraint.
+
+        Raises:
+            ValueError: if the constraint cannot be parsed or uses OCL features without a SQL translation.
+        """
+        expression = self.__parser.parse(constraint)
+        cls = constraint.context
+        # Single-row conditions use unqualified columns (as required by CHECK constraints); cross-table conditions
+        # qualify the columns of the checked row with the 't0' alias used by the validation query.
+        for alias in (None, "t0"):
+            self.__aliases = 0
+            self.__cross_table = False
+            condition = self.__scalar(expression, {"self": _Rows(alias, cls, [], [])})
+            if not self.__cross_table:
+                break
+        return SQLConstraint(constraint, self.mapping.table(cls), self.mapping.key(cls), condition,
+                             self.__cross_table)
+
+    def translate_all(self, constraints=None) -> tuple:
+        """Translate the OCL constraints of the model.
+
+        Args:
+            constraints (list[Constraint], optional): the constraints. Defaults to the OCL constraints of the model.
+
+        Returns:
+            tuple: the list of translated constraints (SQLConstraint) and a dict with the reason why each
+                untranslatable constraint was skipped, by constraint name.
+        """
+        if constraints is None:
+            constraints = sorted((c for c in self.model.constraints if c.language.upper() == "OCL"),
+                                 key=lambda c: c.name)
+        translated, skipped = [], {}
+        for constraint in constraints:
+            try:
+                translated.append(self.translate(constraint))
+            except ValueError as error:
+                skipped[constraint.name] = str(error)
+        return translated, skipped
+
+    # Scalar expressions
+
+    def __scalar(self, expression: OCLExpression, env: dict) -> str:
+        if isinstance(expression, NullLiteralExp):
+            return "NULL"
+        if isinstance(expression, LiteralExpression):
+            return self.__literal(expression)
+        if isinstance(expression, IfExp):
+            return (f"CASE WHEN {self.__scalar(expression.ifCondition, env)} "
+                    f"THEN {self.__scalar(expression.thenExpression, env)} "
+                    f"ELSE {self.__scalar(expression.elseCondition, env)} END")
+        if isinstance(expression, PropertyCallExpression):
+            return self.__property(expression, env)
+        if isinstance(expression, LoopExp):
+            return self.__loop(expression, env)
+        if isinstance(expression, OperationCallExpression):
+            if expression.source is None:
+                return self.__operator(expression, env)
+            return self.__call(expression, env)
+        raise SQLTranslationError(f"OCL expression '{expression.name}' has no SQL translation.")
+
+    def __literal(self, expression: LiteralExpression) -> str:
+        value = expression.value
+        if isinstance(expression.type, Enumeration) or isinstance(value, str):
+            return "'" + str(value).replace("'", "''") + "'"
+        if isinstance(value, bool):
+            return "TRUE" if value else "FALSE"
+        if isinstance(value, (int, float)):
+            return repr(value)
+        raise SQLTranslationError(f"Literal '{value}' has no SQL translation.")
+
+    def __operator(self, expression: OperationCallExpression, env: dict) -> str:
+        operator = expression.operation
+        arguments = expression.arguments
+        if len(arguments) == 1:
+            operand = self.__scalar(arguments[0], env)
+            return f"(NOT {operand})" if operator == "not" else f"(-{operand})"
+        if operator in ("=", "<>") and any(isinstance(argument, NullLiteralExp) for argument in arguments):
+            other = [argument for argument in arguments if not isinstance(argument, NullLiteralExp)]
+            operand = self.__scalar(other[0], env) if other else "NULL"
+            return f"({operand} IS {'' if operator == '=' else 'NOT '}NULL)"
+        left = self.__scalar(arguments[0], env)
+        right = self.__scalar(arguments[1], env)
+        if operator == "implies":
+            return f"(NOT {left} OR {right})"
+        if operator == "xor":
+            return f"({left} <> {right})"
+        if operator in ("and", "or"):
+            return f"({left} {operator.upper()} {right})"
+        if operator == "/":
+            return f"({left} * 1.0 / {right})"
+        if operator == "div":
+            return f"({left} DIV {right})" if self.sql_dialect == "mysql" else f"({left} / {right})"
+        if operator == "mod":
+            return f"({left} % {right})"
+        return f"({left} {operator} {right})"
+
+    def __call(self, expression: OperationCallExpression, env: dict) -> str:
+        operation = expression.operation
+        if self.__is_collection(expression.source):
+            return self.__aggregate(operation, self.__collection(expression.source, env), expression.arguments, env)
+        if operation in ("oclIsTypeOf", "oclIsKindOf"):
+            raise SQLTranslationError(f"OCL operation '{operation}' has no SQL translation.")
+        source = self.__scalar(expression.source, env)
+        arguments = [self.__scalar(argument, env) for argument in expression.arguments]
+        if operation == "oclIsUndefined":
+            return f"({source} IS NULL)"
+        if operation == "size":
+            return f"CHAR_LENGTH({source})" if self.sql_dialect == "mysql" else f"LENGTH({source})"
+        if operation == "concat":
+            if self.sql_dialect == "mysql":
+                return f"CONCAT({source}, {arguments[0]})"
+            return f"({source} || {arguments[0]})"
+        if operation == "round":
+            # OCL rounds halves up, SQL's ROUND rounds them away from zero
+            return f"FLOOR({source} + 0.5)"
+        functions = {"toUpper": "UPPER", "toLower": "LOWER", "abs": "ABS", "floor": "FLOOR"}
+        if operation in functions:
+            return f"{functions[operation]}({source})"
+        raise SQLTranslationError(f"OCL operation '{operation}' has no SQL translation.")
+
+    def __property(self, expression: PropertyCallExpression, env: dict) -> str:
+        prop = expression.property
+        if self.__is_collection(expression):
+            raise SQLTranslationError(f"Collection '{prop.name}' used as a single value.")
+        if isinstance(prop.type, Class):
+            raise SQLTranslationError(f"Object comparisons ('{prop.name}') have no SQL translation.")
+        rows = self.__rows(expression.source, env)
+        value = self.__attribute(rows, prop)
+        if not rows.tables:
+            return value
+        return f"({self.__select(value, rows)})"
+
+    def __loop(self, expression: LoopExp, env: dict) -> str:
+        if expression.name not in ("forAll", "exists"):
+            raise SQLTranslationError(f"Collection '{expression.name}' used as a single value.")
+        if len(expression.iterator) != 1:
+            raise SQLTranslationError("Iterators over several variables have no SQL translation.")
+        rows = self.__collection(expression.source, env)
+        if not isinstance(rows, _Rows):
+            raise SQLTranslationError(f"'{expression.name}' over primitive values has no SQL translation.")
+        scope = dict(env)
+        scope[expression.iterator[0].name] = _Rows(rows.alias, rows.cls, [], [])
+        body = self.__scalar(expression.body[0], scope)
+        if expression.name == "forAll":
+            return f"(NOT EXISTS ({self.__select('1', rows, f'({body}) IS NOT TRUE')}))"
+        return f"(EXISTS ({self.__select('1', rows, body)}))"
+
+    def __aggregate(self, operation: str, collection, arguments: list, env: dict) -> str:
+        rows = collection.rows if isinstance(collection, _Values) else collection
+        if operation == "size":
+            return f"({self.__select('COUNT(*)', rows)})"
+        if operation == "isEmpty":
+            return f"(NOT EXISTS ({self.__select('1', rows)}))"
+        if operation == "notEmpty":
+            return f"(EXISTS ({self.__select('1', rows)}))"
+        if isinstance(collection, _Values):
+            if operation == "sum":
+                return f"({self.__select(f'COALESCE(SUM({collection.value}), 0)', rows)})"
+            if operation in ("max", "min"):
+                return f"({self.__select(f'{operation.upper()}({collection.value})', rows)})"
+            if operation in ("includes", "excludes"):
+                found = self.__select("1", rows, f"{collection.value} = {self.__scalar(arguments[0], env)}")
+                return f"({'' if operation == 'includes' else 'NOT '}EXISTS ({found}))"
+        raise SQLTranslationError(f"OCL operation '{operation}' has no SQL translation.")
+
+    # Collections
+
+    def __is_collection(self, expression: OCLExpression) -> bool:
+        if isinstance(expression, LoopExp):
+            return expression.name in ("select", "reject", "collect")
+        if isinstance(expression, OperationCallExpression):
+            return expression.operation in ("allInstances", "asSet")
+        if isinstance(expression, PropertyCallExpression):
+            prop = expression.property
+            if isinstance(prop.type, Class) and prop.multiplicity.max > 1:
+                return True
+            return expression.source is not None and self.__is_collection(expression.source)
+        return False
+
+    def __collection(self, expression: OCLExpression, env: dict):
+        """Translate a collection expression into _Rows (objects) or _Values (primitive values)."""
+        if isinstance(expression, OperationCallExpression):
+            if expression.operation == "allInstances" and isinstance(expression.source, TypeExp):
+                return self.__all_instances(expression.source.type)
+            if expression.operation == "asSet":
+                return self.__collection(expression.source, env)
+        if isinstance(expression, PropertyCallExpression):
+            source = self.__rows(expression.source, env)
+            prop = expression.property
+            if isinstance(prop.type, Class):
+                return self.__navigate(source, prop)
+            return _Values(self.__attribute(source, prop), source)
+        if isinstance(expression, LoopExp) and len(expression.iterator) == 1:
+            rows = self.__collection(expression.source, env)
+            if isinstance(rows, _Rows):
+                scope = dict(env)
+                scope[expression.iterator[0].name] = _Rows(rows.alias, rows.cls, [], [])
+                if expression.name == "collect":
+                    body = expression.body[0]
+                    if self.__is_collection(body):
+                        raise SQLTranslationError("Nested collections in 'collect' have no SQL translation.")
+                    return _Values(self.__scalar(body, scope), rows)
+                body = self.__scalar(expression.body[0], scope)
+                condition = body if expression.name == "select" else f"({body}) IS NOT TRUE"
+                return _Rows(rows.alias, rows.cls, rows.tables, rows.conditions + [condition])
+        raise SQLTranslationError(f"Collection expression '{expression.name}' has no SQL translation.")
+
+    def __rows(self, expression: OCLExpression, env: dict) -> _Rows:
+        """Translate an expression denoting objects into _Rows."""
+        if isinstance(expression, VariableExp):
+            if expression.name not in env:
+                raise SQLTranslationError(f"Variable '{expression.name}' has no SQL translation.")
+            return env[expression.name]
+        collection = self.__collection(expression, env)
+        if not isinstance(collection, _Rows):
+            raise SQLTranslationError(f"Expression '{expression.name}' does not denote objects.")
+        return collection
+
+    def __all_instances(self, cls: Class) -> _Rows:
+        self.__cross_table = True
+        alias = self.__alias()
+        return _Rows(alias, cls, [f"{self.mapping.table(cls)} {alias}"], [])
+
+    def __navigate(self, source: _Rows, end: Property) -> _Rows:
+        if not isinstance(end.owner, Association) or len(end.owner.ends) != 2:
+            raise SQLTranslationError(f"Navigation '{end.name}' has no SQL translation.")
+        self.__cross_table = True
+        mapping = self.mapping
+        target_cls = end.type
+        source_cls = [other for other in end.owner.ends if other is not end][0].type
+        alias = self.__alias()
+        tables = source.tables + [f"{mapping.table(target_cls)} {alias}"]
+        conditions = list(source.conditions)
+        storage = mapping.storage(end)
+        if storage[0] == "join":
+            _, join_table, source_column, target_column = storage
+            join_alias = self.__alias()
+            tables.append(f"{join_table} {join_alias}")
+            conditions.append(f"{join_alias}.{target_column} = {alias}.{mapping.key(target_cls)}")
+            conditions.append(f"{join_alias}.{source_column} = {self.__key_of(source, source_cls)}")
+        elif storage[0] == "target":
+            conditions.append(f"{alias}.{storage[1]} = {self.__key_of(source, source_cls)}")
+        else:
+            conditions.append(f"{alias}.{mapping.key(target_cls)} = "
+                              f"{self.__column(source, source_cls, storage[1])}")
+        return _Rows(alias, target_cls, tables, conditions)
+
+    # Columns
+
+    def __attribute(self, rows: _Rows, attribute: Property) -> str:
+        owner = rows.cls
+        for cls in [rows.cls] + sorted(rows.cls.all_parents(), key=lambda c: c.name):
+            if any(a is attribute or a.name == attribute.name for a in cls.attributes):
+                owner = cls
+                break
+        return self.__column(rows, owner, attribute.name)
+
+    def __column(self, rows: _Rows, owner: Class, column: str) -> str:
+        """Get a column of the table of owner (rows.cls or one of its ancestors) for the current row."""
+        if owner is rows.cls:
+            return f"{rows.alias}.{column}" if rows.alias else column
+        self.__cross_table = True
+        alias = self.__alias()
+        return (f"(SELECT {alias}.{column} FROM {self.mapping.table(owner)} {alias} "
+                f"WHERE {alias}.{self.mapping.key(owner)} = {self.__key_of(rows, owner)})")
+
+    def __key_of(self, rows: _Rows, ancestor: Class) -> str:
+        """Get the key of the row of an ancestor class (or of the class itself) for the current row."""
+        path = self.__generalization_path(rows.cls, ancestor)
+        qualify = (lambda column: f"{rows.alias}.{column}") if rows.alias else (lambda column: column)
+        key = qualify(self.mapping.key(rows.cls))
+        for index, (child, parent) in enumerate(zip(path, path[1:])):
+            column = self.mapping.parent_key(child, parent)
+            if index == 0:
+                key = qualify(column)
+            else:
+                alias = self.__alias()
+                key = (f"(SELECT {alias}.{column} FROM {self.mapping.table(child)} {alias} "
+                       f"WHERE {alias}.{self.mapping.key(child)} = {key})")
+        return key
+
+    @staticmethod
+    def __generalization_path(cls: Class, ancestor: Class) -> list:
+        paths = [[cls]]
+        while paths:
+            path = paths.pop(0)
+            if path[-1] is ancestor:
+                return path
+            paths.extend(path + [parent] for parent in sorted(path[-1].parents(), key=lambda c: c.name))
+        raise SQLTranslationError(f"'{ancestor.name}' is not a generalization of '{cls.name}'.")
+
+    def __select(self, value: str, rows: _Rows, condition: str = None) -> str:
+        conditions = rows.conditions + ([condition] if condition else [])
+        select = f"SELECT {value} FROM {', '.join(rows.tables)}"
+        return f"{select} WHERE {' AND '.join(conditions)}" if conditions else select
+
+    def __alias(self) -> str:
+        self.__aliases += 1
+        return f"t{self.__aliases}"
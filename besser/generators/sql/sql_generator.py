@@ -2,6 +2,7 @@ import os
 from jinja2 import Environment, FileSystemLoader
 from besser.BUML.metamodel.structural import DomainModel
 from besser.generators import GeneratorInterface
+from besser.generators.sql.ocl_to_sql import OCLToSQLTranslator, SQLTableMapping
 
 
 class SQLGenerator(GeneratorInterface):
@@ -36,15 +37,30 @@ class SQLGenerator(GeneratorInterface):
         If the output directory was not specified, the code generated will be stored in the <current directory>/output
         folder.
 
+        The OCL constraints of the model that only read the attributes of the checked row are added to the tables as
+        CHECK constraints. The constraints involving several tables (navigations, collections, allInstances) are
+        written as validation queries in validation_queries.sql: each query returns the keys of the violating rows.
+
         Returns:
-            None, but store the generated code as a file named sql_alchemy.py 
+            None, but store the generated code as a file named tables.sql (and validation_queries.sql)
         """
         file_path = self.build_generation_path(file_name="tables.sql")
         templates_path = os.path.join(os.path.dirname(
             os.path.abspath(__file__)), "templates")
         env = Environment(loader=FileSystemLoader(templates_path), trim_blocks=True, lstrip_blocks=True)
+        translator = OCLToSQLTranslator(self.model, SQLTableMapping(self.model), self.sql_dialect)
+        constraints, skipped = translator.translate_all()
+        checks = [constraint for constraint in constraints if not constraint.cross_table]
+        queries = [constraint for constraint in constraints if constraint.cross_table]
         template = env.get_template('sql_template.sql.j2')
-        with open(file_path, mode="w") as f:
-            generated_code = template.render(model=self.model, types=self.TYPES, sql_dialect=self.sql_dialect)
+        with self.open_output(file_path, mode="w") as f:
+            generated_code = template.render(model=self.model, types=self.TYPES, sql_dialect=self.sql_dialect,
+                                             checks=checks, skipped=skipped)
             f.write(generated_code)
             print("Code generated in the location: " + file_path)
+        if queries:
+            file_path = self.build_generation_path(file_name="validation_queries.sql")
+            template = env.get_template('validation_queries.sql.j2')
+            with self.open_output(file_path, mode="w") as f:
+                f.write(template.render(queries=queries))
+                print("Code generated in the location: " + file_path)
@@ -2,6 +2,7 @@ import os
 from jinja2 import Environment, FileSystemLoader
 from besser.BUML.metamodel.structural import DomainModel
 from besser.generators import GeneratorInterface
+from besser.generators.sql.ocl_to_sql import OCLToSQLTranslator, SQLAlchemyTableMapping
 
 class SQLAlchemyGenerator(GeneratorInterface):
     """
@@ -35,6 +36,10 @@ class SQLAlchemyGenerator(GeneratorInterface):
         If the output directory was not specified, the code generated will be stored in the <current directory>/output
         folder.
 
+        The OCL constraints of the model that only read the attributes of the checked row are added to the tables as
+        CHECK constraints. The constraints involving several tables are generated as validation queries, run by the
+        generated validate(session) function.
+
         Returns:
             None, but store the generated code as a file named sql_alchemy.py 
         """
@@ -42,13 +47,23 @@ class SQLAlchemyGenerator(GeneratorInterface):
         templates_path = os.path.join(os.path.dirname(
             os.path.abspath(__file__)), "templates")
         env = Environment(loader=FileSystemLoader(templates_path))
+        env.filters["pyrepr"] = repr
         template = env.get_template('sql_alchemy_template.py.j2')
-        with open(file_path, mode="w") as f:
+        translator = OCLToSQLTranslator(self.model, SQLAlchemyTableMapping(self.model))
+        constraints, skipped = translator.translate_all()
+        checks = {}
+        for constraint in constraints:
+            if not constraint.cross_table:
+                checks.setdefault(constraint.constraint.context.name, []).append(constraint)
+        with self.open_output(file_path, mode="w") as f:
             generated_code = template.render(
                 classes=self.model.classes_sorted_by_inheritance(),
                 types=self.TYPES,
                 associations=self.model.associations,
-                enumerations=self.model.get_enumerations()
+                enumerations=self.model.get_enumerations(),
+                checks=checks,
+                queries=[constraint for constraint in constraints if constraint.cross_table],
+                skipped=skipped
             )
             f.write(generated_code)
             print("Code generated in the location: " + file_path)
\ No newline at end of file
@@ -85,7 +85,8 @@ class TerraformGenerator(GeneratorInterface):
             # Create a directory path with the provider and cluster name
             cluster_dir = os.path.join(output_base_dir,
                                        f"{public_cluster.provider.value.lower()}_{public_cluster.name}")
-            os.makedirs(cluster_dir, exist_ok=True)
+            if self.sink is None:
+                os.makedirs(cluster_dir, exist_ok=True)
 
             for template_name, output_file_name in template_to_file_map.items():
                 file_path = os.path.join(cluster_dir, output_file_name)
@@ -96,7 +97,7 @@ class TerraformGenerator(GeneratorInterface):
                     continue
 
                 try:
-                    with open(file_path, mode="w") as f:
+                    with self.open_output(file_path, mode="w") as f:
                         generated_code = template.render(public_cluster=public_cluster, config_lines=config_lines)
                         f.write(generated_code)
                         print(f"Code generated in the location: {file_path}")
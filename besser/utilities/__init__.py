@@ -1,3 +1,5 @@
 from .utils import *
 from .image_to_buml import *
-from .buml_code_builder import *
\ No newline at end of file
+from .buml_code_builder import *
+from .buml_loader import *
+from .data_import import *
@@ -1,5 +1,6 @@
 import os
 from besser.BUML.metamodel.structural.structural import DomainModel
+from besser.generators.output_sink import OutputSink
 
 PRIMITIVE_TYPE_MAPPING = {
     'str': 'StringType',
@@ -14,7 +15,7 @@ PRIMITIVE_TYPE_MAPPING = {
     'datetime': 'DateTimeType',
     'timedelta': 'TimeDeltaType'
 }
-def domain_model_to_code(model: DomainModel, file_path: str):
+def domain_model_to_code(model: DomainModel, file_path: str, sink: OutputSink = None):
     """
     Generates Python code for a B-UML model and writes it to a specified file.
 
@@ -22,17 +23,19 @@ def domain_model_to_code(model: DomainModel, file_path: str):
     model (DomainModel): The B-UML model object containing classes, enumerations, 
         associations, and generalizations.
     file_path (str): The path where the generated code will be saved.
+    sink (OutputSink, optional): The sink receiving the file (e.g., a MemorySink); by default the file is
+        written to disk.
 
     Outputs:
     - A Python file containing the base code representation of the B-UML domain model.
     """
     output_dir = os.path.dirname(file_path)
-    if output_dir and not os.path.exists(output_dir):
+    if sink is None and output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir)
     if not file_path.endswith('.py'):
         file_path += '.py'
 
-    with open(file_path, 'w', encoding='utf-8') as f:
+    with (sink.open(file_path, 'w') if sink is not None else open(file_path, 'w', encoding='utf-8')) as f:
         # Write imports
         f.write("# Generated B-UML Model\n")
         f.write("from besser.BUML.metamodel.structural import (\n")
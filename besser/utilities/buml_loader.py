@@ -0,0 +1,337 @@
+import ast
+import datetime
+import importlib
+import inspect
+import operator
+from typing import Any, Iterable
+
+from besser.BUML.metamodel.deployment import deployment
+from besser.BUML.metamodel.gui import graphical_ui
+from besser.BUML.metamodel.object import object as object_model
+from besser.BUML.metamodel.ocl import ocl
+from besser.BUML.metamodel.state_machine import state_machine
+from besser.BUML.metamodel.structural import structural
+
+# Modules whose names B-UML code can import
+ALLOWED_MODULES = ("besser.BUML.metamodel", "datetime")
+# Modules whose names are accepted but ignored, as well as every statement using them (e.g., running a generator)
+IGNORED_MODULES = ("besser.generators",)
+# Builtins that B-UML code can call
+ALLOWED_BUILTINS = {function.__name__: function for function in (set, frozenset, list, dict, tuple, str, int, float,
+                                                                  bool)}
+
+
+def _classes(module, names: str) -> frozenset:
+    return frozenset(getattr(module, name) for name in names.split())
+
+
+# Classes that B-UML code can call, and whose instances' public attributes and methods it can use
+ALLOWED_CLASSES = frozenset().union(
+    _classes(structural, "Element NamedElement Type DataType PrimitiveDataType EnumerationLiteral Enumeration "
+                         "TypedElement Multiplicity Property Parameter Method Class Association BinaryAssociation "
+                         "AssociationClass Generalization GeneralizationSet Package Constraint Model DomainModel"),
+    _classes(object_model, "AttributeLink Instance Object DataValue LinkEnd Link ObjectModel"),
+    _classes(ocl, "OCLExpression LiteralExpression IntegerLiteralExpression PropertyCallExpression "
+                  "OperationCallExpression OCLConstraint IfExp VariableExp Variable TypeExp Parameter StateExp State "
+                  "RealLiteralExpression Classifier CallExp FeatureCallExp LiteralExp InvalidLiteralExp LoopExp "
+                  "MessageExp NavigationCallExp NullLiteralExp PrimitiveLiteralExp NumericLiteralExp IterateExp "
+                  "IteratorExp LetExp BooleanLiteralExpression DateLiteralExpression StringLiteralExpression "
+                  "InfixOperator DataType CollectionType OrderedSetType SequenceType BagType SetType "
+                  "CollectionLiteralExp CollectionLiteralPart CollectionItem CollectionRange"),
+    _classes(state_machine, "ConfigProperty Body Event Transition State StateMachine"),
+    _classes(graphical_ui, "FileSourceType CollectionSourceType ButtonActionType ButtonType DataSource ModelElement "
+                           "File Collection ViewElement ViewComponent ViewContainer Screen Module DataList Button "
+                           "Image InputField Form MenuItem Menu Application"),
+    _classes(deployment, "Hypervisor Processor IPRangeType ServiceType Provider Protocol Resources Application Volume "
+                         "Container Deployment Service IPRange SecurityGroup Network Subnetwork Zone Region Node "
+                         "EdgeNode CloudNode Cluster PublicCluster OnPremises DeploymentModel"),
+    _classes(datetime, "datetime date time timedelta timezone"),
+)
+
+_BUILTIN_FUNCTIONS = frozenset(ALLOWED_BUILTINS.values())
+_COLLECTIONS = {ast.Set: set, ast.List: list, ast.Tuple: tuple}
+_BINARY_OPERATORS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+                     ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod}
+_UNARY_OPERATORS = {ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Not: operator.not_}
+
+
+class BUMLLoadError(ValueError):
+    """Error raised when B-UML code uses a construct that the loader does not accept."""
+
+
+class _Ignored:
+    """The value of the names imported from ignored modules, and of any expression using them."""
+
+    def __repr__(self):
+        return "<ignored>"
+
+
+_IGNORED = _Ignored()
+_UNDEFINED = object()
+
+
+def _in_modules(module: str, modules: tuple) -> bool:
+    return any(module == prefix or module.startswith(prefix + ".") for prefix in modules)
+
+
+class BUMLLoader:
+    """A loader of B-UML models written as Python code (e.g., produced by ``domain_model_to_code`` or by the
+    notations of B-UML), that builds the model elements without executing the code.
+
+    The loader walks the syntax tree of the code once, and only accepts the statements of such files: imports from
+    the B-UML metamodel, assignments of expressions made of literals, collections, names, attribute accesses, and
+    calls of the metamodel element classes and of the public methods of their instances, and assignments of the
+    public attributes of metamodel elements. Only the classes listed in ``allowed_classes`` can be called: the
+    functions of the allowed modules cannot, even when imported. Imports of generators are accepted, and the
+    statements using them are skipped. Any other construct (functions, loops, other imports, private attributes...)
+    raises a ``BUMLLoadError``, so loading an untrusted file cannot run arbitrary code.
+
+    Args:
+        allowed_modules (tuple[str], optional): modules (and their submodules) whose names can be imported. Defaults
+            to the B-UML metamodel and datetime.
+        allowed_classes (frozenset[type], optional): classes that can be called, and whose instances' public
+            attributes and methods can be used. Defaults to the element classes of the B-UML metamodel and the
+            datetime classes.
+
+    Attributes:
+        allowed_modules (tuple[str]): modules whose names can be imported.
+        allowed_classes (frozenset[type]): classes that can be called, and whose instances can be used.
+    """
+
+    def __init__(self, allowed_modules: tuple = ALLOWED_MODULES, allowed_classes: frozenset = ALLOWED_CLASSES):
+        self.allowed_modules: tuple = allowed_modules
+        self.allowed_classes: frozenset = allowed_classes
+        self.__namespace: dict = {}
+        # names defined by imports or before the code runs, left out of the result unless the code assigns them
+        self.__imported: set = set()
+
+    def load(self, code: str, filename: str = "<buml>", names: dict = None, ignored_names: Iterable[str] = ()) -> dict:
+        """Load B-UML code.
+
+        Args:
+            code (str): the Python code.
+            filename (str, optional): the file name used in error messages. Defaults to "<buml>".
+            names (dict[str, Any], optional): names defined before the code runs (e.g., the metamodel classes, for
+                code without imports). They must be values the code is allowed to use. Defaults to None.
+            ignored_names (Iterable[str], optional): names accepted but ignored, as well as the statements using them
+                (e.g., generators). Defaults to none.
+
+        Returns:
+            dict[str, Any]: the variables defined by the code, by name (the imported, predefined and ignored names are
+            left out, unless the code assigns them).
+
+        Raises:
+            BUMLLoadError: if the code uses a construct that is not accepted, or if building an element fails.
+        """
+        try:
+            tree = ast.parse(code, filename)
+        except SyntaxError as e:
+            raise BUMLLoadError(f"Invalid B-UML code: {e}")
+        self.__namespace = dict(names or {})
+        self.__namespace.update(dict.fromkeys(ignored_names, _IGNORED))
+        self.__imported = set(self.__namespace)
+        for statement in tree.body:
+            try:
+                self.__statement(statement)
+            except BUMLLoadError:
+                raise
+            except Exception as e:
+                raise BUMLLoadError(f"{filename}, line {statement.lineno}: {e}")
+        return {name: value for name, value in self.__namespace.items()
+                if name not in self.__imported and value is not _IGNORED}
+
+    def __error(self, node: ast.AST, message: str) -> BUMLLoadError:
+        return BUMLLoadError(f"line {getattr(node, 'lineno', '?')}: {message}")
+
+    def __statement(self, node: ast.stmt):
+        if isinstance(node, ast.ImportFrom):
+            self.__import_from(node)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if _in_modules(alias.name, IGNORED_MODULES):
+                    value = _IGNORED
+                elif alias.name in self.allowed_modules:
+                    value = importlib.import_module(alias.name)
+                else:
+                    raise self.__error(node, f"import of {alias.name} is not allowed")
+                name = alias.asname or alias.name
+                if "." in name:
+                    raise self.__error(node, f"import of {alias.name} is not allowed")
+                self.__namespace[name] = value
+                self.__imported.add(name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            if node.value is not None:
+                value = self.__expression(node.value)
+                for target in (node.targets if isinstance(node, ast.Assign) else [node.target]):
+                    self.__assign(target, value)
+        elif isinstance(node, ast.Expr):
+            if not isinstance(node.value, (ast.Call, ast.Constant)):
+                raise self.__error(node, "only calls are accepted as expression statements")
+            self.__expression(node.value)
+        elif not isinstance(node, ast.Pass):
+            raise self.__error(node, f"{type(node).__name__} statements are not accepted")
+
+    def __import_from(self, node: ast.ImportFrom):
+        module_name = node.module or ""
+        if node.level or not (_in_modules(module_name, self.allowed_modules) or
+                              _in_modules(module_name, IGNORED_MODULES)):
+            raise self.__error(node, f"import from {module_name} is not allowed")
+        ignored = _in_modules(module_name, IGNORED_MODULES)
+        module = None if ignored else importlib.import_module(module_name)
+        for alias in node.names:
+            if alias.name == "*":
+                if ignored:
+                    raise self.__error(node, f"import * from {module_name} is not allowed")
+                public = [name for name in getattr(module, "__all__", None) or vars(module)
+                          if not name.startswith("_") and self.__is_module_value_allowed(getattr(module, name))]
+                for name in public:
+                    self.__namespace[name] = getattr(module, name)
+                self.__imported.update(public)
+                continue
+            if alias.name.startswith("_"):
+                raise self.__error(node, f"import of {alias.name} is not allowed")
+            if ignored:
+                value = _IGNORED
+            elif hasattr(module, alias.name):
+                value = getattr(module, alias.name)
+                self.__check_module_value(value, alias.name, node)
+            else:
+                # a submodule of an allowed package
+                value = importlib.import_module(f"{module_name}.{alias.name}")
+            self.__namespace[alias.asname or alias.name] = value
+            self.__imported.add(alias.asname or alias.name)
+
+    def __assign(self, target: ast.expr, value: Any):
+        if isinstance(target, ast.Name):
+            self.__namespace[target.id] = value
+            self.__imported.discard(target.id)
+        elif isinstance(target, ast.Attribute):
+            owner = self.__expression(target.value)
+            if owner is _IGNORED or value is _IGNORED:
+                return
+            if inspect.isclass(owner) or inspect.ismodule(owner):
+                raise self.__error(target, "only the attributes of model elements can be assigned")
+            self.__check_element(owner, target.attr, target)
+            setattr(owner, target.attr, value)
+        else:
+            raise self.__error(target, "only names and attributes can be assigned")
+
+    def __is_allowed(self, owner: Any) -> bool:
+        """Whether a value is an allowed class or an instance of one."""
+        return owner in self.allowed_classes if inspect.isclass(owner) else type(owner) in self.allowed_classes
+
+    def __check_element(self, owner: Any, attribute: str, node: ast.AST):
+        """Check that an attribute of a value can be accessed: a public attribute of a metamodel element or class, or
+        of an allowed module."""
+        if attribute.startswith("_"):
+            raise self.__error(node, f"access to {attribute} is not allowed")
+        if inspect.ismodule(owner):
+            allowed = _in_modules(owner.__name__, self.allowed_modules)
+        else:
+            allowed = self.__is_allowed(owner)
+        if not allowed:
+            raise self.__error(node, f"access to {attribute} of {type(owner).__name__} is not allowed")
+
+    def __is_module_value_allowed(self, value: Any) -> bool:
+        """Whether a name of an allowed module can be used: its functions cannot, since only the allowed classes can
+        be called, nor the other modules it imports."""
+        if inspect.ismodule(value):
+            return _in_modules(value.__name__, self.allowed_modules)
+        return not inspect.isroutine(value)
+
+    def __check_module_value(self, value: Any, name: str, node: ast.AST):
+        if not self.__is_module_value_allowed(value):
+            raise self.__error(node, f"use of {name} is not allowed")
+
+    def __check_callable(self, function: Any, node: ast.AST):
+        """Check that a value can be called: an allowed builtin or class, or a public method of an allowed class or
+        of one of its instances."""
+        if function in _BUILTIN_FUNCTIONS or (inspect.isclass(function) and function in self.allowed_classes):
+            return
+        owner = getattr(function, "__self__", None) if inspect.isroutine(function) else None
+        if owner is not None and not inspect.ismodule(owner) and self.__is_allowed(owner) and \
+                not function.__name__.startswith("_"):
+            return
+        raise self.__error(node, f"call of {getattr(function, '__name__', function)!r} is not allowed")
+
+    def __expression(self, node: ast.expr) -> Any:
+        # The node types are tested from the most to the least frequent in B-UML code
+        kind = type(node)
+        if kind is ast.Name:
+            value = self.__namespace.get(node.id, _UNDEFINED)
+            if value is _UNDEFINED:
+                value = ALLOWED_BUILTINS.get(node.id, _UNDEFINED)
+                if value is _UNDEFINED:
+                    raise self.__error(node, f"name {node.id} is not defined")
+            return value
+        if kind is ast.Constant:
+            return node.value
+        if kind is ast.Call:
+            function = self.__expression(node.func)
+            ignored = function is _IGNORED
+            args = []
+            for arg in node.args:
+                if type(arg) is ast.Starred:
+                    raise self.__error(arg, "argument unpacking is not accepted")
+                value = self.__expression(arg)
+                ignored = ignored or value is _IGNORED
+                args.append(value)
+            kwargs = {}
+            for keyword in node.keywords:
+                if keyword.arg is None:
+                    raise self.__error(keyword, "argument unpacking is not accepted")
+                value = self.__expression(keyword.value)
+                ignored = ignored or value is _IGNORED
+                kwargs[keyword.arg] = value
+            if ignored:
+                return _IGNORED
+            self.__check_callable(function, node)
+            return function(*args, **kwargs)
+        if kind is ast.Set or kind is ast.List or kind is ast.Tuple:
+            items = [self.__expression(item) for item in node.elts]
+            if any(item is _IGNORED for item in items):
+                return _IGNORED
+            return _COLLECTIONS[kind](items)
+        if kind is ast.Attribute:
+            owner = self.__expression(node.value)
+            if owner is _IGNORED:
+                return _IGNORED
+            self.__check_element(owner, node.attr, node)
+            value = getattr(owner, node.attr)
+            if inspect.ismodule(owner):
+                self.__check_module_value(value, node.attr, node)
+            return value
+        if kind is ast.Dict:
+            if any(key is None for key in node.keys):
+                raise self.__error(node, "dictionary unpacking is not accepted")
+            return {self.__expression(key): self.__expression(value) for key, value in zip(node.keys, node.values)}
+        if kind is ast.UnaryOp and type(node.op) in _UNARY_OPERATORS:
+            return _UNARY_OPERATORS[type(node.op)](self.__literal(node.operand))
+        if kind is ast.BinOp and type(node.op) in _BINARY_OPERATORS:
+            left, right = self.__literal(node.left), self.__literal(node.right)
+            if not isinstance(node.op, ast.Add) and (isinstance(left, str) or isinstance(right, str)):
+                raise self.__error(node, "only + applies to strings")
+            return _BINARY_OPERATORS[type(node.op)](left, right)
+        raise self.__error(node, f"{kind.__name__} expressions are not accepted")
+
+    def __literal(self, node: ast.expr) -> Any:
+        """Evaluate an operand of an operator, which must be a number or a string."""
+        value = self.__expression(node)
+        if not isinstance(value, (int, float, str)):
+            raise self.__error(node, "operators only apply to numbers and strings")
+        return value
+
+
+def load_buml_code(code: str, filename: str = "<buml>", names: dict = None, ignored_names: Iterable[str] = ()) -> dict:
+    """Load B-UML code with a ``BUMLLoader``, without executing it.
+
+    Args:
+        code (str): the Python code.
+        filename (str, optional): the file name used in error messages. Defaults to "<buml>".
+        names (dict[str, Any], optional): names defined before the code runs. Defaults to None.
+        ignored_names (Iterable[str], optional): names accepted but ignored. Defaults to none.
+
+    Returns:
+        dict[str, Any]: the variables defined by the code, by name.
+    """
+    return BUMLLoader().load(code, filename, names, ignored_names)
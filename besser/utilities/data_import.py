@@ -0,0 +1,334 @@
+import csv
+import itertools
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Iterable, Iterator
+
+from besser.BUML.metamodel.structural import DomainModel, Class, Property, Enumeration, Association
+from besser.BUML.metamodel.object import ObjectModel, ColumnarObjectModel, Object, AttributeLink, DataValue, \
+    Link, LinkEnd
+
+
+class DataImportError(ValueError):
+    """Raised when a row of a data source cannot be imported into an object model."""
+
+
+def _boolean(value: Any) -> bool:
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ("true", "t", "yes", "y", "1"):
+            return True
+        if text in ("false", "f", "no", "n", "0"):
+            return False
+        raise ValueError(f"'{value}' is not a boolean")
+    return bool(value)
+
+
+def _timedelta(value: Any) -> timedelta:
+    if isinstance(value, timedelta):
+        return value
+    return timedelta(seconds=float(value))
+
+
+def _converter(python_type: type, parse: Callable) -> Callable:
+    # Values already of the expected type (e.g., from Parquet or SQL sources) are kept as they are.
+    return lambda value: value if type(value) is python_type else parse(value)
+
+
+# Conversion of the raw values of a source to the Python type of each primitive data type, by type name
+COERCIONS = {
+    "str": _converter(str, str),
+    "int": _converter(int, lambda value: int(value) if not isinstance(value, str) else int(value.strip())),
+    "float": _converter(float, float),
+    "bool": _converter(bool, _boolean),
+    "date": _converter(date, lambda value: value.date() if isinstance(value, datetime) else date.fromisoformat(value)),
+    "datetime": _converter(datetime, datetime.fromisoformat),
+    "time": _converter(time, time.fromisoformat),
+    "timedelta": _timedelta,
+}
+
+
+class ClassMapping:
+    """Maps the rows of a tabular source onto the objects of a class.
+
+    Args:
+        cls (Class): the class of the objects created from the rows.
+        columns (dict[str, str], optional): the source column of each attribute, by attribute name. Defaults to
+            columns named as the attributes.
+        key (str, optional): the column identifying the rows, referenced by the foreign keys of other sources.
+        name (str, optional): the column holding the object names. Defaults to names generated from the keys or
+            the row numbers.
+        links (dict[str, str], optional): the foreign-key column of each association end, by end name. The
+            column holds the key of the object linked to the row object through the end.
+
+    Attributes:
+        cls (Class): the class of the objects created from the rows.
+        columns (dict[str, str]): the source column of each attribute, by attribute name.
+        key (str): the column identifying the rows.
+        name (str): the column holding the object names.
+        links (dict[str, str]): the foreign-key column of each association end, by end name.
+    """
+
+    def __init__(self, cls: Class, columns: dict = None, key: str = None, name: str = None, links: dict = None):
+        self.cls: Class = cls
+        self.columns: dict[str, str] = columns if columns is not None else \
+            {attribute.name: attribute.name for attribute in cls.all_attributes()}
+        self.key: str = key
+        self.name: str = name
+        self.links: dict[str, str] = links if links is not None else {}
+
+    def __repr__(self):
+        return f"ClassMapping({self.cls.name}, {self.columns}, key={self.key}, links={self.links})"
+
+
+class ObjectImporter:
+    """Streams rows from tabular sources (CSV files, Parquet files, SQL result sets) into an object model.
+
+    Rows are read and converted in chunks, so memory stays bounded by the chunk size plus the model being built:
+    values are coerced to the Python type of the primitive data type of each attribute (enumeration values to
+    their literals), objects are added to the model (updating its extents) and foreign-key columns become links.
+    Foreign keys referencing objects not loaded yet are resolved when they are loaded, or by ``finish()``.
+
+    Args:
+        domain_model (DomainModel): the domain model defining the classes and associations.
+        object_model (ObjectModel, optional): the model to fill. Defaults to a new ``ObjectModel``, or a new
+            ``ColumnarObjectModel`` if columnar is True.
+        columnar (bool, optional): whether to create a columnar object model. Defaults to False.
+        chunk_size (int, optional): the number of rows read and converted at once. Defaults to 10000.
+
+    Attributes:
+        domain_model (DomainModel): the domain model defining the classes and associations.
+        object_model (ObjectModel): the model being filled.
+        chunk_size (int): the number of rows read and converted at once.
+    """
+
+    def __init__(self, domain_model: DomainModel, object_model: ObjectModel = None, columnar: bool = False,
+                 chunk_size: int = 10000):
+        if object_model is None:
+            name = f"{domain_model.name} data"
+            object_model = ColumnarObjectModel(name) if columnar else ObjectModel(name, set(), set())
+        self.domain_model: DomainModel = domain_model
+        self.object_model: ObjectModel = object_model
+        self.chunk_size: int = chunk_size
+        # imported objects (ids of columnar models) by key, by class name
+        self.__keys: dict[str, dict[str, Any]] = {}
+        # foreign keys waiting for their target: (end, source object) pairs, by target key, by target class name
+        self.__pending: dict[str, dict[str, list]] = {}
+        self.__rows: int = 0
+
+    def import_rows(self, mapping: ClassMapping, rows: Iterable[dict]) -> int:
+        """Import rows given as dicts of column values.
+
+        Args:
+            mapping (ClassMapping): the mapping of the rows onto objects.
+            rows (Iterable[dict]): the rows.
+
+        Returns:
+            int: the number of rows imported.
+        """
+        attributes = {attribute.name: attribute for attribute in mapping.cls.all_attributes()}
+        unknown = set(mapping.columns) - set(attributes)
+        if unknown:
+            raise DataImportError(f"Class '{mapping.cls.name}' has no attributes {sorted(unknown)}.")
+        converters = {name: _attribute_converter(attributes[name]) for name in mapping.columns}
+        ends = {name: self.__end(mapping.cls, name) for name in mapping.links}
+        count = 0
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, self.chunk_size))
+            if not chunk:
+                return count
+            self.__import_chunk(mapping, chunk, attributes, converters, ends)
+            count += len(chunk)
+
+    def import_csv(self, mapping: ClassMapping, path: str, encoding: str = "utf-8", **reader_options) -> int:
+        """Import the rows of a CSV file with a header row.
+
+        Empty cells are imported as undefined values, except for string attributes.
+
+        Args:
+            mapping (ClassMapping): the mapping of the rows onto objects.
+            path (str): the path of the CSV file.
+            encoding (str, optional): the encoding of the file. Defaults to "utf-8".
+            **reader_options: options of ``csv.DictReader`` (e.g., ``delimiter``).
+
+        Returns:
+            int: the number of rows imported.
+        """
+        with open(path, newline="", encoding=encoding) as file:
+            return self.import_rows(mapping, csv.DictReader(file, **reader_options))
+
+    def import_parquet(self, mapping: ClassMapping, path: str) -> int:
+        """Import the rows of a Parquet file, batch by batch. Requires the ``pyarrow`` package.
+
+        Args:
+            mapping (ClassMapping): the mapping of the rows onto objects.
+            path (str): the path of the Parquet file.
+
+        Returns:
+            int: the number of rows imported.
+        """
+        try:
+            import pyarrow.parquet as parquet
+        except ImportError as error:
+            raise ImportError("Importing Parquet files requires the 'pyarrow' package.") from error
+        batches = parquet.ParquetFile(path).iter_batches(batch_size=self.chunk_size)
+        return self.import_rows(mapping, (row for batch in batches for row in batch.to_pylist()))
+
+    def import_sql(self, mapping: ClassMapping, connection, query: str, parameters: Iterable = ()) -> int:
+        """Import the result set of an SQL query, fetched chunk by chunk.
+
+        Args:
+            mapping (ClassMapping): the mapping of the rows onto objects.
+            connection: a DB-API 2.0 connection (e.g., ``sqlite3.connect(...)``).
+            query (str): the query; its result columns are named as in the mapping.
+            parameters (Iterable, optional): the parameters of the query.
+
+        Returns:
+            int: the number of rows imported.
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute(query, parameters)
+            names = [description[0] for description in cursor.description]
+            return self.import_rows(mapping, (dict(zip(names, row)) for row in _fetch(cursor, self.chunk_size)))
+        finally:
+            cursor.close()
+
+    def finish(self) -> ObjectModel:
+        """Resolve the foreign keys still waiting for their target and return the object model.
+
+        Returns:
+            ObjectModel: the imported object model.
+
+        Raises:
+            DataImportError: if a foreign key references an object that was not imported.
+        """
+        for class_name, pending in self.__pending.items():
+            if pending:
+                key, sources = next(iter(pending.items()))
+                raise DataImportError(f"Foreign keys of '{sources[0][0].name}' reference {len(pending)} missing "
+                                      f"'{class_name}' objects (e.g., key '{key}').")
+        return self.object_model
+
+    def __import_chunk(self, mapping: ClassMapping, chunk: list, attributes: dict, converters: dict, ends: dict):
+        columns = {}
+        for attribute, column in mapping.columns.items():
+            converter = converters[attribute]
+            try:
+                columns[attribute] = [converter(row.get(column)) for row in chunk]
+            except (TypeError, ValueError) as error:
+                raise DataImportError(f"Column '{column}' of '{mapping.cls.name}': {error}") from error
+        keys = [_key(row.get(mapping.key)) for row in chunk] if mapping.key is not None else None
+        if mapping.name is not None:
+            names = [str(row.get(mapping.name)) for row in chunk]
+        elif keys is not None:
+            names = [f"{mapping.cls.name.lower()}_{key}" for key in keys]
+        else:
+            names = [f"{mapping.cls.name.lower()}_{self.__rows + index}" for index in range(len(chunk))]
+        self.__rows += len(chunk)
+
+        if isinstance(self.object_model, ColumnarObjectModel):
+            objects = list(self.object_model.add_objects(mapping.cls, columns, names, count=len(chunk)))
+        else:
+            objects = [self.__create_object(mapping.cls, attributes, columns, index, name)
+                       for index, name in enumerate(names)]
+
+        links = []
+        if keys is not None:
+            index = self.__keys.setdefault(mapping.cls.name, {})
+            # pending foreign keys may reference the new objects through the class or any of its generalizations
+            pending = [self.__pending[cls.name] for cls in itertools.chain((mapping.cls,), mapping.cls.all_parents())
+                       if cls.name in self.__pending]
+            for key, obj in zip(keys, objects):
+                if key is None:
+                    continue
+                if key in index:
+                    raise DataImportError(f"Duplicate key '{key}' for '{mapping.cls.name}' objects.")
+                index[key] = obj
+                for waiting in pending:
+                    links.extend((end, source, obj) for end, source in waiting.pop(key, ()))
+        for end_name, end in ends.items():
+            column = mapping.links[end_name]
+            for row, obj in zip(chunk, objects):
+                key = _key(row.get(column))
+                if key is None:
+                    continue
+                target = self.__find(end.type, key)
+                if target is None:
+                    self.__pending.setdefault(end.type.name, {}).setdefault(key, []).append((end, obj))
+                else:
+                    links.append((end, obj, target))
+        self.__add_links(links)
+
+    def __create_object(self, cls: Class, attributes: dict, columns: dict, index: int, name: str) -> Object:
+        slots = [AttributeLink(attribute=attributes[attribute],
+                               value=DataValue(classifier=attributes[attribute].type, value=values[index]))
+                 for attribute, values in columns.items() if values[index] is not None]
+        obj = Object(name=name, classifier=cls, slots=slots)
+        self.object_model.add_instance(obj)
+        return obj
+
+    def __end(self, cls: Class, name: str) -> Property:
+        for end in cls.all_association_ends():
+            if end.name == name:
+                return end
+        raise DataImportError(f"Class '{cls.name}' has no association end '{name}'.")
+
+    def __find(self, cls: Class, key: str) -> Any:
+        for candidate in itertools.chain((cls,), cls.all_specializations()):
+            target = self.__keys.get(candidate.name, {}).get(key)
+            if target is not None:
+                return target
+        return None
+
+    def __add_links(self, links: list):
+        """Link the (end, source, target) triples: target is reachable from source through end."""
+        if isinstance(self.object_model, ColumnarObjectModel):
+            by_end = {}
+            for end, source, target in links:
+                sources, targets = by_end.setdefault(end, ([], []))
+                sources.append(source)
+                targets.append(target)
+            for end, (sources, targets) in by_end.items():
+                self.object_model.add_links(end, sources, targets)
+            return
+        for end, source, target in links:
+            association: Association = end.owner
+            opposite = next(other for other in association.ends if other is not end)
+            link = Link(name=f"{association.name}_{source.name}_{target.name}", association=association,
+                        connections=[LinkEnd(name=opposite.name, association_end=opposite, object=source),
+                                     LinkEnd(name=end.name, association_end=end, object=target)])
+            self.object_model.links.add(link)
+
+
+def _attribute_converter(attribute: Property) -> Callable:
+    """Get the function converting the raw values of a source to values of an attribute (None stays None)."""
+    attribute_type = attribute.type
+    if isinstance(attribute_type, Enumeration):
+        literals = {literal.name: literal for literal in attribute_type.literals}
+
+        def literal(value):
+            if value is None or value == "":
+                return None
+            if value not in literals:
+                raise ValueError(f"'{value}' is not a literal of '{attribute_type.name}'")
+            return literals[value]
+        return literal
+    coerce = COERCIONS.get(attribute_type.name if attribute_type is not None else None)
+    if coerce is None:
+        raise DataImportError(f"Attribute '{attribute.name}' has no primitive data type to import values of.")
+    keep_empty = attribute_type.name == "str"
+    return lambda value: None if value is None or (value == "" and not keep_empty) else coerce(value)
+
+
+def _key(value: Any) -> Any:
+    # Keys are compared as strings, so that foreign keys read from CSV files match integer keys from SQL sources.
+    return None if value is None or value == "" else str(value)
+
+
+def _fetch(cursor, size: int) -> Iterator:
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
@@ -0,0 +1,2 @@
+from .session_store import *
+from .runtime import *
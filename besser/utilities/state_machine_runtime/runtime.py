@@ -0,0 +1,246 @@
+import asyncio
+import contextlib
+import inspect
+from typing import Any, Callable, Optional
+
+from besser.BUML.metamodel.structural import Method
+from besser.BUML.metamodel.state_machine.state_machine import StateMachine, State, Transition, Session
+from besser.utilities.state_machine_runtime.session_store import SessionStore, InMemorySessionStore, \
+    SessionSerializationError, logger
+
+
+class StateMachineRuntimeError(ValueError):
+    """Error raised when a state machine cannot be executed."""
+
+
+# Functions compiled from the source code of bodies and events, by source code
+_compiled: dict[str, Callable] = {}
+
+
+def compiled_callable(method: Method) -> Optional[Callable]:
+    """Get the function executing a body or event.
+
+    Bodies and events built from a function return it; those built from source code (e.g., loaded from the web
+    editor) have their code compiled once, and the function is cached by source code.
+
+    Args:
+        method (Method): the body or event.
+
+    Returns:
+        Callable: the function, or None if the method has neither a callable nor code.
+    """
+    if method.callable is not None:
+        return method.callable
+    code = method.code
+    if not code:
+        return None
+    function = _compiled.get(code)
+    if function is None:
+        namespace = {}
+        exec(compile(code, f"<{method.name}>", "exec"), namespace)
+        functions = [value for value in namespace.values() if inspect.isfunction(value)]
+        function = namespace.get(method.name) if inspect.isfunction(namespace.get(method.name)) else \
+            (functions[-1] if functions else None)
+        if function is None:
+            raise StateMachineRuntimeError(f"The code of {method.name} does not define a function")
+        _compiled[code] = function
+    return function
+
+
+async def _call(function: Callable, *args) -> Any:
+    """Call a function, awaiting its result if it is a coroutine function."""
+    result = function(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class StateMachineRuntime:
+    """An asyncio engine executing a state machine for many sessions at once.
+
+    Each session starts in the initial state of the machine, whose body is run when the session is created. Events
+    dispatched to a session are checked against the transitions of its current state, in the order they were
+    defined: the first transition whose event matches (and whose event callable returns True, if any) moves the
+    session to its destination state, and the body of that state is run. If a body raises an exception, the
+    fallback body of the state is run instead (and the exception is re-raised if the state has none).
+
+    The transitions of each state are indexed by event name (``State.transitions_for``), so dispatching an event only
+    tests the transitions that can handle it, and the functions of the bodies and events are resolved in advance. Events of the same session are processed one at a time, in order;
+    different sessions run concurrently. Bodies and event callables can be plain functions or coroutine functions.
+
+    The sessions are kept in a ``SessionStore``: a bounded ``InMemorySessionStore`` drops idle sessions, and a
+    ``SQLiteSessionStore`` persists them, so that a restarted runtime resumes each session in its current state.
+    When the store has a ``flush_interval``, the runtime starts a task flushing it at that interval with its first
+    session, so the changes of idle sessions are written too; ``stop()`` cancels the task and flushes the store.
+
+    Args:
+        sm (StateMachine): the state machine to execute.
+        store (SessionStore, optional): the store of the sessions. Defaults to an unbounded InMemorySessionStore.
+
+    Attributes:
+        sm (StateMachine): the state machine to execute.
+        store (SessionStore): the store of the sessions.
+    """
+
+    def __init__(self, sm: StateMachine, store: SessionStore = None):
+        self.sm: StateMachine = sm
+        self.store: SessionStore = store if store is not None else InMemorySessionStore()
+        # session id -> [lock, number of tasks using it]; locks are dropped when no task uses them
+        self.__locks: dict[str, list] = {}
+        self.__initial: Optional[State] = None
+        # state name -> (body function, fallback body function); transition -> event function
+        self.__bodies: dict[str, tuple] = {}
+        self.__events: dict[Transition, Optional[Callable]] = {}
+        self.__flusher: Optional[asyncio.Task] = None
+        self.refresh()
+
+    def refresh(self):
+        """Resolve the functions of the bodies and events again, after the state machine has been modified."""
+        self.__initial = self.sm.initial_state()
+        if self.__initial is None:
+            raise StateMachineRuntimeError(f"StateMachine {self.sm.name} has no initial state")
+        self.__bodies = {}
+        self.__events = {}
+        for state in self.sm.states:
+            self.__bodies[state.name] = self.__body_functions(state)
+            for transition in state.transitions:
+                self.__events[transition] = compiled_callable(transition.event)
+
+    @staticmethod
+    def transitions(state: State, event: str = None) -> tuple[Transition]:
+        """Get the transitions of a state that can be triggered by an event.
+
+        Args:
+            state (State): the state.
+            event (str, optional): the event name. Defaults to None, to get every transition of the state.
+
+        Returns:
+            tuple[Transition]: the transitions, in definition order.
+        """
+        return state.transitions if event is None else state.transitions_for(event)
+
+    async def new_session(self, session_id: str) -> Session:
+        """Create a session in the initial state and run the body of that state.
+
+        Args:
+            session_id (str): the session id.
+
+        Returns:
+            Session: the session.
+        """
+        self.__start_flusher()
+        async with self.__lock(session_id):
+            if self.store.get(session_id) is not None:
+                raise StateMachineRuntimeError(f"Duplicated session in StateMachineRuntime ({session_id})")
+            return await self.__create(session_id)
+
+    def session(self, session_id: str) -> Optional[Session]:
+        """Get a session by id (None if it does not exist)."""
+        return self.store.get(session_id)
+
+    def close_session(self, session_id: str) -> None:
+        """Delete a session and its data.
+
+        Args:
+            session_id (str): the session id.
+        """
+        self.store.delete(session_id)
+
+    async def dispatch(self, session_id: str, event: str = None, params: dict = None) -> bool:
+        """Dispatch an event to a session, creating the session if it does not exist.
+
+        Args:
+            session_id (str): the session id.
+            event (str, optional): the event name. Defaults to None, to test every transition of the current state.
+            params (dict, optional): parameters of the event, merged over the parameters of the transitions.
+
+        Returns:
+            bool: True if a transition was triggered.
+        """
+        self.__start_flusher()
+        async with self.__lock(session_id):
+            session = self.store.get(session_id)
+            if session is None:
+                session = await self.__create(session_id)
+            for transition in self.transitions(session.current_state, event):
+                event_params = {**transition.event_params, **params} if params else transition.event_params
+                if transition not in self.__events:
+                    self.__events[transition] = compiled_callable(transition.event)
+                event_function = self.__events[transition]
+                if event_function is None or await _call(event_function, session, event_params):
+                    session.move(transition)
+                    session.event_params = event_params
+                    await self.__enter(session)
+                    return True
+        return False
+
+    async def stop(self) -> None:
+        """Stop flushing the store periodically, and write its pending changes."""
+        flusher, self.__flusher = self.__flusher, None
+        if flusher is not None and not flusher.done():
+            flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await flusher
+        self.store.flush()
+
+    def __start_flusher(self):
+        """Start the task flushing the store, if it needs one and it is not running in the current event loop."""
+        interval = self.store.flush_interval
+        if interval is None:
+            return
+        loop = asyncio.get_running_loop()
+        if self.__flusher is not None and not self.__flusher.done() and self.__flusher.get_loop() is loop:
+            return
+        self.__flusher = loop.create_task(self.__flush_periodically(interval))
+
+    async def __flush_periodically(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.store.flush()
+            except SessionSerializationError as error:
+                logger.error("%s", error)
+            except Exception:
+                logger.exception("Cannot flush the sessions of StateMachine %s", self.sm.name)
+
+    @staticmethod
+    def __body_functions(state: State) -> tuple:
+        return (compiled_callable(state.body) if state.body is not None else None,
+                compiled_callable(state.fallback_body) if state.fallback_body is not None else None)
+
+    async def __create(self, session_id: str) -> Session:
+        session = Session(id=session_id, current_state=self.__initial, store=self.store)
+        self.store.put(session)
+        await self.__enter(session)
+        return session
+
+    @contextlib.asynccontextmanager
+    async def __lock(self, session_id: str):
+        entry = self.__locks.get(session_id)
+        if entry is None:
+            entry = self.__locks[session_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self.__locks[session_id]
+
+    async def __enter(self, session: Session) -> None:
+        """Run the body of the current state of a session, and of the states it moves to from that body."""
+        state = None
+        while session.current_state is not state:
+            state = session.current_state
+            if state.name not in self.__bodies:
+                self.__bodies[state.name] = self.__body_functions(state)
+            body, fallback_body = self.__bodies[state.name]
+            if body is None:
+                continue
+            try:
+                await _call(body, session)
+            except Exception:
+                if fallback_body is None:
+                    raise
+                await _call(fallback_body, session)
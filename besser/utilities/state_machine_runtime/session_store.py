@@ -0,0 +1,262 @@
+import logging
+import pickle
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from besser.BUML.metamodel.state_machine.state_machine import StateMachine, Session
+
+logger = logging.getLogger("besser.state_machine")
+
+class SessionSerializationError(ValueError):
+    """Raised when the data of sessions cannot be written to a store.
+
+    Args:
+        errors (dict[str, Exception]): the error raised when serializing each session, by session id.
+
+    Attributes:
+        errors (dict[str, Exception]): the error raised when serializing each session, by session id.
+    """
+
+    def __init__(self, errors: dict):
+        self.errors: dict[str, Exception] = errors
+        super().__init__("The data of sessions " + ", ".join(f"{session_id} ({error!r})"
+                                                             for session_id, error in errors.items()) +
+                         " cannot be serialized")
+
+
+class SessionStore(ABC):
+    """Where the sessions of a state machine runtime are kept.
+
+    Sessions attached to a store notify it (with ``put``) whenever their data or current state changes.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Session]:
+        """Get a session by id (None if it does not exist or has expired)."""
+
+    @abstractmethod
+    def put(self, session: Session) -> None:
+        """Add a session, or record that it changed."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Delete a session."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @property
+    def flush_interval(self) -> Optional[float]:
+        """float: Seconds between two writes of the pending changes, triggered by the runtime (None if the store
+        does not need them)."""
+        return None
+
+    def flush(self) -> None:
+        """Write the pending changes to the storage, if the store has one."""
+
+    def close(self) -> None:
+        """Flush the pending changes and release the storage."""
+        self.flush()
+
+
+class InMemorySessionStore(SessionStore):
+    """A store keeping the sessions in memory, evicting the least recently used ones.
+
+    Args:
+        max_sessions (int, optional): maximum number of sessions kept; the least recently used ones are evicted.
+            Defaults to None (unbounded).
+        ttl (float, optional): seconds after which a session that has not been used expires. Defaults to None
+            (sessions do not expire).
+        clock (Callable[[], float], optional): the clock measuring the time. Defaults to time.monotonic.
+
+    Attributes:
+        max_sessions (int): maximum number of sessions kept.
+        ttl (float): seconds after which a session that has not been used expires.
+    """
+
+    def __init__(self, max_sessions: int = None, ttl: float = None, clock: Callable[[], float] = time.monotonic):
+        self.max_sessions: int = max_sessions
+        self.ttl: float = ttl
+        self.__clock: Callable[[], float] = clock
+        # session id -> (session, last use), from the least to the most recently used
+        self.__sessions: OrderedDict = OrderedDict()
+
+    def get(self, session_id: str) -> Optional[Session]:
+        entry = self.__sessions.get(session_id)
+        if entry is None:
+            return None
+        now = self.__clock()
+        if self.ttl is not None and now - entry[1] > self.ttl:
+            self.evict(session_id)
+            return None
+        self.__sessions[session_id] = (entry[0], now)
+        self.__sessions.move_to_end(session_id)
+        return entry[0]
+
+    def put(self, session: Session) -> None:
+        now = self.__clock()
+        self.__sessions[session.id] = (session, now)
+        self.__sessions.move_to_end(session.id)
+        self.__expire(now)
+        if self.max_sessions is not None:
+            while len(self.__sessions) > self.max_sessions:
+                self.evict(next(iter(self.__sessions)))
+
+    def delete(self, session_id: str) -> None:
+        self.__sessions.pop(session_id, None)
+
+    def evict(self, session_id: str) -> Optional[Session]:
+        """Remove a session from memory.
+
+        Args:
+            session_id (str): the session id.
+
+        Returns:
+            Session: the session evicted, or None if it was not in memory.
+        """
+        entry = self.__sessions.pop(session_id, None)
+        return entry[0] if entry is not None else None
+
+    def __expire(self, now: float):
+        if self.ttl is None:
+            return
+        # the least recently used sessions come first, so expiring stops at the first session still alive
+        while self.__sessions:
+            session_id, (_, last_use) = next(iter(self.__sessions.items()))
+            if now - last_use <= self.ttl:
+                break
+            self.evict(session_id)
+
+    def __len__(self) -> int:
+        return len(self.__sessions)
+
+
+class SQLiteSessionStore(SessionStore):
+    """A store persisting the sessions in a SQLite database, with a bounded in-memory cache of the active sessions.
+
+    Changes are written behind: changed sessions are queued and written in one transaction when ``batch_size``
+    sessions are pending or ``snapshot_interval`` seconds have passed since the last write. A ``StateMachineRuntime``
+    using the store also flushes it every ``snapshot_interval`` seconds, so the changes of idle sessions are written
+    too. Sessions evicted from the cache are reloaded from the database, in the state they were saved, so a restarted
+    process resumes them.
+
+    Args:
+        path (str): the path of the database file (``":memory:"`` for a temporary database).
+        sm (StateMachine): the state machine of the sessions, used to restore their current state.
+        cache_size (int, optional): maximum number of sessions kept in memory. Defaults to 10000.
+        batch_size (int, optional): number of changed sessions written in one transaction. Defaults to 1000.
+        snapshot_interval (float, optional): maximum seconds between two writes of the pending changes. Defaults
+            to 5.
+
+    Attributes:
+        sm (StateMachine): the state machine of the sessions.
+        batch_size (int): number of changed sessions written in one transaction.
+        snapshot_interval (float): maximum seconds between two writes of the pending changes.
+    """
+
+    def __init__(self, path: str, sm: StateMachine, cache_size: int = 10000, batch_size: int = 1000,
+                 snapshot_interval: float = 5):
+        self.sm: StateMachine = sm
+        self.batch_size: int = batch_size
+        self.snapshot_interval: float = snapshot_interval
+        self.__states: dict = {state.name: state for state in sm.states}
+        self.__cache: InMemorySessionStore = InMemorySessionStore(max_sessions=cache_size)
+        self.__pending: dict[str, Session] = {}
+        self.__last_flush: float = time.monotonic()
+        self.__connection: sqlite3.Connection = sqlite3.connect(path)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, state TEXT, data BLOB, updated REAL)")
+
+    def get(self, session_id: str) -> Optional[Session]:
+        session = self.__cache.get(session_id)
+        if session is not None:
+            return session
+        # A changed session evicted from the cache before being written is newer than its row
+        session = self.__pending.get(session_id)
+        if session is not None:
+            self.__cache.put(session)
+            return session
+        row = self.__connection.execute("SELECT state, data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        state_name, data = row
+        if state_name not in self.__states:
+            raise ValueError(f"Session {session_id} is in state {state_name}, which is not a state of "
+                             f"StateMachine {self.sm.name}")
+        session = Session(id=session_id, current_state=self.__states[state_name])
+        session._data = pickle.loads(data)
+        session.store = self
+        self.__cache.put(session)
+        return session
+
+    def put(self, session: Session) -> None:
+        if self.__cache.get(session.id) is not session:
+            self.__cache.put(session)
+        self.__pending[session.id] = session
+        if len(self.__pending) >= self.batch_size or time.monotonic() - self.__last_flush >= self.snapshot_interval:
+            # The session being changed is not the one to blame for the sessions that cannot be written
+            try:
+                self.flush()
+            except SessionSerializationError as error:
+                logger.error("%s", error)
+
+    def delete(self, session_id: str) -> None:
+        self.__cache.delete(session_id)
+        self.__pending.pop(session_id, None)
+        with self.__connection:
+            self.__connection.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    @property
+    def flush_interval(self) -> Optional[float]:
+        return self.snapshot_interval
+
+    def flush(self) -> None:
+        """Write the pending changes in one transaction.
+
+        The sessions whose data cannot be pickled are left out (and written again on their next change), so they
+        do not prevent the other sessions from being written.
+
+        Raises:
+            SessionSerializationError: if the data of some sessions cannot be pickled, after writing the others.
+        """
+        errors = {}
+        if self.__pending:
+            now = time.time()
+            rows = []
+            for session in self.__pending.values():
+                try:
+                    data = pickle.dumps(session._data)
+                except Exception as error:
+                    errors[session.id] = error
+                    continue
+                state = session.current_state.name if session.current_state is not None else None
+                rows.append((session.id, state, data, now))
+            with self.__connection:
+                self.__connection.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)", rows)
+            self.__pending = {}
+        self.__last_flush = time.monotonic()
+        if errors:
+            raise SessionSerializationError(errors)
+
+    def snapshot(self, path: str) -> None:
+        """Flush the pending changes and copy the database to a file.
+
+        Args:
+            path (str): the path of the copy.
+        """
+        self.flush()
+        with sqlite3.connect(path) as target:
+            self.__connection.backup(target)
+        target.close()
+
+    def close(self) -> None:
+        self.flush()
+        self.__connection.close()
+
+    def __len__(self) -> int:
+        self.flush()
+        return self.__connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
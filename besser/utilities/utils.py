@@ -7,6 +7,8 @@ def sort_by_timestamp(obj_set: set[NamedElement]) -> list:
 
     This function takes a set of objects (which are instances of the `NamedElement` class in BESSER)
     and returns a list of those objects, sorted in ascending order based on their `timestamp` attribute.
+    The objects are compared by their `creation_sequence`, which follows the order of the timestamps
+    without building them.
 
     Parameters:
     obj_set (set[NamedElement]): A set of objects to be sorted. Each object must have a `timestamp` attribute.
@@ -14,7 +16,7 @@ def sort_by_timestamp(obj_set: set[NamedElement]) -> list:
     Returns:
     list: A list of the objects sorted by their `timestamp` in ascending order.
     """
-    return sorted(obj_set, key=lambda x: x.timestamp)
+    return sorted(obj_set, key=lambda x: x.creation_sequence)
 
 
 class ModelSerializer():
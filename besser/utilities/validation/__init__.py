@@ -0,0 +1,6 @@
+from .ocl_evaluator import *
+from .vectorized import *
+from .batch_validation import *
+from .dependencies import *
+from .incremental_validation import *
+from .conformance import *
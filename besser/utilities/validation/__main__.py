@@ -0,0 +1,5 @@
+import sys
+
+from besser.utilities.validation.cli import main
+
+sys.exit(main())
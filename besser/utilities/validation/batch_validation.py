@@ -0,0 +1,251 @@
+import itertools
+import math
+import multiprocessing
+import os
+import pickle
+from typing import Optional
+
+from besser.BUML.metamodel.structural import Constraint, DomainModel
+from besser.BUML.metamodel.object import Object, ObjectModel
+from besser.BUML.metamodel.ocl.ocl import OCLExpression
+from besser.BUML.notations.ocl.expression_parser import OCLExpressionParser
+from besser.utilities.validation.ocl_evaluator import OCLEvaluator, instances_of
+from besser.utilities.validation.vectorized import VectorizedEvaluator
+
+
+class ConstraintViolation:
+    """A violation of an OCL invariant by an object.
+
+    Args:
+        constraint (Constraint): the violated constraint.
+        object (Object): the object that violates the constraint.
+        message (str): description of the violation.
+
+    Attributes:
+        constraint (Constraint): the violated constraint.
+        object (Object): the object that violates the constraint.
+        message (str): description of the violation.
+    """
+
+    def __init__(self, constraint: Constraint, object: Object, message: str):
+        self.constraint: Constraint = constraint
+        self.object: Object = object
+        self.message: str = message
+
+    def __repr__(self):
+        return f"ConstraintViolation({self.constraint.name}, {self.object.name}, {self.message})"
+
+
+class ValidationReport:
+    """The result of validating an object model against the constraints of a domain model.
+
+    Attributes:
+        violations (list[ConstraintViolation]): the violations found.
+        errors (dict[str, str]): constraints that could not be evaluated, by constraint name.
+        checked (int): the number of (constraint, object) pairs evaluated.
+    """
+
+    def __init__(self):
+        self.violations: list[ConstraintViolation] = []
+        self.errors: dict[str, str] = {}
+        self.checked: int = 0
+
+    @property
+    def is_valid(self) -> bool:
+        """bool: True if no violations nor evaluation errors were found."""
+        return not self.violations and not self.errors
+
+    def merge(self, other: "ValidationReport"):
+        """Merge the results of another report into this report.
+
+        Args:
+            other (ValidationReport): the report to merge.
+        """
+        self.violations.extend(other.violations)
+        self.errors.update(other.errors)
+        self.checked += other.checked
+
+    def violations_by_constraint(self) -> dict:
+        """dict[str, list[ConstraintViolation]]: Get the violations grouped by constraint name."""
+        grouped = {}
+        for violation in self.violations:
+            grouped.setdefault(violation.constraint.name, []).append(violation)
+        return grouped
+
+    def to_dict(self) -> dict:
+        """dict: Get a JSON serializable summary of the report."""
+        return {
+            "checked": self.checked,
+            "violations": [
+                {"constraint": v.constraint.name, "object": v.object.name, "message": v.message}
+                for v in self.violations
+            ],
+            "errors": dict(self.errors),
+        }
+
+    def __repr__(self):
+        return f"ValidationReport(checked={self.checked}, violations={len(self.violations)}, errors={len(self.errors)})"
+
+
+# Read-only state shared with the worker processes. With the 'fork' start method the workers inherit it from the
+# parent process; otherwise it is sent once to each worker as a serialized snapshot.
+_worker_state = None
+_worker_evaluator = None
+
+
+def _init_worker(snapshot: bytes = None):
+    global _worker_state, _worker_evaluator
+    if snapshot is not None:
+        _worker_state = pickle.loads(snapshot)
+    domain_model, object_model, _, _ = _worker_state
+    _worker_evaluator = OCLEvaluator(object_model, domain_model)
+
+
+def _check_chunk(task: tuple) -> tuple:
+    """Evaluate one constraint on a slice of the instances of its context class.
+
+    Returns a tuple (constraint index, number of checked objects, [(object index, message), ...]).
+    """
+    constraint_index, start, stop = task
+    _, _, expressions, extents = _worker_state
+    expression = expressions[constraint_index]
+    extent = extents[constraint_index]
+    failures = []
+    for index in range(start, stop):
+        message = check_object(_worker_evaluator, expression, extent[index])
+        if message is not None:
+            failures.append((index, message))
+    return constraint_index, stop - start, failures
+
+
+def _check_vectorized(evaluator: VectorizedEvaluator, constraint_index: int, expression: OCLExpression,
+                      extent: list) -> tuple:
+    """Evaluate one constraint on all the instances of its context class with array operations.
+
+    Returns a tuple in the format of _check_chunk.
+    """
+    try:
+        results = evaluator.evaluate(expression, extent)
+    except Exception as error:
+        return constraint_index, len(extent), [(index, f"Evaluation error: {error}") for index in range(len(extent))]
+    failures = [(index, "Evaluated to undefined" if result is None else f"Evaluated to {result}")
+                for index, result in enumerate(results) if result is not True]
+    return constraint_index, len(extent), failures
+
+
+def check_object(evaluator: OCLEvaluator, expression: OCLExpression, obj: Object) -> Optional[str]:
+    """Evaluate an invariant on an object.
+
+    Args:
+        evaluator (OCLEvaluator): the evaluator.
+        expression (OCLExpression): the parsed invariant.
+        obj (Object): the object.
+
+    Returns:
+        str: the violation message, or None if the object satisfies the invariant.
+    """
+    try:
+        result = evaluator.evaluate(expression, obj)
+    except Exception as error:
+        return f"Evaluation error: {error}"
+    if result is not True:
+        return "Evaluated to undefined" if result is None else f"Evaluated to {result}"
+    return None
+
+
+def ocl_constraints(domain_model: DomainModel) -> list:
+    """list[Constraint]: Get the OCL constraints of a domain model, sorted by name."""
+    return sorted((c for c in domain_model.constraints if c.language.upper() == "OCL"), key=lambda c: c.name)
+
+
+def validate_object_model(domain_model: DomainModel, object_model: ObjectModel, constraints: list = None,
+                          processes: int = None, chunk_size: int = None, vectorized: bool = False) -> ValidationReport:
+    """Check the OCL invariants of a domain model against every instance of their context class in an object model.
+
+    The work is partitioned in (constraint, chunk of objects) tasks that are distributed over a process pool. The
+    models are shared read-only with the workers: inherited through ``fork`` where available, or sent once per worker
+    as a serialized snapshot otherwise. Each constraint is parsed once, in the calling process.
+
+    Args:
+        domain_model (DomainModel): the domain model holding the constraints.
+        object_model (ObjectModel): the object model to validate.
+        constraints (list[Constraint], optional): the constraints to check. Defaults to all the OCL constraints of
+            the domain model.
+        processes (int, optional): number of worker processes. Defaults to the number of CPUs. With 1 process,
+            validation runs in the calling process.
+        chunk_size (int, optional): number of objects per task. By default, the objects of each constraint are split
+            to produce about four tasks per worker.
+        vectorized (bool, optional): evaluate the constraints that only read attributes of ``self`` with NumPy
+            array operations over all the instances at once (see ``VectorizedEvaluator``), in the calling process.
+            The other constraints are still evaluated object by object. Defaults to False.
+
+    Returns:
+        ValidationReport: the violations found.
+    """
+    global _worker_state, _worker_evaluator
+    if constraints is None:
+        constraints = ocl_constraints(domain_model)
+    processes = processes or os.cpu_count() or 1
+    report = ValidationReport()
+
+    parser = OCLExpressionParser(domain_model)
+    valid_constraints, expressions, extents = [], [], []
+    extent_cache = {}
+    for constraint in constraints:
+        try:
+            expressions.append(parser.parse(constraint))
+        except ValueError as error:
+            report.errors[constraint.name] = str(error)
+            continue
+        if constraint.context not in extent_cache:
+            extent_cache[constraint.context] = instances_of(object_model, constraint.context)
+        valid_constraints.append(constraint)
+        extents.append(extent_cache[constraint.context])
+
+    vectorized_results = []
+    if vectorized:
+        evaluator = VectorizedEvaluator(object_model, domain_model)
+        vectorized_results = [_check_vectorized(evaluator, index, expression, extents[index])
+                              for index, expression in enumerate(expressions)
+                              if VectorizedEvaluator.supports(expression)]
+    vectorized_indexes = {result[0] for result in vectorized_results}
+    pending = [index for index in range(len(expressions)) if index not in vectorized_indexes]
+
+    total = sum(len(extents[index]) for index in pending)
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(total / (processes * 4)))
+    tasks = [(index, start, min(start + chunk_size, len(extents[index])))
+             for index in pending
+             for start in range(0, len(extents[index]), chunk_size)]
+
+    _worker_state = (domain_model, object_model, expressions, extents)
+    try:
+        if processes == 1 or len(tasks) <= 1:
+            _init_worker()
+            results = map(_check_chunk, tasks)
+            _collect(report, itertools.chain(vectorized_results, results), valid_constraints, extents)
+        else:
+            if "fork" in multiprocessing.get_all_start_methods():
+                context, initargs = multiprocessing.get_context("fork"), ()
+            else:
+                context = multiprocessing.get_context()
+                initargs = (pickle.dumps(_worker_state, protocol=pickle.HIGHEST_PROTOCOL),)
+            with context.Pool(processes, initializer=_init_worker, initargs=initargs) as pool:
+                results = pool.imap_unordered(_check_chunk, tasks)
+                _collect(report, itertools.chain(vectorized_results, results), valid_constraints, extents)
+    finally:
+        _worker_state = None
+        _worker_evaluator = None
+    return report
+
+
+def _collect(report: ValidationReport, results, constraints: list, extents: list):
+    # Chunks complete in any order; violations are reported by constraint, then in object order.
+    found = []
+    for constraint_index, checked, failures in results:
+        report.checked += checked
+        found.extend((constraint_index, object_index, message) for object_index, message in failures)
+    for constraint_index, object_index, message in sorted(found, key=lambda failure: failure[:2]):
+        report.violations.append(
+            ConstraintViolation(constraints[constraint_index], extents[constraint_index][object_index], message)
+        )
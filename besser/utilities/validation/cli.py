@@ -0,0 +1,71 @@
+import argparse
+import json
+import sys
+
+from besser.utilities.utils import ModelSerializer
+from besser.utilities.validation.batch_validation import validate_object_model
+from besser.utilities.validation.conformance import check_conformance
+
+
+def build_args_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="besser-validate",
+        description="Check the OCL constraints of a domain model against an object model"
+    )
+    parser.add_argument('domain_model',
+                        help='domain model file serialized with ModelSerializer')
+    parser.add_argument('object_model',
+                        help='object model file serialized with ModelSerializer')
+    parser.add_argument('-p', '--processes', type=int, default=None,
+                        help='number of worker processes (number of CPUs by default)')
+    parser.add_argument('-c', '--chunk-size', type=int, default=None,
+                        help='number of objects per task')
+    parser.add_argument('-n', '--constraint', action='append', default=None,
+                        help='name of a constraint to check (can be repeated; all constraints by default)')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='evaluate attribute-only constraints with NumPy array operations')
+    parser.add_argument('--conformance', action='store_true',
+                        help='also check slot types, required attributes, multiplicities and abstract classes')
+    parser.add_argument('--json', action='store_true',
+                        help='print the report as JSON')
+    return parser
+
+
+def main(argv: list = None) -> int:
+    args = build_args_parser().parse_args(argv)
+    serializer = ModelSerializer()
+    domain_model = serializer.load(args.domain_model)
+    object_model = serializer.load(args.object_model)
+
+    constraints = None
+    if args.constraint:
+        by_name = {constraint.name: constraint for constraint in domain_model.constraints}
+        missing = [name for name in args.constraint if name not in by_name]
+        if missing:
+            print(f"Unknown constraints: {', '.join(missing)}", file=sys.stderr)
+            return 2
+        constraints = [by_name[name] for name in args.constraint]
+
+    conformance = list(check_conformance(domain_model, object_model)) if args.conformance else []
+    report = validate_object_model(domain_model, object_model, constraints=constraints,
+                                   processes=args.processes, chunk_size=args.chunk_size,
+                                   vectorized=args.vectorized)
+    if args.json:
+        result = report.to_dict()
+        if args.conformance:
+            result["conformance"] = [{"kind": violation.kind, "element": violation.element.name,
+                                      "message": violation.message} for violation in conformance]
+        print(json.dumps(result, indent=2, default=str))
+    else:
+        for violation in conformance:
+            print(f"{violation.kind}: {violation.element.name}: {violation.message}")
+        for violation in report.violations:
+            print(f"{violation.constraint.name}: {violation.object.name}: {violation.message}")
+        for name, error in report.errors.items():
+            print(f"{name}: not evaluated: {error}")
+        print(f"{report.checked} checks, {len(report.violations)} violations, {len(report.errors)} errors")
+    return 0 if report.is_valid and not conformance else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,236 @@
+from array import array
+from datetime import date, datetime, time, timedelta
+from itertools import chain
+from typing import Any, Iterator
+
+from besser.BUML.metamodel.structural import DomainModel, Class, Enumeration, EnumerationLiteral, Property, \
+    UNLIMITED_MAX_MULTIPLICITY
+from besser.BUML.metamodel.object import ObjectModel, Object, ColumnarObjectModel
+from besser.utilities.validation.ocl_evaluator import is_kind_of
+
+# Python types accepted for the values of each primitive data type, by type name
+VALUE_TYPES = {
+    "int": (int,),
+    "float": (float, int),
+    "str": (str,),
+    "bool": (bool,),
+    "date": (date,),
+    "datetime": (datetime,),
+    "time": (time,),
+    "timedelta": (timedelta,),
+}
+
+
+class ConformanceViolation:
+    """A place where an object model does not conform to its domain model.
+
+    Args:
+        kind (str): the kind of violation: ``classifier``, ``abstract``, ``attribute``, ``type``, ``required``,
+            ``multiplicity`` or ``link``.
+        element (NamedElement): the object or link that does not conform (for columnar object models, the attribute
+            or association whose column or edges hold invalid values).
+        message (str): description of the violation.
+
+    Attributes:
+        kind (str): the kind of violation.
+        element (NamedElement): the element that does not conform.
+        message (str): description of the violation.
+    """
+
+    def __init__(self, kind: str, element, message: str):
+        self.kind: str = kind
+        self.element = element
+        self.message: str = message
+
+    def __repr__(self):
+        return f"ConformanceViolation({self.kind}, {self.element.name}, {self.message})"
+
+
+def _end_key(end: Property) -> tuple:
+    # Ends are matched by association and end name, to support models deserialized separately.
+    return end.owner.name if end.owner is not None else None, end.name
+
+
+def check_conformance(domain_model: DomainModel, object_model: ObjectModel) -> Iterator[ConformanceViolation]:
+    """Check that an object model conforms to a domain model, yielding the violations as they are found.
+
+    The checks are:
+
+    * the classifier of each object is a class of the domain model, and is not abstract;
+    * each slot is an attribute of the class of the object, and its value has the type of the attribute
+      (``DataValue`` values are checked against the ``PrimitiveDataType`` or the ``Enumeration`` of the attribute);
+    * attributes with a minimum multiplicity of at least 1 have a value;
+    * each link connects objects whose classes conform to the types of the association ends;
+    * the number of objects linked to each object through each association end of its class is within the
+      multiplicity of the end.
+
+    Multiplicities are checked with per-end degree counters filled in one pass over the links, so the check takes
+    O(objects + links) time. Columnar object models are checked column by column.
+
+    Args:
+        domain_model (DomainModel): the domain model.
+        object_model (ObjectModel): the object model to check.
+
+    Returns:
+        Iterator[ConformanceViolation]: the violations.
+    """
+    classes = {cls.name: cls for cls in domain_model.get_classes()}
+    if isinstance(object_model, ColumnarObjectModel):
+        yield from _check_columnar(domain_model, object_model, classes)
+        return
+    objects = [instance for instance in object_model.instances if isinstance(instance, Object)]
+    indexes = {obj: index for index, obj in enumerate(objects)}
+    degrees = {}
+    yield from _count_links(object_model, indexes, degrees)
+
+    # Per-class data is computed once: attributes by name, required attributes and the ends to check
+    class_info = {}
+    for index, obj in enumerate(objects):
+        classifier = obj.classifier
+        cls = classes.get(classifier.name) if classifier is not None else None
+        if cls is None:
+            yield ConformanceViolation("classifier", obj, f"'{getattr(classifier, 'name', None)}' is not a class "
+                                                          f"of the domain model")
+            continue
+        if cls.is_abstract:
+            yield ConformanceViolation("abstract", obj, f"'{cls.name}' is abstract")
+        if cls.name not in class_info:
+            attributes = {attribute.name: attribute for attribute in cls.all_attributes()}
+            required = [attribute for attribute in attributes.values()
+                        if attribute.multiplicity is not None and attribute.multiplicity.min >= 1]
+            ends = [(end, _end_key(end)) for end in cls.all_association_ends()]
+            class_info[cls.name] = attributes, required, ends
+        attributes, required, ends = class_info[cls.name]
+
+        defined = set()
+        for name, value in _values(obj):
+            attribute = attributes.get(name)
+            if attribute is None:
+                yield ConformanceViolation("attribute", obj, f"'{name}' is not an attribute of '{cls.name}'")
+                continue
+            if value is None:
+                continue
+            defined.add(name)
+            if not _has_type(value, attribute):
+                yield ConformanceViolation("type", obj, f"'{name}' holds {value!r}, which is not a "
+                                                        f"{attribute.type.name}")
+        for attribute in required:
+            if attribute.name not in defined:
+                yield ConformanceViolation("required", obj, f"'{attribute.name}' has no value")
+
+        for end, key in ends:
+            counts = degrees.get(key)
+            degree = counts[index] if counts is not None else 0
+            if not _within(degree, end.multiplicity):
+                yield _multiplicity_violation(obj, end, degree)
+
+
+def _count_links(object_model: ObjectModel, indexes: dict, degrees: dict) -> Iterator[ConformanceViolation]:
+    """Fill the degree counters of the association ends in one pass over the links, yielding invalid links."""
+    size = len(indexes)
+    keys = {}
+    for link in object_model.links:
+        connections = link.connections
+        for link_end in connections:
+            end = link_end.association_end
+            key = keys.get(end)
+            if key is None:
+                key = keys[end] = _end_key(end)
+            target = link_end.object
+            if target not in indexes:
+                yield ConformanceViolation("link", link, f"'{target.name}' is not an object of the model")
+                continue
+            if end.type is not None and target.classifier is not None and not is_kind_of(target.classifier, end.type):
+                yield ConformanceViolation("link", link, f"'{target.name}' is not a '{end.type.name}' "
+                                                         f"for end '{end.name}'")
+            counts = degrees.get(key)
+            if counts is None:
+                counts = degrees[key] = array("q", bytes(8 * size))
+            # each end of the link counts one object for each of the other objects of the link
+            for other in connections:
+                if other is not link_end and other.object in indexes:
+                    counts[indexes[other.object]] += 1
+
+
+def _check_columnar(domain_model: DomainModel, object_model: ColumnarObjectModel,
+                    classes: dict) -> Iterator[ConformanceViolation]:
+    """Check a columnar object model column by column.
+
+    The columns of a table are the attributes of its class, and typed columns only hold values of their type, so
+    only the distinct values of dictionary-encoded columns are type-checked. Degrees are counted on the edge arrays.
+    """
+    degrees = {}
+    for association in domain_model.associations:
+        for end in association.ends:
+            degrees[_end_key(end)] = object_model.degrees(end)
+            for cls in object_model.classes_at(end):
+                if end.type is not None and not is_kind_of(cls, end.type):
+                    yield ConformanceViolation("link", association, f"'{end.name}' links objects of class "
+                                                                    f"'{cls.name}', which is not a '{end.type.name}'")
+
+    for table in object_model.tables:
+        ids = object_model.table_ids(table.cls)
+        cls = classes.get(table.cls.name)
+        if cls is None or cls.is_abstract:
+            kind, message = ("classifier", f"'{table.cls.name}' is not a class of the domain model") \
+                if cls is None else ("abstract", f"'{cls.name}' is abstract")
+            for object_id in chain.from_iterable(ids):
+                yield ConformanceViolation(kind, object_model.object(object_id), message)
+            if cls is None:
+                continue
+        rows = None
+        for attribute in table.attributes:
+            distinct = table.dictionary(attribute.name)
+            for value in distinct or ():
+                if not _has_type(value, attribute):
+                    yield ConformanceViolation("type", attribute, f"'{attribute.name}' holds {value!r}, which is "
+                                                                  f"not a {attribute.type.name}")
+            if attribute.multiplicity is not None and attribute.multiplicity.min >= 1:
+                if rows is None:
+                    rows = array("q")
+                    for ids_range in ids:
+                        rows.extend(ids_range)
+                for row in table.undefined_rows(attribute.name):
+                    yield ConformanceViolation("required", object_model.object(rows[row]),
+                                               f"'{attribute.name}' has no value")
+        for end in cls.all_association_ends():
+            counts = degrees.get(_end_key(end))
+            multiplicity = end.multiplicity
+            for ids_range in ids:
+                # most ranges conform: their minimum and maximum degrees are computed at C speed
+                degree_range = counts[ids_range.start:ids_range.stop] if counts is not None else [0]
+                if _within(min(degree_range), multiplicity) and _within(max(degree_range), multiplicity):
+                    continue
+                for object_id in ids_range:
+                    degree = counts[object_id] if counts is not None else 0
+                    if not _within(degree, multiplicity):
+                        yield _multiplicity_violation(object_model.object(object_id), end, degree)
+
+
+def _within(degree: int, multiplicity) -> bool:
+    return multiplicity.min <= degree and (multiplicity.max >= UNLIMITED_MAX_MULTIPLICITY
+                                           or degree <= multiplicity.max)
+
+
+def _multiplicity_violation(obj: Object, end: Property, degree: int) -> ConformanceViolation:
+    return ConformanceViolation("multiplicity", obj, f"'{end.name}' links {degree} objects, "
+                                                     f"expected {end.multiplicity}")
+
+
+def _values(obj: Object) -> Iterator:
+    """Get the (attribute name, value) pairs of an object."""
+    return ((slot.attribute.name, slot.value.value if slot.value is not None else None) for slot in obj.slots)
+
+
+def _has_type(value: Any, attribute: Property) -> bool:
+    attribute_type = attribute.type
+    if isinstance(attribute_type, Enumeration):
+        names = {literal.name for literal in attribute_type.literals}
+        return (value.name if isinstance(value, EnumerationLiteral) else value) in names
+    if isinstance(attribute_type, Class) or attribute_type is None:
+        return True
+    expected = VALUE_TYPES.get(attribute_type.name)
+    if expected is None:
+        return True
+    # bool is a subclass of int, but booleans are not integers in B-UML
+    return isinstance(value, expected) and not (isinstance(value, bool) and bool not in expected)
@@ -0,0 +1,92 @@
+from besser.BUML.metamodel.structural import Association, Property
+from besser.BUML.metamodel.ocl.ocl import OCLExpression, OperationCallExpression, PropertyCallExpression, \
+    VariableExp, IfExp, LoopExp
+
+# Operations whose result is (part of) their source collection, so navigating from the result reads the same
+# property paths as navigating from the source.
+_SOURCE_PRESERVING_OPERATIONS = ("asSet", "first", "last", "any")
+
+
+class ConstraintDependencies:
+    """The properties an OCL expression reads, as navigation paths starting from the ``self`` object.
+
+    For instance, ``self.has->forAll(b | b.pages > 0)`` depends on the paths ``(has,)`` and ``(has, pages)``: the
+    expression must be re-evaluated for a library when its ``has`` links change, or when the ``pages`` of a book
+    linked to it through ``has`` changes. Expressions that read objects not reachable from ``self`` (e.g., through
+    ``allInstances()``) are global: any change of the model may affect them.
+
+    Args:
+        expression (OCLExpression): the parsed expression of the constraint.
+
+    Attributes:
+        paths (set[tuple[Property, ...]]): the property paths read by the expression.
+        is_global (bool): whether the expression reads objects not reachable from ``self``.
+    """
+
+    def __init__(self, expression: OCLExpression):
+        self.paths: set[tuple] = set()
+        self.is_global: bool = False
+        self.__analyze(expression, {"self": {()}})
+
+    def __analyze(self, expression: OCLExpression, variables: dict) -> set:
+        """Collect the paths read by an expression and return the paths its value may denote."""
+        if expression is None:
+            return set()
+        if isinstance(expression, VariableExp):
+            if expression.name not in variables:
+                self.is_global = True
+                return set()
+            return variables[expression.name]
+        if isinstance(expression, PropertyCallExpression):
+            if expression.source is None:
+                sources = variables.get("_it", variables["self"])
+            else:
+                sources = self.__analyze(expression.source, variables)
+            paths = {source + (expression.property,) for source in sources}
+            self.paths.update(paths)
+            return paths
+        if isinstance(expression, LoopExp):
+            sources = self.__analyze(expression.source, variables)
+            scope = dict(variables)
+            for iterator in expression.iterator:
+                scope[iterator.name] = sources
+            body = set()
+            for item in expression.body:
+                body |= self.__analyze(item, scope)
+            if expression.name == "collect":
+                return body
+            return sources if expression.name in ("select", "reject") else set()
+        if isinstance(expression, OperationCallExpression):
+            if expression.operation == "allInstances":
+                self.is_global = True
+                return set()
+            sources = self.__analyze(expression.source, variables) if expression.source is not None else set()
+            for argument in expression.arguments:
+                self.__analyze(argument, variables)
+            return sources if expression.operation in _SOURCE_PRESERVING_OPERATIONS else set()
+        if isinstance(expression, IfExp):
+            self.__analyze(expression.ifCondition, variables)
+            return self.__analyze(expression.thenExpression, variables) | \
+                self.__analyze(expression.elseCondition, variables)
+        return set()
+
+    def __repr__(self):
+        paths = sorted(".".join(prop.name for prop in path) for path in self.paths)
+        return f"ConstraintDependencies({paths}, global={self.is_global})"
+
+
+def opposite_end(end: Property) -> Property:
+    """Get the opposite end of a binary association end.
+
+    Args:
+        end (Property): the association end.
+
+    Returns:
+        Property: the other end of the association, or None if end is not an association end.
+    """
+    association = end.owner
+    if not isinstance(association, Association):
+        return None
+    others = [other for other in association.ends if other is not end]
+    return others[0] if others else end
+
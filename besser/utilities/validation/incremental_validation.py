@@ -0,0 +1,157 @@
+from besser.BUML.metamodel.structural import DomainModel, Property
+from besser.BUML.metamodel.object import Object, ObjectModel
+from besser.BUML.notations.ocl.expression_parser import OCLExpressionParser
+from besser.utilities.validation.ocl_evaluator import OCLEvaluator, instances_of, is_kind_of, navigate
+from besser.utilities.validation.batch_validation import ConstraintViolation, ValidationReport, check_object, \
+    ocl_constraints
+from besser.utilities.validation.dependencies import ConstraintDependencies, opposite_end
+
+
+def _property_key(prop: Property) -> tuple:
+    # Properties are matched by name and type name, as in ocl_evaluator, to support models deserialized separately.
+    return prop.name, prop.type.name if prop.type is not None else None
+
+
+class IncrementalValidator:
+    """Keeps the validation results of an object model up to date while the model is being edited.
+
+    The validator enables change tracking on the object model and computes the dependencies of each constraint
+    (the property paths it reads from ``self``). After a set of changes, ``revalidate()`` only re-evaluates the
+    (constraint, object) pairs that may be affected: the objects that reach a changed object through the
+    navigations read by the constraint. Constraints reading objects not reachable from ``self`` (e.g., through
+    ``allInstances()``) are re-evaluated on all the instances of their context whenever the model changes.
+
+    Args:
+        domain_model (DomainModel): the domain model holding the constraints.
+        object_model (ObjectModel): the object model to validate.
+        constraints (list[Constraint], optional): the constraints to check. Defaults to all the OCL constraints of
+            the domain model.
+
+    Attributes:
+        domain_model (DomainModel): the domain model holding the constraints.
+        object_model (ObjectModel): the object model to validate.
+    """
+
+    def __init__(self, domain_model: DomainModel, object_model: ObjectModel, constraints: list = None):
+        self.domain_model: DomainModel = domain_model
+        self.object_model: ObjectModel = object_model
+        self.__evaluator: OCLEvaluator = OCLEvaluator(object_model, domain_model)
+        self.__constraints: list = []
+        self.__expressions: list = []
+        self.__dependencies: list[ConstraintDependencies] = []
+        self.__errors: dict[str, str] = {}
+        # (constraint index, path prefix) pairs reading each property, by property key
+        self.__readers: dict[tuple, list] = {}
+        # current violation messages of each constraint, by object
+        self.__violations: list[dict[Object, str]] = []
+
+        parser = OCLExpressionParser(domain_model)
+        for constraint in (constraints if constraints is not None else ocl_constraints(domain_model)):
+            try:
+                expression = parser.parse(constraint)
+            except ValueError as error:
+                self.__errors[constraint.name] = str(error)
+                continue
+            dependencies = ConstraintDependencies(expression)
+            index = len(self.__constraints)
+            for path in dependencies.paths:
+                for position, prop in enumerate(path):
+                    self.__readers.setdefault(_property_key(prop), []).append((index, path[:position]))
+            self.__constraints.append(constraint)
+            self.__expressions.append(expression)
+            self.__dependencies.append(dependencies)
+            self.__violations.append({})
+
+        self.__tracker = object_model.track_changes()
+        self.validate()
+
+    def dependencies(self, constraint) -> ConstraintDependencies:
+        """Get the dependencies computed for a constraint.
+
+        Args:
+            constraint (Constraint): the constraint.
+
+        Returns:
+            ConstraintDependencies: the property paths read by the constraint.
+        """
+        return self.__dependencies[self.__constraints.index(constraint)]
+
+    def validate(self) -> ValidationReport:
+        """Evaluate every constraint on every instance of its context class, discarding the tracked changes.
+
+        Returns:
+            ValidationReport: the violations found.
+        """
+        self.__tracker.clear()
+        checked = 0
+        for index, constraint in enumerate(self.__constraints):
+            self.__violations[index] = {}
+            for obj in instances_of(self.object_model, constraint.context):
+                self.__check(index, obj)
+                checked += 1
+        return self.__report(checked)
+
+    def revalidate(self) -> ValidationReport:
+        """Re-evaluate the constraints affected by the changes made to the object model since the last validation.
+
+        Returns:
+            ValidationReport: the current violations of the model; ``checked`` is the number of (constraint,
+                object) pairs re-evaluated.
+        """
+        tracker = self.__tracker
+        if not tracker.has_changes:
+            return self.__report(0)
+        affected = [set() for _ in self.__constraints]
+        for obj in tracker.removed:
+            for violations in self.__violations:
+                violations.pop(obj, None)
+        for obj in tracker.added:
+            for objects in affected:
+                objects.add(obj)
+        for changes in (tracker.attributes, tracker.ends):
+            for obj, properties in changes.items():
+                for prop in properties:
+                    self.__propagate(obj, prop, affected)
+        tracker.clear()
+
+        instances = self.object_model.instances
+        checked = 0
+        for index, constraint in enumerate(self.__constraints):
+            if self.__dependencies[index].is_global:
+                self.__violations[index] = {}
+                objects = instances_of(self.object_model, constraint.context)
+            else:
+                objects = [obj for obj in affected[index]
+                           if obj in instances and is_kind_of(obj.classifier, constraint.context)]
+            for obj in objects:
+                self.__check(index, obj)
+                checked += 1
+        return self.__report(checked)
+
+    def __propagate(self, obj: Object, prop: Property, affected: list):
+        """Add to affected the objects whose constraints read prop of obj, walking the path prefixes backwards."""
+        for index, prefix in self.__readers.get(_property_key(prop), ()):
+            roots = {obj}
+            for end in reversed(prefix):
+                opposite = opposite_end(end)
+                if opposite is None:
+                    roots = set(instances_of(self.object_model, self.__constraints[index].context))
+                    break
+                roots = {source for target in roots for source in navigate(target, opposite)}
+            affected[index] |= roots
+
+    def __check(self, index: int, obj: Object):
+        message = check_object(self.__evaluator, self.__expressions[index], obj)
+        if message is None:
+            self.__violations[index].pop(obj, None)
+        else:
+            self.__violations[index][obj] = message
+
+    def __report(self, checked: int) -> ValidationReport:
+        report = ValidationReport()
+        report.checked = checked
+        report.errors = dict(self.__errors)
+        for index, violations in enumerate(self.__violations):
+            for obj in sorted(violations, key=lambda o: o.name):
+                report.violations.append(ConstraintViolation(self.__constraints[index], obj, violations[obj]))
+        return report
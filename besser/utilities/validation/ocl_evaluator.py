@@ -0,0 +1,397 @@
+import itertools
+import math
+from typing import Any
+
+from besser.BUML.metamodel.structural import Class, Enumeration, EnumerationLiteral, PrimitiveDataType, Property, \
+    Type, Constraint, DomainModel
+from besser.BUML.metamodel.object import Object, ObjectModel, ObjectView
+from besser.BUML.metamodel.ocl.ocl import OCLExpression, OperationCallExpression, PropertyCallExpression, \
+    LiteralExpression, NullLiteralExp, VariableExp, TypeExp, IfExp, LoopExp
+from besser.BUML.notations.ocl.expression_parser import OCLExpressionParser
+
+# Python types of the values stored in DataValues, by primitive data type name
+PYTHON_TYPES = {
+    "int": int,
+    "float": float,
+    "str": str,
+    "bool": bool,
+}
+
+
+class OCLEvaluationError(ValueError):
+    """Raised when an OCL expression cannot be evaluated on an object."""
+
+
+def slot_value(obj: Object, attribute: Property) -> Any:
+    """Get the value an object holds for an attribute.
+
+    Args:
+        obj (Object): the object.
+        attribute (Property): the attribute of the object classifier.
+
+    Returns:
+        Any: the value of the attribute (enumeration literals are returned by name), or None if the
+            object has no slot for the attribute.
+    """
+    if isinstance(obj, ObjectView):
+        # Objects of columnar models read the value from the column of the attribute, without building slots
+        value = obj.value_of(attribute)
+        return value.name if isinstance(value, EnumerationLiteral) else value
+    for slot in obj.slots:
+        if slot.attribute is attribute or slot.attribute.name == attribute.name:
+            value = slot.value.value if slot.value is not None else None
+            if isinstance(value, EnumerationLiteral):
+                return value.name
+            return value
+    return None
+
+
+def navigate(obj: Object, end: Property) -> list:
+    """Get the objects linked to an object through an association end.
+
+    Args:
+        obj (Object): the source object.
+        end (Property): the association end to navigate (the end on the side of the target objects).
+
+    Returns:
+        list[Object]: the linked objects.
+    """
+    return obj.navigate(end)
+
+
+def is_kind_of(classifier: Type, cls: Type) -> bool:
+    """Check whether a classifier is a given class or one of its specializations.
+
+    Types are matched by identity or, for models deserialized separately, by name.
+
+    Args:
+        classifier (Type): the classifier to check.
+        cls (Type): the expected class.
+
+    Returns:
+        bool: True if classifier conforms to cls.
+    """
+    if classifier is cls or classifier.name == cls.name:
+        return True
+    return isinstance(classifier, Class) and any(parent.name == cls.name for parent in classifier.all_parents())
+
+
+def instances_of(object_model: ObjectModel, cls: Type) -> list:
+    """Get the objects of an object model whose classifier conforms to a class (OCL ``allInstances()``).
+
+    Args:
+        object_model (ObjectModel): the object model.
+        cls (Type): the class.
+
+    Returns:
+        list[Object]: the instances of the class and of its specializations.
+    """
+    return [instance for instance in object_model.instances_of(cls) if isinstance(instance, Object)]
+
+
+class OCLEvaluator:
+    """Interpreter for OCL expressions (as produced by ``OCLExpressionParser``) over an object model.
+
+    Expressions are evaluated with Python semantics for primitive values. Collections are represented as lists
+    and an undefined value (OCL ``null``/``invalid``) as None; operations applied to an undefined value are
+    undefined as well.
+
+    Args:
+        object_model (ObjectModel): the object model providing the instances (used by ``allInstances()``).
+        domain_model (DomainModel, optional): the domain model used to resolve type names in constraints.
+
+    Attributes:
+        object_model (ObjectModel): the object model providing the instances.
+        domain_model (DomainModel): the domain model used to resolve type names in constraints.
+    """
+
+    def __init__(self, object_model: ObjectModel = None, domain_model: DomainModel = None):
+        self.object_model: ObjectModel = object_model
+        self.domain_model: DomainModel = domain_model
+        self.__parsed: dict = {}
+        self.__handlers: dict = {
+            OperationCallExpression: self._evaluate_operation,
+            PropertyCallExpression: self._evaluate_property,
+            LoopExp: self._evaluate_loop,
+            IfExp: self._evaluate_if,
+            VariableExp: self._evaluate_variable,
+            TypeExp: self._evaluate_type,
+            NullLiteralExp: self._evaluate_null,
+            LiteralExpression: self._evaluate_literal,
+        }
+
+    def expression_of(self, constraint: Constraint) -> OCLExpression:
+        """Get the parsed expression of a constraint. Each constraint is parsed once per evaluator.
+
+        Args:
+            constraint (Constraint): the OCL constraint.
+
+        Returns:
+            OCLExpression: the parsed expression.
+        """
+        expression = self.__parsed.get(constraint)
+        if expression is None:
+            expression = OCLExpressionParser(self.domain_model).parse(constraint)
+            self.__parsed[constraint] = expression
+        return expression
+
+    def check(self, constraint: Constraint, obj: Object) -> bool:
+        """Check whether an object satisfies an invariant.
+
+        Args:
+            constraint (Constraint): the OCL invariant.
+            obj (Object): the object (an instance of the constraint context).
+
+        Returns:
+            bool: True if the invariant evaluates to true on the object.
+        """
+        return self.evaluate(self.expression_of(constraint), obj) is True
+
+    def evaluate(self, expression: OCLExpression, obj: Object, variables: dict = None) -> Any:
+        """Evaluate an OCL expression with ``self`` bound to an object.
+
+        Args:
+            expression (OCLExpression): the expression to evaluate.
+            obj (Object): the object bound to ``self``.
+            variables (dict, optional): additional variable bindings.
+
+        Returns:
+            Any: the value of the expression.
+        """
+        env = {"self": obj}
+        if variables:
+            env.update(variables)
+        return self._eval(expression, env)
+
+    def _eval(self, expression: OCLExpression, env: dict) -> Any:
+        handler = self.__handlers.get(type(expression))
+        if handler is None:
+            for cls in type(expression).__mro__:
+                if cls in self.__handlers:
+                    handler = self.__handlers[cls]
+                    self.__handlers[type(expression)] = handler
+                    break
+            else:
+                raise OCLEvaluationError(f"Unsupported OCL expression: {type(expression).__name__}")
+        return handler(expression, env)
+
+    def _evaluate_literal(self, expression: LiteralExpression, env: dict) -> Any:
+        return expression.value
+
+    def _evaluate_null(self, expression: NullLiteralExp, env: dict) -> Any:
+        return None
+
+    def _evaluate_variable(self, expression: VariableExp, env: dict) -> Any:
+        if expression.name not in env:
+            raise OCLEvaluationError(f"Undefined variable '{expression.name}'.")
+        return env[expression.name]
+
+    def _evaluate_type(self, expression: TypeExp, env: dict) -> Any:
+        return expression.type
+
+    def _evaluate_if(self, expression: IfExp, env: dict) -> Any:
+        condition = self._eval(expression.ifCondition, env)
+        if condition is None:
+            return None
+        if condition:
+            return self._eval(expression.thenExpression, env)
+        return self._eval(expression.elseCondition, env)
+
+    def _evaluate_property(self, expression: PropertyCallExpression, env: dict) -> Any:
+        source = self._eval(expression.source, env) if expression.source is not None else env["self"]
+        prop = expression.property
+        is_end = isinstance(prop.type, Class)
+        if isinstance(source, list):
+            values = []
+            for item in source:
+                if is_end:
+                    values.extend(navigate(item, prop))
+                else:
+                    values.append(slot_value(item, prop))
+            return values
+        if source is None:
+            return None
+        if not is_end:
+            return slot_value(source, prop)
+        targets = navigate(source, prop)
+        if prop.multiplicity.max > 1:
+            return targets
+        return targets[0] if targets else None
+
+    def _evaluate_loop(self, expression: LoopExp, env: dict) -> Any:
+        collection = _as_collection(self._eval(expression.source, env))
+        body = expression.body[0]
+        names = [iterator.name for iterator in expression.iterator]
+        scope = dict(env)
+        if expression.name in ("forAll", "exists"):
+            undefined = False
+            for values in itertools.product(collection, repeat=len(names)):
+                scope.update(zip(names, values))
+                result = self._eval(body, scope)
+                if result is None:
+                    undefined = True
+                elif bool(result) is (expression.name == "exists"):
+                    return expression.name == "exists"
+            return None if undefined else expression.name == "forAll"
+        name = names[0]
+        results = []
+        for item in collection:
+            scope[name] = item
+            result = self._eval(body, scope)
+            if expression.name == "collect":
+                if isinstance(result, list):
+                    results.extend(result)
+                else:
+                    results.append(result)
+            elif (result is True) is (expression.name == "select"):
+                results.append(item)
+        return results
+
+    def _evaluate_operation(self, expression: OperationCallExpression, env: dict) -> Any:
+        operation = expression.operation
+        if expression.source is not None:
+            source = self._eval(expression.source, env)
+            arguments = [self._eval(argument, env) for argument in expression.arguments]
+            return self._call(operation, source, arguments)
+        arguments = expression.arguments
+        if operation in ("and", "or", "implies"):
+            return self._evaluate_boolean(operation, arguments, env)
+        if len(arguments) == 1:
+            value = self._eval(arguments[0], env)
+            if value is None:
+                return None
+            return (not value) if operation == "not" else -value
+        left = self._eval(arguments[0], env)
+        right = self._eval(arguments[1], env)
+        if operation == "=":
+            return left == right
+        if operation == "<>":
+            return left != right
+        if left is None or right is None:
+            return None
+        return _BINARY_OPERATIONS[operation](left, right)
+
+    def _evaluate_boolean(self, operation: str, arguments: list, env: dict) -> Any:
+        # Three-valued logic: a defined operand may decide the result even if the other one is undefined.
+        decisive = operation == "or"
+        left = self._eval(arguments[0], env)
+        if operation == "implies":
+            if left is False:
+                return True
+            decisive, left = True, (None if left is None else not left)
+        if left is decisive:
+            return decisive
+        right = self._eval(arguments[1], env)
+        if right is None:
+            return None
+        if bool(right) is decisive:
+            return decisive
+        return None if left is None else not decisive
+
+    def _call(self, operation: str, source: Any, arguments: list) -> Any:
+        if operation == "allInstances":
+            return instances_of(self.object_model, source)
+        if operation == "oclIsUndefined":
+            return source is None
+        if operation in ("oclIsTypeOf", "oclIsKindOf"):
+            return _conforms(source, arguments[0], exact=operation == "oclIsTypeOf")
+        if isinstance(source, str) and operation in _STRING_OPERATIONS:
+            return _STRING_OPERATIONS[operation](source, *arguments)
+        if operation in _COLLECTION_OPERATIONS:
+            return _COLLECTION_OPERATIONS[operation](_as_collection(source), *arguments)
+        if source is None:
+            return None
+        if operation in _NUMBER_OPERATIONS:
+            return _NUMBER_OPERATIONS[operation](source)
+        raise OCLEvaluationError(f"Unsupported OCL operation '{operation}'.")
+
+
+def _as_collection(value: Any) -> list:
+    if isinstance(value, list):
+        return value
+    return [] if value is None else [value]
+
+
+def _conforms(value: Any, expected: Type, exact: bool) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, Object):
+        return value.classifier.name == expected.name if exact else is_kind_of(value.classifier, expected)
+    if isinstance(expected, Enumeration):
+        return value in {literal.name for literal in expected.literals}
+    if isinstance(expected, PrimitiveDataType) and expected.name in PYTHON_TYPES:
+        python_type = PYTHON_TYPES[expected.name]
+        if python_type is not bool and isinstance(value, bool):
+            return False
+        return isinstance(value, python_type) if exact or python_type is not float else isinstance(value, (int, float))
+    return False
+
+
+def _unique(collection: list) -> list:
+    seen = set()
+    result = []
+    for item in collection:
+        key = id(item) if isinstance(item, Object) else item
+        if key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
+
+
+def _div(left: Any, right: Any) -> Any:
+    # OCL div truncates towards zero, whereas Python's // floors (-7 div 2 = -3, -7 // 2 = -4)
+    quotient = abs(left) // abs(right)
+    return quotient if (left < 0) == (right < 0) else -quotient
+
+
+def _mod(left: Any, right: Any) -> Any:
+    # the remainder of the truncated division, with the sign of the dividend (-7 mod 2 = -1)
+    return left - right * _div(left, right)
+
+
+def _round(value: Any) -> int:
+    # OCL rounds halves up (2.5 -> 3, -2.5 -> -2), whereas Python rounds them to even
+    return math.floor(value + 0.5)
+
+
+_BINARY_OPERATIONS = {
+    "+": lambda left, right: left + right,
+    "-": lambda left, right: left - right,
+    "*": lambda left, right: left * right,
+    "/": lambda left, right: left / right if right != 0 else None,
+    "div": lambda left, right: _div(left, right) if right != 0 else None,
+    "mod": lambda left, right: _mod(left, right) if right != 0 else None,
+    "<": lambda left, right: left < right,
+    ">": lambda left, right: left > right,
+    "<=": lambda left, right: left <= right,
+    ">=": lambda left, right: left >= right,
+    "xor": lambda left, right: bool(left) != bool(right),
+}
+
+_COLLECTION_OPERATIONS = {
+    "size": len,
+    "isEmpty": lambda collection: len(collection) == 0,
+    "notEmpty": lambda collection: len(collection) > 0,
+    "includes": lambda collection, item: item in collection,
+    "excludes": lambda collection, item: item not in collection,
+    "sum": lambda collection: sum(item for item in collection if item is not None),
+    "max": lambda collection: max(collection) if collection else None,
+    "min": lambda collection: min(collection) if collection else None,
+    "asSet": _unique,
+    "first": lambda collection: collection[0] if collection else None,
+    "last": lambda collection: collection[-1] if collection else None,
+}
+
+_STRING_OPERATIONS = {
+    "size": len,
+    "toUpper": str.upper,
+    "toLower": str.lower,
+    "concat": lambda value, other: value + other if other is not None else None,
+    "substring": lambda value, lower, upper: value[lower - 1:upper],
+}
+
+_NUMBER_OPERATIONS = {
+    "abs": abs,
+    "floor": math.floor,
+    "round": _round,
+}
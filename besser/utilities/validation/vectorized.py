@@ -0,0 +1,228 @@
+import operator
+
+import numpy as np
+
+from besser.BUML.metamodel.structural import Class, DomainModel
+from besser.BUML.metamodel.object import ObjectModel
+from besser.BUML.metamodel.ocl.ocl import OCLExpression, OperationCallExpression, PropertyCallExpression, \
+    LiteralExpression, NullLiteralExp, VariableExp, IfExp
+from besser.utilities.validation.ocl_evaluator import OCLEvaluator, slot_value
+
+
+class _Column:
+    """The values of an expression for every object, with a mask of the objects for which it is defined."""
+
+    def __init__(self, values: np.ndarray, defined: np.ndarray):
+        self.values: np.ndarray = values
+        self.defined: np.ndarray = defined
+
+
+class VectorizedEvaluator:
+    """Evaluates OCL expressions on many objects at once with NumPy array operations.
+
+    The attributes of the context class read by an expression are projected into NumPy columns (one value per
+    object plus a mask of the objects where the value is defined), and arithmetic, comparison and boolean operators,
+    ``if`` expressions and ``oclIsUndefined()``/``abs()``/``floor()``/``round()``/``size()`` are applied to whole
+    columns. The results follow the semantics of the scalar ``OCLEvaluator``, including the three-valued logic of
+    undefined values. Expressions reading other objects (navigations, collections, ``allInstances()``) are
+    evaluated object by object with the scalar evaluator.
+
+    Args:
+        object_model (ObjectModel): the object model providing the instances.
+        domain_model (DomainModel, optional): the domain model used to resolve type names in constraints.
+
+    Attributes:
+        object_model (ObjectModel): the object model providing the instances.
+        domain_model (DomainModel): the domain model used to resolve type names in constraints.
+    """
+
+    def __init__(self, object_model: ObjectModel = None, domain_model: DomainModel = None):
+        self.object_model: ObjectModel = object_model
+        self.domain_model: DomainModel = domain_model
+        self.__scalar: OCLEvaluator = OCLEvaluator(object_model, domain_model)
+
+    @classmethod
+    def supports(cls, expression: OCLExpression) -> bool:
+        """Check whether an expression can be evaluated with array operations.
+
+        Args:
+            expression (OCLExpression): the parsed expression.
+
+        Returns:
+            bool: True if the expression only reads attributes of ``self`` through supported operations.
+        """
+        if isinstance(expression, (NullLiteralExp, LiteralExpression)):
+            return True
+        if isinstance(expression, PropertyCallExpression):
+            return not isinstance(expression.property.type, Class) and isinstance(expression.source, VariableExp) \
+                and expression.source.name == "self"
+        if isinstance(expression, IfExp):
+            return all(cls.supports(part) for part in
+                       (expression.ifCondition, expression.thenExpression, expression.elseCondition))
+        if isinstance(expression, OperationCallExpression):
+            if expression.source is None:
+                return expression.operation in _OPERATORS and all(cls.supports(a) for a in expression.arguments)
+            return expression.operation in _FUNCTIONS and not expression.arguments and cls.supports(expression.source)
+        return False
+
+    def evaluate(self, expression: OCLExpression, objects: list) -> list:
+        """Evaluate an expression on a list of objects.
+
+        Args:
+            expression (OCLExpression): the parsed expression.
+            objects (list[Object]): the objects bound to ``self``.
+
+        Returns:
+            list: the value of the expression for each object (None where it is undefined).
+        """
+        if not self.supports(expression):
+            return [self.__scalar.evaluate(expression, obj) for obj in objects]
+        if not objects:
+            return []
+        column = self.__eval(expression, objects, {})
+        return [value if defined else None
+                for value, defined in zip(column.values.tolist(), column.defined.tolist())]
+
+    def __eval(self, expression: OCLExpression, objects: list, columns: dict) -> _Column:
+        size = len(objects)
+        if isinstance(expression, NullLiteralExp):
+            return _Column(np.zeros(size, dtype=bool), np.zeros(size, dtype=bool))
+        if isinstance(expression, LiteralExpression):
+            value = expression.value
+            return _Column(np.full(size, value, dtype=object if isinstance(value, str) else None),
+                           np.ones(size, dtype=bool))
+        if isinstance(expression, PropertyCallExpression):
+            # Each attribute is projected once per evaluation, even if the expression reads it several times
+            name = expression.property.name
+            if name not in columns:
+                columns[name] = _project([slot_value(obj, expression.property) for obj in objects])
+            return columns[name]
+        if isinstance(expression, IfExp):
+            condition = self.__eval(expression.ifCondition, objects, columns)
+            then_column = self.__eval(expression.thenExpression, objects, columns)
+            else_column = self.__eval(expression.elseCondition, objects, columns)
+            choose = condition.values.astype(bool)
+            return _Column(np.where(choose, then_column.values, else_column.values),
+                           condition.defined & np.where(choose, then_column.defined, else_column.defined))
+        operation = expression.operation
+        if expression.source is not None:
+            return _FUNCTIONS[operation](self.__eval(expression.source, objects, columns))
+        arguments = [self.__eval(argument, objects, columns) for argument in expression.arguments]
+        return _OPERATORS[operation](*arguments)
+
+
+def _project(values: list) -> _Column:
+    defined = np.fromiter((value is not None for value in values), dtype=bool, count=len(values))
+    if all(isinstance(value, (int, float, bool)) for value in values if value is not None):
+        filled = [0 if value is None else value for value in values]
+        return _Column(np.array(filled), defined)
+    return _Column(np.array(values, dtype=object), defined)
+
+
+def _apply(function, *columns: _Column, undefined_when=None) -> _Column:
+    """Apply an elementwise function where all the operands are defined."""
+    defined = columns[0].defined
+    for column in columns[1:]:
+        defined = defined & column.defined
+    if undefined_when is not None:
+        defined = defined & ~undefined_when(*columns)
+    if defined.all():
+        return _Column(np.asarray(function(*(column.values for column in columns))), defined)
+    result = function(*(column.values[defined] for column in columns))
+    values = np.zeros(len(defined), dtype=np.asarray(result).dtype)
+    values[defined] = result
+    return _Column(values, defined)
+
+
+def _binary(function):
+    return lambda left, right: _apply(function, left, right)
+
+
+def _division(function):
+    return lambda left, right: _apply(function, left, right,
+                                      undefined_when=lambda _, divisor: divisor.defined & (divisor.values == 0))
+
+
+def _truncated_divide(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    # As in the scalar evaluator, OCL div truncates towards zero, whereas floor_divide floors
+    quotient = np.abs(left) // np.abs(right)
+    return np.where((left < 0) == (right < 0), quotient, -quotient)
+
+
+def _truncated_mod(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    return left - right * _truncated_divide(left, right)
+
+
+def _equality(negate: bool):
+    # As in the scalar evaluator, '=' and '<>' are always defined: two undefined values are equal.
+    def compare(left: _Column, right: _Column) -> _Column:
+        both = left.defined & right.defined
+        equal = ~(left.defined | right.defined)
+        if both.any():
+            equal[both] = np.asarray(left.values[both] == right.values[both], dtype=bool)
+        return _Column(~equal if negate else equal, np.ones(len(equal), dtype=bool))
+    return compare
+
+
+def _boolean(decisive: bool, negate_left: bool = False):
+    # Three-valued logic: a defined decisive operand decides the result even if the other one is undefined.
+    def combine(left: _Column, right: _Column) -> _Column:
+        left_values = left.values.astype(bool)
+        if negate_left:
+            left_values = ~left_values
+        right_values = right.values.astype(bool)
+        decided = (left.defined & (left_values == decisive)) | (right.defined & (right_values == decisive))
+        defined = decided | (left.defined & right.defined)
+        return _Column(np.where(decided, decisive, not decisive), defined)
+    return combine
+
+
+def _unary(function):
+    return lambda operand: _apply(function, operand)
+
+
+_OPERATORS = {
+    "and": _boolean(False),
+    "or": _boolean(True),
+    "implies": _boolean(True, negate_left=True),
+    "xor": _binary(lambda left, right: left.astype(bool) != right.astype(bool)),
+    "not": _unary(lambda values: ~values.astype(bool)),
+    "=": _equality(negate=False),
+    "<>": _equality(negate=True),
+    "<": _binary(operator.lt),
+    ">": _binary(operator.gt),
+    "<=": _binary(operator.le),
+    ">=": _binary(operator.ge),
+    "+": _binary(operator.add),
+    "*": _binary(operator.mul),
+    "/": _division(np.true_divide),
+    "div": _division(_truncated_divide),
+    "mod": _division(_truncated_mod),
+}
+
+
+def _minus(*columns: _Column) -> _Column:
+    return _apply(operator.neg, *columns) if len(columns) == 1 else _apply(operator.sub, *columns)
+
+
+_OPERATORS["-"] = _minus
+
+def _size(column: _Column) -> _Column:
+    # As in the scalar evaluator, an undefined value is an empty collection: its size is 0.
+    sizes = np.zeros(len(column.defined), dtype=np.int64)
+    if column.defined.any():
+        sizes[column.defined] = [len(value) for value in column.values[column.defined]]
+    return _Column(sizes, np.ones(len(column.defined), dtype=bool))
+
+
+_FUNCTIONS = {
+    "oclIsUndefined": lambda column: _Column(~column.defined, np.ones(len(column.defined), dtype=bool)),
+    "abs": _unary(np.abs),
+    "floor": _unary(lambda values: np.floor(values).astype(np.int64)),
+    # OCL rounds halves up, whereas np.round rounds them to even
+    "round": _unary(lambda values: np.floor(values + 0.5).astype(np.int64)),
+    "size": _size,
+    "toUpper": _unary(np.frompyfunc(str.upper, 1, 1)),
+    "toLower": _unary(np.frompyfunc(str.lower, 1, 1)),
+}
+
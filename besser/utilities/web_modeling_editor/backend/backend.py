@@ -1,27 +1,78 @@
-from fastapi import FastAPI, HTTPException, File, UploadFile
+import asyncio
+import json
+import logging
+import pickle
+import time
+from concurrent.futures import BrokenExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, HTTPException, File, UploadFile, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, Response
-import os, io, zipfile, shutil
-import tempfile
-import uuid
-
-from besser.utilities.buml_code_builder import domain_model_to_code
-from besser.generators.django import DjangoGenerator
-from besser.generators.python_classes import PythonGenerator
-from besser.generators.java_classes import JavaGenerator
-from besser.generators.pydantic_classes import PydanticGenerator
-from besser.generators.sql_alchemy import SQLAlchemyGenerator
-from besser.generators.sql import SQLGenerator
-from besser.generators.backend import BackendGenerator
-
-from besser.utilities.web_modeling_editor.backend.models.class_diagram import ClassDiagramInput
-from besser.utilities.web_modeling_editor.backend.services.json_to_buml import process_class_diagram, process_state_machine
+from fastapi.responses import Response, StreamingResponse, FileResponse
+
+from besser.utilities.web_modeling_editor.backend.constants import WORKER_PROCESSES, MAX_PENDING_JOBS, JOB_TIMEOUT, \
+    CACHE_ENTRIES, CACHE_BYTES, CACHE_DIR, MAX_DIAGRAM_SESSIONS, DIAGRAM_SESSION_TTL, METRICS_ENABLED, \
+    JOBS_DIR, JOB_PROCESSES, JOB_RETENTION, JOB_HEARTBEAT_INTERVAL, DOCKER_CONFIG_PATH
+from besser.generators.instrumentation import REGISTRY, STAGE_DURATION, enable_metrics, metrics_enabled, run_recorded
+from besser.utilities.web_modeling_editor.backend.models.class_diagram import ClassDiagramInput, MultiGeneratorInput, JobInput
 from besser.utilities.web_modeling_editor.backend.services.buml_to_json import domain_model_to_json, parse_buml_content, state_machine_to_json
+from besser.utilities.web_modeling_editor.backend.services.generation import GENERATOR_CONFIG, generate_output_file, export_buml_file, \
+    convert_class_diagram, generate_files, stream_zip, generate_snapshot_output, run_generation_job
+from besser.utilities.web_modeling_editor.backend.services.worker_pool import WorkerPool, WorkerPoolBusyError
+from besser.utilities.web_modeling_editor.backend.services.generation_cache import GenerationCache, generation_key
+from besser.utilities.web_modeling_editor.backend.services.diagram_session import DiagramSession, DiagramSessionStore, \
+    DiagramSessionError
+from besser.utilities.web_modeling_editor.backend.services.job_queue import JobStore, JobQueue, SUCCEEDED, \
+    FINISHED_STATES
+
+# Conversions and generations run in worker processes, so that the event loop keeps serving the other requests
+worker_pool = WorkerPool(processes=WORKER_PROCESSES, max_pending=MAX_PENDING_JOBS, timeout=JOB_TIMEOUT)
+
+# Generation results by content address (diagram, generator and options), so that unchanged diagrams are not
+# generated again; identical generations requested at the same time share one job
+generation_cache = GenerationCache(max_entries=CACHE_ENTRIES, max_bytes=CACHE_BYTES, directory=CACHE_DIR)
+generations_in_flight: dict[str, asyncio.Future] = {}
+
+# Class diagrams being edited, kept in memory with their B-UML model and updated with JSON patches
+diagram_sessions = DiagramSessionStore(max_sessions=MAX_DIAGRAM_SESSIONS, ttl=DIAGRAM_SESSION_TTL)
+
+# Long generations (e.g., building and pushing a Docker image) run as jobs, off the request path: the job table and the
+# artifacts are kept in JOBS_DIR, so the jobs survive restarts, and clients poll or stream their progress
+job_store = JobStore(JOBS_DIR)
+job_queue = JobQueue(job_store, run_generation_job, processes=JOB_PROCESSES, retention=JOB_RETENTION,
+                     heartbeat_interval=JOB_HEARTBEAT_INTERVAL)
+JOB_EVENTS_POLL_INTERVAL = 0.5
+
+# Metrics of the backend, exposed on /metrics; the jobs of the worker processes send their metric updates back with
+# their results (the stages of the conversions and generations, and the durations of the generators)
+enable_metrics(METRICS_ENABLED)
+REQUEST_DURATION = REGISTRY.histogram("besser_http_request_duration_seconds",
+                                      "Duration of the HTTP requests, until the response starts.",
+                                      ("method", "route", "status"))
+CACHE_REQUESTS = REGISTRY.counter("besser_generation_cache_requests_total",
+                                  "Generation requests, by result in the cache: hit, miss, or shared with an identical "
+                                  "generation in progress.", ("result",))
+PENDING_JOBS = REGISTRY.gauge("besser_worker_pool_pending_jobs", "Number of jobs queued or running in the worker pool.")
+CACHED_RESULTS = REGISTRY.gauge("besser_generation_cache_entries", "Number of generation results cached in memory.")
+OPEN_SESSIONS = REGISTRY.gauge("besser_diagram_sessions", "Number of open diagram sessions.")
+
+logger = logging.getLogger("besser.backend")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_queue.start()
+    yield
+    worker_pool.shutdown(wait=False)
+    job_queue.shutdown(wait=False)
+
 
 app = FastAPI(
     title="Besser Backend API",
     description="API for generating code from UML class diagrams using various generators",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Set up CORS middleware
@@ -33,112 +84,301 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Define generator mappings
-GENERATOR_CONFIG = {
-    "python": (PythonGenerator, "classes.py"),
-    "java": (JavaGenerator, "java_classes.zip"),
-    "django": (DjangoGenerator, "models.py"),
-    "pydantic": (PydanticGenerator, "pydantic_classes.py"),
-    "sqlalchemy": (SQLAlchemyGenerator, "sql_alchemy.py"),
-    "sql": (SQLGenerator, "tables.sql"),
-    "backend": (BackendGenerator, "backend.zip")
-}
+
+async def record_request_duration(request: Request, call_next):
+    """Record the duration of a request, by route template (e.g., /diagram-sessions/{session_id})."""
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    REQUEST_DURATION.observe(time.perf_counter() - start, method=request.method,
+                             route=getattr(route, "path", "unmatched"), status=response.status_code)
+    return response
+
+if METRICS_ENABLED:
+    app.middleware("http")(record_request_duration)
+
+
+async def run_job(function, *args, generator: str = ""):
+    """Run a job in the worker pool, mapping a full pool to 429, a timeout to 504 and a dead worker to 503.
+
+    When metrics are enabled, the metric updates of the job are applied in this process, and the time spent waiting
+    for a worker and transferring the arguments and result is recorded as the "queue" stage of the generator."""
+    try:
+        if not metrics_enabled():
+            return await worker_pool.run(function, *args)
+        start = time.perf_counter()
+        result, records, duration = await worker_pool.run(run_recorded, function, *args)
+        REGISTRY.replay(records)
+        STAGE_DURATION.observe(time.perf_counter() - start - duration, stage="queue", generator=generator)
+        return result
+    except WorkerPoolBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="The generation took too long.")
+    except BrokenExecutor:
+        raise HTTPException(status_code=503, detail="The worker process of the generation died.",
+                            headers={"Retry-After": "1"})
+
+
+async def run_jobs(jobs: list) -> list:
+    """Run jobs in the worker pool, no more at once than the pool can run, so that the jobs of a request do not fill
+    the pool and get answered with 429. When a job fails, the other jobs are cancelled (those already running finish
+    in their worker) and the error is raised.
+
+    Args:
+        jobs (list[tuple]): the function, the arguments and the generator name of each job.
+
+    Returns:
+        list: the results of the jobs, in order.
+    """
+    limit = asyncio.Semaphore(worker_pool.parallelism)
+    failed = asyncio.Event()
+
+    async def run_limited(function, args, generator):
+        async with limit:
+            # a job waiting for the semaphore can get it before being cancelled after the failure of another job
+            if failed.is_set():
+                raise asyncio.CancelledError()
+            try:
+                return await run_job(function, *args, generator=generator)
+            except Exception:
+                failed.set()
+                raise
+
+    tasks = [asyncio.ensure_future(run_limited(function, args, generator)) for function, args, generator in jobs]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def cached_generation(json_data: dict, generator: str) -> tuple:
+    """Get a generation result from the cache, or run the generation (once for identical concurrent requests)."""
+    key = generation_key(json_data, generator)
+    result = await generation_cache.get_async(key)
+    if result is not None:
+        CACHE_REQUESTS.inc(result="hit")
+        return result
+    while key in generations_in_flight:
+        CACHE_REQUESTS.inc(result="shared")
+        in_flight = generations_in_flight[key]
+        try:
+            return await asyncio.shield(in_flight)
+        except asyncio.CancelledError:
+            # the request running the job was cancelled: the job is run again by one of the waiting requests
+            if not in_flight.cancelled():
+                raise
+    CACHE_REQUESTS.inc(result="miss")
+    in_flight = generations_in_flight[key] = asyncio.get_running_loop().create_future()
+    try:
+        result = await run_job(generate_output_file, json_data, generator, generator=generator)
+    except asyncio.CancelledError:
+        in_flight.cancel()
+        raise
+    except Exception as e:
+        in_flight.set_exception(e)
+        # the error is raised to the waiting requests, the future does not need to be retrieved otherwise
+        in_flight.exception()
+        raise
+    else:
+        in_flight.set_result(result)
+        await generation_cache.put_async(key, result)
+        return result
+    finally:
+        del generations_in_flight[key]
+
 
 @app.post("/generate-output")
 async def generate_output(input_data: ClassDiagramInput):
-    # Create unique temporary directory for this request
-    temp_dir = tempfile.mkdtemp(prefix=f'besser_{uuid.uuid4().hex}_')
+    json_data = input_data.dict()
+    generator = input_data.generator
+    logger.debug("Generation requested", extra={"request": {
+        "generator": generator, "elements": len(input_data.elements.get("elements", {})),
+        "relationships": len(input_data.elements.get("relationships", {}))}})
+
+    if generator not in GENERATOR_CONFIG:
+        raise HTTPException(status_code=400, detail="Invalid generator type specified.")
+
     try:
-        json_data = input_data.dict()
-        print("Input data received:", json_data)
-
-        generator = input_data.generator
-        if generator not in GENERATOR_CONFIG:
-            raise HTTPException(status_code=400, detail="Invalid generator type specified.")
-
-        buml_model = process_class_diagram(json_data)
-        generator_class, _ = GENERATOR_CONFIG[generator]
-        generator_instance = generator_class(buml_model, output_dir=temp_dir)
-
-        generator_instance.generate()
-
-        # Get file name
-        _, file_name = GENERATOR_CONFIG[generator]
-
-        # Handle zip file generators
-        if generator == "java" or generator == "backend":
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-                for root, _, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        zip_file.write(file_path, os.path.relpath(file_path, temp_dir))
-            zip_buffer.seek(0)
-            # Clean up temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            return StreamingResponse(zip_buffer, media_type="application/zip", 
-                                  headers={"Content-Disposition": f"attachment; filename={file_name}"})
-
-        # For other generators, return the single file
-        output_file_path = os.path.join(temp_dir, file_name)
-        if not os.path.exists(output_file_path):
-            raise ValueError(f"{generator} generation failed: Output file was not created.")
-
-        # Read file content before deleting
-        with open(output_file_path, 'rb') as f:
-            file_content = f.read()
-        
-        # Clean up temp directory
-        shutil.rmtree(temp_dir, ignore_errors=True)
-        
-        return Response(content=file_content, media_type="text/plain", 
-                      headers={"Content-Disposition": f"attachment; filename={file_name}"})
+        file_content, file_name, media_type = await cached_generation(json_data, generator)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error during file generation or response")
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+    return Response(content=file_content, media_type=media_type,
+                    headers={"Content-Disposition": f"attachment; filename={file_name}"})
+
+@app.post("/generate-outputs")
+async def generate_outputs(input_data: MultiGeneratorInput):
+    """Run several generators on a class diagram, returned in a zip archive with a folder per generator. The diagram
+    is converted once, and the generators run in parallel in the worker processes (at most one per process)."""
+    generators = list(dict.fromkeys(input_data.generators))
+    invalid = [generator for generator in generators if generator not in GENERATOR_CONFIG]
+    if not generators or invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid generator types specified: {invalid}")
 
+    try:
+        buml_model = await run_job(convert_class_diagram, input_data.dict())
+        outputs = await run_jobs([(generate_files, (buml_model, generator), generator) for generator in generators])
+    except HTTPException:
+        raise
     except Exception as e:
-        # Ensure cleanup on error
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir, ignore_errors=True)
-        print(f"Error during file generation or response: {str(e)}")
+        logger.exception("Error during file generation or response")
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+    files = ((f"{generator}/{path}", content) for generator, output in zip(generators, outputs)
+             for path, content in output.items())
+    return StreamingResponse(stream_zip(files), media_type="application/zip",
+                             headers={"Content-Disposition": "attachment; filename=generated.zip"})
 
 @app.post("/export-buml")
 async def export_buml(input_data: ClassDiagramInput):
-    # Create unique temporary directory for this request
-    temp_dir = tempfile.mkdtemp(prefix=f'besser_{uuid.uuid4().hex}_')
     try:
-        json_data = input_data.dict()
-        elements_data = input_data.elements
-
-        if elements_data.get("type") == "StateMachineDiagram":
-            state_machine_code = process_state_machine(elements_data)
-            output_file_path = os.path.join(temp_dir, "state_machine.py")
-            with open(output_file_path, "w") as f:
-                f.write(state_machine_code)
-            with open(output_file_path, "rb") as f:
-                file_content = f.read()
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            return Response(content=file_content, media_type="text/plain",
-                          headers={"Content-Disposition": "attachment; filename=state_machine.py"})
-
-        elif elements_data.get("type") == "ClassDiagram":
-            buml_model = process_class_diagram(json_data)
-            output_file_path = os.path.join(temp_dir, "domain_model.py")
-            domain_model_to_code(model=buml_model, file_path=output_file_path)
-            with open(output_file_path, "rb") as f:
-                file_content = f.read()
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            return Response(content=file_content, media_type="text/plain",
-                          headers={"Content-Disposition": "attachment; filename=domain_model.py"})
+        file_content, file_name = await run_job(export_buml_file, input_data.dict())
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error during BUML export")
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+    return Response(content=file_content, media_type="text/plain",
+                    headers={"Content-Disposition": f"attachment; filename={file_name}"})
 
-        else:
-            raise ValueError(f"Unsupported or missing diagram type: {elements_data.get('type')}")
+def get_diagram_session(session_id: str) -> DiagramSession:
+    session = diagram_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired diagram session {session_id}")
+    return session
 
+@app.post("/diagram-sessions")
+async def create_diagram_session(input_data: ClassDiagramInput):
+    try:
+        session_id, session = diagram_sessions.create(input_data.dict()["elements"])
     except Exception as e:
-        # Ensure cleanup on error
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir, ignore_errors=True)
-        print(f"Error during BUML export: {str(e)}")
+        logger.exception("Error during diagram session creation")
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+    return {"session_id": session_id, "version": session.version}
+
+@app.get("/diagram-sessions/{session_id}")
+async def get_diagram(session_id: str):
+    session = get_diagram_session(session_id)
+    return {"session_id": session_id, "version": session.version, "elements": session.diagram}
+
+@app.patch("/diagram-sessions/{session_id}")
+async def patch_diagram(session_id: str, operations: List[Dict[str, Any]]):
+    session = get_diagram_session(session_id)
+    try:
+        version = session.apply(operations)
+    except DiagramSessionError as e:
+        raise HTTPException(status_code=400, detail=f"{str(e)} (the diagram is at version {session.version})")
+    return {"session_id": session_id, "version": version}
+
+@app.post("/diagram-sessions/{session_id}/validate")
+async def validate_diagram(session_id: str):
+    session = get_diagram_session(session_id)
+    report = session.validate()
+    return {"version": session.version, "valid": not any(report.values()), **report}
+
+@app.post("/diagram-sessions/{session_id}/generate/{generator}")
+async def generate_diagram_output(session_id: str, generator: str):
+    session = get_diagram_session(session_id)
+    if generator not in GENERATOR_CONFIG:
+        raise HTTPException(status_code=400, detail="Invalid generator type specified.")
+    try:
+        # The model is pickled now, as the patches received during the generation change it
+        snapshot = pickle.dumps(session.model)
+        file_content, file_name, media_type = await run_job(generate_snapshot_output, snapshot, generator,
+                                                            generator=generator)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error during file generation or response")
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+    return Response(content=file_content, media_type=media_type,
+                    headers={"Content-Disposition": f"attachment; filename={file_name}"})
+
+@app.delete("/diagram-sessions/{session_id}")
+async def delete_diagram_session(session_id: str):
+    diagram_sessions.delete(session_id)
+    return {"session_id": session_id}
+
+@app.post("/jobs", status_code=202)
+async def submit_job(input_data: JobInput):
+    """Queue a generation, run by the job workers. Returns the job id, to poll (GET /jobs/{job_id}) or stream
+    (GET /jobs/{job_id}/events) its progress, and download its artifact (GET /jobs/{job_id}/artifact)."""
+    if input_data.generator not in GENERATOR_CONFIG:
+        raise HTTPException(status_code=400, detail="Invalid generator type specified.")
+    if input_data.docker_image and input_data.generator != "backend":
+        raise HTTPException(status_code=400, detail="Docker images are only built by the backend generator.")
+    payload = input_data.dict()
+    if input_data.docker_image:
+        payload["docker_config_path"] = DOCKER_CONFIG_PATH
+    # The job table is a SQLite database: it is read and written in a thread, off the event loop
+    try:
+        job_id = await asyncio.to_thread(job_queue.submit, input_data.generator, payload)
+    except BrokenExecutor:
+        raise HTTPException(status_code=503, detail="The job worker processes cannot be started.",
+                            headers={"Retry-After": "1"})
+    job = await asyncio.to_thread(job_store.get, job_id)
+    return {"job_id": job_id, "status": job["status"]}
+
+async def get_job(job_id: str) -> dict:
+    job = await asyncio.to_thread(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str, after: int = 0):
+    job = await get_job(job_id)
+    return {**job, "progress": await asyncio.to_thread(job_store.events, job_id, after)}
+
+async def job_event_stream(job_id: str, after: int):
+    # The status is read before the messages, so every message of a finished job is sent before its final status
+    while True:
+        job = await asyncio.to_thread(job_store.get, job_id)
+        for event in await asyncio.to_thread(job_store.events, job_id, after):
+            after = event["sequence"]
+            yield f"id: {after}\nevent: progress\ndata: {json.dumps(event)}\n\n"
+        if job is None or job["status"] in FINISHED_STATES:
+            yield f"event: status\ndata: {json.dumps(job)}\n\n"
+            return
+        await asyncio.sleep(JOB_EVENTS_POLL_INTERVAL)
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """Stream the progress of a job as server-sent events, ending with its status once it is finished. A client
+    reconnecting with the Last-Event-ID header only receives the messages it has not received yet."""
+    await get_job(job_id)
+    after = int(request.headers.get("last-event-id") or 0)
+    return StreamingResponse(job_event_stream(job_id, after), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+@app.get("/jobs/{job_id}/artifact")
+async def download_job_artifact(job_id: str):
+    job = await get_job(job_id)
+    if job["status"] != SUCCEEDED:
+        detail = f"The job is {job['status']}" + (f": {job['error']}" if job["error"] else "")
+        raise HTTPException(status_code=409, detail=detail)
+    return FileResponse(job_store.artifact_path(job_id), media_type=job["media_type"], filename=job["file_name"])
+
+@app.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    await get_job(job_id)
+    await asyncio.to_thread(job_store.delete, job_id)
+    return {"job_id": job_id}
+
+@app.get("/metrics")
+async def metrics():
+    """The metrics of the backend, in the Prometheus text format."""
+    if not metrics_enabled():
+        raise HTTPException(status_code=404, detail="Metrics are disabled (BESSER_METRICS=0).")
+    PENDING_JOBS.set(worker_pool.pending)
+    CACHED_RESULTS.set(len(generation_cache))
+    OPEN_SESSIONS.set(len(diagram_sessions))
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.post("/get-json-model")
 async def get_json_model(buml_file: UploadFile = File(...)):
@@ -166,7 +406,7 @@ async def get_json_model(buml_file: UploadFile = File(...)):
         return wrapped_response
             
     except Exception as e:
-        print(f"Error in get_json_model: {str(e)}")
+        logger.exception("Error in get_json_model")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1,7 +1,21 @@
 from .constants import (
     VALID_PRIMITIVE_TYPES,
     VISIBILITY_MAP,
-    RELATIONSHIP_TYPES
+    RELATIONSHIP_TYPES,
+    WORKER_PROCESSES,
+    MAX_PENDING_JOBS,
+    JOB_TIMEOUT,
+    CACHE_ENTRIES,
+    CACHE_BYTES,
+    CACHE_DIR,
+    MAX_DIAGRAM_SESSIONS,
+    DIAGRAM_SESSION_TTL,
+    METRICS_ENABLED,
+    JOBS_DIR,
+    JOB_PROCESSES,
+    JOB_RETENTION,
+    JOB_HEARTBEAT_INTERVAL,
+    DOCKER_CONFIG_PATH
 )
 
 
@@ -10,4 +24,18 @@ __all__ = [
     'VALID_PRIMITIVE_TYPES',
     'VISIBILITY_MAP',
     'RELATIONSHIP_TYPES',
+    'WORKER_PROCESSES',
+    'MAX_PENDING_JOBS',
+    'JOB_TIMEOUT',
+    'CACHE_ENTRIES',
+    'CACHE_BYTES',
+    'CACHE_DIR',
+    'MAX_DIAGRAM_SESSIONS',
+    'DIAGRAM_SESSION_TTL',
+    'METRICS_ENABLED',
+    'JOBS_DIR',
+    'JOB_PROCESSES',
+    'JOB_RETENTION',
+    'JOB_HEARTBEAT_INTERVAL',
+    'DOCKER_CONFIG_PATH',
 ] 
\ No newline at end of file
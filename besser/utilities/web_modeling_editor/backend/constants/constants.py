@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 VALID_PRIMITIVE_TYPES = {
     "str": "str",
     "string": "str",
@@ -23,4 +26,36 @@ RELATIONSHIP_TYPES = {
     "unidirectional": "ClassUnidirectional",
     "composition": "ClassComposition",
     "inheritance": "ClassInheritance"
-} 
\ No newline at end of file
+} 
+
+# Worker pool running the conversions and generations (see services/worker_pool.py), configurable with environment
+# variables: number of processes (CPUs by default), maximum jobs queued or running, and seconds to wait for a job
+WORKER_PROCESSES = int(os.environ["BESSER_WORKER_PROCESSES"]) if os.environ.get("BESSER_WORKER_PROCESSES") else None
+MAX_PENDING_JOBS = int(os.environ["BESSER_MAX_PENDING_JOBS"]) if os.environ.get("BESSER_MAX_PENDING_JOBS") else None
+JOB_TIMEOUT = float(os.environ.get("BESSER_JOB_TIMEOUT", 120))
+
+# Cache of the generation results (see services/generation_cache.py): maximum number and total bytes of the results
+# kept in memory, and an optional directory keeping the results on disk
+CACHE_ENTRIES = int(os.environ.get("BESSER_CACHE_ENTRIES", 256))
+CACHE_BYTES = int(os.environ.get("BESSER_CACHE_BYTES", 256 * 2**20))
+CACHE_DIR = os.environ.get("BESSER_CACHE_DIR") or None
+
+# Diagram sessions edited with JSON patches (see services/diagram_session.py): maximum number of sessions, and seconds
+# after which an idle session is dropped
+MAX_DIAGRAM_SESSIONS = int(os.environ.get("BESSER_MAX_DIAGRAM_SESSIONS", 100))
+DIAGRAM_SESSION_TTL = float(os.environ.get("BESSER_DIAGRAM_SESSION_TTL", 3600))
+
+# Metrics of the backend, exposed on /metrics in the Prometheus text format (see besser/generators/instrumentation.py):
+# enabled unless BESSER_METRICS is 0
+METRICS_ENABLED = os.environ.get("BESSER_METRICS", "1").lower() not in ("0", "false", "no")
+
+# Queue of the long generations, run as jobs (see services/job_queue.py): directory of the job table and of the
+# artifacts (to be kept across restarts), number of job worker processes, seconds after which finished jobs are removed,
+# seconds between the heartbeats of the running jobs (the jobs of a backend missing 3 heartbeats are run again by
+# another one), and the Docker configuration file (registry credentials, image name and tag) used to build and push
+# backend images
+JOBS_DIR = os.environ.get("BESSER_JOBS_DIR") or os.path.join(tempfile.gettempdir(), "besser_jobs")
+JOB_PROCESSES = int(os.environ.get("BESSER_JOB_PROCESSES", 2))
+JOB_RETENTION = float(os.environ.get("BESSER_JOB_RETENTION", 86400))
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get("BESSER_JOB_HEARTBEAT_INTERVAL", 10))
+DOCKER_CONFIG_PATH = os.environ.get("BESSER_DOCKER_CONFIG") or None
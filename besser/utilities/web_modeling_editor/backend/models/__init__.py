@@ -1,3 +1,3 @@
-from .class_diagram import ClassDiagramInput
+from .class_diagram import ClassDiagramInput, MultiGeneratorInput, JobInput
 
-__all__ = ['ClassDiagramInput'] 
\ No newline at end of file
+__all__ = ['ClassDiagramInput', 'MultiGeneratorInput', 'JobInput']
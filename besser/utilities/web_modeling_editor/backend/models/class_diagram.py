@@ -1,6 +1,15 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 class ClassDiagramInput(BaseModel):
     elements: Dict[str, Any]
     generator: Optional[str] = None
+
+class MultiGeneratorInput(BaseModel):
+    elements: Dict[str, Any]
+    generators: List[str]
+
+class JobInput(BaseModel):
+    elements: Dict[str, Any]
+    generator: str
+    docker_image: bool = False
@@ -1,4 +1,10 @@
 from .buml_to_json import parse_buml_content, domain_model_to_json
 from .json_to_buml import process_class_diagram, process_state_machine
+from .worker_pool import WorkerPool, WorkerPoolBusyError
+from .generation_cache import GenerationCache, generation_key
+from .diagram_session import DiagramSession, DiagramSessionStore, DiagramSessionError
+from .job_queue import JobStore, JobQueue
 
-__all__ = ['parse_buml_content', 'domain_model_to_json', 'process_class_diagram', 'process_state_machine']
+__all__ = ['parse_buml_content', 'domain_model_to_json', 'process_class_diagram', 'process_state_machine',
+           'WorkerPool', 'WorkerPoolBusyError', 'GenerationCache', 'generation_key',
+           'DiagramSession', 'DiagramSessionStore', 'DiagramSessionError', 'JobStore', 'JobQueue']
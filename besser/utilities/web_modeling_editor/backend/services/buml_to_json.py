@@ -1,71 +1,70 @@
 import uuid
 from besser.BUML.metamodel.structural import (
-    Class, Property, Method, DomainModel, PrimitiveDataType,
+    Class, Property, Method, Parameter, DomainModel, PrimitiveDataType,
     Enumeration, EnumerationLiteral, BinaryAssociation, Generalization, 
-    Multiplicity, UNLIMITED_MAX_MULTIPLICITY, Constraint
+    Multiplicity, UNLIMITED_MAX_MULTIPLICITY, Constraint,
+    StringType, IntegerType, FloatType, BooleanType, TimeType, DateType, DateTimeType, TimeDeltaType
 )
+from besser.utilities.buml_loader import load_buml_code
 from besser.utilities.web_modeling_editor.backend.constants.constants import VISIBILITY_MAP, RELATIONSHIP_TYPES
 from besser.utilities.web_modeling_editor.backend.services.layout_calculator import calculate_center_point, determine_connection_direction, calculate_connection_points, calculate_path_points, calculate_relationship_bounds
+from besser.utilities.web_modeling_editor.backend.services.layout_engine import compute_layout
 import inspect
 from besser.BUML.metamodel.state_machine import (
     StateMachine, Session, Body, Event
 )
 
 
+# Names available to B-UML content without imports, and generators, whose statements are skipped
+BUML_NAMES = {
+    'Class': Class,
+    'Property': Property,
+    'Method': Method,
+    'Parameter': Parameter,
+    'PrimitiveDataType': PrimitiveDataType,
+    'BinaryAssociation': BinaryAssociation,
+    'Constraint': Constraint,
+    'Multiplicity': Multiplicity,
+    'UNLIMITED_MAX_MULTIPLICITY': UNLIMITED_MAX_MULTIPLICITY,
+    'Generalization': Generalization,
+    'Enumeration': Enumeration,
+    'EnumerationLiteral': EnumerationLiteral,
+    'DomainModel': DomainModel,
+    'StringType': StringType,
+    'IntegerType': IntegerType,
+    'FloatType': FloatType,
+    'BooleanType': BooleanType,
+    'TimeType': TimeType,
+    'DateType': DateType,
+    'DateTimeType': DateTimeType,
+    'TimeDeltaType': TimeDeltaType,
+}
+IGNORED_NAMES = ('PythonGenerator', 'DjangoGenerator', 'SQLAlchemyGenerator', 'SQLGenerator', 'RESTAPIGenerator',
+                 'BackendGenerator', 'RDFGenerator', 'JavaGenerator', 'PydanticGenerator')
+
 def parse_buml_content(content: str) -> DomainModel:
-    """Parse B-UML content from a Python file and return a DomainModel and OCL constraints."""
+    """Parse B-UML content from a Python file and return a DomainModel and OCL constraints.
+
+    The content is not executed: it is loaded by a BUMLLoader, which builds the model elements from its syntax tree
+    and rejects any statement that is not part of a B-UML model definition.
+    """
     try:
-        # Create a safe environment for eval
-        safe_globals = {
-            'Class': Class,
-            'Property': Property,
-            'Method': Method,
-            'PrimitiveDataType': PrimitiveDataType,
-            'BinaryAssociation': BinaryAssociation,
-            'Constraint': Constraint,
-            'Multiplicity': Multiplicity,
-            'UNLIMITED_MAX_MULTIPLICITY': UNLIMITED_MAX_MULTIPLICITY,
-            'Generalization': Generalization,
-            'Enumeration': Enumeration,
-            'EnumerationLiteral': EnumerationLiteral,
-            'set': set,
-            'StringType': PrimitiveDataType("str"),
-            'IntegerType': PrimitiveDataType("int"),
-            'DateType': PrimitiveDataType("date"),
-            # Add mock generators that do nothing
-            'PythonGenerator': lambda model: type('MockGenerator', (), {'generate': lambda: None}),
-            'DjangoGenerator': lambda model: type('MockGenerator', (), {'generate': lambda: None}),
-            'SQLAlchemyGenerator': lambda model: type('MockGenerator', (), {'generate': lambda: None}),
-            'SQLGenerator': lambda model: type('MockGenerator', (), {'generate': lambda: None}),
-            'RESTAPIGenerator': lambda model: type('MockGenerator', (), {'generate': lambda: None}),
-            'BackendGenerator': lambda model, **kwargs: type('MockGenerator', (), {'generate': lambda: None}),
-            'RDFGenerator': lambda model: type('MockGenerator', (), {'generate': lambda: None})
-        }
-        
+        # Load the B-UML content
+        local_vars = load_buml_code(content, "<buml>", BUML_NAMES, IGNORED_NAMES)
+
         # Create a new domain model
         domain_model = DomainModel("Generated Model")
-        
-        
-        # Execute the B-UML content in a safe environment
-        local_vars = {}
-        exec(content, safe_globals, local_vars)
-        #print("Local variables after execution:", local_vars.keys())
-        
+
         # First pass: Add all classes and enumerations
-        classes = {}
         for var_name, var_value in local_vars.items():
             if isinstance(var_value, (Class, Enumeration)):
                 domain_model.types.add(var_value)
-                classes[var_name] = var_value
             elif isinstance(var_value, Constraint):
                 domain_model.constraints.add(var_value)
-        
 
         # Second pass: Add associations and generalizations
         for var_name, var_value in local_vars.items():
             if isinstance(var_value, BinaryAssociation):
-                #print(f"Found association: {var_name} = {var_value}")
-                #print(f"Association ends: {var_value.ends}")
                 domain_model.associations.add(var_value)
             elif isinstance(var_value, Generalization):
                 domain_model.generalizations.add(var_value)
@@ -76,6 +75,21 @@ def parse_buml_content(content: str) -> DomainModel:
         print(f"Error parsing B-UML content: {e}")
         raise ValueError(f"Failed to parse B-UML content: {str(e)}")
     
+# Width of the class, enumeration and constraint elements, and height of their rows
+ELEMENT_WIDTH = 160
+ROW_HEIGHT = 30
+
+def element_height(type_obj) -> int:
+    """Height of the element of a class (a row per attribute and method), an enumeration (a row per literal) or a
+    constraint, with a row for the name."""
+    if isinstance(type_obj, Class):
+        rows = len(type_obj.attributes) + len(type_obj.methods)
+    elif isinstance(type_obj, Enumeration):
+        rows = len(type_obj.literals)
+    else:
+        rows = 0
+    return max(100, ROW_HEIGHT * (rows + 1))
+
 def domain_model_to_json(domain_model):
     """Convert a B-UML DomainModel object to JSON format matching the frontend structure."""
     elements = {}
@@ -87,41 +101,37 @@ def domain_model_to_json(domain_model):
         "height": 800  # Increased height for better visibility
     }
     
-    # Grid layout configuration
-    grid_size = {
-        "x_spacing": 300,  # Space between elements horizontally
-        "y_spacing": 200,  # Space between elements vertically
-        "max_columns": 3   # Maximum elements per row
-    }
-    
-    # Track position
-    current_column = 0
-    current_row = 0
-    
-    def get_position():
-        nonlocal current_column, current_row
-        x = -600 + (current_column * grid_size["x_spacing"])
-        y = -300 + (current_row * grid_size["y_spacing"])
-        
-        # Move to next position
-        current_column += 1
-        if current_column >= grid_size["max_columns"]:
-            current_column = 0
-            current_row += 1
-            
-        return x, y
+    # Compute the positions of the elements: generalization hierarchies in layers, and the rest by the forces of the
+    # associations and constraint links
+    diagram_elements = sorted((type_obj for type_obj in domain_model.types | domain_model.constraints
+                               if isinstance(type_obj, (Class, Enumeration, Constraint))),
+                              key=lambda type_obj: (type(type_obj).__name__, type_obj.name or ""))
+    sizes = {type_obj: (ELEMENT_WIDTH, element_height(type_obj)) for type_obj in diagram_elements}
+    links = [tuple(end.type for end in association.ends) for association in domain_model.associations
+             if len(association.ends) == 2]
+    links += [(constraint, constraint.context) for constraint in domain_model.constraints]
+    positions = compute_layout(sizes, [(generalization.specific, generalization.general)
+                                       for generalization in domain_model.generalizations], links, origin=(-600, -300))
+    if positions:
+        # Enlarge the diagram to the extent of the layout, which starts at (-600, -300)
+        right = max(x for x, _ in positions.values()) + ELEMENT_WIDTH
+        bottom = max(y + sizes[type_obj][1] for type_obj, (_, y) in positions.items())
+        default_size = {
+            "width": max(default_size["width"], right + 600),
+            "height": max(default_size["height"], bottom + 300)
+        }
 
     # First pass: Create all class and enumeration elements
     class_id_map = {}  # Store mapping between Class objects and their IDs
     
-    for type_obj in domain_model.types | domain_model.constraints:
+    for type_obj in diagram_elements:
         if isinstance(type_obj, (Class, Enumeration, Constraint)):
             # Generate UUID for the element
             element_id = str(uuid.uuid4())
             class_id_map[type_obj] = element_id
             
             # Get position for this element
-            x, y = get_position()
+            x, y = positions[type_obj]
             
             # Initialize lists for attributes and methods IDs
             attribute_ids = []
@@ -218,8 +228,8 @@ def domain_model_to_json(domain_model):
                 "bounds": {
                     "x": x,
                     "y": y,
-                    "width": 160,
-                    "height": max(100, 30 * (len(attribute_ids) + len(method_ids) + 1))
+                    "width": ELEMENT_WIDTH,
+                    "height": sizes[type_obj][1]
                 },
                 **({
                     "attributes": attribute_ids,
@@ -320,33 +330,37 @@ def domain_model_to_json(domain_model):
     for generalization in domain_model.generalizations:
         rel_id = str(uuid.uuid4())
         if generalization.general in class_id_map and generalization.specific in class_id_map:
+            source_bounds = elements[class_id_map[generalization.specific]]['bounds']
+            target_bounds = elements[class_id_map[generalization.general]]['bounds']
+            source_dir, target_dir = determine_connection_direction(source_bounds, target_bounds)
+            source_point = calculate_connection_points(source_bounds, source_dir)
+            target_point = calculate_connection_points(target_bounds, target_dir)
+            path_points = calculate_path_points(source_point, target_point, source_dir, target_dir)
             relationships[rel_id] = {
                 "id": rel_id,
                 "type": "ClassInheritance",
                 "source": {
                     "element": class_id_map[generalization.specific],
+                    "direction": source_dir,
                     "bounds": {
-                        "x": 0,
-                        "y": 0,
+                        "x": source_point['x'],
+                        "y": source_point['y'],
                         "width": 0,
                         "height": 0
                     }
                 },
                 "target": {
                     "element": class_id_map[generalization.general],
+                    "direction": target_dir,
                     "bounds": {
-                        "x": 0,
-                        "y": 0,
+                        "x": target_point['x'],
+                        "y": target_point['y'],
                         "width": 0,
                         "height": 0
                     }
                 },
-                "path": [
-                    {"x": 0, "y": 0},
-                    {"x": 50, "y": 0},
-                    {"x": 50, "y": 50},
-                    {"x": 100, "y": 50}
-                ]
+                "bounds": calculate_relationship_bounds(path_points),
+                "path": path_points
             }
 
     # Handle OCL constraint links
@@ -0,0 +1,406 @@
+import copy
+import time
+import uuid
+from typing import Any, Callable, Optional
+
+from besser.BUML.metamodel.structural import DomainModel, Class, Enumeration, BinaryAssociation, Generalization
+from besser.BUML.notations.ocl.expression_parser import OCLExpressionParser
+from besser.utilities.state_machine_runtime.session_store import InMemorySessionStore
+from besser.utilities.web_modeling_editor.backend.services.json_to_buml import build_enumeration, build_attributes, \
+    build_methods, build_relationship, generate_unique_class_name, process_diagram_constraints
+
+CLASS_TYPES = ("Class", "AbstractClass")
+
+
+class DiagramSessionError(ValueError):
+    """Error raised when a patch cannot be applied to a diagram session."""
+
+
+def _pointer(path: str) -> list:
+    """Split a JSON pointer (RFC 6901) into its unescaped tokens."""
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise DiagramSessionError(f"Invalid path {path!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+
+def _apply_operation(document: dict, operation: dict) -> Callable[[], None]:
+    """Apply an add, remove or replace operation (RFC 6902) to a JSON document, in place, and get the function
+    undoing it."""
+    op = operation.get("op")
+    if op not in ("add", "remove", "replace"):
+        raise DiagramSessionError(f"Unsupported operation {op!r}")
+    tokens = _pointer(operation.get("path", ""))
+    if not tokens:
+        raise DiagramSessionError("The root of the diagram cannot be patched")
+    parent = document
+    for token in tokens[:-1]:
+        try:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise DiagramSessionError(f"Path not found: {operation['path']}")
+    key = tokens[-1]
+    # The value is copied, so that the diagram does not share objects with the patch
+    value = copy.deepcopy(operation.get("value"))
+    if isinstance(parent, list):
+        if op == "add" and key == "-":
+            parent.append(value)
+            return parent.pop
+        try:
+            index = int(key)
+        except ValueError:
+            raise DiagramSessionError(f"Invalid array index in {operation['path']}")
+        if op == "add" and 0 <= index <= len(parent):
+            parent.insert(index, value)
+            return lambda: parent.pop(index)
+        if op != "add" and 0 <= index < len(parent):
+            previous = parent[index]
+            if op == "remove":
+                del parent[index]
+                return lambda: parent.insert(index, previous)
+            parent[index] = value
+            return lambda: parent.__setitem__(index, previous)
+        raise DiagramSessionError(f"Path not found: {operation['path']}")
+    if isinstance(parent, dict):
+        if op != "add" and key not in parent:
+            raise DiagramSessionError(f"Path not found: {operation['path']}")
+        if key in parent:
+            previous = parent[key]
+            undo = lambda: parent.__setitem__(key, previous)
+        else:
+            undo = lambda: parent.pop(key)
+        if op == "remove":
+            del parent[key]
+        else:
+            parent[key] = value
+        return undo
+    raise DiagramSessionError(f"Path not found: {operation['path']}")
+
+
+class DiagramSession:
+    """A class diagram being edited, kept in memory together with its B-UML model.
+
+    The diagram is edited with JSON patches (the add, remove and replace operations of RFC 6902) on its JSON, e.g.
+    ``{"op": "add", "path": "/elements/<id>", "value": {...}}`` to add a class or an attribute element,
+    ``{"op": "replace", "path": "/elements/<id>/name", "value": "Book"}`` to rename a class, or
+    ``{"op": "add", "path": "/relationships/<id>", "value": {...}}`` to add a relationship. Only the model elements
+    built from the patched diagram elements are updated (a class with its attributes and methods, a relationship),
+    so the cost of an edit does not depend on the size of the diagram. The classes are updated in place, so the
+    associations and generalizations referencing them stay valid.
+
+    A patch is atomic, as in RFC 6902: if an operation is invalid, or the patched diagram cannot be converted (e.g.,
+    a method returning a class that does not exist), the operations are undone, and the diagram, the model and the
+    version stay as they were.
+
+    Args:
+        diagram (dict): the class diagram JSON (the ``elements`` of a ClassDiagramInput).
+        id (str, optional): the session id. Defaults to None.
+
+    Attributes:
+        diagram (dict): the class diagram JSON.
+        id (str): the session id.
+        model (DomainModel): the B-UML model of the diagram.
+        version (int): the number of patches applied.
+        problems (dict[str, str]): the diagram elements that could not be converted, with the reason, by id.
+    """
+
+    def __init__(self, diagram: dict, id: str = None):
+        self.diagram: dict = diagram
+        self.id: str = id
+        self.version: int = 0
+        self.__reset()
+
+    def __reset(self):
+        """Build the model from the whole diagram, dropping the model elements built so far."""
+        self.model: DomainModel = DomainModel("Class Diagram")
+        self.problems: dict[str, str] = {}
+        # element id -> Class or Enumeration; class name -> element id; element id -> name given in the diagram
+        self.__classes: dict[str, Any] = {}
+        self.__names: dict[str, str] = {}
+        self.__diagram_names: dict[str, str] = {}
+        # attribute, method or literal element id -> id of its class or enumeration element
+        self.__owners: dict[str, str] = {}
+        # relationship id -> (BinaryAssociation or Generalization, source element id, target element id)
+        self.__relationships: dict[str, tuple] = {}
+        self.__element_relationships: dict[str, set] = {}
+        self.__ocl_elements: set = set()
+        self.__build()
+
+    @property
+    def elements(self) -> dict:
+        """dict: Get the elements of the diagram, by id."""
+        return self.diagram.setdefault("elements", {})
+
+    @property
+    def relationships(self) -> dict:
+        """dict: Get the relationships of the diagram, by id."""
+        return self.diagram.setdefault("relationships", {})
+
+    def __build(self):
+        self.__sync(dict.fromkeys(self.elements), dict.fromkeys(self.relationships), True)
+
+    def apply(self, operations: list) -> int:
+        """Apply a JSON patch to the diagram and update the model.
+
+        The operations are applied in order, all or none: if one of them is invalid, or the model cannot be built
+        from the patched diagram, the diagram and the model are restored.
+
+        Args:
+            operations (list[dict]): the patch operations.
+
+        Returns:
+            int: the new version of the session.
+
+        Raises:
+            DiagramSessionError: if an operation is invalid, or the patched diagram cannot be converted.
+        """
+        dirty_classes, dirty_relationships, constraints = {}, {}, False
+        rebuild = False
+        undo = []
+        syncing = False
+        try:
+            for index, operation in enumerate(operations):
+                tokens = _pointer(operation.get("path", "")) if isinstance(operation, dict) else []
+                if len(tokens) < 2 or tokens[0] not in ("elements", "relationships"):
+                    rebuild = True
+                elif tokens[0] == "relationships":
+                    dirty_relationships[tokens[1]] = None
+                else:
+                    before = self.elements.get(tokens[1])
+                    constraints |= self.__mark(tokens[1], before, dirty_classes)
+                try:
+                    undo.append(_apply_operation(self.diagram, operation))
+                except (DiagramSessionError, AttributeError) as e:
+                    raise DiagramSessionError(f"Operation {index}: {e}")
+                if len(tokens) >= 2 and tokens[0] == "elements":
+                    constraints |= self.__mark(tokens[1], self.elements.get(tokens[1]), dirty_classes)
+            syncing = True
+            if rebuild:
+                self.__reset()
+            else:
+                self.__sync(dirty_classes, dirty_relationships, constraints)
+        except Exception as e:
+            for undo_operation in reversed(undo):
+                undo_operation()
+            # The model may have been partly updated: it is built again from the restored diagram
+            if syncing:
+                self.__reset()
+            if isinstance(e, DiagramSessionError):
+                raise
+            raise DiagramSessionError(f"The diagram cannot be converted: {e}") from e
+        self.version += 1
+        return self.version
+
+    def __mark(self, element_id: str, element: Optional[dict], dirty_classes: dict) -> bool:
+        """Mark the class or enumeration affected by a change of an element; return whether constraints are."""
+        if not isinstance(element, dict):
+            owner = self.__owners.get(element_id)
+        elif element.get("type") in CLASS_TYPES or element.get("type") == "Enumeration":
+            owner = element_id
+        elif element.get("type") == "ClassOCLConstraint":
+            self.__ocl_elements.add(element_id)
+            return True
+        else:
+            owner = self.__owners.get(element_id)
+        if owner is not None or element_id in self.__classes:
+            dirty_classes[owner if owner is not None else element_id] = None
+        return element_id in self.__ocl_elements
+
+    def __sync(self, dirty_classes: dict, dirty_relationships: dict, constraints: bool):
+        elements = self.elements
+        types = self.model.types
+
+        # Removed elements, and enumerations (whose changes can change the type of any attribute)
+        enumerations_changed = False
+        for element_id in list(dirty_classes):
+            element = elements.get(element_id)
+            element_type = element.get("type") if isinstance(element, dict) else None
+            current = self.__classes.get(element_id)
+            kind = Enumeration if element_type == "Enumeration" else Class if element_type in CLASS_TYPES else None
+            if current is not None and not isinstance(current, kind or ()):
+                self.__remove_class(element_id, dirty_relationships)
+                enumerations_changed |= isinstance(current, Enumeration)
+                constraints = True
+                current = None
+            if element_type == "ClassOCLConstraint":
+                self.__ocl_elements.add(element_id)
+            if kind is Enumeration:
+                enumeration = build_enumeration(element, elements)
+                if current is not None:
+                    current.name = enumeration.name
+                    current.literals = enumeration.literals
+                    enumeration = current
+                else:
+                    types.add(enumeration)
+                    self.__classes[element_id] = enumeration
+                self.__rename(element_id, enumeration, enumeration.name)
+                self.__own(element_id, element)
+                enumerations_changed = True
+            if kind is None:
+                dirty_classes.pop(element_id)
+        if enumerations_changed:
+            dirty_classes.update((element_id, None) for element_id, cls in self.__classes.items()
+                                 if isinstance(cls, Class))
+
+        # Classes are created or renamed first, so that the methods can refer to any of them
+        classes = []
+        for element_id in dirty_classes:
+            element = elements[element_id]
+            if element.get("type") not in CLASS_TYPES:
+                continue
+            cls = self.__classes.get(element_id)
+            if cls is None:
+                cls = Class(name=element.get("name"))
+                types.add(cls)
+                self.__classes[element_id] = cls
+            if self.__diagram_names.get(element_id) != element.get("name"):
+                self.__diagram_names[element_id] = element.get("name")
+                self.__rename(element_id, cls, generate_unique_class_name(element.get("name"), self.__names))
+                dirty_relationships.update(dict.fromkeys(self.__element_relationships.get(element_id, ())))
+                constraints = True
+            cls.is_abstract = element.get("type") == "AbstractClass"
+            classes.append((element_id, element, cls))
+        types_by_name = {name: self.__classes[element_id] for name, element_id in self.__names.items()} \
+            if classes else {}
+        for element_id, element, cls in classes:
+            cls.attributes.clear()
+            cls.attributes.update(build_attributes(element, elements, types_by_name))
+            cls.methods.clear()
+            cls.methods.update(build_methods(element, elements, types_by_name))
+            self.__own(element_id, element)
+
+        for relationship_id in dirty_relationships:
+            self.__sync_relationship(relationship_id)
+
+        if constraints:
+            self.__ocl_elements = {element_id for element_id in self.__ocl_elements if element_id in elements}
+            ocl_elements = {element_id: elements[element_id] for element_id in self.__ocl_elements}
+            self.model.constraints = process_diagram_constraints(ocl_elements, self.model)
+
+    def __rename(self, element_id: str, cls: Any, name: str):
+        if self.__names.get(cls.name) == element_id:
+            del self.__names[cls.name]
+        cls.name = name
+        self.__names[name] = element_id
+
+    def __own(self, element_id: str, element: dict):
+        for child_id in element.get("attributes", []) + element.get("methods", []):
+            self.__owners[child_id] = element_id
+
+    def __remove_class(self, element_id: str, dirty_relationships: dict):
+        cls = self.__classes.pop(element_id)
+        self.model.types.discard(cls)
+        if self.__names.get(cls.name) == element_id:
+            del self.__names[cls.name]
+        self.__diagram_names.pop(element_id, None)
+        dirty_relationships.update(dict.fromkeys(self.__element_relationships.get(element_id, ())))
+
+    def __sync_relationship(self, relationship_id: str):
+        previous = self.__relationships.pop(relationship_id, None)
+        self.problems.pop(relationship_id, None)
+        if previous is not None:
+            built, source_id, target_id = previous
+            if isinstance(built, BinaryAssociation):
+                self.model.associations.discard(built)
+                for end in built.ends:
+                    end.type._delete_association(association=built)
+            else:
+                self.model.generalizations.discard(built)
+                built.general._delete_generalization(generalization=built)
+                built.specific._delete_generalization(generalization=built)
+            self.__element_relationships[source_id].discard(relationship_id)
+            self.__element_relationships[target_id].discard(relationship_id)
+
+        relationship = self.relationships.get(relationship_id)
+        if not isinstance(relationship, dict) or relationship.get("type") == "ClassOCLLink":
+            return
+        source, target = relationship.get("source"), relationship.get("target")
+        if not relationship.get("type") or not source or not target:
+            self.problems[relationship_id] = "Missing type, source or target"
+            return
+        source_id, target_id = source.get("element"), target.get("element")
+        source_class, target_class = self.__classes.get(source_id), self.__classes.get(target_id)
+        # The relationship is registered on its ends even if it cannot be built, to be built again when they change
+        self.__element_relationships.setdefault(source_id, set()).add(relationship_id)
+        self.__element_relationships.setdefault(target_id, set()).add(relationship_id)
+        if not isinstance(source_class, Class) or not isinstance(target_class, Class):
+            self.problems[relationship_id] = "The source or target is not a class"
+            return
+        try:
+            built = build_relationship(relationship, source_class, target_class)
+        except ValueError as e:
+            self.problems[relationship_id] = str(e)
+            return
+        if isinstance(built, BinaryAssociation):
+            self.model.associations.add(built)
+        elif isinstance(built, Generalization):
+            self.model.generalizations.add(built)
+        else:
+            return
+        self.__relationships[relationship_id] = (built, source_id, target_id)
+
+    def validate(self) -> dict:
+        """Check the live model: the relationships that could not be converted, and the OCL constraints that do not
+        parse against the model.
+
+        Returns:
+            dict: the problems of the elements (``elements``) and the errors of the constraints (``constraints``), by id
+            or name.
+        """
+        parser = OCLExpressionParser(self.model)
+        errors = {}
+        for constraint in sorted(self.model.constraints, key=lambda c: c.name):
+            try:
+                parser.parse(constraint)
+            except ValueError as e:
+                errors[constraint.name] = str(e)
+        return {"elements": dict(self.problems), "constraints": errors}
+
+
+class DiagramSessionStore:
+    """The diagram sessions of the backend, by id, bounded in number and idle time (the least recently used sessions
+    are dropped first). The sessions are kept in an ``InMemorySessionStore``, the store of the state machine runtime.
+
+    Args:
+        max_sessions (int, optional): maximum number of sessions. Defaults to 100.
+        ttl (float, optional): seconds after which an idle session is dropped. Defaults to None (no expiry).
+        clock (Callable[[], float], optional): the clock measuring the idle time. Defaults to time.monotonic.
+    """
+
+    def __init__(self, max_sessions: int = 100, ttl: float = None, clock: Callable[[], float] = time.monotonic):
+        self.__sessions: InMemorySessionStore = InMemorySessionStore(max_sessions=max_sessions, ttl=ttl, clock=clock)
+
+    @property
+    def max_sessions(self) -> int:
+        """int: Get the maximum number of sessions."""
+        return self.__sessions.max_sessions
+
+    @property
+    def ttl(self) -> float:
+        """float: Get the seconds after which an idle session is dropped."""
+        return self.__sessions.ttl
+
+    def create(self, diagram: dict) -> tuple:
+        """Create a session.
+
+        Args:
+            diagram (dict): the class diagram JSON.
+
+        Returns:
+            tuple[str, DiagramSession]: the session id and the session.
+        """
+        session = DiagramSession(diagram, uuid.uuid4().hex)
+        self.__sessions.put(session)
+        return session.id, session
+
+    def get(self, session_id: str) -> Optional[DiagramSession]:
+        """Get a session by id (None if it does not exist or has expired)."""
+        return self.__sessions.get(session_id)
+
+    def delete(self, session_id: str):
+        """Delete a session."""
+        self.__sessions.delete(session_id)
+
+    def __len__(self) -> int:
+        return len(self.__sessions)
@@ -0,0 +1,247 @@
+import io
+import os
+import pickle
+import tempfile
+import zipfile
+from typing import Callable, Iterable, Iterator
+
+from besser.utilities.buml_code_builder import domain_model_to_code
+from besser.BUML.metamodel.structural import DomainModel
+from besser.generators import MemorySink, ZipSink, span
+from besser.generators.django import DjangoGenerator
+from besser.generators.python_classes import PythonGenerator
+from besser.generators.java_classes import JavaGenerator
+from besser.generators.pydantic_classes import PydanticGenerator
+from besser.generators.sql_alchemy import SQLAlchemyGenerator
+from besser.generators.sql import SQLGenerator
+from besser.generators.backend import BackendGenerator
+
+from besser.utilities.web_modeling_editor.backend.services.json_to_buml import process_class_diagram, process_state_machine
+from besser.utilities.web_modeling_editor.backend.services.job_queue import JobStore
+
+# Define generator mappings
+GENERATOR_CONFIG = {
+    "python": (PythonGenerator, "classes.py"),
+    "java": (JavaGenerator, "java_classes.zip"),
+    "django": (DjangoGenerator, "models.py"),
+    "pydantic": (PydanticGenerator, "pydantic_classes.py"),
+    "sqlalchemy": (SQLAlchemyGenerator, "sql_alchemy.py"),
+    "sql": (SQLGenerator, "tables.sql"),
+    "backend": (BackendGenerator, "backend.zip")
+}
+
+
+# The functions below run in the worker processes of the backend: they only take and return picklable values.
+# Generators write to in-memory sinks, so no file is written to disk.
+
+def generate_output_file(json_data: dict, generator: str) -> tuple:
+    """Convert a class diagram and run a generator on it.
+
+    Args:
+        json_data (dict): the class diagram input (elements and generator).
+        generator (str): the generator name, a key of GENERATOR_CONFIG.
+
+    Returns:
+        tuple[bytes, str, str]: the content, file name and media type of the output.
+    """
+    return generate_model_output(process_class_diagram(json_data), generator)
+
+
+def generate_model_output(buml_model: DomainModel, generator: str) -> tuple:
+    """Run a generator on a B-UML model.
+
+    Args:
+        buml_model (DomainModel): the B-UML model.
+        generator (str): the generator name, a key of GENERATOR_CONFIG.
+
+    Returns:
+        tuple[bytes, str, str]: the content, file name and media type of the output.
+    """
+    generator_class, file_name = GENERATOR_CONFIG[generator]
+    generator_instance = generator_class(buml_model)
+
+    # Handle zip file generators: the files are streamed into the archive as they are generated
+    if generator == "java" or generator == "backend":
+        zip_buffer = io.BytesIO()
+        generator_instance.sink = ZipSink(zip_buffer)
+        with span("generate", generator=generator):
+            generator_instance.generate()
+        with span("package", generator=generator):
+            generator_instance.sink.close()
+            return zip_buffer.getvalue(), file_name, "application/zip"
+
+    # For other generators, return the single file
+    generator_instance.sink = MemorySink()
+    with span("generate", generator=generator):
+        generator_instance.generate()
+    if file_name not in generator_instance.sink.files:
+        raise ValueError(f"{generator} generation failed: Output file was not created.")
+    return generator_instance.sink.files[file_name], file_name, "text/plain"
+
+
+def generate_snapshot_output(snapshot: bytes, generator: str) -> tuple:
+    """Run a generator on a pickled B-UML model, a snapshot of a model that keeps changing in the backend.
+
+    Args:
+        snapshot (bytes): the pickled B-UML model.
+        generator (str): the generator name, a key of GENERATOR_CONFIG.
+
+    Returns:
+        tuple[bytes, str, str]: the content, file name and media type of the output.
+    """
+    with span("unpickle", generator=generator):
+        buml_model = pickle.loads(snapshot)
+    return generate_model_output(buml_model, generator)
+
+
+def convert_class_diagram(json_data: dict) -> DomainModel:
+    """Convert a class diagram into a B-UML model, to be shared by several generation jobs.
+
+    Args:
+        json_data (dict): the class diagram input.
+
+    Returns:
+        DomainModel: the B-UML model.
+    """
+    return process_class_diagram(json_data)
+
+
+def generate_files(buml_model: DomainModel, generator: str) -> dict:
+    """Run a generator on a B-UML model, keeping the generated files in memory.
+
+    Args:
+        buml_model (DomainModel): the B-UML model.
+        generator (str): the generator name, a key of GENERATOR_CONFIG.
+
+    Returns:
+        dict[str, bytes]: the content of the generated files, by path.
+    """
+    generator_class, _ = GENERATOR_CONFIG[generator]
+    generator_instance = generator_class(buml_model)
+    generator_instance.sink = MemorySink()
+    with span("generate", generator=generator):
+        generator_instance.generate()
+    return generator_instance.sink.files
+
+
+def generate_docker_output(buml_model: DomainModel, docker_config_path: str = None,
+                           progress: Callable[[str], None] = None) -> tuple:
+    """Run the backend generator with the Docker image generation. The files are generated in a temporary directory,
+    the build context of the image, and returned in a zip archive.
+
+    Args:
+        buml_model (DomainModel): the B-UML model.
+        docker_config_path (str, optional): the Docker configuration file (registry credentials, image name and tag).
+            Without it, the image is not built, and the archive contains the Dockerfile and a script building it.
+        progress (Callable[[str], None], optional): receives the messages of the Docker build and push.
+
+    Returns:
+        tuple[bytes, str, str]: the content, file name and media type of the archive.
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        generator = BackendGenerator(buml_model, output_dir=output_dir, docker_image=True,
+                                     docker_config_path=docker_config_path, progress=progress)
+        with span("generate", generator="backend"):
+            generator.generate()
+        files = []
+        for directory, _, file_names in os.walk(output_dir):
+            for file_name in sorted(file_names):
+                path = os.path.join(directory, file_name)
+                with open(path, "rb") as f:
+                    files.append((os.path.relpath(path, output_dir).replace(os.sep, "/"), f.read()))
+    return b"".join(stream_zip(files)), GENERATOR_CONFIG["backend"][1], "application/zip"
+
+
+def run_generation_job(directory: str, job_id: str, owner: str = None):
+    """Run a generation job of the job queue, in a job worker process. The progress of the job, and its artifact or
+    error, are written to the job table.
+
+    Args:
+        directory (str): the directory of the job table (see JobStore).
+        job_id (str): the job id.
+        owner (str, optional): the owner id of the job queue (see JobQueue). Defaults to None.
+    """
+    store = JobStore(directory)
+    payload = store.start(job_id, owner)
+    if payload is None:
+        return
+    try:
+        generator = payload["generator"]
+        store.progress(job_id, "Converting the class diagram")
+        buml_model = process_class_diagram(payload)
+        store.progress(job_id, f"Running the {generator} generator")
+        if payload.get("docker_image"):
+            result = generate_docker_output(buml_model, payload.get("docker_config_path"),
+                                            lambda message: store.progress(job_id, message))
+        else:
+            result = generate_model_output(buml_model, generator)
+        store.finish(job_id, *result)
+    except Exception as e:
+        store.fail(job_id, str(e))
+
+
+class _ZipStream(io.RawIOBase):
+    """A write-only, unseekable file collecting the bytes written by a zip archive until they are sent."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks: list = []
+        self.__position: int = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.__position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.__position
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip(files: Iterable[tuple], compression: int = zipfile.ZIP_DEFLATED) -> Iterator[bytes]:
+    """Build a zip archive, yielding its bytes entry by entry instead of building the whole archive first.
+
+    Args:
+        files (Iterable[tuple[str, bytes]]): the path and content of the files.
+        compression (int, optional): the compression method. Defaults to zipfile.ZIP_DEFLATED.
+
+    Returns:
+        Iterator[bytes]: the chunks of the archive.
+    """
+    stream = _ZipStream()
+    # The span includes the time to send the chunks, as they are produced when the response asks for them
+    with span("stream"), zipfile.ZipFile(stream, "w", compression) as archive:
+        for path, content in files:
+            archive.writestr(path, content)
+            yield stream.take()
+    yield stream.take()
+
+
+def export_buml_file(json_data: dict) -> tuple:
+    """Convert a class or state machine diagram into B-UML Python code.
+
+    Args:
+        json_data (dict): the diagram input.
+
+    Returns:
+        tuple[bytes, str]: the code and the file name.
+    """
+    elements_data = json_data["elements"]
+    if elements_data.get("type") == "StateMachineDiagram":
+        return process_state_machine(elements_data).encode(), "state_machine.py"
+
+    elif elements_data.get("type") == "ClassDiagram":
+        buml_model = process_class_diagram(json_data)
+        sink = MemorySink()
+        domain_model_to_code(model=buml_model, file_path="domain_model.py", sink=sink)
+        return sink.files["domain_model.py"], "domain_model.py"
+
+    else:
+        raise ValueError(f"Unsupported or missing diagram type: {elements_data.get('type')}")
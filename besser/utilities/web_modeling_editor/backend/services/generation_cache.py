@@ -0,0 +1,238 @@
+import asyncio
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Keys of the diagram JSON that only describe the layout, and do not change the generated code
+LAYOUT_KEYS = frozenset({"bounds", "path"})
+
+
+def _strip_layout(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _strip_layout(item) for key, item in value.items() if key not in LAYOUT_KEYS}
+    if isinstance(value, list):
+        return [_strip_layout(item) for item in value]
+    return value
+
+
+def generation_key(json_data: dict, generator: str, options: dict = None) -> str:
+    """Compute the content address of a generation: a hash of the canonical JSON of the diagram (without its layout),
+    the generator name and its options.
+
+    Args:
+        json_data (dict): the diagram input.
+        generator (str): the generator name.
+        options (dict, optional): the options of the generator.
+
+    Returns:
+        str: the SHA-256 hex digest.
+    """
+    canonical = json.dumps([_strip_layout(json_data.get("elements")), generator, options or {}],
+                           sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class GenerationCache:
+    """A cache of generation results, by content address: a bounded in-memory LRU tier, and an optional disk tier.
+
+    Results evicted from memory stay on disk (if a directory is given), from where they are loaded back into memory
+    when requested again. The event loop uses ``get_async`` and ``put_async``, which read and write the disk tier in a
+    thread. The files of the disk tier are listed once, when the cache is created; then the cache keeps their sizes
+    and their order of use up to date itself, so the directory is meant to be used by one cache at a time.
+
+    Args:
+        max_entries (int, optional): maximum number of results in memory. Defaults to 256.
+        max_bytes (int, optional): maximum total size of the results in memory. Defaults to 256 MiB.
+        directory (str, optional): directory of the disk tier. Defaults to None (no disk tier).
+        max_disk_bytes (int, optional): maximum total size of the disk tier; the oldest files are removed beyond it.
+            Defaults to 1 GiB.
+
+    Attributes:
+        max_entries (int): maximum number of results in memory.
+        max_bytes (int): maximum total size of the results in memory.
+        directory (str): directory of the disk tier.
+        max_disk_bytes (int): maximum total size of the disk tier.
+        hits (int): number of results found in the cache.
+        misses (int): number of results not found in the cache.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 256 * 2**20, directory: str = None,
+                 max_disk_bytes: int = 2**30):
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.directory: str = directory
+        self.max_disk_bytes: int = max_disk_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__entries: OrderedDict = OrderedDict()
+        self.__bytes: int = 0
+        self.__lock: threading.Lock = threading.Lock()
+        # size of the file of each result of the disk tier, from the least to the most recently used
+        self.__disk: OrderedDict = OrderedDict()
+        self.__disk_bytes: int = 0
+        self.__disk_lock: threading.Lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self.__load_disk_index()
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Get a result, from memory or from the disk tier.
+
+        Args:
+            key (str): the content address.
+
+        Returns:
+            tuple: the result, or None if it is not cached.
+        """
+        result = self.__get_memory(key)
+        if result is not None:
+            return result
+        return self.__loaded(key, self.__read(key))
+
+    async def get_async(self, key: str) -> Optional[tuple]:
+        """Get a result, from memory or from the disk tier, read in a thread.
+
+        Args:
+            key (str): the content address.
+
+        Returns:
+            tuple: the result, or None if it is not cached.
+        """
+        result = self.__get_memory(key)
+        if result is not None:
+            return result
+        return self.__loaded(key, await asyncio.to_thread(self.__read, key) if self.directory is not None else None)
+
+    def put(self, key: str, result: tuple):
+        """Cache a result.
+
+        Args:
+            key (str): the content address.
+            result (tuple): the result, made of bytes and strings.
+        """
+        self.__put_memory(key, result)
+        self.__write(key, result)
+
+    async def put_async(self, key: str, result: tuple):
+        """Cache a result, written to the disk tier in a thread.
+
+        Args:
+            key (str): the content address.
+            result (tuple): the result, made of bytes and strings.
+        """
+        self.__put_memory(key, result)
+        if self.directory is not None:
+            await asyncio.to_thread(self.__write, key, result)
+
+    def __get_memory(self, key: str) -> Optional[tuple]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def __loaded(self, key: str, result: Optional[tuple]) -> Optional[tuple]:
+        """Count a result read from the disk tier (or not found), and keep it in memory."""
+        with self.__lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.__insert(key, result, _size(result))
+        return result
+
+    def __put_memory(self, key: str, result: tuple):
+        size = _size(result)
+        with self.__lock:
+            self.__insert(key, result, size)
+
+    def __insert(self, key: str, result: tuple, size: int):
+        if size > self.max_bytes:
+            return
+        previous = self.__entries.pop(key, None)
+        if previous is not None:
+            self.__bytes -= previous[1]
+        self.__entries[key] = (result, size)
+        self.__bytes += size
+        while len(self.__entries) > self.max_entries or self.__bytes > self.max_bytes:
+            _, (_, evicted_size) = self.__entries.popitem(last=False)
+            self.__bytes -= evicted_size
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def __read(self, key: str) -> Optional[tuple]:
+        if self.directory is None:
+            return None
+        with self.__disk_lock:
+            if key not in self.__disk:
+                return None
+        try:
+            with open(self.__path(key), "rb") as f:
+                result = pickle.load(f)
+            # The modification time keeps the order of use of the files for the next cache on the directory
+            os.utime(self.__path(key))
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.__forget(key)
+            return None
+        with self.__disk_lock:
+            if key in self.__disk:
+                self.__disk.move_to_end(key)
+        return result
+
+    def __write(self, key: str, result: tuple):
+        if self.directory is None:
+            return
+        # The file is written under a temporary name and renamed, so readers never see a partial file
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as f:
+            pickle.dump(result, f)
+            size = f.tell()
+        os.replace(temp_path, self.__path(key))
+        with self.__disk_lock:
+            self.__disk_bytes += size - self.__disk.pop(key, 0)
+            self.__disk[key] = size
+            evicted = []
+            while self.__disk_bytes > self.max_disk_bytes:
+                evicted_key, evicted_size = self.__disk.popitem(last=False)
+                self.__disk_bytes -= evicted_size
+                evicted.append(evicted_key)
+        for evicted_key in evicted:
+            try:
+                os.remove(self.__path(evicted_key))
+            except OSError:
+                pass
+
+    def __forget(self, key: str):
+        with self.__disk_lock:
+            self.__disk_bytes -= self.__disk.pop(key, 0)
+
+    def __load_disk_index(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                files.append((stat.st_mtime_ns, entry.name[:-len(".pkl")], stat.st_size))
+        for _, key, size in sorted(files):
+            self.__disk[key] = size
+            self.__disk_bytes += size
+
+    def clear(self):
+        """Remove every result from memory (the disk tier is kept)."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+def _size(result: tuple) -> int:
+    return sum(len(item) for item in result if isinstance(item, (bytes, str)))
@@ -0,0 +1,435 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor
+from contextlib import closing
+from typing import Callable, Optional
+
+# States of a job: queued until a worker takes it, then running until it succeeds (with an artifact) or fails
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+FINISHED_STATES = (SUCCEEDED, FAILED)
+# The job ids are the hex of a UUID: other ids are unknown, and never used to build a path
+_JOB_ID = re.compile("[0-9a-f]{32}")
+# Number of missed heartbeats after which a running job is considered interrupted
+STALE_HEARTBEATS = 3
+
+logger = logging.getLogger("besser.jobs")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    generator TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    error TEXT,
+    file_name TEXT,
+    media_type TEXT,
+    owner TEXT,
+    heartbeat REAL
+);
+CREATE TABLE IF NOT EXISTS job_events (
+    sequence INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    time REAL NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_events_job ON job_events (job_id, sequence);
+"""
+
+_COLUMNS = ("id", "generator", "status", "created", "started", "finished", "error", "file_name", "media_type")
+
+
+class JobStore:
+    """The table of the generation jobs, in a SQLite database, with the artifacts of the finished jobs as files next
+    to it. The jobs survive the restarts of the backend.
+
+    The store is shared by the backend and the job worker processes: each call opens its own connection, and the
+    database is in write-ahead logging mode, so that reading the jobs is not blocked by the workers updating them.
+
+    Args:
+        directory (str): the directory of the database (jobs.db) and of the artifacts.
+
+    Attributes:
+        directory (str): the directory of the database and of the artifacts.
+        path (str): the path of the database.
+    """
+
+    def __init__(self, directory: str):
+        self.directory: str = directory
+        self.path: str = os.path.join(directory, "jobs.db")
+        os.makedirs(os.path.join(directory, "artifacts"), exist_ok=True)
+        with closing(self.__connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            # the tables created before the jobs had an owner
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner", "TEXT"), ("heartbeat", "REAL")):
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            connection.commit()
+
+    def __connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def __execute(self, statement: str, parameters: tuple = ()) -> sqlite3.Cursor:
+        with closing(self.__connect()) as connection, connection:
+            return connection.execute(statement, parameters)
+
+    def __query(self, statement: str, parameters: tuple = ()) -> list:
+        with closing(self.__connect()) as connection:
+            return connection.execute(statement, parameters).fetchall()
+
+    def artifact_path(self, job_id: str) -> str:
+        """Get the path of the artifact of a job.
+
+        Args:
+            job_id (str): the job id.
+
+        Returns:
+            str: the path of the artifact.
+
+        Raises:
+            ValueError: if the job id is not a job id of the store.
+        """
+        if not _JOB_ID.fullmatch(job_id):
+            raise ValueError(f"Invalid job id {job_id!r}")
+        return os.path.join(self.directory, "artifacts", job_id)
+
+    def create(self, generator: str, payload: dict) -> str:
+        """Add a queued job.
+
+        Args:
+            generator (str): the generator name.
+            payload (dict): the input of the job (the class diagram input and the options of the generator).
+
+        Returns:
+            str: the job id.
+        """
+        job_id = uuid.uuid4().hex
+        self.__execute("INSERT INTO jobs (id, generator, payload, status, created) VALUES (?, ?, ?, ?, ?)",
+                       (job_id, generator, json.dumps(payload), QUEUED, time.time()))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Get a job, without its payload.
+
+        Args:
+            job_id (str): the job id.
+
+        Returns:
+            dict: the id, generator, status, times (created, started, finished), error, and file name and media type
+            of the artifact of the job, or None if there is no such job.
+        """
+        if not _JOB_ID.fullmatch(job_id):
+            return None
+        rows = self.__query(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,))
+        return dict(zip(_COLUMNS, rows[0])) if rows else None
+
+    def start(self, job_id: str, owner: str = None) -> Optional[dict]:
+        """Mark a queued job as running.
+
+        Args:
+            job_id (str): the job id.
+            owner (str, optional): the id of the job queue running the job, which keeps its heartbeat. Defaults to
+                None (no owner: the job is considered interrupted by any job queue starting).
+
+        Returns:
+            dict: the payload of the job, or None if the job is not queued (e.g., deleted or already taken).
+        """
+        with closing(self.__connect()) as connection, connection:
+            now = time.time()
+            updated = connection.execute("UPDATE jobs SET status = ?, started = ?, owner = ?, heartbeat = ? "
+                                         "WHERE id = ? AND status = ?",
+                                         (RUNNING, now, owner, now if owner else None, job_id, QUEUED)).rowcount
+            if not updated:
+                return None
+            payload, = connection.execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(payload)
+
+    def progress(self, job_id: str, message: str):
+        """Add a progress message to a job.
+
+        Args:
+            job_id (str): the job id.
+            message (str): the message.
+        """
+        self.__execute("INSERT INTO job_events (job_id, time, message) VALUES (?, ?, ?)",
+                       (job_id, time.time(), message))
+
+    def events(self, job_id: str, after: int = 0) -> list:
+        """Get the progress messages of a job.
+
+        Args:
+            job_id (str): the job id.
+            after (int, optional): only get the messages after this sequence number. Defaults to 0 (all messages).
+
+        Returns:
+            list[dict]: the sequence number, time and text of the messages, in order.
+        """
+        rows = self.__query("SELECT sequence, time, message FROM job_events WHERE job_id = ? AND sequence > ? "
+                            "ORDER BY sequence", (job_id, after))
+        return [{"sequence": sequence, "time": at, "message": message} for sequence, at, message in rows]
+
+    def finish(self, job_id: str, content: bytes, file_name: str, media_type: str):
+        """Mark a job as succeeded, with its artifact.
+
+        Args:
+            job_id (str): the job id.
+            content (bytes): the content of the artifact.
+            file_name (str): the file name of the artifact.
+            media_type (str): the media type of the artifact.
+        """
+        # The file is written under a temporary name and renamed, so the artifact of a job is never partial
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.join(self.directory, "artifacts"), suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, self.artifact_path(job_id))
+        updated = self.__execute("UPDATE jobs SET status = ?, finished = ?, file_name = ?, media_type = ? "
+                                 "WHERE id = ?", (SUCCEEDED, time.time(), file_name, media_type, job_id)).rowcount
+        if not updated:
+            # The job was deleted while it was running
+            os.remove(self.artifact_path(job_id))
+
+    def fail(self, job_id: str, error: str):
+        """Mark a job as failed.
+
+        Args:
+            job_id (str): the job id.
+            error (str): the error message.
+        """
+        self.__execute("UPDATE jobs SET status = ?, finished = ?, error = ? WHERE id = ? AND status IN (?, ?)",
+                       (FAILED, time.time(), error, job_id, QUEUED, RUNNING))
+
+    def heartbeat(self, owner: str):
+        """Record that the running jobs of a job queue are still running.
+
+        Args:
+            owner (str): the id of the job queue.
+        """
+        self.__execute("UPDATE jobs SET heartbeat = ? WHERE owner = ? AND status = ?", (time.time(), owner, RUNNING))
+
+    def requeue_interrupted(self, stale_after: float) -> list:
+        """Queue again the jobs left running by a stopped backend: the running jobs without an owner, or whose owner
+        has not recorded a heartbeat for a time. The jobs of the other running backends are left to them.
+
+        Args:
+            stale_after (float): seconds without a heartbeat after which a running job is interrupted.
+
+        Returns:
+            list[str]: the ids of the jobs queued again, oldest first.
+        """
+        stale = "status = ? AND (heartbeat IS NULL OR heartbeat < ?)"
+        requeued = []
+        with closing(self.__connect()) as connection, connection:
+            # The job is queued again only if it is still stale, so that a job is not taken by two backends
+            deadline = time.time() - stale_after
+            for job_id, in connection.execute(f"SELECT id FROM jobs WHERE {stale} ORDER BY created",
+                                              (RUNNING, deadline)).fetchall():
+                if connection.execute(f"UPDATE jobs SET status = ?, started = NULL, owner = NULL, heartbeat = NULL "
+                                      f"WHERE id = ? AND {stale}", (QUEUED, job_id, RUNNING, deadline)).rowcount:
+                    requeued.append(job_id)
+        return requeued
+
+    def queued(self) -> list:
+        """Get the jobs waiting for a worker.
+
+        Returns:
+            list[str]: the ids of the queued jobs, oldest first.
+        """
+        return [job_id for job_id, in self.__query("SELECT id FROM jobs WHERE status = ? ORDER BY created",
+                                                   (QUEUED,))]
+
+    def delete(self, job_id: str):
+        """Remove a job, with its progress messages and its artifact.
+
+        Args:
+            job_id (str): the job id.
+
+        Raises:
+            ValueError: if the job id is not a job id of the store.
+        """
+        artifact_path = self.artifact_path(job_id)
+        self.__execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        self.__execute("DELETE FROM job_events WHERE job_id = ?", (job_id,))
+        try:
+            os.remove(artifact_path)
+        except OSError:
+            pass
+
+    def delete_finished(self, before: float):
+        """Remove the jobs finished before a time.
+
+        Args:
+            before (float): the time, in seconds since the epoch.
+        """
+        rows = self.__query("SELECT id FROM jobs WHERE status IN (?, ?) AND finished < ?", (*FINISHED_STATES, before))
+        for job_id, in rows:
+            self.delete(job_id)
+
+
+class JobQueue:
+    """Runs the jobs of a ``JobStore`` in a pool of worker processes, for the generations too long to be run while a
+    request waits (e.g., building and pushing a Docker image).
+
+    The runner is called in a worker with the directory of the store, the job id and the owner id of the queue. It
+    takes the job with ``JobStore.start``, and writes its progress, artifact or error to the store, from where the
+    backend reads them.
+
+    Several backends can share a store: each queue has its own owner id, and records a heartbeat of its running jobs
+    every ``heartbeat_interval`` seconds. The running jobs whose owner missed ``STALE_HEARTBEATS`` heartbeats (e.g.,
+    because its backend stopped) are queued and run again, when a queue starts and at each heartbeat; the jobs still
+    queued when a backend stops are run when a queue starts.
+
+    If a worker process dies (e.g., killed for using too much memory), its jobs fail, and the queue starts new worker
+    processes for the next jobs.
+
+    Args:
+        store (JobStore): the job table.
+        runner (Callable[[str, str, str], None]): the function running a job, defined at module level so that it can
+            be pickled.
+        processes (int, optional): number of worker processes. Defaults to 1.
+        retention (float, optional): seconds after which finished jobs and their artifacts are removed. Defaults to
+            one day.
+        heartbeat_interval (float, optional): seconds between the heartbeats of the running jobs. Defaults to 10.
+        executor_factory (Callable[[int], Executor], optional): creates the executor given the number of processes.
+            Defaults to ProcessPoolExecutor.
+
+    Attributes:
+        store (JobStore): the job table.
+        processes (int): number of worker processes.
+        retention (float): seconds after which finished jobs are removed.
+        heartbeat_interval (float): seconds between the heartbeats of the running jobs.
+        owner (str): the owner id of the queue, recorded in the jobs it runs.
+    """
+
+    def __init__(self, store: JobStore, runner: Callable[[str, str, str], None], processes: int = 1,
+                 retention: float = 86400, heartbeat_interval: float = 10,
+                 executor_factory: Callable[[int], Executor] = None):
+        self.store: JobStore = store
+        self.processes: int = processes
+        self.retention: float = retention
+        self.heartbeat_interval: float = heartbeat_interval
+        self.owner: str = uuid.uuid4().hex
+        self.__runner: Callable[[str, str, str], None] = runner
+        self.__executor_factory: Callable[[int], Executor] = executor_factory or \
+            (lambda workers: ProcessPoolExecutor(max_workers=workers))
+        self.__executor: Executor = None
+        self.__heartbeat: threading.Thread = None
+        self.__stopped: threading.Event = threading.Event()
+        self.__lock: threading.Lock = threading.Lock()
+
+    def __get_executor(self) -> Executor:
+        self.__start_heartbeat()
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = self.__executor_factory(self.processes)
+            return self.__executor
+
+    def __start_heartbeat(self):
+        with self.__lock:
+            if self.__heartbeat is None:
+                self.__stopped.clear()
+                self.__heartbeat = threading.Thread(target=self.__beat, name="besser-job-heartbeat", daemon=True)
+                self.__heartbeat.start()
+
+    def __reset(self, executor: Executor):
+        """Drop a broken executor, so that the next job starts new workers."""
+        with self.__lock:
+            if self.__executor is not executor:
+                return
+            self.__executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def __beat(self):
+        while not self.__stopped.wait(self.heartbeat_interval):
+            try:
+                self.store.heartbeat(self.owner)
+                for job_id in self.store.requeue_interrupted(STALE_HEARTBEATS * self.heartbeat_interval):
+                    self.__dispatch(job_id)
+            except Exception:
+                logger.exception("Error during the heartbeat of the jobs")
+
+    def start(self) -> list:
+        """Remove the expired jobs, and run the jobs left queued or interrupted by a stopped backend.
+
+        Returns:
+            list[str]: the ids of the resumed jobs.
+        """
+        self.__start_heartbeat()
+        self.store.delete_finished(time.time() - self.retention)
+        self.store.requeue_interrupted(STALE_HEARTBEATS * self.heartbeat_interval)
+        job_ids = self.store.queued()
+        for job_id in job_ids:
+            try:
+                self.__dispatch(job_id)
+            except BrokenExecutor:
+                logger.exception("The job %s cannot be started", job_id)
+        return job_ids
+
+    def submit(self, generator: str, payload: dict) -> str:
+        """Add a job and queue it for a worker.
+
+        Args:
+            generator (str): the generator name.
+            payload (dict): the input of the job.
+
+        Returns:
+            str: the job id.
+
+        Raises:
+            BrokenExecutor: if the worker processes cannot be started. The job is marked as failed.
+        """
+        self.store.delete_finished(time.time() - self.retention)
+        job_id = self.store.create(generator, payload)
+        self.__dispatch(job_id)
+        return job_id
+
+    def __dispatch(self, job_id: str):
+        executor = self.__get_executor()
+        try:
+            try:
+                future = executor.submit(self.__runner, self.store.directory, job_id, self.owner)
+            except BrokenExecutor:
+                # A worker died since the last job: start new workers and submit the job to them
+                self.__reset(executor)
+                executor = self.__get_executor()
+                future = executor.submit(self.__runner, self.store.directory, job_id, self.owner)
+        except BrokenExecutor as e:
+            # Otherwise the job would stay queued until the next backend starts
+            self.__reset(executor)
+            self.store.fail(job_id, f"The job workers cannot be started: {e!r}")
+            raise
+        future.add_done_callback(lambda done: self.__check(job_id, executor, done))
+
+    def __check(self, job_id: str, executor: Executor, future: Future):
+        # The runner records its own errors; this catches the failures of the worker itself (e.g., a killed process)
+        if not future.cancelled() and future.exception() is not None:
+            self.store.fail(job_id, f"The job worker failed: {future.exception()!r}")
+            if isinstance(future.exception(), BrokenExecutor):
+                self.__reset(executor)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the heartbeat and the worker processes. The jobs not started yet stay queued, to be run by the next
+        backend.
+
+        Args:
+            wait (bool, optional): whether to wait for the running jobs. Defaults to True.
+        """
+        self.__stopped.set()
+        heartbeat = self.__heartbeat
+        if heartbeat is not None:
+            heartbeat.join()
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+            self.__heartbeat = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,16 +1,29 @@
 import re
 import uuid
-from besser.BUML.metamodel.structural import DomainModel, Class, Enumeration, Property, Method, BinaryAssociation, \
-    Generalization, PrimitiveDataType, EnumerationLiteral, Multiplicity, UNLIMITED_MAX_MULTIPLICITY, Constraint
+from besser.BUML.metamodel.structural import DomainModel, Class, Enumeration, Property, Method, Parameter, \
+    BinaryAssociation, Generalization, PrimitiveDataType, EnumerationLiteral, Multiplicity, UNLIMITED_MAX_MULTIPLICITY, Constraint, \
+    primitive_data_types
 from besser.BUML.metamodel.state_machine import Body, Event, StateMachine
+from besser.generators.instrumentation import REGISTRY, metrics_enabled, span
 from besser.utilities.web_modeling_editor.backend.constants.constants import VISIBILITY_MAP, VALID_PRIMITIVE_TYPES
 from besser.utilities.web_modeling_editor.backend.services.layout_calculator import (
     determine_connection_direction, calculate_connection_points,
     calculate_path_points, calculate_relationship_bounds
 )
 
-def parse_attribute(attribute_name, domain_model=None):
-    """Parse an attribute string to extract visibility, name, and type, removing any colons."""
+# The shared primitive data types of the metamodel, by name
+PRIMITIVE_TYPES_BY_NAME = {primitive.name: primitive for primitive in primitive_data_types}
+
+def primitive_type(name):
+    """Get the shared PrimitiveDataType of a name (raises a ValueError if it is not a primitive type name)."""
+    primitive = PRIMITIVE_TYPES_BY_NAME.get(name)
+    return primitive if primitive is not None else PrimitiveDataType(name)
+
+def parse_attribute(attribute_name, types_by_name=None):
+    """Parse an attribute string to extract visibility, name, and type, removing any colons.
+
+    The type is kept if it is the name of an enumeration in ``types_by_name`` (the types of the model by name), and
+    converted to a primitive type name otherwise."""
     parts = attribute_name.replace(":", "").split()  # Remove colons from the attribute name
     if len(parts) == 1:
         visibility = "public"
@@ -25,7 +38,7 @@ def parse_attribute(attribute_name, domain_model=None):
         if len(parts) > 2:
             type_name = parts[2]
             # Check if type is an enumeration in the domain model
-            if domain_model and any(isinstance(t, Enumeration) and t.name == type_name for t in domain_model.types):
+            if types_by_name and isinstance(types_by_name.get(type_name), Enumeration):
                 attr_type = type_name  # Keep the enumeration type name
             else:
                 # Convert to primitive type if not an enumeration
@@ -35,6 +48,9 @@ def parse_attribute(attribute_name, domain_model=None):
             
     return visibility, name, attr_type
 
+# A method signature: its name, its parameters, and its optional return type
+METHOD_PATTERN = re.compile(r"([^(]+)\((.*?)\)(?:\s*:\s*(.+))?")
+
 def parse_method(method_str):
     """
     Parse a method string to extract visibility, name, parameters, and return type.
@@ -43,8 +59,6 @@ def parse_method(method_str):
     "- findBook(title: str): Book" -> ("private", "findBook", [{"name": "title", "type": "str"}], "Book")
     "validate()" -> ("public", "validate", [], None)
     """
-    import re
-
     # Default values
     visibility = "public"
     parameters = []
@@ -60,8 +74,7 @@ def parse_method(method_str):
         method_str = method_str[2:].strip()
 
     # Parse method using regex
-    pattern = r"([^(]+)\((.*?)\)(?:\s*:\s*(.+))?"
-    match = re.match(pattern, method_str)
+    match = METHOD_PATTERN.match(method_str)
     
     if not match:
         return visibility, method_str.replace("()", ""), parameters, return_type
@@ -159,8 +172,11 @@ def parse_multiplicity(multiplicity_str):
         
     return Multiplicity(min_multiplicity=min_multiplicity, max_multiplicity=max_multiplicity)
 
-def process_ocl_constraints(ocl_text: str, domain_model: DomainModel) -> list:
-    """Process OCL constraints and convert them to BUML Constraint objects."""
+def process_ocl_constraints(ocl_text: str, domain_model: DomainModel, domain_classes: dict = None) -> list:
+    """Process OCL constraints and convert them to BUML Constraint objects.
+
+    ``domain_classes`` maps the lowercase names of the types of the domain model to the types (computed from the
+    domain model if not given)."""
     if not ocl_text:
         return []
     
@@ -168,7 +184,8 @@ def process_ocl_constraints(ocl_text: str, domain_model: DomainModel) -> list:
     lines = re.split(r'[,\n]', ocl_text)
     constraint_count = 1
 
-    domain_classes = {cls.name.lower(): cls for cls in domain_model.types}
+    if domain_classes is None:
+        domain_classes = {cls.name.lower(): cls for cls in domain_model.types}
 
     for line in lines:
         line = line.strip()
@@ -219,6 +236,128 @@ def generate_unique_class_name(base_name, existing_names):
         counter += 1
     return f"{base_name}{counter}"
 
+def build_enumeration(element, elements):
+    """Build the Enumeration of an enumeration element, with its literals."""
+    literals = set()
+    for literal_id in element.get("attributes", []):
+        literal = elements.get(literal_id)
+        if literal:
+            literals.add(EnumerationLiteral(name=literal.get("name", "")))
+    return Enumeration(name=element.get("name"), literals=literals)
+
+def build_attributes(element, elements, types_by_name):
+    """Build the attributes of a class element (their types can be enumerations in ``types_by_name``, the types of
+    the model by name)."""
+    attributes = set()
+    for attr_id in element.get("attributes", []):
+        attr = elements.get(attr_id)
+        if attr:
+            visibility, name, attr_type = parse_attribute(attr.get("name", ""), types_by_name)
+            # If attr_type is a string matching an enumeration name, get the actual enumeration
+            enum_type = types_by_name.get(attr_type)
+            if isinstance(enum_type, Enumeration):
+                attributes.add(Property(name=name, type=enum_type, visibility=visibility))
+            else:
+                attributes.add(Property(name=name, type=primitive_type(attr_type), visibility=visibility))
+    return attributes
+
+def build_methods(element, elements, types_by_name):
+    """Build the methods of a class element (their return types can be classes in ``types_by_name``, the types of
+    the model by name)."""
+    methods = set()
+    for method_id in element.get("methods", []):
+        method = elements.get(method_id)
+        if method:
+            visibility, name, parameters, return_type = parse_method(method.get("name", ""))
+
+            # Create method parameters
+            method_params = []
+            for param in parameters:
+                param_type = primitive_type(param['type'])
+                param_obj = Parameter(
+                    name=param['name'],
+                    type=param_type,
+                    default_value=param.get('default')
+                )
+                method_params.append(param_obj)
+
+            # Create method with parameters and return type
+            method_obj = Method(
+                name=name,
+                visibility=visibility,
+                parameters=method_params
+            )
+            # Handle return type
+            if return_type:
+                # Check if return type is a class in the domain model
+                return_class = types_by_name.get(return_type)
+                if isinstance(return_class, Class):
+                    method_obj.type = return_class
+                else:
+                    # If not a class, treat as primitive type
+                    method_obj.type = primitive_type(return_type)
+            methods.add(method_obj)
+    return methods
+
+def build_relationship(relationship, source_class, target_class):
+    """Build the BinaryAssociation or Generalization of a relationship between two classes (None for other types)."""
+    rel_type = relationship.get("type")
+    source = relationship.get("source")
+    target = relationship.get("target")
+
+    # Handle each type of relationship
+    if rel_type == "ClassBidirectional" or rel_type == "ClassUnidirectional" or rel_type == "ClassComposition" or rel_type == "ClassAggregation" :
+        is_composite = rel_type == "ClassComposition"
+        source_navigable = rel_type != "ClassUnidirectional"
+        target_navigable = True
+
+        source_multiplicity = parse_multiplicity(source.get("multiplicity", "1"))
+        target_multiplicity = parse_multiplicity(target.get("multiplicity", "1"))
+
+        source_property = Property(
+            name=source.get("role", ""),
+            type=source_class,
+            multiplicity=source_multiplicity,
+            is_navigable=source_navigable
+        )
+        target_property = Property(
+            name=target.get("role", ""),
+            type=target_class,
+            multiplicity=target_multiplicity,
+            is_navigable=target_navigable,
+            is_composite=is_composite
+        )
+
+        association_name = relationship.get("name") or f"{source_class.name}_{target_class.name}"
+
+        return BinaryAssociation(
+            name=association_name,
+            ends={source_property, target_property}
+        )
+
+    elif rel_type == "ClassInheritance":
+        return Generalization(general=target_class, specific=source_class)
+
+    return None
+
+# Size of the last converted class diagram
+MODEL_ELEMENTS = REGISTRY.gauge("besser_model_elements", "Number of elements of the last converted class diagram.",
+                                ("kind",))
+
+def record_model_size(domain_model):
+    """Record the number of elements of a domain model, by kind, in the besser_model_elements gauge."""
+    if not metrics_enabled():
+        return
+    classes = domain_model.get_classes()
+    MODEL_ELEMENTS.set(len(classes), kind="classes")
+    MODEL_ELEMENTS.set(sum(isinstance(t, Enumeration) for t in domain_model.types), kind="enumerations")
+    MODEL_ELEMENTS.set(sum(len(cls.attributes) for cls in classes), kind="attributes")
+    MODEL_ELEMENTS.set(sum(len(cls.methods) for cls in classes), kind="methods")
+    MODEL_ELEMENTS.set(len(domain_model.associations), kind="associations")
+    MODEL_ELEMENTS.set(len(domain_model.generalizations), kind="generalizations")
+    MODEL_ELEMENTS.set(len(domain_model.constraints), kind="constraints")
+
+@span("convert")
 def process_class_diagram(json_data):
     """Process Class Diagram specific elements."""
     domain_model = DomainModel("Class Diagram")
@@ -227,98 +366,44 @@ def process_class_diagram(json_data):
     elements = json_data.get('elements', {}).get('elements', {})
     relationships = json_data.get('elements', {}).get('relationships', {})
 
-    # print(f"Elements: {elements}")
-    # print(f"Relationships: {relationships}")
-
-    # Track existing class names
-    existing_class_names = set()
+    # The enumerations and classes by (unique) name, and the classes by element id
+    types_by_name = {}
+    classes_by_id = {}
 
     # First process enumerations to have them available for attribute types
     for element_id, element in elements.items():
         if element.get("type") == "Enumeration":
-            element_name = element.get("name")
-            literals = set()
-            for literal_id in element.get("attributes", []):
-                literal = elements.get(literal_id)
-                if literal:
-                    literal_obj = EnumerationLiteral(name=literal.get("name", ""))
-                    literals.add(literal_obj)
-            enum = Enumeration(name=element_name, literals=literals)
+            enum = build_enumeration(element, elements)
             domain_model.types.add(enum)
-            existing_class_names.add(element_name)
+            types_by_name[enum.name] = enum
 
-    # Then process classes with attributes that might reference enumerations
+    # Then create the classes, so that attributes and methods can refer to any of them
+    class_elements = []
     for element_id, element in elements.items():
         # Check for both regular Class and AbstractClass
         if element.get("type") in ["Class", "AbstractClass"]:
             # Set is_abstract based on the type
             original_name = element.get("name")
-            unique_name = generate_unique_class_name(original_name, existing_class_names)
-            existing_class_names.add(unique_name)
+            unique_name = generate_unique_class_name(original_name, types_by_name)
             
             # Create the class with the unique name
             is_abstract = element.get("type") == "AbstractClass"
             cls = Class(name=unique_name, is_abstract=is_abstract)
+            types_by_name[unique_name] = cls
+            classes_by_id[element_id] = cls
+            class_elements.append((element, cls))
             
             # Store the mapping of original to unique name if needed
             element["original_name"] = original_name
             element["unique_name"] = unique_name
-            
-            # Add attributes
-            for attr_id in element.get("attributes", []):
-                attr = elements.get(attr_id)
-                if attr:
-                    visibility, name, attr_type = parse_attribute(attr.get("name", ""), domain_model)
-                    # If attr_type is a string matching an enumeration name, get the actual enumeration
-                    if any(isinstance(t, Enumeration) and t.name == attr_type for t in domain_model.types):
-                        enum_type = next(t for t in domain_model.types if isinstance(t, Enumeration) and t.name == attr_type)
-                        property = Property(name=name, type=enum_type, visibility=visibility)
-                    else:
-                        property = Property(name=name, type=PrimitiveDataType(attr_type), visibility=visibility)
-                    cls.attributes.add(property)
-
-            # Add methods
-            for method_id in element.get("methods", []):
-                method = elements.get(method_id)
-                if method:
-                    visibility, name, parameters, return_type = parse_method(method.get("name", ""))
-                    
-                    # Create method parameters
-                    method_params = []
-                    for param in parameters:
-                        param_type = PrimitiveDataType(param['type'])
-                        param_obj = Property(
-                            name=param['name'],
-                            type=param_type,
-                            visibility='public'
-                        )
-                        if 'default' in param:
-                            param_obj.default_value = param['default']
-                        method_params.append(param_obj)
-                    
-                    # Create method with parameters and return type
-                    method_obj = Method(
-                        name=name,
-                        visibility=visibility,
-                        parameters=method_params
-                    )
-                    # Handle return type
-                    if return_type:
-                        # Check if return type is a class in the domain model
-                        return_class = domain_model.get_class_by_name(return_type)
-                        if return_class:
-                            method_obj.type = return_class
-                        else:
-                            # If not a class, treat as primitive type
-                            method_obj.type = PrimitiveDataType(return_type)
-                    cls.methods.add(method_obj)
-
-            domain_model.types.add(cls)
+
+    for element, cls in class_elements:
+        cls.attributes.update(build_attributes(element, elements, types_by_name))
+        cls.methods.update(build_methods(element, elements, types_by_name))
+        domain_model.types.add(cls)
 
     # Processing relationships (Associations, Generalizations, and Compositions)
     for rel_id, relationship in relationships.items():
-        #print(f"Processing relationship ID: {rel_id} with data: {relationship}")
-
         rel_type = relationship.get("type")
         source = relationship.get("source")
         target = relationship.get("target")
@@ -339,70 +424,42 @@ def process_class_diagram(json_data):
             print(f"Skipping relationship {rel_id} due to missing elements.")
             continue
 
-        source_class = domain_model.get_class_by_name(source_element.get("name", ""))
-        target_class = domain_model.get_class_by_name(target_element.get("name", ""))
+        source_class = classes_by_id.get(source.get("element"))
+        target_class = classes_by_id.get(target.get("element"))
 
         if not source_class or not target_class:
             print(f"Skipping relationship {rel_id} because classes are missing in the domain model.")
             continue
 
-        # Handle each type of relationship
-        if rel_type == "ClassBidirectional" or rel_type == "ClassUnidirectional" or rel_type == "ClassComposition" or rel_type == "ClassAggregation" :
-            is_composite = rel_type == "ClassComposition"
-            source_navigable = rel_type != "ClassUnidirectional"
-            target_navigable = True
-
-            source_multiplicity = parse_multiplicity(source.get("multiplicity", "1"))
-            target_multiplicity = parse_multiplicity(target.get("multiplicity", "1"))
-
-            # Use unique names to find the correct classes
-            source_unique_name = source_element.get("unique_name", source_element.get("name", ""))
-            target_unique_name = target_element.get("unique_name", target_element.get("name", ""))
-
-            source_class = domain_model.get_class_by_name(source_unique_name)
-            target_class = domain_model.get_class_by_name(target_unique_name)
-
-            source_property = Property(
-                name=source.get("role", ""),
-                type=source_class,
-                multiplicity=source_multiplicity,
-                is_navigable=source_navigable
-            )
-            target_property = Property(
-                name=target.get("role", ""),
-                type=target_class,
-                multiplicity=target_multiplicity,
-                is_navigable=target_navigable,
-                is_composite=is_composite
-            )
-
-            association_name = relationship.get("name") or f"{source_class.name}_{target_class.name}"
+        built = build_relationship(relationship, source_class, target_class)
+        if isinstance(built, BinaryAssociation):
+            domain_model.associations.add(built)
+        elif isinstance(built, Generalization):
+            domain_model.generalizations.add(built)
 
-            association = BinaryAssociation(
-                name=association_name,
-                ends={source_property, target_property}
-            )
-            domain_model.associations.add(association)
+    # Process OCL constraints
+    domain_model.constraints = process_diagram_constraints(elements, domain_model)
 
-        elif rel_type == "ClassInheritance":
-            generalization = Generalization(general=target_class, specific=source_class)
-            domain_model.generalizations.add(generalization)
+    record_model_size(domain_model)
+    return domain_model
 
-    # Process OCL constraints
+def process_diagram_constraints(elements, domain_model):
+    """Process the OCL constraint elements of a class diagram."""
     all_constraints = set()
+    domain_classes = None
     for element_id, element in elements.items():
         if element.get("type") in ["ClassOCLConstraint"]:
             ocl = element.get("constraint")
             if ocl:
+                if domain_classes is None:
+                    domain_classes = {cls.name.lower(): cls for cls in domain_model.types}
                 try:
-                    new_constraints = process_ocl_constraints(ocl, domain_model)
+                    new_constraints = process_ocl_constraints(ocl, domain_model, domain_classes)
                     all_constraints.update(new_constraints)
                 except Exception as e:
                     print(f"Error processing OCL constraint for element {element_id}: {e}")
                     continue
-    domain_model.constraints = all_constraints
-
-    return domain_model
+    return all_constraints
 
 def process_state_machine(json_data):
     """Process State Machine Diagram specific elements and return Python code as string."""
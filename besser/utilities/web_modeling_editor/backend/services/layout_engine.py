@@ -0,0 +1,319 @@
+from typing import Iterable
+
+import numpy as np
+
+# Space between two elements of a layer, and between two layers, of a generalization hierarchy
+HORIZONTAL_SPACING = 60
+VERTICAL_SPACING = 80
+# Space between two hierarchies (or isolated elements) in the diagram
+BLOCK_SPACING = 80
+# Width over height of the diagram the blocks are packed into
+ASPECT_RATIO = 1.6
+# Number of barycenter sweeps ordering the layers of a hierarchy
+ORDERING_SWEEPS = 4
+# Width of the columns of the height profile used to pack the blocks
+_PACKING_UNIT = 20
+
+
+class _Block:
+    """A generalization hierarchy (or an isolated element), laid out in layers and then moved as a whole.
+
+    Attributes:
+        members (list[int]): the indexes of its elements.
+        offsets (dict[int, tuple[float, float]]): the position of each element, relative to the block.
+        width (float): the width of the block.
+        height (float): the height of the block.
+    """
+
+    def __init__(self, members: list):
+        self.members: list = members
+        self.offsets: dict = {}
+        self.width: float = 0
+        self.height: float = 0
+
+
+def compute_layout(sizes: dict, generalizations: Iterable[tuple] = (), links: Iterable[tuple] = (),
+                   origin: tuple = (0, 0), iterations: int = 50) -> dict:
+    """Compute the positions of the elements of a diagram.
+
+    The generalization hierarchies are laid out in layers (Sugiyama-style): every class is placed below its
+    superclasses, the classes of a layer are ordered by the barycenter of their superclasses and subclasses to reduce
+    crossings, and each class is centered under its superclasses. Each hierarchy, and each element without
+    generalizations, then forms a block, and the blocks are placed by a force-directed simulation (Fruchterman-Reingold)
+    with NumPy-vectorized iterations, in which the linked blocks (e.g., by associations) attract each other and all
+    the blocks repel each other. Finally, the blocks are packed in rows following their simulated positions, so that
+    no elements overlap.
+
+    Args:
+        sizes (dict[Hashable, tuple[float, float]]): the width and height of each element. The layout is
+            deterministic for a given order of the elements.
+        generalizations (Iterable[tuple[Hashable, Hashable]], optional): the (specific, general) pairs of elements.
+        links (Iterable[tuple[Hashable, Hashable]], optional): the pairs of elements drawn close to each other (e.g.,
+            the ends of associations).
+        origin (tuple[float, float], optional): the top left corner of the diagram. Defaults to (0, 0).
+        iterations (int, optional): the number of iterations of the force-directed simulation. Defaults to 50.
+
+    Returns:
+        dict[Hashable, tuple[int, int]]: the top left corner of each element.
+    """
+    nodes = list(sizes)
+    if not nodes:
+        return {}
+    index = {node: position for position, node in enumerate(nodes)}
+    widths = np.array([float(sizes[node][0]) for node in nodes])
+    heights = np.array([float(sizes[node][1]) for node in nodes])
+    edges = [(index[specific], index[general]) for specific, general in generalizations
+             if specific in index and general in index and specific != general]
+
+    blocks = _hierarchy_blocks(len(nodes), edges, widths, heights)
+    block_of = np.empty(len(nodes), dtype=np.int64)
+    for number, block in enumerate(blocks):
+        block_of[block.members] = number
+    block_links = [(block_of[index[source]], block_of[index[target]]) for source, target in links
+                   if source in index and target in index]
+    centers = _force_directed(blocks, [(a, b) for a, b in block_links if a != b], iterations)
+    corners = _pack(blocks, centers)
+
+    positions = {}
+    for block, (block_x, block_y) in zip(blocks, corners):
+        for member in block.members:
+            x, y = block.offsets[member]
+            positions[nodes[member]] = (int(round(origin[0] + block_x + x)), int(round(origin[1] + block_y + y)))
+    return positions
+
+
+def _hierarchy_blocks(count: int, edges: list, widths: np.ndarray, heights: np.ndarray) -> list:
+    """Group the elements by generalization hierarchy, and lay out each hierarchy in layers."""
+    parent = list(range(count))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for specific, general in edges:
+        parent[find(specific)] = find(general)
+    components = {}
+    for node in range(count):
+        components.setdefault(find(node), []).append(node)
+
+    generals = {}
+    specifics = {}
+    for specific, general in edges:
+        generals.setdefault(specific, []).append(general)
+        specifics.setdefault(general, []).append(specific)
+    layers = _layers(count, generals, specifics)
+
+    blocks = []
+    for members in components.values():
+        block = _Block(members)
+        if len(members) == 1:
+            block.offsets[members[0]] = (0.0, 0.0)
+            block.width, block.height = widths[members[0]], heights[members[0]]
+        else:
+            _layout_hierarchy(block, layers, generals, specifics, widths, heights)
+        blocks.append(block)
+    return blocks
+
+
+def _layers(count: int, generals: dict, specifics: dict) -> list:
+    """Assign each element to a layer: one below its lowest general element (longest path layering).
+
+    Generalization cycles, which the metamodel does not prevent, are broken at one of their elements, placed below
+    its general elements already placed only."""
+    layers = [0] * count
+    pending = [len(generals.get(node, ())) for node in range(count)]
+    done = [False] * count
+    queue = [node for node in range(count) if not pending[node]]
+    placed = 0
+    for first in range(count):
+        if not done[first] and placed == len(queue):
+            # Every remaining element is in or under a cycle: the general elements not placed yet lead to one
+            seen = set()
+            node = first
+            while node not in seen:
+                seen.add(node)
+                node = next(general for general in generals[node] if not done[general])
+            pending[node] = 0
+            queue.append(node)
+        while placed < len(queue):
+            node = queue[placed]
+            placed += 1
+            done[node] = True
+            for specific in specifics.get(node, ()):
+                if not done[specific]:
+                    layers[specific] = max(layers[specific], layers[node] + 1)
+                    pending[specific] -= 1
+                    if not pending[specific]:
+                        queue.append(specific)
+    return layers
+
+
+def _layout_hierarchy(block: _Block, layers: list, generals: dict, specifics: dict, widths: np.ndarray,
+                      heights: np.ndarray):
+    """Order the layers of a hierarchy by barycenters, and place its elements."""
+    rows = {}
+    for member in block.members:
+        rows.setdefault(layers[member], []).append(member)
+    rows = [rows[layer] for layer in sorted(rows)]
+    rank = {member: position for row in rows for position, member in enumerate(row)}
+
+    def reorder(row: list, neighbors: dict):
+        keys = {}
+        for member in row:
+            adjacent = [rank[other] for other in neighbors.get(member, ()) if other in rank]
+            keys[member] = sum(adjacent) / len(adjacent) if adjacent else rank[member]
+        row.sort(key=keys.__getitem__)
+        for position, member in enumerate(row):
+            rank[member] = position
+
+    for _ in range(ORDERING_SWEEPS):
+        for row in rows[1:]:
+            reorder(row, generals)
+        for row in reversed(rows[:-1]):
+            reorder(row, specifics)
+
+    # Each layer is placed under the centers of the general elements of its elements, then each layer is placed over
+    # the centers of the specific elements, without changing the order of the layers
+    centers = {}
+    x = 0.0
+    for member in rows[0]:
+        centers[member] = x + widths[member] / 2
+        x += widths[member] + HORIZONTAL_SPACING
+    for row in rows[1:]:
+        _place_row(row, generals, centers, widths)
+    for row in reversed(rows[:-1]):
+        _place_row(row, specifics, centers, widths)
+
+    left = min(centers[member] - widths[member] / 2 for member in block.members)
+    y = 0.0
+    for row in rows:
+        for member in row:
+            block.offsets[member] = (centers[member] - widths[member] / 2 - left, y)
+        y += max(heights[member] for member in row) + VERTICAL_SPACING
+    block.width = max(centers[member] + widths[member] / 2 for member in block.members) - left
+    block.height = y - VERTICAL_SPACING
+
+
+def _place_row(row: list, neighbors: dict, centers: dict, widths: np.ndarray):
+    """Place the elements of a layer at the barycenter of their neighbors, keeping their order and spacing."""
+    desired = []
+    for member in row:
+        adjacent = [centers[other] for other in neighbors.get(member, ()) if other in centers]
+        desired.append(sum(adjacent) / len(adjacent) if adjacent else centers.get(member))
+    known = [value for value in desired if value is not None]
+    fallback = sum(known) / len(known) if known else 0.0
+    desired = [fallback if value is None else value for value in desired]
+    placed = []
+    for position, member in enumerate(row):
+        center = desired[position]
+        if placed:
+            previous = row[position - 1]
+            center = max(center, placed[-1] + (widths[previous] + widths[member]) / 2 + HORIZONTAL_SPACING)
+        placed.append(center)
+    # The elements were only pushed to the right: the row is moved back by their mean shift
+    shift = sum(want - got for want, got in zip(desired, placed)) / len(row)
+    for member, center in zip(row, placed):
+        centers[member] = center + shift
+
+
+def _force_directed(blocks: list, links: list, iterations: int) -> np.ndarray:
+    """Simulate the forces between the blocks, and return the position of their centers.
+
+    As in the grid variant of Fruchterman-Reingold, blocks only repel the blocks closer than twice the ideal distance,
+    found through a grid of cells of that size, so that each iteration takes a time linear in the number of blocks."""
+    count = len(blocks)
+    sizes = np.array([(block.width, block.height) for block in blocks])
+    # Ideal distance between linked blocks: the side of the mean block, spacing included
+    k = float(np.sqrt(np.mean(np.prod(sizes + BLOCK_SPACING, axis=1))))
+    columns = int(np.ceil(np.sqrt(count * ASPECT_RATIO)))
+    grid = np.arange(count)
+    positions = np.stack([grid % columns, grid // columns], axis=1) * k
+    if count == 1 or iterations <= 0:
+        return positions
+
+    if links:
+        pairs = np.array(links, dtype=np.int64)
+        sources, targets = pairs[:, 0], pairs[:, 1]
+    else:
+        sources = targets = np.empty(0, dtype=np.int64)
+    # The attraction of each link is divided by the degrees of its blocks, so that the blocks with many links (e.g.,
+    # large hierarchies) do not pull the others into a dense cluster
+    degrees = np.bincount(sources, minlength=count) + np.bincount(targets, minlength=count)
+    weights = 1 / np.sqrt(degrees[sources] * degrees[targets])
+    temperature = k * columns / 10
+    for iteration in range(iterations):
+        displacement = np.zeros_like(positions)
+        # Repulsion between close blocks, k² / d along their difference
+        near, other = _neighbor_pairs(positions, k)
+        delta = positions[near] - positions[other]
+        force = delta * (k * k / np.maximum(np.einsum("ij,ij->i", delta, delta), 1e-2))[:, None]
+        for axis in range(2):
+            displacement[:, axis] += np.bincount(near, force[:, axis], count)
+        # Attraction between linked blocks, d² / k along their difference
+        if len(sources):
+            delta = positions[sources] - positions[targets]
+            force = delta * (np.sqrt(np.einsum("ij,ij->i", delta, delta)) * weights / k)[:, None]
+            for axis in range(2):
+                displacement[:, axis] -= np.bincount(sources, force[:, axis], count)
+                displacement[:, axis] += np.bincount(targets, force[:, axis], count)
+        # Each block moves along its displacement, by at most the temperature, which decreases linearly
+        length = np.sqrt(np.einsum("ij,ij->i", displacement, displacement))
+        step = temperature * (1 - iteration / iterations)
+        positions += displacement * (np.minimum(length, step) / np.maximum(length, 1e-9))[:, None]
+    return positions
+
+
+def _neighbor_pairs(positions: np.ndarray, cell: float) -> tuple:
+    """Find the ordered pairs of distinct points in the same or in adjacent cells of a grid."""
+    cells = np.floor(positions / cell).astype(np.int64)
+    cells -= cells.min(axis=0)
+    # The cells are shifted by one so that the keys of the adjacent cells are positive and distinct
+    stride = int(cells[:, 1].max()) + 3
+    keys = (cells[:, 0] + 1) * stride + cells[:, 1] + 1
+    order = np.argsort(keys, kind="stable")
+    unique, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    points = np.arange(len(keys))
+    sources, targets = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            wanted = keys + dx * stride + dy
+            slots = np.minimum(np.searchsorted(unique, wanted), len(unique) - 1)
+            numbers = np.where(unique[slots] == wanted, counts[slots], 0)
+            # The points of the cell of each point, as runs of the sorted points
+            offsets = np.arange(numbers.sum()) - np.repeat(np.cumsum(numbers) - numbers, numbers)
+            sources.append(np.repeat(points, numbers))
+            targets.append(order[np.repeat(starts[slots], numbers) + offsets])
+    sources, targets = np.concatenate(sources), np.concatenate(targets)
+    distinct = sources != targets
+    return sources[distinct], targets[distinct]
+
+
+def _pack(blocks: list, centers: np.ndarray) -> list:
+    """Pack the blocks without overlaps: the simulated positions are spread over a diagram of the total area of the
+    blocks, and the blocks are placed in the vertical order of their simulated positions, each on top of the blocks
+    already placed, at the place closest to its spread position."""
+    sizes = np.array([(block.width, block.height) for block in blocks]) + BLOCK_SPACING
+    area = float(np.sum(np.prod(sizes, axis=1)))
+    width = max(float(np.sqrt(area * ASPECT_RATIO)), float(np.max(sizes[:, 0])))
+    columns = int(np.ceil(width / _PACKING_UNIT))
+    spans = np.minimum(np.ceil(sizes[:, 0] / _PACKING_UNIT).astype(np.int64), columns)
+    # The targets are the ranks of the simulated coordinates, so that the dense and sparse regions of the simulation
+    # are evened out
+    ranks = np.argsort(np.argsort(centers, axis=0, kind="stable"), axis=0, kind="stable")
+    targets = ranks / max(len(blocks) - 1, 1) * (width, area / width)
+    # The lowest free height of each column of the diagram
+    skyline = np.zeros(columns)
+    corners: list = [None] * len(blocks)
+    for number in np.lexsort((centers[:, 0], centers[:, 1])):
+        span = spans[number]
+        # The height at which the block can be placed at each column: the maximum of the skyline under it
+        heights = np.lib.stride_tricks.sliding_window_view(skyline, span).max(axis=1)
+        distances = np.abs(np.arange(len(heights)) * _PACKING_UNIT + sizes[number, 0] / 2 - targets[number, 0]) + \
+            np.abs(heights + sizes[number, 1] / 2 - targets[number, 1])
+        first = int(np.argmin(distances))
+        y = float(heights[first])
+        corners[number] = (first * _PACKING_UNIT, y)
+        skyline[first:first + span] = y + sizes[number, 1]
+    return corners
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable
+
+
+class WorkerPoolBusyError(RuntimeError):
+    """Error raised when a job is submitted to a worker pool that already has its maximum number of jobs."""
+
+
+class WorkerPool:
+    """A process pool running the CPU-bound jobs of the backend (model conversion, code generation, zipping) out of
+    the event loop, with a bound on the number of jobs queued or running.
+
+    Jobs submitted when the pool is full are rejected with ``WorkerPoolBusyError`` (answered with 429 by the API).
+    A job that exceeds its timeout, or whose request is cancelled, is cancelled if it has not started yet; a job
+    already running finishes in its worker, and keeps its slot until then. Python cannot stop a single job of a
+    process pool, so a job that never returns keeps its worker and its slot until the pool is shut down: the timeout
+    bounds the wait of the request, not the work of the job.
+
+    If a worker process dies (e.g., killed for using too much memory), the jobs of the pool fail with
+    ``BrokenProcessPool`` and release their slots, and the pool starts new worker processes for the next jobs.
+
+    Args:
+        processes (int, optional): number of worker processes. Defaults to the number of CPUs.
+        max_pending (int, optional): maximum number of jobs queued or running. Defaults to 4 jobs per process.
+        timeout (float, optional): default seconds to wait for a job. Defaults to None (no timeout).
+        executor_factory (Callable[[int], Executor], optional): creates the executor given the number of processes.
+            Defaults to ProcessPoolExecutor.
+
+    Attributes:
+        processes (int): number of worker processes.
+        max_pending (int): maximum number of jobs queued or running.
+        timeout (float): default seconds to wait for a job.
+    """
+
+    def __init__(self, processes: int = None, max_pending: int = None, timeout: float = None,
+                 executor_factory: Callable[[int], Executor] = None):
+        self.processes: int = processes
+        self.max_pending: int = max_pending
+        self.timeout: float = timeout
+        self.__executor_factory: Callable[[int], Executor] = executor_factory or \
+            (lambda workers: ProcessPoolExecutor(max_workers=workers))
+        self.__executor: Executor = None
+        self.__pending: int = 0
+        self.__lock: threading.Lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """int: Get the number of jobs queued or running."""
+        return self.__pending
+
+    @property
+    def capacity(self) -> int:
+        """int: Get the maximum number of jobs queued or running."""
+        if self.max_pending is not None:
+            return self.max_pending
+        return 4 * self.__workers()
+
+    @property
+    def parallelism(self) -> int:
+        """int: Get the number of jobs that can run at once (at least 1): more jobs submitted at once only wait for a
+        worker while holding slots."""
+        return max(1, min(self.__workers(), self.capacity))
+
+    def __workers(self) -> int:
+        return self.processes or os.cpu_count() or 1
+
+    async def run(self, function: Callable, *args, timeout: float = None) -> Any:
+        """Run a function in a worker process.
+
+        Args:
+            function (Callable): the function, defined at module level so that it can be pickled.
+            *args: the arguments of the function.
+            timeout (float, optional): seconds to wait for the result. Defaults to the timeout of the pool.
+
+        Returns:
+            Any: the result of the function.
+
+        Raises:
+            WorkerPoolBusyError: if the pool already has its maximum number of jobs.
+            asyncio.TimeoutError: if the job does not finish in time.
+        """
+        with self.__lock:
+            if self.__pending >= self.capacity:
+                raise WorkerPoolBusyError(f"The worker pool is busy ({self.__pending} jobs)")
+            self.__pending += 1
+        try:
+            executor = self.__get_executor()
+            try:
+                future = executor.submit(function, *args)
+            except BrokenExecutor:
+                # A worker died since the last job: start new workers and submit the job to them
+                self.__reset(executor)
+                executor = self.__get_executor()
+                future = executor.submit(function, *args)
+        except BaseException:
+            self.__release()
+            raise
+        # The slot is released when the job is done in the worker, not when the request stops waiting for it
+        future.add_done_callback(lambda done: self.__done(executor, done))
+        wait = timeout if timeout is not None else self.timeout
+        return await asyncio.wait_for(asyncio.wrap_future(future), wait)
+
+    def __done(self, executor: Executor, future: Future):
+        self.__release()
+        if not future.cancelled() and isinstance(future.exception(), BrokenExecutor):
+            self.__reset(executor)
+
+    def __release(self):
+        with self.__lock:
+            self.__pending -= 1
+
+    def __get_executor(self) -> Executor:
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = self.__executor_factory(self.processes)
+            return self.__executor
+
+    def __reset(self, executor: Executor):
+        """Drop a broken executor, so that the next job starts new workers."""
+        with self.__lock:
+            if self.__executor is not executor:
+                return
+            self.__executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes, cancelling the jobs not started yet.
+
+        Args:
+            wait (bool, optional): whether to wait for the running jobs. Defaults to True.
+        """
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
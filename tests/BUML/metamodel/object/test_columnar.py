@@ -0,0 +1,73 @@
+from besser.BUML.metamodel.object import ColumnarObjectModel, ObjectView
+import pytest
+
+from besser.BUML.metamodel.structural import Class, Property, Multiplicity, BinaryAssociation, Generalization, \
+    IntegerType, StringType, BooleanType, FloatType, Constraint, DomainModel
+from besser.utilities.validation import validate_object_model
+from tests.BUML.metamodel.object.library_object import library_model, object_model, book, library, \
+    has
+
+# Testing that a columnar copy of an object model validates as the original model
+def test_columnar_copy():
+    columnar = ColumnarObjectModel.from_object_model(object_model)
+    assert len(columnar) == len(object_model.instances)
+    books = columnar.instances_of(book)
+    assert sorted(obj.name for obj in books) == sorted(
+        obj.name for obj in object_model.instances if obj.classifier is book)
+    libraries = columnar.instances_of(library)
+    assert set(libraries[0].navigate(has)) == set(books)
+    expected = validate_object_model(library_model, object_model, processes=1)
+    report = validate_object_model(library_model, columnar, processes=1)
+    assert report.checked == expected.checked
+    assert {(v.constraint.name, v.object.name) for v in report.violations} == \
+        {(v.constraint.name, v.object.name) for v in expected.violations}
+
+# Testing column storage, generated names, subclass extents and links added in bulk
+def test_columnar_bulk_load():
+    person: Class = Class(name="Person", attributes={Property(name="age", type=IntegerType),
+                                                     Property(name="name", type=StringType)})
+    student: Class = Class(name="Student")
+    Generalization(general=person, specific=student)
+    friend: Property = Property(name="friend", type=person, multiplicity=Multiplicity(0, "*"))
+    of: Property = Property(name="of", type=person, multiplicity=Multiplicity(0, "*"))
+    BinaryAssociation(name="friendship", ends={friend, of})
+    model = ColumnarObjectModel(name="people")
+    people = model.add_objects(person, {"age": [30, None, 40], "name": ["Ann", "Bob", "Ann"]})
+    students = model.add_objects(student, {"age": [20]}, names=["carl"])
+    model.add_links(friend, [people[0], people[0]], [people[1], students[0]])
+    ann = model.object(people[0])
+    assert isinstance(ann, ObjectView) and ann == model.object(people[0])
+    assert ann.name == "person_0" and model.object(students[0]).name == "carl"
+    age = [attribute for attribute in person.attributes if attribute.name == "age"][0]
+    assert model.value(people[1], age) is None
+    assert {slot.attribute.name: slot.value.value for slot in ann.slots} == {"age": 30, "name": "Ann"}
+    assert len(model.instances_of(person)) == 4 and len(model.instances_of(student)) == 1
+    assert ann.navigate(friend) == [model.object(people[1]), model.object(students[0])]
+    assert model.object(students[0]).navigate(of) == [ann]
+    assert len(model.links) == 2 and len(ann.links) == 2
+
+
+# Testing that boolean columns hold booleans, and that a Boolean invariant is evaluated on them
+def test_columnar_booleans():
+    active: Property = Property(name="active", type=BooleanType)
+    weight: Property = Property(name="weight", type=FloatType)
+    account: Class = Class(name="Account", attributes={active, weight})
+    invariant: Constraint = Constraint(name="isActive", context=account,
+                                       expression="context Account inv active: self.active", language="OCL")
+    domain_model = DomainModel(name="accounts", types={account}, constraints={invariant})
+    model = ColumnarObjectModel(name="accounts")
+    ids = model.add_objects(account, {"active": [True, False, None], "weight": [1, 2.5, None]})
+    first = model.object(ids[0])
+    assert model.value(ids[0], active) is True and model.value(ids[1], active) is False
+    assert {slot.attribute.name: slot.value.value for slot in first.slots} == {"active": True, "weight": 1}
+    report = validate_object_model(domain_model, model, processes=1)
+    assert sorted((v.object.name, v.message) for v in report.violations) == [
+        ("account_1", "Evaluated to False"), ("account_2", "Evaluated to undefined")]
+
+    with pytest.raises(ValueError, match="type 'bool'"):
+        model.set_value(ids[0], active, 5)
+    with pytest.raises(ValueError, match="type 'float'"):
+        model.add_objects(account, {"weight": [True]})
+    assert model.value(ids[0], active) is True and len(model.instances_of(account)) == 3
+    assert model.add_objects(account, {"active": [False]}) == range(3, 4)
+    assert model.value(3, active) is False and model.value(3, weight) is None
@@ -1,3 +1,4 @@
+import pytest
 from besser.BUML.metamodel.object import *
 from besser.BUML.metamodel.structural import *
 
@@ -71,4 +72,65 @@ def test_link_ends_method():
     for link_end in obj1.link_ends():
         assert link_end.object.name == "object2"
     for link_end in obj2.link_ends():
-        assert link_end.object.name == "object1"
\ No newline at end of file
+        assert link_end.object.name == "object1"
+
+# Testing that object model elements are stored in slots, without a per-instance __dict__
+def test_slots_layout():
+    data_value: DataValue = DataValue(classifier=IntegerType, value=1)
+    attribute_link: AttributeLink = AttributeLink(attribute=Property(name="attr", type=IntegerType), value=data_value)
+    obj: Object = Object(name="object1", classifier=class1, slots=[attribute_link])
+    for element in (obj, attribute_link, data_value):
+        assert not hasattr(element, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.undeclared = 1
+    assert obj.slots[0].value.value == 1
+
+# Testing the extents of the classifiers, including the instances of their specializations
+def test_instances_of():
+    parent: Class = Class(name="parent")
+    child: Class = Class(name="child")
+    Generalization(general=parent, specific=child)
+    obj1: Object = Object(name="object1", classifier=parent, slots=[])
+    obj2: Object = Object(name="object2", classifier=child, slots=[])
+    model: ObjectModel = ObjectModel(name="mymodel", instances={obj1}, links=set())
+    assert model.instances_of(parent) == [obj1]
+    model.add_instance(obj2)
+    assert set(model.instances_of(parent)) == {obj1, obj2}
+    assert model.instances_of(child) == [obj2]
+    model.remove_instance(obj2)
+    assert model.instances_of(child) == []
+    assert model.instances_of(parent) == [obj1]
+    # Classifiers with the same name (e.g., of a model deserialized separately) share the extent
+    assert model.instances_of(Class(name="parent")) == [obj1]
+    assert model.instances_of(Class(name="other")) == []
+    # An instance whose classifier was changed in the model is still removed from all the extents
+    obj1.classifier = child
+    model.remove_instance(obj1)
+    assert model.instances_of(parent) == [] and model.instances_of(child) == []
+
+# Testing navigation through association ends, kept in sync with the link connections
+def test_navigate():
+    obj1: Object = Object(name="object1", classifier=class1, slots=[])
+    obj2: Object = Object(name="object2", classifier=class2, slots=[])
+    obj3: Object = Object(name="object3", classifier=class2, slots=[])
+    link1: Link = Link(name="link1", association=association1, connections=[
+        LinkEnd(name="l_end1", association_end=aend1, object=obj1),
+        LinkEnd(name="l_end2", association_end=aend2, object=obj2)])
+    assert obj1.navigate(aend2) == [obj2]
+    assert obj2.navigate(aend1) == [obj1]
+    assert obj1.navigate(aend1) == []
+    link1.connections = [LinkEnd(name="l_end1", association_end=aend1, object=obj1),
+                         LinkEnd(name="l_end3", association_end=aend2, object=obj3)]
+    assert obj1.navigate(aend2) == [obj3]
+    assert obj2.navigate(aend1) == []
+    assert obj3.navigate(aend1) == [obj1]
+    # Reassigning the object of a link end updates the navigation of both objects
+    end3 = link1.connections[1]
+    end3.object = obj2
+    assert obj1.navigate(aend2) == [obj2]
+    assert obj2.navigate(aend1) == [obj1] and obj3.navigate(aend1) == []
+    link1.connections = []
+    assert obj1.navigate(aend2) == [] and obj2.navigate(aend1) == [] and not obj1.links
+    # A link end removed from its link no longer updates it
+    end3.object = obj3
+    assert obj3.navigate(aend1) == []
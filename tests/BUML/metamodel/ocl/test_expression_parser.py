@@ -0,0 +1,115 @@
+import re
+
+import pytest
+from antlr4 import InputStream, CommonTokenStream
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorListener import ErrorListener
+
+from besser.BUML.metamodel.structural import DomainModel, Class, Property, Multiplicity, BinaryAssociation, \
+    Enumeration, EnumerationLiteral, StringType, IntegerType, FloatType
+from besser.BUML.notations.ocl.BOCLLexer import BOCLLexer
+from besser.BUML.notations.ocl.BOCLParser import BOCLParser
+from besser.BUML.notations.ocl.expression_parser import OCLExpressionParser, OCLParseError, LOOP_OPERATIONS, \
+    COLLECTION_OPERATIONS, OBJECT_OPERATIONS, BOOLEAN_OPERATORS, COMPARISON_OPERATORS, ARITHMETIC_OPERATORS
+
+genre = Enumeration(name="Genre", literals={EnumerationLiteral(name="Fiction"), EnumerationLiteral(name="Poetry")})
+book = Class(name="Book", attributes={Property(name="title", type=StringType), Property(name="pages", type=IntegerType),
+                                      Property(name="price", type=FloatType), Property(name="genre", type=genre)})
+library = Class(name="Library", attributes={Property(name="name", type=StringType)})
+association = BinaryAssociation(name="library_book", ends={
+    Property(name="library", type=library, multiplicity=Multiplicity(1, 1)),
+    Property(name="books", type=book, multiplicity=Multiplicity(0, "*"))})
+model = DomainModel(name="Library", types={book, library, genre}, associations={association})
+
+# Expressions of the subset: each one must be accepted by both parsers. B-OCL parses slowly, so the expressions
+# stay short.
+ACCEPTED = [
+    "context Book inv: self.pages > 0 and self.price <= 100",
+    "context Book inv: self.pages >= 1 or self.price < 1.5",
+    "context Book inv: self.pages = 1 xor self.pages <> 2",
+    "context Book inv: self.pages > 0 implies not (self.price = null)",
+    "context Book inv: -self.pages + 1 < 0",
+    "context Book inv: self.pages * 2 - 1 > self.price / 2",
+    "context Book inv: (self.pages div 3) mod 2 < 1",
+    "context Book inv: self.genre = Genre::Fiction",
+    "context Book inv: if self.title.oclIsUndefined() then true else false endif",
+    "context Book inv: self.title->size() > 3 and self.title <> \"two words\"",
+    "context Book inv: self.title <> 'NI'",
+    "context Book inv: self.title.toUpper() = self.title.toLower()",
+    "context Book inv: self.title.concat(\"a\").substring(1, 3) <> null",
+    "context Book inv: self.price.abs() >= self.price.floor()",
+    "context Book inv: self.price.round() = 1",
+    "context Book inv: self.oclIsTypeOf(Book) and self.oclIsKindOf(Book)",
+    "context Book inv: pages > 0",
+    "context Book inv: Book->allInstances()->size() > 0",
+    "context Library inv books: self.books->forAll(b | b.pages > 0)",
+    "context Library inv: self.books->exists(b : Book | b.pages <= 110)",
+    "context Library inv: self.books->select(b | b.pages < 10)->isEmpty()",
+    "context Library inv: self.books->reject(pages = 0)->size() <> 1",
+    "context Library inv: self.books->collect(b | b.pages)->sum() < 1000",
+    "context Library inv: self.books->forAll(b, c | b.pages = c.pages)",
+    "context Library inv: self.books->collect(b | b.price)->min() < 2",
+    "context Library inv: self.books->collect(b | b.price)->max() > 1",
+    "context Library inv: self.books->last() = null implies self.books->excludes(self.books->first())",
+    "context Library inv: self.books->includes(self.books->first())",
+]
+
+# Constructs outside the subset that B-OCL rejects too.
+REJECTED = [
+    "context Library inv: self.books->notEmpty()",
+    "context Library inv: self.books->asSet()->size() = 1",
+    "context Book inv: self.title.size() > 3",
+    "context Book inv: Book.allInstances()->size() > 0",
+    "context Book inv: self.title <> 'two words'",
+    "context Book inv: self.title <> ''",
+]
+
+
+class _RaisingErrorListener(ErrorListener):
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        raise SyntaxError(f"{line}:{column} {msg}")
+
+
+def bocl_accepts(expression):
+    lexer = BOCLLexer(InputStream(expression))
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(_RaisingErrorListener())
+    parser = BOCLParser(CommonTokenStream(lexer))
+    parser.removeErrorListeners()
+    parser.addErrorListener(_RaisingErrorListener())
+    parser._interp.predictionMode = PredictionMode.SLL
+    try:
+        parser.oclFile()
+    except SyntaxError:
+        return False
+    return True
+
+
+def subset_accepts(expression):
+    try:
+        context = model.get_class_by_name(re.match(r"context (\w+)", expression).group(1))
+        OCLExpressionParser(model).parse_expression(expression, context)
+    except OCLParseError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize("expression", ACCEPTED)
+def test_subset_expression_is_bocl(expression):
+    assert subset_accepts(expression)
+    assert bocl_accepts(expression)
+
+
+@pytest.mark.parametrize("expression", REJECTED)
+def test_non_bocl_expression_is_rejected(expression):
+    assert not subset_accepts(expression)
+    assert not bocl_accepts(expression)
+
+
+def test_corpus_covers_subset_tables():
+    tokens = set()
+    for expression in ACCEPTED:
+        tokens.update(re.findall(r"->|<>|<=|>=|\w+|[=<>+\-*/]", expression))
+    tables = LOOP_OPERATIONS + COLLECTION_OPERATIONS + OBJECT_OPERATIONS + BOOLEAN_OPERATORS + \
+        COMPARISON_OPERATORS + ARITHMETIC_OPERATORS
+    assert [entry for entry in tables if entry not in tokens] == []
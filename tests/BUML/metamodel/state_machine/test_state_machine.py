@@ -1,6 +1,8 @@
 import pytest
 
-from besser.BUML.metamodel.state_machine.state_machine import ConfigProperty, StateMachine
+from besser.BUML.metamodel.structural import Method
+from besser.BUML.metamodel.state_machine.state_machine import ConfigProperty, StateMachine, State, Transition, \
+    Body, Event
 
 
 def test_new_state():
@@ -42,3 +44,40 @@ def test_new_property():
         # This should not work
         parameter3 = sm1.new_property('section1', 'property2', 3)
     assert "Duplicated property in StateMachine (section1, property2)" in str(excinfo.value)
+
+
+def body_function(session):
+    session.set('x', 1)
+
+
+def test_lazy_code():
+    body = Body('body_function', body_function)
+    assert Method.code.fget(body) is None  # the source is not read at construction
+    assert body.code.startswith('def body_function(session):')
+    assert Event('always', None).code is None
+    assert Body('inline', code="def inline(session):\n    pass\n").callable is None
+
+
+def test_indexes():
+    sm = StateMachine('sm')
+    states = [sm.new_state(f"s{i}", initial=(i == 0)) for i in range(3000)]
+    assert sm.initial_state() is states[0] and sm.get_state('s1234') is states[1234]
+    go, stop = Event('go', None), Event('stop', None)
+    states[0].when_event_go_to(go, states[1], {})
+    states[0].when_event_go_to(stop, states[2], {})
+    states[0].when_event_go_to(go, states[3], {})
+    assert [t.dest.name for t in states[0].transitions_for('go')] == ['s1', 's3']
+    assert states[0].transitions_for('unknown') == ()
+    # the getters are read-only, so the indexes cannot go stale
+    with pytest.raises(AttributeError):
+        states[0].transitions.append(Transition('t', states[0], states[4], go))
+    with pytest.raises(AttributeError):
+        sm.states.append(State(sm, 'extra'))
+    assert len(states[0].transitions_for('go')) == 2 and sm.get_state('extra') is None
+    # assigning new sequences rebuilds the indexes
+    transitions = list(states[0].transitions[1:])
+    states[0].transitions = transitions
+    transitions.append(Transition('t', states[0], states[4], go))
+    assert [t.dest.name for t in states[0].transitions_for('go')] == ['s3']
+    sm.states = states[1:]
+    assert sm.initial_state() is None and sm.get_state('s0') is None
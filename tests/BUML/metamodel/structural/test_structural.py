@@ -59,6 +59,13 @@ def test_attribute_type_and_multiplicity_violation():
                                         multiplicity=Multiplicity(2, 1))
     assert "Invalid primitive data type" in str(excinfo.value)
 
+    with pytest.raises(ValueError) as excinfo:
+        attribute1: Property = Property(name="attribute1", type=5)
+    assert "Invalid type" in str(excinfo.value)
+    with pytest.raises(ValueError) as excinfo:
+        parameter1: Parameter = Parameter(name="parameter1", type=object())
+    assert "Invalid type" in str(excinfo.value)
+
 
 # Testing class initialization
 def test_class_initialization():
@@ -212,6 +219,38 @@ def test_sort_attributes():
     assert attributes[1] == attribute2
     assert attributes[2] == attribute3
 
+# Testing timestamps built from the creation sequence and explicit timestamps
+def test_timestamps():
+    from datetime import datetime, timedelta
+    first: Class = Class(name="first")
+    second: Class = Class(name="second")
+    assert first.creation_sequence < second.creation_sequence
+    assert first.timestamp < second.timestamp
+    assert first.timestamp is first.timestamp
+    earlier: Class = Class(name="earlier", timestamp=first.timestamp - timedelta(seconds=1))
+    assert earlier.timestamp == first.timestamp - timedelta(seconds=1)
+    assert sort_by_timestamp({second, first, earlier}) == [earlier, first, second]
+    second.timestamp = datetime(2000, 1, 1)
+    assert sort_by_timestamp({second, first, earlier}) == [second, earlier, first]
+
+# Testing that the creation order and the timestamps are kept across processes and serialization
+def test_timestamps_across_processes():
+    import pickle
+    import subprocess
+    import sys
+    from datetime import datetime, timedelta
+    before = datetime.now()
+    created = subprocess.run(
+        [sys.executable, "-c", "import pickle, sys; from besser.BUML.metamodel.structural import Class; "
+                               "sys.stdout.buffer.write(pickle.dumps(Class(name='remote')))"],
+        capture_output=True, check=True).stdout
+    local: Class = Class(name="local")
+    remote: Class = pickle.loads(created)
+    assert before - timedelta(seconds=1) < remote.timestamp <= local.timestamp
+    assert sort_by_timestamp({local, remote}) == [remote, local]
+    copy: Class = pickle.loads(pickle.dumps(local))
+    assert copy.timestamp == local.timestamp and copy.creation_sequence == local.creation_sequence
+
 # Testing the classes_sorted_by_inheritance method
 def test_classes_sorted_by_inheritance():
     cl1 = Class(name="c1")
@@ -0,0 +1,83 @@
+import importlib.util
+import math
+import sys
+
+import pytest
+from pydantic import ValidationError
+
+from besser.BUML.metamodel.structural import DomainModel, Class, Property, Multiplicity, BinaryAssociation, \
+    Constraint, StringType, IntegerType
+from besser.generators.python_classes import PythonGenerator, OCLToPythonTranslator
+from besser.generators.pydantic_classes import PydanticGenerator
+
+
+def build_model():
+    library = Class(name="Library", attributes={Property(name="name", type=StringType)})
+    book = Class(name="Book", attributes={Property(name="title", type=StringType),
+                                          Property(name="pages", type=IntegerType)})
+    association = BinaryAssociation(name="lib_book", ends={
+        Property(name="locatedIn", type=library, multiplicity=Multiplicity(1, 1)),
+        Property(name="has", type=book, multiplicity=Multiplicity(0, "*"))})
+    constraints = {
+        Constraint(name="positivePages", context=book, expression="context Book inv: self.pages > 0", language="OCL"),
+        Constraint(name="shortTitle", context=book,
+                   expression="context Book inv: self.title->size() <= 20 implies self.pages < 1000",
+                   language="OCL"),
+        Constraint(name="thinBooks", context=library,
+                   expression="context Library inv: self.has->forAll(b | b.pages < 500) and self.has->size() < 3",
+                   language="OCL"),
+        Constraint(name="all", context=library, expression="context Library inv: Library->allInstances()->size() > 0",
+                   language="OCL"),
+    }
+    return DomainModel(name="Library", types={library, book}, associations={association}, constraints=constraints)
+
+
+def load(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# Testing the compilation of OCL expressions to Python
+def test_translation():
+    invariants, skipped = OCLToPythonTranslator(build_model()).translate_all()
+    compiled = {invariant.name: invariant.expression for invariant in invariants["Book"] + invariants["Library"]}
+    assert compiled["positivePages"] == "(self.pages > 0)"
+    assert compiled["thinBooks"] == "(all((b.pages < 500) for b in self.has) and (len(self.has) < 3))"
+    assert list(skipped) == ["all"]
+
+
+# Testing that div, mod and round keep their OCL semantics on negative numbers and halves
+def test_translation_arithmetic():
+    model = build_model()
+    book = model.get_class_by_name("Book")
+    translator = OCLToPythonTranslator(model)
+    expected = {"-7 div 2": -3, "7 div -2": -3, "-7 mod 2": -1, "7 mod -2": 1, "-7 mod -2": -1,
+                "(2.5).round()": 3, "(-2.5).round()": -2, "(-2.6).round()": -3}
+    for text, value in expected.items():
+        constraint = Constraint(name="c", context=book, expression=f"context Book inv: {text}", language="OCL")
+        assert eval(translator.translate(constraint).expression, {"math": math}) == value, text
+
+
+# Testing the validate() method of the generated Python classes
+def test_python_classes(tmp_path):
+    PythonGenerator(build_model(), output_dir=str(tmp_path)).generate()
+    classes = load(tmp_path / "classes.py", "classes_ocl")
+    library = classes.Library(name="City", has=set())
+    books = [classes.Book(title="Short", pages=100, locatedIn=library) for _ in range(3)]
+    library.has = set(books)
+    assert books[0].validate() == []
+    assert library.validate() == ["thinBooks"]
+    books[0].pages = None
+    assert books[0].validate() == ["positivePages", "shortTitle"]
+
+
+# Testing the model validators of the generated pydantic classes
+def test_pydantic_classes(tmp_path):
+    PydanticGenerator(build_model(), output_dir=str(tmp_path)).generate()
+    classes = load(tmp_path / "pydantic_classes.py", "pydantic_classes_ocl")
+    assert classes.Book(title="Short", pages=100, id=1, library_id=1).pages == 100
+    with pytest.raises(ValidationError, match="positivePages"):
+        classes.Book(title="Short", pages=0, id=1, library_id=1)
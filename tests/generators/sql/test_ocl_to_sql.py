@@ -0,0 +1,109 @@
+import importlib.util
+import os
+import sqlite3
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from besser.BUML.metamodel.structural import DomainModel, Class, Property, Multiplicity, BinaryAssociation, \
+    Constraint, StringType, IntegerType
+from besser.generators.sql import SQLGenerator, OCLToSQLTranslator, SQLTableMapping
+from besser.generators.sql_alchemy import SQLAlchemyGenerator
+
+
+def build_model():
+    library = Class(name="Library", attributes={Property(name="name", type=StringType)})
+    book = Class(name="Book", attributes={Property(name="title", type=StringType),
+                                          Property(name="pages", type=IntegerType)})
+    association = BinaryAssociation(name="lib_book", ends={
+        Property(name="locatedIn", type=library, multiplicity=Multiplicity(1, 1)),
+        Property(name="has", type=book, multiplicity=Multiplicity(0, "*"))})
+    constraints = {
+        Constraint(name="positivePages", context=book, expression="context Book inv: self.pages > 0", language="OCL"),
+        Constraint(name="smallLibrary", context=library,
+                   expression="context Library inv: self.has->size() <= 2 and self.has->forAll(b | b.title <> \"\")",
+                   language="OCL"),
+        Constraint(name="typed", context=book, expression="context Book inv: self.pages.oclIsTypeOf(Integer)",
+                   language="OCL"),
+    }
+    return DomainModel(name="Library", types={library, book}, associations={association}, constraints=constraints)
+
+
+# Testing the classification of constraints in CHECK constraints and validation queries
+def test_translation():
+    model = build_model()
+    translated, skipped = OCLToSQLTranslator(model, SQLTableMapping(model), "postgres").translate_all()
+    by_name = {constraint.name: constraint for constraint in translated}
+    assert by_name["positivePages"].condition == "(pages > 0)"
+    assert not by_name["positivePages"].cross_table
+    assert by_name["smallLibrary"].cross_table
+    assert "FROM Book t1 WHERE t1.Library_id = t0.Library_id" in by_name["smallLibrary"].query
+    assert list(skipped) == ["typed"]
+
+
+
+# Testing that the arithmetic conditions keep their OCL semantics on negative numbers and halves, in SQLite
+def test_translation_arithmetic():
+    model = build_model()
+    book = model.get_class_by_name("Book")
+    translator = OCLToSQLTranslator(model, SQLTableMapping(model))
+    constraint = Constraint(name="arithmetic", context=book, language="OCL",
+                            expression="context Book inv: self.pages div 2 = -3 and self.pages mod 2 = -1 and "
+                                       "(self.pages / 2 + 1).round() = -2 and (self.pages / 2 - 0.1).round() = -4")
+    condition = translator.translate(constraint).condition
+    with sqlite3.connect(":memory:") as connection:
+        assert connection.execute(f"SELECT {condition} FROM (SELECT -7 AS pages)").fetchone() == (1,)
+
+# Testing that the storage of the links follows the order of the end names, as the generated schema
+def test_storage():
+    model = build_model()
+    association, = model.associations
+    ends = {end.name: end for end in association.ends}
+    mapping = SQLTableMapping(model)
+    assert mapping.storage(ends["has"]) == ("target", "Library_id")
+    assert mapping.storage(ends["locatedIn"]) == ("source", "Library_id")
+    ends["locatedIn"].multiplicity = Multiplicity(0, "*")
+    assert mapping.storage(ends["has"]) == ("join", "Book_Library", "Library_id", "Book_id")
+    assert mapping.storage(ends["locatedIn"]) == ("join", "Book_Library", "Book_id", "Library_id")
+
+
+# Testing the SQL generator output
+def test_sql_generator(tmp_path):
+    SQLGenerator(build_model(), output_dir=str(tmp_path), sql_dialect="postgres").generate()
+    tables = (tmp_path / "tables.sql").read_text()
+    assert "ADD CONSTRAINT positivePages CHECK (((pages > 0)) IS TRUE);" in tables
+    assert "-- Constraint typed not translated to SQL" in tables
+    queries = (tmp_path / "validation_queries.sql").read_text()
+    assert "-- smallLibrary" in queries and "IS NOT TRUE;" in queries
+
+
+# Testing the constraints generated for SQLAlchemy against a SQLite database
+def test_sql_alchemy_constraints(tmp_path):
+    SQLAlchemyGenerator(build_model(), output_dir=str(tmp_path)).generate()
+    spec = importlib.util.spec_from_file_location("sql_alchemy_ocl", os.path.join(tmp_path, "sql_alchemy.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["sql_alchemy_ocl"] = module
+    spec.loader.exec_module(module)
+
+    engine = create_engine("sqlite:///:memory:")
+    module.Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        library = module.Library(name="City library")
+        session.add(library)
+        session.flush()
+        session.add_all([module.Book(title=f"Book {i}", pages=10, library_id=library.id) for i in range(3)])
+        session.commit()
+        assert module.validate(session) == {"smallLibrary": [library.id]}
+
+        session.add(module.Book(title="Empty", pages=0, library_id=library.id))
+        with pytest.raises(IntegrityError):
+            session.commit()
+        session.rollback()
+
+        # An undefined attribute violates the invariant, as in OCL
+        session.add(module.Book(title="Unknown", pages=None, library_id=library.id))
+        with pytest.raises(IntegrityError):
+            session.commit()
@@ -0,0 +1,83 @@
+import pytest
+
+from besser.generators import MemorySink
+from besser.generators.instrumentation import MetricsRegistry, REGISTRY, GENERATOR_DURATION, STAGE_DURATION, \
+    enable_metrics, metrics_enabled, run_recorded, span
+from besser.generators.python_classes import PythonGenerator
+from tests.BUML.metamodel.object.library_object import library_model
+
+
+@pytest.fixture
+def metrics():
+    enabled = metrics_enabled()
+    enable_metrics()
+    REGISTRY.clear()
+    yield REGISTRY
+    REGISTRY.clear()
+    enable_metrics(enabled)
+
+
+def recorded_stage():
+    with span("convert"):
+        pass
+    return "result"
+
+
+# Testing the Prometheus text format of the metrics
+def test_render(metrics):
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    size = registry.gauge("model_elements", "Model size.")
+    duration = registry.histogram("duration_seconds", "Duration.", buckets=(0.1, 1))
+    requests.inc(route="/generate-output")
+    requests.inc(2, route="/generate-output")
+    size.set(12)
+    for value in (0.05, 0.5, 5):
+        duration.observe(value)
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/generate-output"} 3.0',
+        "# HELP model_elements Model size.",
+        "# TYPE model_elements gauge",
+        "model_elements 12.0",
+        "# HELP duration_seconds Duration.",
+        "# TYPE duration_seconds histogram",
+        'duration_seconds_bucket{le="0.1"} 1.0',
+        'duration_seconds_bucket{le="1.0"} 2.0',
+        'duration_seconds_bucket{le="+Inf"} 3.0',
+        "duration_seconds_sum 5.55",
+        "duration_seconds_count 3.0",
+    ]
+    assert registry.counter("requests_total", "Requests.", ("route",)) is requests
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests.")
+
+
+# Testing that spans and generators are recorded when enabled only
+def test_spans_and_generators(metrics):
+    generator = PythonGenerator(library_model)
+    generator.sink = MemorySink()
+    generator.generate()
+    with span("package", generator="python"):
+        pass
+    rendered = metrics.render()
+    assert 'besser_generator_duration_seconds_count{generator="PythonGenerator"} 1.0' in rendered
+    assert 'besser_stage_duration_seconds_count{stage="package",generator="python"} 1.0' in rendered
+
+    enable_metrics(False)
+    metrics.clear()
+    generator.generate()
+    with span("package", generator="python"):
+        pass
+    assert not list(GENERATOR_DURATION._samples()) and not list(STAGE_DURATION._samples())
+
+
+# Testing that the updates made in a worker are captured, then replayed in the main process
+def test_run_recorded(metrics):
+    result, records, duration = run_recorded(recorded_stage)
+    assert result == "result" and duration >= 0
+    assert [record[:2] for record in records] == [("besser_stage_duration_seconds", "observe")]
+    assert not list(STAGE_DURATION._samples())
+    metrics.replay(records)
+    assert 'besser_stage_duration_seconds_count{stage="convert",generator=""} 1.0' in metrics.render()
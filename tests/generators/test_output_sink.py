@@ -0,0 +1,37 @@
+import io
+import zipfile
+
+from besser.generators import DiskSink, MemorySink, ZipSink
+from besser.generators.python_classes import PythonGenerator
+from besser.generators.backend import BackendGenerator
+from tests.BUML.metamodel.object.library_object import library_model
+
+
+# Testing that generators write to the sink instead of the output directory
+def test_memory_sink(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generator = PythonGenerator(library_model)
+    generator.sink = MemorySink()
+    generator.generate()
+    assert list(generator.sink.files) == ["classes.py"]
+    assert b"class Library" in generator.sink.files["classes.py"]
+    assert not list(tmp_path.iterdir())
+
+
+def test_zip_sink(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    buffer = io.BytesIO()
+    generator = BackendGenerator(library_model)
+    generator.sink = ZipSink(buffer)
+    generator.generate()
+    generator.sink.close()
+    with zipfile.ZipFile(buffer) as archive:
+        assert sorted(archive.namelist()) == ["main_api.py", "pydantic_classes.py", "sql_alchemy.py"]
+    assert not list(tmp_path.iterdir())
+
+
+def test_disk_sink(tmp_path):
+    generator = PythonGenerator(library_model)
+    generator.sink = DiskSink(str(tmp_path / "out"))
+    generator.generate()
+    assert (tmp_path / "out" / "classes.py").read_text().count("class Library") == 1
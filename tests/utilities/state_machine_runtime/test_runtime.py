@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from besser.BUML.metamodel.state_machine import StateMachine, Body, Event
+from besser.utilities.state_machine_runtime import StateMachineRuntime, compiled_callable
+
+
+def idle_body(session):
+    session.set('visits', (session.get('visits') or 0) + 1)
+
+
+async def greet_body(session):
+    await asyncio.sleep(0)
+    session.set('greeting', f"hello {session.event_params['name']}")
+
+
+def broken_body(session):
+    raise RuntimeError("broken")
+
+
+def fallback_body(session):
+    session.set('error', True)
+
+
+def is_long(session, event_params):
+    return len(event_params['text']) > 3
+
+
+def build_machine():
+    sm = StateMachine('greeter')
+    idle = sm.new_state('idle', initial=True)
+    greet = sm.new_state('greet')
+    error = sm.new_state('error')
+    idle.set_body(Body('idle_body', idle_body))
+    greet.set_body(Body('greet_body', greet_body))
+    error.set_body(Body('broken_body', broken_body))
+    error.set_fallback_body(Body('fallback_body', fallback_body))
+    message = Event('message', is_long)
+    idle.when_event_go_to(message, greet, {'name': 'bot'})
+    idle.when_event_go_to(Event('fail', None), error, {})
+    greet.when_event_go_to(Event('reset', None), idle, {})
+    return sm
+
+
+def test_dispatch():
+    runtime = StateMachineRuntime(build_machine())
+
+    async def scenario():
+        session = await runtime.new_session('s1')
+        assert session.current_state.name == 'idle' and session.get('visits') == 1
+        assert len(runtime.transitions(session.current_state)) == 2
+        assert not await runtime.dispatch('s1', 'message', {'text': 'hi'})
+        assert not await runtime.dispatch('s1', 'unknown')
+        assert await runtime.dispatch('s1', 'message', {'text': 'hello', 'name': 'Ann'})
+        assert session.current_state.name == 'greet' and session.get('greeting') == 'hello Ann'
+        assert await runtime.dispatch('s1', 'reset')
+        assert session.get('visits') == 2
+        session.delete('visits')
+        assert session.get('visits') is None
+        # the fallback body handles the errors of the body
+        assert await runtime.dispatch('s1', 'fail')
+        assert session.current_state.name == 'error' and session.get('error')
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_sessions():
+    runtime = StateMachineRuntime(build_machine())
+
+    async def scenario():
+        await asyncio.gather(*(runtime.dispatch(f"s{i}", 'message', {'text': 'hello', 'name': str(i)})
+                               for i in range(2000)))
+        assert len(runtime.store) == 2000
+        assert all(runtime.session(f"s{i}").get('greeting') == f"hello {i}" for i in range(2000))
+        runtime.close_session('s0')
+        assert runtime.session('s0') is None
+
+    asyncio.run(scenario())
+
+    sm = StateMachine('empty')
+    with pytest.raises(ValueError) as excinfo:
+        StateMachineRuntime(sm)
+    assert "StateMachine empty has no initial state" in str(excinfo.value)
+
+
+# Testing bodies and events given as source code, compiled once
+def test_compiled_code():
+    sm = StateMachine('counter')
+    start = sm.new_state('start', initial=True)
+    count = sm.new_state('count')
+    code = "def count_body(session):\n    session.set('n', (session.get('n') or 0) + 1)\n"
+    count.set_body(Body('count_body', code=code))
+    start.when_event_go_to(Event('go', code="def go(session, event_params):\n    return event_params['ok']\n"),
+                           count, {'ok': True})
+    count.when_event_go_to(Event('back', None), start, {})
+    runtime = StateMachineRuntime(sm)
+    assert compiled_callable(count.body) is compiled_callable(Body('other', code=code))
+
+    async def scenario():
+        assert not await runtime.dispatch('s', 'go', {'ok': False})
+        assert await runtime.dispatch('s', 'go')
+        assert await runtime.dispatch('s', 'back') and await runtime.dispatch('s', 'go')
+        assert runtime.session('s').get('n') == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,116 @@
+import asyncio
+import sqlite3
+import threading
+from contextlib import closing
+
+import pytest
+
+from besser.BUML.metamodel.state_machine import Session
+from besser.utilities.state_machine_runtime import StateMachineRuntime, InMemorySessionStore, SQLiteSessionStore, \
+    SessionSerializationError
+from tests.utilities.state_machine_runtime.test_runtime import build_machine
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# Testing the LRU and TTL eviction of the in-memory store
+def test_in_memory_store():
+    clock = FakeClock()
+    store = InMemorySessionStore(max_sessions=2, ttl=10, clock=clock)
+    for session_id in ("a", "b"):
+        store.put(Session(id=session_id))
+    assert store.get("a") is not None  # "b" is now the least recently used
+    store.put(Session(id="c"))
+    assert store.get("b") is None and len(store) == 2
+    clock.now = 5
+    store.get("c")
+    clock.now = 12
+    assert store.get("a") is None and store.get("c") is not None
+
+
+# Testing that a changed session evicted from the cache before a flush is not lost
+def test_sqlite_store_eviction_before_flush():
+    sm = build_machine()
+    store = SQLiteSessionStore(":memory:", sm, cache_size=1, batch_size=100, snapshot_interval=100)
+    a = Session(id="a", current_state=sm.initial_state())
+    a.store = store
+    store.put(a)
+    a.set("k", 1)
+    store.put(Session(id="b", current_state=sm.initial_state()))
+    assert store.get("a") is a and a.get("k") == 1
+    store.flush()
+    store.put(Session(id="c", current_state=sm.initial_state()))
+    assert store.get("a").get("k") == 1
+    store.close()
+
+
+# Testing that sessions persisted in SQLite are resumed in their current state
+def test_sqlite_store(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    sm = build_machine()
+
+    async def first_run():
+        runtime = StateMachineRuntime(sm, SQLiteSessionStore(path, sm, cache_size=10, batch_size=50))
+        for i in range(100):
+            await runtime.dispatch(f"s{i}", 'message', {'text': 'hello', 'name': str(i)})
+        runtime.store.snapshot(str(tmp_path / "snapshot.db"))
+        runtime.store.close()
+
+    async def second_run():
+        runtime = StateMachineRuntime(sm, SQLiteSessionStore(path, sm, cache_size=10))
+        session = runtime.session("s42")
+        assert session.current_state.name == 'greet' and session.get('greeting') == 'hello 42'
+        assert await runtime.dispatch("s42", 'reset')
+        assert session.current_state.name == 'idle' and session.get('visits') == 2
+        assert len(runtime.store) == 100
+        runtime.store.close()
+
+    asyncio.run(first_run())
+    asyncio.run(second_run())
+    snapshot = SQLiteSessionStore(str(tmp_path / "snapshot.db"), sm)
+    assert len(snapshot) == 100 and snapshot.get("s7").get('greeting') == 'hello 7'
+    snapshot.close()
+
+
+
+# Testing that the runtime flushes the changes of idle sessions, and that unpicklable sessions are isolated
+def test_sqlite_store_flush(tmp_path, caplog):
+    path = str(tmp_path / "sessions.db")
+    sm = build_machine()
+
+    def saved_sessions():
+        with closing(sqlite3.connect(path)) as connection:
+            return {session_id for session_id, in connection.execute("SELECT id FROM sessions")}
+
+    async def run():
+        store = SQLiteSessionStore(path, sm, batch_size=1000, snapshot_interval=0.05)
+        runtime = StateMachineRuntime(sm, store)
+        await runtime.dispatch("s0", 'message', {'text': 'hello', 'name': '0'})
+        await runtime.dispatch("s1", 'message', {'text': 'hello', 'name': '1'})
+        runtime.session("s1").set('lock', threading.Lock())
+        await asyncio.sleep(0.2)
+        assert saved_sessions() == {"s0"} and "s1" in caplog.text
+        runtime.session("s1").delete('lock')
+        await runtime.stop()
+        assert saved_sessions() == {"s0", "s1"}
+        store.close()
+
+    asyncio.run(run())
+
+    store = SQLiteSessionStore(":memory:", sm, snapshot_interval=3600)
+    store.put(Session(id="good"))
+    broken = Session(id="broken", store=store)
+    broken.set('lock', threading.Lock())
+    with pytest.raises(SessionSerializationError) as error:
+        store.flush()
+    assert list(error.value.errors) == ["broken"] and len(store) == 1
+    broken.delete('lock')
+    store.flush()
+    assert len(store) == 2
+    store.close()
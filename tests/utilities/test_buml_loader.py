@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from besser.BUML.metamodel.structural import DomainModel, Class, Enumeration, BinaryAssociation
+from besser.BUML.metamodel.object import ObjectModel
+from besser.generators import MemorySink
+from besser.utilities import domain_model_to_code, load_buml_code, BUMLLoadError
+from besser.utilities.web_modeling_editor.backend.services import parse_buml_content
+from tests.BUML.metamodel.object.library_object import library_model
+
+LIBRARY_OBJECT_FILE = os.path.join(os.path.dirname(__file__), "..", "BUML", "metamodel", "object", "library_object.py")
+
+
+# Testing the loading of a hand-written B-UML file
+def test_load_buml_file():
+    with open(LIBRARY_OBJECT_FILE) as f:
+        namespace = load_buml_code(f.read())
+    model = namespace["library_model"]
+    assert isinstance(model, DomainModel)
+    assert {cls.name for cls in model.get_classes()} == {"Library", "Book", "Author"}
+    assert len(model.constraints) == len(library_model.constraints)
+    assert isinstance(namespace["object_model"], ObjectModel)
+    assert "Class" not in namespace and "datetime" not in namespace
+
+
+# Testing the loading of the code produced by domain_model_to_code
+def test_load_generated_code():
+    sink = MemorySink()
+    domain_model_to_code(library_model, "library.py", sink=sink)
+    code = sink.files["library.py"].decode()
+    model = load_buml_code(code)["domain_model"]
+    assert {cls.name for cls in model.get_classes()} == {"Library", "Book", "Author"}
+    assert {a.name for a in model.associations} == {a.name for a in library_model.associations}
+    book = model.get_class_by_name("Book")
+    assert {attribute.name for attribute in book.attributes} == {"title", "pages", "release"}
+
+    # the web editor collects the elements of the code, and skips the generators
+    code += "\nfrom besser.generators.python_classes import PythonGenerator\n" \
+            "generator = PythonGenerator(model=domain_model)\ngenerator.generate()\n"
+    parsed = parse_buml_content(code)
+    assert {cls.name for cls in parsed.get_classes()} == {"Library", "Book", "Author"}
+    assert all(isinstance(a, BinaryAssociation) for a in parsed.associations) and len(parsed.associations) == 2
+
+
+# Testing that code other than model definitions is rejected, without running it
+@pytest.mark.parametrize("code", [
+    "import os",
+    "from os import system",
+    "__import__('os')",
+    "open('file.txt', 'w')",
+    "from besser.BUML.metamodel.structural import Class\nClass.__subclasses__()",
+    "from besser.BUML.metamodel.structural import Class\nClass.attributes = None",
+    "import datetime\ndatetime.sys.exit()",
+    "def f():\n    pass",
+    "for i in range(3):\n    pass",
+    "x = [i for i in (1, 2)]",
+    "x = 'a' * 1000000000",
+    "x = lambda: 0",
+    "from besser.BUML.metamodel.state_machine import Body, compiled_callable\n"
+    "b = Body('x', code='import os\\nos.system(\\'touch pwned\\')\\ndef x(session): pass')\n"
+    "compiled_callable(b)",
+    "from besser.utilities.state_machine_runtime import SQLiteSessionStore",
+    "from besser.BUML.metamodel.state_machine import Session\nSession('s', None)",
+    "from besser.BUML.metamodel.object import ChangeTracker\nChangeTracker()",
+    "from besser.BUML.metamodel.structural import Class\nc = Class('A')\nc.__class__",
+    "import datetime\nx = datetime.sys",
+])
+def test_rejected_code(code):
+    with pytest.raises(BUMLLoadError):
+        load_buml_code(code)
+
+
+# Testing the names defined before the code runs
+def test_predefined_names():
+    namespace = load_buml_code("Book = Class(name='Book')\nGenre = Enumeration(name='Genre')",
+                               names={"Class": Class, "Enumeration": Enumeration})
+    assert set(namespace) == {"Book", "Genre"} and namespace["Book"].name == "Book"
+    with pytest.raises(BUMLLoadError, match="not defined"):
+        load_buml_code("Book = Class(name='Book')")
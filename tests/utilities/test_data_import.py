@@ -0,0 +1,66 @@
+import sqlite3
+
+import pytest
+
+from besser.BUML.metamodel.object import ColumnarObjectModel
+from besser.utilities import ObjectImporter, ClassMapping, DataImportError
+from besser.utilities.validation import validate_object_model
+from tests.BUML.metamodel.object.library_object import library_model, library, book, has, located_in
+
+
+def write_csv(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+# Testing a CSV import with type coercion and foreign keys referencing rows loaded later
+def test_import_csv(tmp_path):
+    books = write_csv(tmp_path / "books.csv", "id,title,pages,release,library\n"
+                                              "1,Dune,412,2020-03-15,L1\n2,Emma,,2021-01-01,L1\n3,Ulysses,730,,\n")
+    libraries = write_csv(tmp_path / "libraries.csv", "code,name,address\nL1,City library,Main street\n")
+    importer = ObjectImporter(library_model, chunk_size=2)
+    importer.import_csv(ClassMapping(book, key="id", links={"locatedIn": "library"}), books)
+    importer.import_csv(ClassMapping(library, key="code", name="name"), libraries)
+    model = importer.finish()
+
+    assert len(model.instances_of(book)) == 3 and len(model.links) == 2
+    library_obj = model.instances_of(library)[0]
+    assert library_obj.name == "City library"
+    assert sorted(obj.name for obj in library_obj.navigate(has)) == ["book_1", "book_2"]
+    values = {obj.name: {slot.attribute.name: slot.value.value for slot in obj.slots}
+              for obj in model.instances_of(book)}
+    assert values["book_1"]["pages"] == 412 and values["book_1"]["release"].year == 2020
+    assert "pages" not in values["book_2"]
+    report = validate_object_model(library_model, model, processes=1)
+    assert not report.errors
+
+
+# Testing an SQL import into a columnar object model
+def test_import_sql_columnar():
+    connection = sqlite3.connect(":memory:")
+    connection.executescript("""
+        CREATE TABLE library (id INTEGER, name TEXT, address TEXT);
+        CREATE TABLE book (id INTEGER, title TEXT, pages INTEGER, library_id INTEGER);
+        INSERT INTO library VALUES (1, 'City library', 'Main street');
+        INSERT INTO book VALUES (10, 'Dune', 412, 1), (11, 'Emma', 250, 1);
+    """)
+    importer = ObjectImporter(library_model, columnar=True)
+    importer.import_sql(ClassMapping(library, key="id"), connection, "SELECT id, name, address FROM library")
+    importer.import_sql(ClassMapping(book, columns={"title": "title", "pages": "pages"}, key="id",
+                                     links={"locatedIn": "library_id"}), connection, "SELECT * FROM book")
+    model = importer.finish()
+    assert isinstance(model, ColumnarObjectModel)
+    library_obj = model.instances_of(library)[0]
+    assert sorted(obj.name for obj in library_obj.navigate(has)) == ["book_10", "book_11"]
+    assert [obj.name for obj in model.instances_of(book)[0].navigate(located_in)] == ["library_1"]
+
+
+# Testing the errors reported for invalid values and dangling foreign keys
+def test_import_errors():
+    importer = ObjectImporter(library_model)
+    with pytest.raises(DataImportError):
+        importer.import_rows(ClassMapping(book, columns={"pages": "pages"}), [{"pages": "many"}])
+    importer.import_rows(ClassMapping(book, columns={}, links={"locatedIn": "library"}), [{"library": "L9"}])
+    with pytest.raises(DataImportError) as excinfo:
+        importer.finish()
+    assert "L9" in str(excinfo.value)
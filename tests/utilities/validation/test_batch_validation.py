@@ -0,0 +1,70 @@
+from besser.BUML.metamodel.object import ObjectModel
+from besser.BUML.metamodel.structural import Constraint
+from besser.BUML.notations.ocl.expression_parser import OCLExpressionParser
+from besser.utilities.validation import validate_object_model, OCLEvaluator
+from tests.BUML.metamodel.object.library_object import library_model, object_model, book, library, \
+    book_obj, library_obj, constraintLibraryElseFalse, constraintBookPageNumber
+
+EXPECTED_VIOLATIONS = {
+    ("BookIsTypeOfIntFalse", "Book Object"),
+    ("BookIsTypeOfIntFalse", "Book 2 Object"),
+    ("LibaryElseFalse", "Library Object"),
+}
+
+
+def violations(report):
+    return {(v.constraint.name, v.object.name) for v in report.violations}
+
+
+# Testing the evaluation of single constraints
+def test_evaluator_check():
+    evaluator = OCLEvaluator(object_model, library_model)
+    assert evaluator.check(constraintBookPageNumber, book_obj) is True
+    assert evaluator.check(constraintLibraryElseFalse, library_obj) is False
+    size = Constraint(name="size", context=library, expression="context Library inv: self.has->size() = 2",
+                      language="OCL")
+    assert evaluator.check(size, library_obj) is True
+    all_books = Constraint(name="all", context=book, expression="Book->allInstances()->size() = 2", language="OCL")
+    assert evaluator.check(all_books, book_obj) is True
+
+
+
+# Testing the OCL semantics of div, mod and round, which differ from Python's on negative numbers and halves
+def test_evaluator_arithmetic():
+    evaluator = OCLEvaluator(object_model, library_model)
+    parser = OCLExpressionParser(library_model)
+    expected = {"7 div 2": 3, "-7 div 2": -3, "7 div -2": -3, "-7 div -2": 3, "7 mod 2": 1, "-7 mod 2": -1,
+                "7 mod -2": 1, "-7 mod -2": -1, "7 div 0": None, "(2.5).round()": 3, "(-2.5).round()": -2,
+                "(0.5).round()": 1, "(-0.5).round()": 0, "(-2.6).round()": -3, "(1.4).round()": 1}
+    for text, value in expected.items():
+        assert evaluator.evaluate(parser.parse_expression(text, book), book_obj) == value, text
+
+# Testing batch validation in the calling process
+def test_validate_serial():
+    report = validate_object_model(library_model, object_model, processes=1)
+    assert report.checked == 17
+    assert violations(report) == EXPECTED_VIOLATIONS
+    assert not report.errors
+    assert not report.is_valid
+
+
+# Testing that a process pool produces the same report
+def test_validate_parallel():
+    report = validate_object_model(library_model, object_model, processes=3, chunk_size=1)
+    assert report.checked == 17
+    assert violations(report) == EXPECTED_VIOLATIONS
+
+
+# Testing constraints that cannot be parsed
+def test_validate_errors():
+    wrong = Constraint(name="wrong", context=book, expression="context Book inv: self.unknown > 0", language="OCL")
+    report = validate_object_model(library_model, object_model, constraints=[wrong], processes=1)
+    assert "wrong" in report.errors
+    assert report.checked == 0
+
+
+# Testing an empty object model
+def test_validate_empty_model():
+    report = validate_object_model(library_model, ObjectModel(name="empty", instances=set(), links=set()))
+    assert report.checked == 0
+    assert report.is_valid
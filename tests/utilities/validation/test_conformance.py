@@ -0,0 +1,65 @@
+from besser.BUML.metamodel.structural import DomainModel, Class, Property, Multiplicity, BinaryAssociation, \
+    StringType, IntegerType
+from besser.BUML.metamodel.object import ObjectModel, Object, AttributeLink, DataValue, Link, LinkEnd, \
+    ColumnarObjectModel
+from besser.utilities.validation import check_conformance
+
+name = Property(name="name", type=StringType)
+size = Property(name="size", type=IntegerType, multiplicity=Multiplicity(0, 1))
+team = Class(name="Team", attributes={name, size})
+person = Class(name="Person", attributes={Property(name="name", type=StringType)})
+base = Class(name="Base", is_abstract=True)
+members = Property(name="members", type=person, multiplicity=Multiplicity(1, 2))
+member_of = Property(name="memberOf", type=team, multiplicity=Multiplicity(1, 1))
+membership = BinaryAssociation(name="membership", ends={members, member_of})
+model = DomainModel(name="teams", types={team, person, base}, associations={membership})
+
+
+def value(attribute, data):
+    return AttributeLink(attribute=attribute, value=DataValue(classifier=attribute.type, value=data))
+
+
+def link(team_obj, person_obj):
+    return Link(name=f"{team_obj.name}_{person_obj.name}", association=membership, connections=[
+        LinkEnd(name="team_end", association_end=member_of, object=team_obj),
+        LinkEnd(name="person_end", association_end=members, object=person_obj)])
+
+
+def kinds(violations):
+    return sorted((v.kind, v.element.name) for v in violations)
+
+
+# Testing the conformance of an object model to its domain model
+def test_conformance():
+    person_name = list(person.attributes)[0]
+    red = Object(name="red", classifier=team, slots=[value(name, "Red"), value(size, 3)])
+    blue = Object(name="blue", classifier=team, slots=[value(size, "large")])
+    people = [Object(name=f"p{i}", classifier=person, slots=[value(person_name, f"P{i}")]) for i in range(4)]
+    abstract = Object(name="base", classifier=base)
+    links = {link(red, people[0]), link(red, people[1]), link(red, people[2]), link(blue, people[2])}
+    object_model = ObjectModel(name="teams", instances={red, blue, abstract, *people}, links=links)
+
+    found = kinds(check_conformance(model, object_model))
+    assert found == [
+        ("abstract", "base"),
+        ("multiplicity", "p2"),     # member of two teams
+        ("multiplicity", "p3"),     # member of no team
+        ("multiplicity", "red"),    # three members
+        ("required", "blue"),       # no name
+        ("type", "blue"),           # size is not an integer
+    ]
+
+    # the checker is a generator: violations are streamed as they are found
+    first = next(check_conformance(model, object_model))
+    assert first.kind in {"abstract", "multiplicity", "required", "type"}
+
+
+# Testing the conformance checker on a columnar object model
+def test_conformance_columnar():
+    columnar = ColumnarObjectModel(name="teams")
+    team_ids = columnar.add_objects(team, {"name": ["Red", "Blue"]})
+    person_ids = columnar.add_objects(person, {"name": ["A", "B", "C"]})
+    columnar.add_links(members, [team_ids[0], team_ids[0], team_ids[0]], person_ids)
+    violations = list(check_conformance(model, columnar))
+    assert [(v.kind, v.element.object_id) for v in violations] == [
+        ("multiplicity", team_ids[0]), ("multiplicity", team_ids[1])]
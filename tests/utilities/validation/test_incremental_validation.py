@@ -0,0 +1,97 @@
+from besser.BUML.metamodel.structural import Constraint, StringType, IntegerType
+from besser.BUML.metamodel.object import ObjectModel, Object, AttributeLink, DataValue, Link, LinkEnd
+from besser.utilities.validation import IncrementalValidator, ConstraintDependencies, validate_object_model
+from besser.BUML.notations.ocl.expression_parser import parse_ocl_constraint
+from tests.BUML.metamodel.object.library_object import library_model, library, book, library_name, title, \
+    pages, has, located_in, lib_book_association, constraintPageNumber, constraintBookPageNumber, \
+    constraintLibrarySize
+
+CONSTRAINTS = [constraintPageNumber, constraintBookPageNumber, constraintLibrarySize]
+
+
+def new_book(name, page_count):
+    return Object(name=name, classifier=book, slots=[
+        AttributeLink(attribute=title, value=DataValue(classifier=StringType, value=name)),
+        AttributeLink(attribute=pages, value=DataValue(classifier=IntegerType, value=page_count))])
+
+
+def new_link(library_obj, book_obj):
+    return Link(name=f"{library_obj.name}_{book_obj.name}", association=lib_book_association, connections=[
+        LinkEnd(name="library_end", association_end=located_in, object=library_obj),
+        LinkEnd(name="book_end", association_end=has, object=book_obj)])
+
+
+def build_model():
+    library_obj = Object(name="Library", classifier=library, slots=[
+        AttributeLink(attribute=library_name, value=DataValue(classifier=StringType, value="Library"))])
+    books = [new_book(f"Book {i}", 100 + i) for i in range(3)]
+    links = {new_link(library_obj, b) for b in books}
+    return ObjectModel(name="model", instances={library_obj, *books}, links=links), library_obj, books
+
+
+def violations(report):
+    return {(v.constraint.name, v.object.name) for v in report.violations}
+
+
+# Testing the dependency analysis of constraints
+def test_dependencies():
+    dependencies = ConstraintDependencies(parse_ocl_constraint(constraintPageNumber, library_model))
+    assert dependencies.paths == {(has,), (has, pages)}
+    assert not dependencies.is_global
+    all_books = Constraint(name="all", context=book, expression="Book->allInstances()->size() > 0", language="OCL")
+    assert ConstraintDependencies(parse_ocl_constraint(all_books, library_model)).is_global
+
+
+# Testing the change tracker of object models
+def test_change_tracking():
+    model, library_obj, books = build_model()
+    tracker = model.track_changes()
+    books[0].slots[1].value.value = 5
+    assert tracker.attributes == {books[0]: {pages}}
+    new_link(library_obj, books[1])
+    assert tracker.ends[library_obj] == {has}
+    assert tracker.ends[books[1]] == {located_in}
+    extra = new_book("Extra", 10)
+    model.add_instance(extra)
+    assert extra in tracker.added and extra._tracker is tracker
+    tracker.clear()
+    assert not tracker.has_changes
+
+
+# Testing that only the affected (constraint, object) pairs are re-evaluated
+def test_revalidate():
+    model, library_obj, books = build_model()
+    validator = IncrementalValidator(library_model, model, constraints=CONSTRAINTS)
+    assert validator.validate().is_valid
+    assert validator.revalidate().checked == 0
+
+    books[0].slots[1].value = DataValue(classifier=IntegerType, value=-1)
+    report = validator.revalidate()
+    # BookPageNumber on the changed book and libraryPageNumber on the library reaching it through 'has'
+    assert report.checked == 2
+    assert violations(report) == {("BookPageNumber", "Book 0"), ("libraryPageNumber", "Library")}
+
+    books[0].slots[1].value.value = 50
+    assert validator.revalidate().is_valid
+
+    extra = new_book("Extra", 0)
+    model.add_instance(extra)
+    new_link(library_obj, extra)
+    report = validator.revalidate()
+    assert violations(report) == {("BookPageNumber", "Extra"), ("libraryPageNumber", "Library")}
+    assert report.checked < len(CONSTRAINTS) * len(model.instances)
+
+    model.remove_instance(extra)
+    report = validator.revalidate()
+    assert ("BookPageNumber", "Extra") not in violations(report)
+
+
+# Testing that incremental and full validation agree
+def test_revalidate_matches_full_validation():
+    model, library_obj, books = build_model()
+    validator = IncrementalValidator(library_model, model, constraints=CONSTRAINTS)
+    books[1].slots[1].value.value = -3
+    books[2].slots[1].value.value = 0
+    incremental = validator.revalidate()
+    full = validate_object_model(library_model, model, constraints=CONSTRAINTS, processes=1)
+    assert violations(incremental) == violations(full)
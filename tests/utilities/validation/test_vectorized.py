@@ -0,0 +1,68 @@
+import random
+
+from besser.BUML.metamodel.structural import DomainModel, Class, Property, Constraint, StringType, IntegerType, \
+    FloatType
+from besser.BUML.metamodel.object import ObjectModel, Object, AttributeLink, DataValue
+from besser.BUML.notations.ocl.expression_parser import OCLExpressionParser
+from besser.utilities.validation import VectorizedEvaluator, OCLEvaluator, validate_object_model
+from tests.BUML.metamodel.object.library_object import library_model, object_model, constraintPageNumber
+
+name = Property(name="name", type=StringType)
+age = Property(name="age", type=IntegerType)
+score = Property(name="score", type=FloatType)
+person = Class(name="Person", attributes={name, age, score})
+
+EXPRESSIONS = [
+    "self.age >= 18 and self.age < 130",
+    "self.age > 20 or self.score > 0.5",
+    "self.age > 20 implies self.score >= 0",
+    "self.age = null",
+    "self.name <> 'Bob'",
+    "self.age.oclIsUndefined() or self.age mod 7 <> 3",
+    "(self.age div (self.age - 50)) >= 0",
+    "self.score / self.age < 0.1",
+    "if self.name->size() > 3 then self.age * 2 > 50 else -self.score < 0 endif",
+    "not (self.score.floor() = self.age) xor self.age.abs() > 10",
+    "(self.age - 50) div 7 + (self.age - 50) mod -7 = (self.score * 2 - 1.5).round()",
+]
+
+
+def build_people(count):
+    rng = random.Random(7)
+    people = []
+    for i in range(count):
+        values = {name: rng.choice(["Ann", "Bob", "Carla", None]),
+                  age: rng.choice([None, 0, 50] + list(range(-5, 140, 9))),
+                  score: rng.choice([None, 0.0, -1.5, 0.25, 0.75, 3.0])}
+        slots = [AttributeLink(attribute=attribute, value=DataValue(classifier=attribute.type, value=value))
+                 for attribute, value in values.items()]
+        people.append(Object(name=f"p{i}", classifier=person, slots=slots))
+    return people
+
+
+# Testing that vectorized evaluation matches the scalar evaluator, including undefined values
+def test_matches_scalar_evaluation():
+    domain_model = DomainModel(name="People", types={person})
+    people = build_people(300)
+    model = ObjectModel(name="people", instances=set(people), links=set())
+    parser = OCLExpressionParser(domain_model)
+    scalar = OCLEvaluator(model, domain_model)
+    vectorized = VectorizedEvaluator(model, domain_model)
+    for text in EXPRESSIONS:
+        expression = parser.parse_expression(text, person)
+        assert VectorizedEvaluator.supports(expression), text
+        assert vectorized.evaluate(expression, people) == [scalar.evaluate(expression, p) for p in people], text
+
+
+# Testing the fallback to the scalar evaluator and the vectorized batch validation mode
+def test_fallback_and_batch_validation():
+    expression = OCLExpressionParser(library_model).parse(constraintPageNumber)
+    assert not VectorizedEvaluator.supports(expression)
+    library_obj = [o for o in object_model.instances if o.classifier.name == "Library"]
+    assert VectorizedEvaluator(object_model, library_model).evaluate(expression, library_obj) == [True]
+
+    serial = validate_object_model(library_model, object_model, processes=1)
+    vectorized = validate_object_model(library_model, object_model, processes=1, vectorized=True)
+    assert vectorized.checked == serial.checked
+    assert [(v.constraint.name, v.object.name, v.message) for v in vectorized.violations] == \
+        [(v.constraint.name, v.object.name, v.message) for v in serial.violations]
@@ -0,0 +1,208 @@
+import asyncio
+import copy
+import io
+import os
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi.testclient import TestClient
+
+from besser.BUML.metamodel.structural import StringType, IntegerType
+from besser.utilities.web_modeling_editor.backend import backend
+from besser.utilities.web_modeling_editor.backend.services import WorkerPool, WorkerPoolBusyError, process_class_diagram
+
+CLASS_DIAGRAM = {
+    "elements": {
+        "type": "ClassDiagram",
+        "elements": {
+            "c1": {"id": "c1", "type": "Class", "name": "Book", "attributes": ["a1", "a2"], "methods": []},
+            "a1": {"id": "a1", "type": "ClassAttribute", "name": "+ title: str"},
+            "a2": {"id": "a2", "type": "ClassAttribute", "name": "+ pages: int"},
+        },
+        "relationships": {},
+    },
+    "generator": "python",
+}
+
+
+def wait_for(event: threading.Event):
+    event.wait(5)
+    return "done"
+
+
+# Testing the bound, the timeout and the cancellation of the worker pool
+def test_worker_pool():
+    pool = WorkerPool(processes=1, max_pending=2, executor_factory=lambda workers: ThreadPoolExecutor(workers))
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run(wait_for, release))
+        await asyncio.sleep(0.05)
+        # the second job is queued behind the first one and times out before starting
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(wait_for, release, timeout=0.05)
+        assert pool.pending == 1
+        second = asyncio.ensure_future(pool.run(wait_for, release))
+        await asyncio.sleep(0.05)
+        with pytest.raises(WorkerPoolBusyError):
+            await pool.run(wait_for, release)
+        release.set()
+        assert await first == "done" and await second == "done"
+
+    asyncio.run(scenario())
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+def exit_worker():
+    os._exit(1)
+
+
+# Testing that the worker pool starts new workers when a worker process dies
+def test_worker_pool_recovery():
+    pool = WorkerPool(processes=1, max_pending=2)
+
+    async def scenario():
+        with pytest.raises(BrokenProcessPool):
+            await pool.run(exit_worker)
+        assert pool.pending == 0
+        assert await pool.run(os.getpid) != os.getpid()
+
+    asyncio.run(scenario())
+    pool.shutdown()
+
+
+# Testing the generation endpoints, run in the worker processes
+def test_generate_output():
+    with TestClient(backend.app) as client:
+        response = client.post("/generate-output", json=CLASS_DIAGRAM)
+        assert response.status_code == 200
+        assert "class Book" in response.text
+        response = client.post("/export-buml", json=CLASS_DIAGRAM)
+        assert response.status_code == 200 and "Book" in response.text
+
+        # the repeated generation is served from the cache, without a job
+        max_pending = backend.worker_pool.max_pending
+        backend.worker_pool.max_pending = 0
+        hits = backend.generation_cache.hits
+        response = client.post("/generate-output", json=CLASS_DIAGRAM)
+        assert response.status_code == 200 and "class Book" in response.text
+        assert backend.generation_cache.hits == hits + 1
+
+        backend.generation_cache.clear()
+        try:
+            response = client.post("/generate-output", json=CLASS_DIAGRAM)
+            assert response.status_code == 429 and response.headers["Retry-After"] == "1"
+        finally:
+            backend.worker_pool.max_pending = max_pending
+
+
+# Testing the generation of several outputs from one conversion
+def test_generate_outputs():
+    with TestClient(backend.app) as client:
+        response = client.post("/generate-outputs", json={"elements": CLASS_DIAGRAM["elements"],
+                                                           "generators": ["sql", "pydantic", "java", "sql"]})
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            names = archive.namelist()
+            assert "sql/tables.sql" in names and "pydantic/pydantic_classes.py" in names
+            assert any(name.startswith("java/") and name.endswith("Book.java") for name in names)
+            assert "Book" in archive.read("pydantic/pydantic_classes.py").decode()
+
+        response = client.post("/generate-outputs", json={"elements": CLASS_DIAGRAM["elements"],
+                                                           "generators": ["sql", "cobol"]})
+        assert response.status_code == 400
+
+        # the generators of one request are run a few at a time, so they fit in a pool with a single slot
+        max_pending = backend.worker_pool.max_pending
+        backend.worker_pool.max_pending = 1
+        try:
+            response = client.post("/generate-outputs", json={"elements": CLASS_DIAGRAM["elements"],
+                                                               "generators": ["sql", "pydantic", "java", "python"]})
+            assert response.status_code == 200
+        finally:
+            backend.worker_pool.max_pending = max_pending
+
+
+def failing_job():
+    raise ValueError("failed")
+
+
+# Testing that the jobs of a request are cancelled when one of them fails
+def test_run_jobs(monkeypatch):
+    pool = WorkerPool(processes=1, executor_factory=lambda workers: ThreadPoolExecutor(workers))
+    monkeypatch.setattr(backend, "worker_pool", pool)
+    started = []
+
+    async def scenario():
+        with pytest.raises(ValueError, match="failed"):
+            await backend.run_jobs([(failing_job, (), "a"), (started.append, ("b",), "b")])
+        assert await backend.run_jobs([(started.append, ("c",), "c"), (os.getpid, (), "d")]) == [None, os.getpid()]
+
+    asyncio.run(scenario())
+    assert started == ["c"] and pool.pending == 0
+    pool.shutdown()
+
+
+# Testing the metrics of the requests, the cache, and the stages run in the worker processes
+def test_metrics():
+    backend.generation_cache.clear()
+    with TestClient(backend.app) as client:
+        for _ in range(2):
+            assert client.post("/generate-output", json=CLASS_DIAGRAM).status_code == 200
+        response = client.get("/metrics")
+        assert response.status_code == 200 and response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        metrics = response.text
+        assert 'besser_http_request_duration_seconds_count{method="POST",route="/generate-output",status="200"}' \
+            in metrics
+        assert 'besser_generation_cache_requests_total{result="hit"}' in metrics
+        assert 'besser_generation_cache_requests_total{result="miss"}' in metrics
+        assert 'besser_stage_duration_seconds_count{stage="convert",generator=""}' in metrics
+        for stage in ("generate", "queue"):
+            assert f'besser_stage_duration_seconds_count{{stage="{stage}",generator="python"}}' in metrics
+        assert 'besser_generator_duration_seconds_count{generator="PythonGenerator"}' in metrics
+        assert 'besser_model_elements{kind="classes"} 1.0' in metrics
+        assert "besser_worker_pool_pending_jobs 0.0" in metrics
+
+
+# Testing the resolution of types: shared primitive types, enumerations, classes declared later, and relationships
+# between classes renamed to unique names
+def test_type_resolution():
+    diagram = copy.deepcopy(CLASS_DIAGRAM)
+    elements = diagram["elements"]["elements"]
+    elements["c1"]["attributes"].append("a3")
+    elements["c1"]["methods"] = ["m1"]
+    elements.update({
+        "a3": {"id": "a3", "type": "ClassAttribute", "name": "+ genre: Genre"},
+        "m1": {"id": "m1", "type": "ClassMethod", "name": "+ author(): Class1"},
+        "e1": {"id": "e1", "type": "Enumeration", "name": "Genre", "attributes": ["l1"], "methods": []},
+        "l1": {"id": "l1", "type": "ClassAttribute", "name": "Novel"},
+        "c2": {"id": "c2", "type": "Class", "name": "Class", "attributes": [], "methods": []},
+        "c3": {"id": "c3", "type": "Class", "name": "Class", "attributes": [], "methods": []},
+    })
+    diagram["elements"]["relationships"] = {
+        "r1": {"id": "r1", "type": "ClassInheritance", "source": {"element": "c3"}, "target": {"element": "c2"}},
+    }
+    model = process_class_diagram(diagram)
+    book = model.get_class_by_name("Book")
+    types = {attribute.name: attribute.type for attribute in book.attributes}
+    assert types["title"] is StringType and types["pages"] is IntegerType
+    assert types["genre"] is model.get_type_by_name("Genre")
+    assert next(iter(book.methods)).type is model.get_class_by_name("Class1")
+    generalization = next(iter(model.generalizations))
+    assert generalization.general.name == "Class1" and generalization.specific.name == "Class2"
+
+
+# Testing that an uploaded B-UML file is not executed, and that the error is logged with its traceback
+def test_get_json_model_rejected(caplog, tmp_path):
+    code = "from besser.BUML.metamodel.state_machine import Body, compiled_callable\n" \
+           f"b = Body('x', code='import os\\nos.mkdir({str(tmp_path / 'pwned')!r})\\ndef x(session): pass')\n" \
+           "compiled_callable(b)\n"
+    with TestClient(backend.app) as client:
+        response = client.post("/get-json-model", files={"buml_file": ("model.py", code, "text/x-python")})
+    assert response.status_code == 500 and not (tmp_path / "pwned").exists()
+    record, = [record for record in caplog.records if record.name == "besser.backend"]
+    assert record.message == "Error in get_json_model" and record.exc_info is not None
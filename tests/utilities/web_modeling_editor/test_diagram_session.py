@@ -0,0 +1,137 @@
+import copy
+
+import pytest
+from fastapi.testclient import TestClient
+
+from besser.utilities.web_modeling_editor.backend import backend
+from besser.utilities.web_modeling_editor.backend.services import DiagramSession, DiagramSessionStore, \
+    DiagramSessionError, process_class_diagram
+from tests.utilities.web_modeling_editor.test_backend import CLASS_DIAGRAM
+
+AUTHOR_PATCH = [
+    {"op": "add", "path": "/elements/c2", "value": {"id": "c2", "type": "Class", "name": "Author",
+                                                   "attributes": [], "methods": []}},
+    {"op": "add", "path": "/elements/a3", "value": {"id": "a3", "type": "ClassAttribute", "name": "+ name: str"}},
+    {"op": "add", "path": "/elements/c2/attributes/-", "value": "a3"},
+    {"op": "add", "path": "/relationships/r1", "value": {
+        "id": "r1", "type": "ClassBidirectional", "name": "writes",
+        "source": {"element": "c2", "multiplicity": "1..*", "role": "authors"},
+        "target": {"element": "c1", "multiplicity": "*", "role": "books"}}},
+]
+
+
+def attribute_names(cls):
+    return {attribute.name for attribute in cls.attributes}
+
+
+# Testing that a session builds the same model as a full conversion
+def test_session_build():
+    session = DiagramSession(copy.deepcopy(CLASS_DIAGRAM["elements"]))
+    model = process_class_diagram(copy.deepcopy(CLASS_DIAGRAM))
+    assert {c.name for c in session.model.get_classes()} == {c.name for c in model.get_classes()}
+    assert attribute_names(session.model.get_class_by_name("Book")) == {"title", "pages"}
+
+
+# Testing the incremental edits: add class, attribute and relationship, rename, remove
+def test_session_patches():
+    session = DiagramSession(copy.deepcopy(CLASS_DIAGRAM["elements"]))
+    book = session.model.get_class_by_name("Book")
+    assert session.apply(AUTHOR_PATCH) == 1
+    author = session.model.get_class_by_name("Author")
+    assert attribute_names(author) == {"name"}
+    association = next(iter(session.model.associations))
+    assert association.name == "writes" and {end.type for end in association.ends} == {author, book}
+
+    session.apply([{"op": "replace", "path": "/elements/c1/name", "value": "Novel"},
+                   {"op": "replace", "path": "/elements/a1/name", "value": "+ subtitle: str"}])
+    assert session.model.get_class_by_name("Novel") is book and session.model.get_class_by_name("Book") is None
+    assert attribute_names(book) == {"subtitle", "pages"}
+    # a duplicated name gets a suffix, as in a full conversion
+    session.apply([{"op": "replace", "path": "/elements/c2/name", "value": "Novel"}])
+    assert author.name == "Novel1"
+
+    session.apply([{"op": "remove", "path": "/elements/c2"}])
+    assert author not in session.model.types and not session.model.associations
+    assert not book.associations
+    assert "r1" in session.validate()["elements"]
+    session.apply([{"op": "remove", "path": "/relationships/r1"}])
+    assert session.validate() == {"elements": {}, "constraints": {}}
+
+
+# Testing that an invalid patch is reported and undone as a whole
+def test_session_invalid_patch():
+    diagram = copy.deepcopy(CLASS_DIAGRAM["elements"])
+    session = DiagramSession(copy.deepcopy(diagram))
+    with pytest.raises(DiagramSessionError, match="Operation 2"):
+        session.apply([{"op": "replace", "path": "/elements/c1/name", "value": "Novel"},
+                       {"op": "remove", "path": "/elements/c1/attributes/0"},
+                       {"op": "replace", "path": "/elements/c9/name", "value": "Missing"}])
+    assert session.diagram == diagram and session.version == 0
+    assert session.model.get_class_by_name("Novel") is None
+
+    # a method returning a class that does not exist yet cannot be converted
+    method_patch = [{"op": "add", "path": "/elements/m1", "value": {"id": "m1", "type": "ClassMethod",
+                                                                    "name": "+ author(): Author"}},
+                    {"op": "add", "path": "/elements/c1/methods/-", "value": "m1"}]
+    with pytest.raises(DiagramSessionError, match="cannot be converted"):
+        session.apply(method_patch)
+    assert session.diagram == diagram and session.version == 0
+    assert attribute_names(session.model.get_class_by_name("Book")) == {"title", "pages"}
+    assert session.apply(AUTHOR_PATCH + method_patch) == 1
+    method, = session.model.get_class_by_name("Book").methods
+    assert method.type is session.model.get_class_by_name("Author")
+
+
+# Testing the OCL constraints of the live model
+def test_session_constraints():
+    session = DiagramSession(copy.deepcopy(CLASS_DIAGRAM["elements"]))
+    session.apply([{"op": "add", "path": "/elements/o1", "value": {
+        "id": "o1", "type": "ClassOCLConstraint", "constraint": "context Book inv positive: self.pages > 0"}}])
+    assert len(session.model.constraints) == 1 and session.validate()["constraints"] == {}
+    session.apply([{"op": "replace", "path": "/elements/a2/name", "value": "+ length: int"}])
+    assert session.validate()["constraints"]
+
+
+
+# Testing that a patch of the whole diagram builds the model again, keeping the version
+def test_session_rebuild():
+    session = DiagramSession(copy.deepcopy(CLASS_DIAGRAM["elements"]))
+    session.apply(AUTHOR_PATCH)
+    elements = copy.deepcopy(session.elements)
+    del elements["c1"]
+    assert session.apply([{"op": "replace", "path": "/elements", "value": elements}]) == 2
+    assert {c.name for c in session.model.get_classes()} == {"Author"}
+    assert "r1" in session.validate()["elements"]
+
+# Testing the bounds of the session store
+def test_session_store():
+    now = [0.0]
+    store = DiagramSessionStore(max_sessions=2, ttl=10, clock=lambda: now[0])
+    first, session = store.create({})
+    assert session.id == first and store.max_sessions == 2 and store.ttl == 10
+    second, _ = store.create({})
+    assert store.get(first) is not None
+    third, _ = store.create({})
+    assert store.get(second) is None and len(store) == 2
+    now[0] = 11
+    assert store.get(first) is None and store.get(third) is None
+
+
+# Testing the diagram session endpoints
+def test_session_endpoints():
+    with TestClient(backend.app) as client:
+        session_id = client.post("/diagram-sessions", json=CLASS_DIAGRAM).json()["session_id"]
+        response = client.patch(f"/diagram-sessions/{session_id}", json=AUTHOR_PATCH)
+        assert response.status_code == 200 and response.json()["version"] == 1
+        response = client.patch(f"/diagram-sessions/{session_id}", json=[{"op": "move", "path": "/elements/c1"}])
+        assert response.status_code == 400
+        response = client.patch(f"/diagram-sessions/{session_id}", json=[
+            {"op": "add", "path": "/elements/m1", "value": {"id": "m1", "type": "ClassMethod", "name": "+ f(): Nobody"}},
+            {"op": "add", "path": "/elements/c1/methods/-", "value": "m1"}])
+        assert response.status_code == 400 and "version 1" in response.json()["detail"]
+        assert client.post(f"/diagram-sessions/{session_id}/validate").json()["valid"]
+        response = client.post(f"/diagram-sessions/{session_id}/generate/python")
+        assert response.status_code == 200 and "class Author" in response.text
+        assert "Author" in str(client.get(f"/diagram-sessions/{session_id}").json()["elements"])
+        client.delete(f"/diagram-sessions/{session_id}")
+        assert client.get(f"/diagram-sessions/{session_id}").status_code == 404
@@ -0,0 +1,65 @@
+import asyncio
+import copy
+
+from besser.utilities.web_modeling_editor.backend.services import GenerationCache, generation_key
+from tests.utilities.web_modeling_editor.test_backend import CLASS_DIAGRAM
+
+
+# Testing that the key ignores the layout and the order of the keys, but not the content
+def test_generation_key():
+    key = generation_key(CLASS_DIAGRAM, "python")
+    moved = copy.deepcopy(CLASS_DIAGRAM)
+    moved["elements"]["elements"]["c1"]["bounds"] = {"x": 10, "y": 20, "width": 100, "height": 80}
+    reordered = {"generator": "python", "elements": dict(reversed(list(moved["elements"].items())))}
+    assert generation_key(moved, "python") == key
+    assert generation_key(reordered, "python") == key
+    assert generation_key(CLASS_DIAGRAM, "java") != key
+    assert generation_key(CLASS_DIAGRAM, "python", {"option": 1}) != key
+    renamed = copy.deepcopy(CLASS_DIAGRAM)
+    renamed["elements"]["elements"]["c1"]["name"] = "Novel"
+    assert generation_key(renamed, "python") != key
+
+
+# Testing the bounds of the memory tier
+def test_memory_tier():
+    cache = GenerationCache(max_entries=2, max_bytes=100)
+    cache.put("a", (b"a" * 10, "a.py", "text/plain"))
+    cache.put("b", (b"b" * 10, "b.py", "text/plain"))
+    assert cache.get("a")[0] == b"a" * 10
+    cache.put("c", (b"c" * 10, "c.py", "text/plain"))
+    # "b" is the least recently used result
+    assert cache.get("b") is None and len(cache) == 2
+    cache.put("d", (b"d" * 80, "d.py", "text/plain"))
+    assert cache.get("a") is None and cache.get("c") is None and cache.get("d") is not None
+    cache.put("e", (b"e" * 200, "e.py", "text/plain"))
+    assert cache.get("e") is None
+    assert cache.hits == 2 and cache.misses == 4
+
+
+# Testing the disk tier
+def test_disk_tier(tmp_path):
+    cache = GenerationCache(max_entries=1, directory=str(tmp_path), max_disk_bytes=250)
+    cache.put("a", (b"a" * 60, "a.py", "text/plain"))
+    cache.put("b", (b"b" * 60, "b.py", "text/plain"))
+    assert len(cache) == 1
+    assert cache.get("a") == (b"a" * 60, "a.py", "text/plain")
+    assert GenerationCache(directory=str(tmp_path)).get("b")[0] == b"b" * 60
+    # the disk tier keeps the most recently used results within its bound
+    assert cache.get("b")[0] == b"b" * 60
+    cache.put("c", (b"c" * 60, "c.py", "text/plain"))
+    disk = GenerationCache(directory=str(tmp_path))
+    assert disk.get("a") is None and disk.get("b") is not None and disk.get("c") is not None
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+# Testing the access to the disk tier from the event loop
+def test_async_access(tmp_path):
+    async def scenario():
+        cache = GenerationCache(max_entries=1, directory=str(tmp_path))
+        await cache.put_async("a", (b"a" * 60, "a.py", "text/plain"))
+        await cache.put_async("b", (b"b" * 60, "b.py", "text/plain"))
+        assert await cache.get_async("a") == (b"a" * 60, "a.py", "text/plain")
+        assert await cache.get_async("c") is None
+        assert cache.hits == 1 and cache.misses == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,220 @@
+import asyncio
+import io
+import time
+import zipfile
+from concurrent.futures import BrokenExecutor, Executor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import docker
+import pytest
+from fastapi.testclient import TestClient
+
+from besser.generators.backend import BackendGenerator
+from besser.utilities.web_modeling_editor.backend import backend
+from besser.utilities.web_modeling_editor.backend.services import JobStore, JobQueue, process_class_diagram
+from besser.utilities.web_modeling_editor.backend.services.generation import run_generation_job
+from besser.utilities.web_modeling_editor.backend.services.job_queue import FINISHED_STATES
+
+from tests.utilities.web_modeling_editor.test_backend import CLASS_DIAGRAM
+
+DOCKER_CONFIG = """[DEFAULT]
+docker_username = user
+docker_password = secret
+docker_image_name = library
+docker_repository = registry.example.org
+docker_tag = 1.0
+docker_port = 8000
+"""
+
+
+class FakeImages:
+    def __init__(self):
+        self.builds = []
+
+    def build(self, path, rm, tag):
+        with open(f"{path}/Dockerfile") as dockerfile:
+            self.builds.append((tag, dockerfile.read()))
+        return object(), [{"stream": "Step 1/10 : FROM python:3.9-slim\n"}, {"stream": "\n"}]
+
+
+class FakeAPI:
+    def __init__(self, error=None):
+        self.error = error
+        self.pushes = []
+
+    def push(self, name, stream, decode):
+        self.pushes.append(name)
+        yield {"status": "Pushing", "progress": "[=====>    ]"}
+        if self.error:
+            yield {"error": self.error}
+
+
+class FakeDockerClient:
+    """A stand-in for docker.DockerClient, recording the builds, logins and pushes."""
+
+    def __init__(self, push_error=None):
+        self.images = FakeImages()
+        self.api = FakeAPI(push_error)
+        self.logins = []
+
+    def login(self, username, password):
+        self.logins.append(username)
+
+
+class DeadExecutor(Executor):
+    """An executor whose worker processes died."""
+
+    def submit(self, fn, *args, **kwargs):
+        raise BrokenProcessPool("A process in the process pool was terminated abruptly")
+
+
+def wait_for_job(store: JobStore, job_id: str) -> dict:
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job["status"] in FINISHED_STATES:
+            return job
+        time.sleep(0.05)
+    raise TimeoutError(job_id)
+
+
+# Testing the Docker build and push of the backend generator, with a stand-in client
+def test_docker_build_and_push(tmp_path):
+    config_path = tmp_path / "docker.ini"
+    config_path.write_text(DOCKER_CONFIG)
+    model = process_class_diagram(CLASS_DIAGRAM)
+    client, messages = FakeDockerClient(), []
+    generator = BackendGenerator(model, output_dir=str(tmp_path / "out"), docker_image=True,
+                                 docker_config_path=str(config_path), docker_client=client, progress=messages.append)
+    generator.generate()
+    (tag, dockerfile), = client.images.builds
+    assert tag == "registry.example.org/library:1.0" and "EXPOSE 8000" in dockerfile
+    assert client.logins == ["user"] and client.api.pushes == [tag]
+    assert messages == [f"Building the Docker image {tag}", "Step 1/10 : FROM python:3.9-slim",
+                        f"Pushing the Docker image {tag}", "Pushing [=====>    ]"]
+
+    generator.docker_client = FakeDockerClient(push_error="denied: requested access to the resource is denied")
+    with pytest.raises(RuntimeError, match="denied"):
+        generator.generate()
+
+
+# Testing the jobs: artifacts, progress, Docker builds and failures, and the jobs resumed after a restart
+def test_job_queue(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs"))
+    queue = JobQueue(store, run_generation_job, executor_factory=lambda workers: ThreadPoolExecutor(workers))
+    job_id = queue.submit("python", CLASS_DIAGRAM)
+    job = wait_for_job(store, job_id)
+    assert job["status"] == "succeeded" and job["file_name"] == "classes.py"
+    with open(store.artifact_path(job_id), "rb") as artifact:
+        assert b"class Book" in artifact.read()
+    assert [event["message"] for event in store.events(job_id)] == ["Converting the class diagram",
+                                                                     "Running the python generator"]
+
+    config_path = tmp_path / "docker.ini"
+    config_path.write_text(DOCKER_CONFIG)
+    client = FakeDockerClient()
+    monkeypatch.setattr(docker, "from_env", lambda: client)
+    job_id = queue.submit("backend", {**CLASS_DIAGRAM, "generator": "backend", "docker_image": True,
+                                      "docker_config_path": str(config_path)})
+    assert wait_for_job(store, job_id)["status"] == "succeeded"
+    assert client.api.pushes == ["registry.example.org/library:1.0"]
+    assert "Pushing [=====>    ]" in [event["message"] for event in store.events(job_id)]
+    with zipfile.ZipFile(store.artifact_path(job_id)) as archive:
+        assert {"Dockerfile", "main_api.py", "sql_alchemy.py", "pydantic_classes.py"} <= set(archive.namelist())
+
+    job_id = queue.submit("cobol", {**CLASS_DIAGRAM, "generator": "cobol"})
+    job = wait_for_job(store, job_id)
+    assert job["status"] == "failed" and "cobol" in job["error"]
+    queue.shutdown()
+
+    # A job left running by a stopped backend is run again by the next one
+    job_id = store.create("sql", {**CLASS_DIAGRAM, "generator": "sql"})
+    store.start(job_id)
+    queue = JobQueue(JobStore(store.directory), run_generation_job,
+                     executor_factory=lambda workers: ThreadPoolExecutor(workers))
+    assert queue.start() == [job_id]
+    assert wait_for_job(store, job_id)["status"] == "succeeded"
+    queue.shutdown()
+    store.delete(job_id)
+    assert store.get(job_id) is None and not store.events(job_id)
+
+
+# Testing the job endpoints: submission, polling, streaming of the progress, and download of the artifact
+def test_job_endpoints():
+    with TestClient(backend.app) as client:
+        response = client.post("/jobs", json={**CLASS_DIAGRAM, "generator": "java"})
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        events = client.get(f"/jobs/{job_id}/events")
+        assert events.headers["content-type"].startswith("text/event-stream")
+        assert "event: progress" in events.text and '"status": "succeeded"' in events.text
+        job = client.get(f"/jobs/{job_id}").json()
+        assert job["status"] == "succeeded" and len(job["progress"]) == 2
+        artifact = client.get(f"/jobs/{job_id}/artifact")
+        assert artifact.status_code == 200 and artifact.headers["content-type"] == "application/zip"
+        with zipfile.ZipFile(io.BytesIO(artifact.content)) as archive:
+            assert any(name.endswith("Book.java") for name in archive.namelist())
+
+        assert client.post("/jobs", json={**CLASS_DIAGRAM, "docker_image": True}).status_code == 400
+        assert client.delete(f"/jobs/{job_id}").status_code == 200
+        assert client.get(f"/jobs/{job_id}").status_code == 404
+        assert client.get(f"/jobs/{job_id}/artifact").status_code == 404
+        assert client.delete(f"/jobs/{job_id}").status_code == 404
+        assert client.delete("/jobs/..").status_code == 404 and client.get("/jobs/jobs.db").status_code == 404
+
+
+
+# Testing that the job endpoints read and write the job table off the event loop
+def test_job_endpoints_off_event_loop(monkeypatch):
+    def off_loop(function):
+        def wrapper(*args):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            return function(*args)
+        return wrapper
+
+    for name in ("get", "events", "delete"):
+        monkeypatch.setattr(backend.job_store, name, off_loop(getattr(backend.job_store, name)))
+    monkeypatch.setattr(backend.job_queue, "submit", off_loop(backend.job_queue.submit))
+    with TestClient(backend.app) as client:
+        job_id = client.post("/jobs", json={**CLASS_DIAGRAM, "generator": "python"}).json()["job_id"]
+        assert '"status": "succeeded"' in client.get(f"/jobs/{job_id}/events").text
+        assert client.get(f"/jobs/{job_id}").json()["status"] == "succeeded"
+        assert client.get(f"/jobs/{job_id}/artifact").status_code == 200
+        assert client.delete(f"/jobs/{job_id}").status_code == 200
+
+# Testing that the jobs of a running backend are left to it, and that the jobs of a stopped one are run again
+def test_job_owners(tmp_path):
+    store = JobStore(str(tmp_path / "jobs"))
+    job_id = store.create("sql", {**CLASS_DIAGRAM, "generator": "sql"})
+    store.start(job_id, "other")
+    queue = JobQueue(store, run_generation_job, heartbeat_interval=0.1,
+                     executor_factory=lambda workers: ThreadPoolExecutor(workers))
+    assert queue.start() == [] and store.get(job_id)["status"] == "running"
+    store.heartbeat("other")
+    assert store.requeue_interrupted(stale_after=60) == []
+    # the other backend stops its heartbeat: the job is run again by this one
+    assert wait_for_job(store, job_id)["status"] == "succeeded"
+    queue.shutdown()
+    with pytest.raises(ValueError):
+        store.artifact_path("../jobs.db")
+
+
+# Testing that a job is submitted to new workers when the workers died, and fails when they cannot be started
+def test_broken_job_executor(tmp_path):
+    store = JobStore(str(tmp_path / "jobs"))
+    executors = [DeadExecutor(), ThreadPoolExecutor(1)]
+    queue = JobQueue(store, run_generation_job, executor_factory=lambda workers: executors.pop(0))
+    job_id = queue.submit("python", CLASS_DIAGRAM)
+    assert wait_for_job(store, job_id)["status"] == "succeeded"
+    queue.shutdown()
+
+    queue = JobQueue(store, run_generation_job, executor_factory=lambda workers: DeadExecutor())
+    with pytest.raises(BrokenExecutor):
+        queue.submit("python", CLASS_DIAGRAM)
+    assert store.queued() == []
+    job_id = store.create("python", CLASS_DIAGRAM)
+    assert queue.start() == [job_id]
+    job = store.get(job_id)
+    assert job["status"] == "failed" and "cannot be started" in job["error"]
+    queue.shutdown()
@@ -0,0 +1,22 @@
+from besser.utilities.web_modeling_editor.backend.services.generation import export_buml_file
+from besser.utilities.web_modeling_editor.backend.services.json_to_buml import process_class_diagram
+
+CLASS_DIAGRAM = {
+    "elements": {
+        "type": "ClassDiagram",
+        "elements": {
+            "c1": {"id": "c1", "type": "Class", "name": "Book", "attributes": ["a1"], "methods": ["m1"]},
+            "a1": {"id": "a1", "type": "ClassAttribute", "name": "+ title: str"},
+            "m1": {"id": "m1", "type": "ClassMethod", "name": "+ rename(title: str = 'x')"},
+        },
+        "relationships": {},
+    },
+}
+
+
+# Testing the conversion of method parameters with default values
+def test_method_parameters():
+    book = process_class_diagram(CLASS_DIAGRAM).get_class_by_name("Book")
+    parameter = next(iter(next(iter(book.methods)).parameters))
+    assert parameter.name == "title" and parameter.default_value == "x"
+    assert "default_value='x'" in export_buml_file(CLASS_DIAGRAM)[0].decode()
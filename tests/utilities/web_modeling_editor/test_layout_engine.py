@@ -0,0 +1,67 @@
+import random
+import time
+
+from besser.BUML.metamodel.structural import DomainModel, Class, Property, BinaryAssociation, Generalization, \
+    Multiplicity, StringType
+from besser.utilities.web_modeling_editor.backend.services import domain_model_to_json
+from besser.utilities.web_modeling_editor.backend.services.layout_engine import compute_layout
+
+
+def overlaps(positions: dict, sizes: dict) -> list:
+    boxes = [(positions[node], sizes[node], node) for node in positions]
+    return [(a, b) for index, ((ax, ay), (aw, ah), a) in enumerate(boxes) for (bx, by), (bw, bh), b in boxes[index + 1:]
+            if ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah]
+
+
+# Testing that the general elements are above the specific ones, centered over them, and that linked elements are close
+def test_layers_and_links():
+    sizes = {name: (160, 100) for name in ("Animal", "Dog", "Cat", "Puppy", "Owner", "Vet", "Clinic")}
+    generalizations = [("Dog", "Animal"), ("Cat", "Animal"), ("Puppy", "Dog")]
+    links = [("Owner", "Dog"), ("Vet", "Clinic")]
+    positions = compute_layout(sizes, generalizations, links, origin=(-600, -300))
+    assert not overlaps(positions, sizes)
+    assert positions["Puppy"][1] > positions["Dog"][1] > positions["Animal"][1]
+    assert positions["Dog"][1] == positions["Cat"][1]
+    # The superclass is centered over its subclasses
+    assert positions["Animal"][0] == (positions["Dog"][0] + positions["Cat"][0]) // 2
+    assert min(x for x, _ in positions.values()) == -600 and min(y for _, y in positions.values()) == -300
+    # The layout is deterministic
+    assert compute_layout(sizes, generalizations, links, origin=(-600, -300)) == positions
+
+
+# Testing a large diagram, with generalization cycles and links to unknown elements
+def test_large_layout():
+    rng = random.Random(0)
+    sizes = {index: (160, 100 + 30 * rng.randint(0, 5)) for index in range(1500)}
+    generalizations = [(index, index - rng.randint(1, 5)) for index in range(5, 1500) if rng.random() < 0.2]
+    cycle = [(10, 11), (11, 12), (12, 10)]
+    generalizations += cycle + [(13, 11)]
+    links = [(index, rng.randrange(1500)) for index in range(1500)] + [(0, "unknown")]
+    start = time.perf_counter()
+    positions = compute_layout(sizes, generalizations, links)
+    assert time.perf_counter() - start < 2
+    assert len(positions) == 1500 and not overlaps(positions, sizes)
+    assert all(positions[specific][1] > positions[general][1] for specific, general in generalizations
+               if (specific, general) not in cycle)
+
+
+# Testing the layout of a domain model converted to a diagram
+def test_domain_model_to_json_layout():
+    person = Class(name="Person", attributes={Property(name="name", type=StringType)})
+    student = Class(name="Student")
+    course = Class(name="Course")
+    enrollment = BinaryAssociation(name="enrollment", ends={
+        Property(name="students", type=student, multiplicity=Multiplicity(0, "*")),
+        Property(name="courses", type=course, multiplicity=Multiplicity(0, "*"))})
+    model = DomainModel(name="University", types={person, student, course}, associations={enrollment},
+                        generalizations={Generalization(general=person, specific=student)})
+    diagram = domain_model_to_json(model)
+    elements = {element["name"]: element for element in diagram["elements"].values() if element["owner"] is None}
+    assert elements["Student"]["bounds"]["y"] > elements["Person"]["bounds"]["y"]
+    inheritance = next(relationship for relationship in diagram["relationships"].values()
+                       if relationship["type"] == "ClassInheritance")
+    # The path goes from the top of the subclass to the bottom of the superclass
+    student_bounds, person_bounds = elements["Student"]["bounds"], elements["Person"]["bounds"]
+    assert inheritance["source"]["direction"] == "Up" and inheritance["target"]["direction"] == "Down"
+    assert inheritance["path"][0]["y"] == student_bounds["y"]
+    assert inheritance["path"][-1]["y"] == person_bounds["y"] + person_bounds["height"]